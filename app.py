@@ -1,21 +1,16 @@
 import streamlit as st
+import streamlit.components.v1 as components
 from streamlit_option_menu import option_menu
 import pandas as pd
 from src.services.extractor import extract_text_from_pdf
 from src.pipelines.scorer import score_with_openrouter, get_gemini_client, extract_candidate_name_from_cv, extract_candidate_info_from_cv, score_candidate_pipeline, _get_model_name, call_api_with_retry
 from src.repositories.github_utils import (
-    save_results_to_github,
-    load_results_from_github,
-    load_results_for_position,
-    clear_results_cache,
-    save_job_positions_to_github,
-    load_job_positions_from_github,
-    delete_job_position_from_github,
-    update_job_position_in_github,
-    update_results_in_github,
-    get_results_filename,
-    parse_kalibrr_date
+    RESULTS_LIST_COLUMNS,
+    RESULTS_LONG_TEXT_COLUMNS,
+    clear_results_cache
 )
+from src.repositories.job_positions_repository import get_job_positions_repository
+from src.repositories.results_store import get_results_store, result_row_keys, start_results_syncer
 from src.services.candidate_processor import (
     parse_candidate_csv,
     extract_resume_from_url,
@@ -24,6 +19,13 @@ from src.services.candidate_processor import (
     _get_column_value,
     fetch_candidates_from_google_sheets
 )
+from src.services.column_schema import (
+    MATCH_NAME,
+    MATCH_NAME_PHONE,
+    match_existing_candidates,
+    to_canonical
+)
+from src.utils.github_client import github_call_stats
 from src.utils.usage_logger import log_cv_processing, print_daily_summary, get_daily_summary
 from PIL import Image
 from datetime import datetime
@@ -41,6 +43,51 @@ REJECTION_REASONS = [
 ]
 REJECTION_REASON_CV_SCREENING = "Tidak lolos CV screening"
 
+# Screening results storage (RESULTS_STORE=github|sqlite); a local SQLite
+# store is synced to GitHub in the background
+results_store = get_results_store()
+start_results_syncer(results_store)
+
+# Job positions are cached per process and re-read only when their blob SHA
+# changes; cached results views are rebuilt when the positions change
+positions_repo = get_job_positions_repository()
+positions_repo.subscribe("app", lambda old_sha, new_sha: clear_results_cache())
+
+
+def _job_position_edits():
+    """This session's staged job position edits (committed by "Save changes")."""
+    if "job_position_edits" not in st.session_state:
+        st.session_state.job_position_edits = positions_repo.edits()
+    return st.session_state.job_position_edits
+
+
+def _job_positions():
+    """Job positions as this session sees them (saved rows + unsaved edits)."""
+    return _job_position_edits().load()
+
+
+def _pending_position_edits_banner(on_job_management):
+    """Warn about unsaved job position edits, and before the page is left with them."""
+    pending = _job_position_edits().pending
+    if pending:
+        if on_job_management:
+            st.warning(f"📝 **{pending} unsaved change(s) to job positions.** "
+                       "Click **Save changes** to commit them; closing or reloading this page loses them.")
+        else:
+            st.warning(f"📝 **{pending} unsaved change(s) to job positions** are shown on every page of this session "
+                       "but are not saved yet. Open **Job Management** and click **Save changes**.")
+    # The browser asks before closing / reloading the tab while edits are unsaved
+    guard = "e => { e.preventDefault(); e.returnValue = ''; }" if pending else "null"
+    components.html(f"<script>window.parent.onbeforeunload = {guard};</script>", height=0)
+
+
+def _current_user():
+    """Signed-in recruiter for status patch logs ("streamlit" if unknown)."""
+    try:
+        return st.user.email or "streamlit"
+    except Exception:
+        return "streamlit"
+
 # --- Page Config ---
 logo = Image.open("logo.webp")
 st.set_page_config(
@@ -774,12 +821,46 @@ Recruiter Feedback:
     return min(max(score, 0), 100)
 
 
+# Unsaved job position edits are visible (and guarded) on every page
+_pending_position_edits_banner(selected == "Job Management")
+
 # ========================================
 # SECTION 1: JOB MANAGEMENT
 # ========================================
 if selected == "Job Management":
     st.markdown("<h2 style='text-align:center;color:#111827;font-weight:600;'>Job Position Management</h2>", unsafe_allow_html=True)
 
+    # Changes are staged for this session and committed together with "Save changes"
+    position_edits = _job_position_edits()
+
+    # Unsaved changes of this session: one commit for all of them
+    if position_edits.pending:
+        col_commit, col_discard, _ = st.columns([1, 1, 4])
+        with col_commit:
+            if st.button("Save changes", key="save_position_edits", type="primary", use_container_width=True):
+                if position_edits.flush():
+                    st.session_state.confirm_discard_position_edits = False
+                    st.success("Job positions saved successfully!")
+                    time.sleep(1)
+                    st.rerun()
+                else:
+                    st.error("Could not save job positions. Your changes are still pending.")
+        with col_discard:
+            if st.button("Discard", key="discard_position_edits", use_container_width=True):
+                st.session_state.confirm_discard_position_edits = True
+        if st.session_state.get("confirm_discard_position_edits"):
+            st.warning(f"Discard {position_edits.pending} unsaved change(s)? This cannot be undone.")
+            col_yes, col_no, _ = st.columns([1, 1, 4])
+            with col_yes:
+                if st.button("Yes, discard", key="confirm_discard_position_edits_yes", use_container_width=True):
+                    position_edits.discard()
+                    st.session_state.confirm_discard_position_edits = False
+                    st.rerun()
+            with col_no:
+                if st.button("Keep changes", key="confirm_discard_position_edits_no", use_container_width=True):
+                    st.session_state.confirm_discard_position_edits = False
+                    st.rerun()
+
     st.markdown("### Add or Update Job Position")
 
     col1, col2, col3 = st.columns([1, 1, 2])
@@ -800,7 +881,7 @@ if selected == "Job Management":
             st.warning("Please provide Job ID from Kalibrr.")
         else:
             # Check if job position already exists
-            existing_jobs = load_job_positions_from_github()
+            existing_jobs = position_edits.load()
             if existing_jobs is not None and not existing_jobs.empty:
                 existing_positions = existing_jobs[existing_jobs['Job Position'].str.lower() == job_position.strip().lower()]
                 
@@ -823,8 +904,8 @@ if selected == "Job Management":
                         "Date Created": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                     }])
 
-                    if save_job_positions_to_github(new_job):
-                        st.success(f"Job position '{job_position}' saved successfully! Old pooled version preserved.")
+                    if position_edits.add(new_job):
+                        st.success(f"Job position '{job_position}' added! Old pooled version preserved. Click Save changes to commit.")
                         time.sleep(1)
                         st.rerun()
                 else:
@@ -836,8 +917,8 @@ if selected == "Job Management":
                         "Date Created": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                     }])
 
-                    if save_job_positions_to_github(new_job):
-                        st.success(f"Job position '{job_position}' saved successfully!")
+                    if position_edits.add(new_job):
+                        st.success(f"Job position '{job_position}' added! Click Save changes to commit.")
                         time.sleep(1)
                         st.rerun()
             else:
@@ -848,8 +929,8 @@ if selected == "Job Management":
                     "Date Created": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 }])
 
-                if save_job_positions_to_github(new_job):
-                    st.success(f"Job position '{job_position}' saved successfully!")
+                if position_edits.add(new_job):
+                    st.success(f"Job position '{job_position}' added! Click Save changes to commit.")
                     time.sleep(1)
                     st.rerun()
 
@@ -857,7 +938,7 @@ if selected == "Job Management":
     st.markdown("### All Job Positions")
 
     # Load and display all job positions
-    jobs_df = load_job_positions_from_github()
+    jobs_df = position_edits.load()
 
     if jobs_df is not None and not jobs_df.empty:
         # Ensure Pooling Status column exists
@@ -909,13 +990,11 @@ if selected == "Job Management":
             with col_status:
                 if is_pooled:
                     if st.button("Pooled", key=f"unpool_{idx}", type="primary", use_container_width=True):
-                        from src.repositories.github_utils import toggle_job_pooling_status
-                        if toggle_job_pooling_status(row['Job Position'], ""):
+                        if position_edits.set_pooling(row['Job Position'], ""):
                             st.rerun()
                 else:
                     if st.button("Active", key=f"pool_{idx}", use_container_width=True):
-                        from src.repositories.github_utils import toggle_job_pooling_status
-                        if toggle_job_pooling_status(row['Job Position'], "Pooled"):
+                        if position_edits.set_pooling(row['Job Position'], "Pooled"):
                             st.rerun()
             
             with col_actions:
@@ -926,8 +1005,8 @@ if selected == "Job Management":
                         st.rerun()
                 with btn_del:
                     if st.button("Delete", key=f"delete_{idx}", use_container_width=True):
-                        if delete_job_position_from_github(row['Job Position']):
-                            st.success(f"'{row['Job Position']}' deleted!")
+                        if position_edits.delete(row['Job Position']):
+                            st.success(f"'{row['Job Position']}' deleted! Click Save changes to commit.")
                             time.sleep(1)
                             st.rerun()
             
@@ -949,8 +1028,8 @@ if selected == "Job Management":
                             elif not edit_job_id.strip():
                                 st.warning("Please provide Job ID from Kalibrr.")
                             else:
-                                if update_job_position_in_github(row['Job Position'], edit_job_position.strip(), edit_job_description.strip(), edit_job_id.strip()):
-                                    st.success("Updated!")
+                                if position_edits.update(row['Job Position'], edit_job_position.strip(), edit_job_description.strip(), edit_job_id.strip()):
+                                    st.success("Updated! Click Save changes to commit.")
                                     st.session_state[f"editing_{idx}"] = False
                                     time.sleep(1)
                                     st.rerun()
@@ -980,7 +1059,7 @@ elif selected == "Screening":
         st.session_state.screening_data = None
 
     # Load job positions
-    jobs_df = load_job_positions_from_github()
+    jobs_df = _job_positions()
 
     if jobs_df is None or jobs_df.empty:
         st.warning("No job positions found. Please add job positions in the Job Management section first.")
@@ -1195,54 +1274,13 @@ elif selected == "Screening":
                     selected_job = st.session_state.screening_selected_job
                     
                     # Load existing results to check for duplicates
-                    position_results_file = get_results_filename(selected_job)
-                    existing_results = load_results_from_github(path=position_results_file)
-                    
-                    existing_emails = set()
-                    existing_name_phone = set()
-                    existing_names = set()  # Add name-only tracking
+                    existing_results = results_store.load(selected_job, fresh=True, columns=RESULTS_LIST_COLUMNS)
                     
-                    if existing_results is not None and not existing_results.empty:
-                        # Convert to string first before using .str accessor
-                        existing_emails = set(
-                            existing_results[existing_results["Candidate Email"].notna()]["Candidate Email"].astype(str).str.lower()
-                        )
-                        for _, row in existing_results.iterrows():
-                            name = row.get("Candidate Name", "")
-                            phone = row.get("Phone", "")
-                            # Track by name+phone
-                            if pd.notna(name) and pd.notna(phone) and str(name).strip() and str(phone).strip():
-                                key = f"{str(name).strip().lower()}_{str(phone).strip()}"
-                                existing_name_phone.add(key)
-                            # Track by name-only as fallback
-                            if pd.notna(name) and str(name).strip():
-                                existing_names.add(str(name).strip().lower())
-                    for idx, row in candidates_df.iterrows():
-                        first_name = row.get("Nama Depan") or row.get("First Name") or ""
-                        last_name = row.get("Nama Belakang") or row.get("Last Name") or ""
-                        candidate_name = f"{first_name} {last_name}".strip()
-                        if not candidate_name:
-                            candidate_name = row.get("Nama") or row.get("Candidate Name") or row.get("Name", "")
-                        
-                        candidate_email = row.get("Alamat Email") or row.get("Email Pelamar") or row.get("Candidate Email") or row.get("Email", "")
-                        candidate_phone = row.get("Nomor Handphone") or row.get("Telp") or row.get("Phone") or row.get("Telepon", "")
-                        
-                        is_duplicate = False
-                        if pd.notna(candidate_email) and str(candidate_email).strip():
-                            if str(candidate_email).strip().lower() in existing_emails:
-                                is_duplicate = True
-                        elif pd.notna(candidate_name) and pd.notna(candidate_phone) and str(candidate_phone).strip():
-                            # Check by name+phone
-                            name_phone_key = f"{str(candidate_name).strip().lower()}_{str(candidate_phone).strip()}"
-                            if name_phone_key in existing_name_phone:
-                                is_duplicate = True
-                        elif pd.notna(candidate_name) and str(candidate_name).strip():
-                            # Fallback: check by name-only if no email and no phone
-                            if str(candidate_name).strip().lower() in existing_names:
-                                is_duplicate = True
-                        
-                        if not is_duplicate:
-                            data_count += 1
+                    # Email, else name+phone, else name-only match against existing results
+                    match = match_existing_candidates(
+                        to_canonical(candidates_df), existing_results, name_only_fallback=True
+                    )
+                    data_count = int((match == "").sum())
                 
                 st.markdown(f"""
                 <div class='step-summary'>
@@ -1267,32 +1305,8 @@ elif selected == "Screening":
                 data_source = st.session_state.screening_data_source
                 
                 # Check for existing candidates to prevent duplicates
-                position_results_file = get_results_filename(selected_job)
-                existing_results = load_results_from_github(path=position_results_file)
-                
-                # Build sets for duplicate detection (by email OR by name+phone OR by name-only)
-                existing_emails = set()
-                existing_name_phone = set()
-                existing_names = set()  # Add name-only tracking
+                existing_results = results_store.load(selected_job, fresh=True, columns=RESULTS_LIST_COLUMNS)
                 
-                if existing_results is not None and not existing_results.empty:
-                    # Track by email - convert to string first before using .str accessor
-                    existing_emails = set(
-                        existing_results[existing_results["Candidate Email"].notna()]["Candidate Email"].astype(str).str.lower()
-                    )
-                    
-                    # Track by name+phone for candidates without email
-                    for _, row in existing_results.iterrows():
-                        name = row.get("Candidate Name", "")
-                        phone = row.get("Phone", "")
-                        # Track by name+phone
-                        if pd.notna(name) and pd.notna(phone) and str(name).strip() and str(phone).strip():
-                            key = f"{str(name).strip().lower()}_{str(phone).strip()}"
-                            existing_name_phone.add(key)
-                        # Track by name-only as fallback
-                        if pd.notna(name) and str(name).strip():
-                            existing_names.add(str(name).strip().lower())
-
                 # Handle different data sources
                 if data_source == "PDF Upload":
                     uploaded_cvs = st.session_state.screening_data
@@ -1361,7 +1375,7 @@ elif selected == "Screening":
                             
                             try:
                                 result_df = pd.DataFrame([candidate_result])
-                                if save_results_to_github(result_df, job_position=selected_job):
+                                if results_store.append(selected_job, result_df):
                                     successfully_saved += 1
                                     save_status.success(f"Saved {candidate_name} ({successfully_saved}/{i+1})")
                                     # Log successful CV processing
@@ -1405,42 +1419,22 @@ elif selected == "Screening":
                 elif data_source in ["Google Sheets", "CSV Upload"]:
                     candidates_df = st.session_state.screening_data
                     
-                    # Check for duplicates (by email OR by name+phone)
-                    new_candidates = []
-                    skipped_candidates = []
+                    # Check for duplicates (by email OR by name+phone OR by name-only)
+                    # Map the export header (UI / API / legacy Indonesian) to canonical columns once
+                    candidates = to_canonical(candidates_df)
+                    match = match_existing_candidates(candidates, existing_results, name_only_fallback=True)
                     
-                    for idx, row in candidates_df.iterrows():
-                        # Get candidate info with proper Kalibrr column mapping
-                        # Kalibrr uses "Nama Depan" and "Nama Belakang"
-                        first_name = row.get("Nama Depan") or row.get("First Name") or ""
-                        last_name = row.get("Nama Belakang") or row.get("Last Name") or ""
-                        candidate_name = f"{first_name} {last_name}".strip()
-                        if not candidate_name:
-                            candidate_name = row.get("Nama") or row.get("Candidate Name") or row.get("Name", "")
-                        
-                        candidate_email = row.get("Alamat Email") or row.get("Email Pelamar") or row.get("Candidate Email") or row.get("Email", "")
-                        candidate_phone = row.get("Nomor Handphone") or row.get("Telp") or row.get("Phone") or row.get("Telepon", "")
-                        
-                        # Check by email first
-                        is_duplicate = False
-                        if pd.notna(candidate_email) and str(candidate_email).strip():
-                            if str(candidate_email).strip().lower() in existing_emails:
-                                skipped_candidates.append(f"{candidate_name} ({candidate_email})")
-                                is_duplicate = True
-                        elif pd.notna(candidate_name) and pd.notna(candidate_phone) and str(candidate_phone).strip():
-                            # Check by name+phone
-                            name_phone_key = f"{str(candidate_name).strip().lower()}_{str(candidate_phone).strip()}"
-                            if name_phone_key in existing_name_phone:
-                                skipped_candidates.append(f"{candidate_name} ({candidate_phone})")
-                                is_duplicate = True
-                        elif pd.notna(candidate_name) and str(candidate_name).strip():
-                            # Fallback: check by name-only if no email and no phone
-                            if str(candidate_name).strip().lower() in existing_names:
-                                skipped_candidates.append(f"{candidate_name} (name match)")
-                                is_duplicate = True
-                        
-                        if not is_duplicate:
-                            new_candidates.append(row)
+                    skipped = candidates[match != ""]
+                    skipped_match = match[match != ""]
+                    skipped_candidates = [
+                        f"{name} (name match)" if kind == MATCH_NAME
+                        else f"{name} ({phone})" if kind == MATCH_NAME_PHONE
+                        else f"{name} ({email})"
+                        for name, email, phone, kind in zip(
+                            skipped["Candidate Name"], skipped["Candidate Email"], skipped["Phone"], skipped_match
+                        )
+                    ]
+                    new_candidates = [row for _, row in candidates[match == ""].iterrows()]
                     
                     if skipped_candidates:
                         st.warning(f"⏩ Skipping {len(skipped_candidates)} already-analyzed candidate(s):")
@@ -1462,19 +1456,14 @@ elif selected == "Screening":
                             failed_saves = 0
                             
                             for i, row in enumerate(new_candidates):
-                                # Get candidate name with proper Kalibrr column mapping
-                                first_name = row.get("Nama Depan") or row.get("First Name") or ""
-                                last_name = row.get("Nama Belakang") or row.get("Last Name") or ""
-                                candidate_name = f"{first_name} {last_name}".strip()
-                                if not candidate_name:
-                                    candidate_name = row.get("Nama") or row.get("Candidate Name") or row.get("Name", "Unknown")
+                                candidate_name = row["Candidate Name"] or "Unknown"
                                 
                                 status_text.text(f"Processing {i+1}/{len(new_candidates)}: {candidate_name}")
                                 
                                 # Get resume link
-                                resume_link = row.get("Link Resume") or row.get("Tautan Resume") or row.get("Resume Link") or row.get("Resume", "")
+                                resume_link = row["Resume Link"]
                                 cv_text = ""
-                                if pd.notna(resume_link) and str(resume_link).strip():
+                                if resume_link:
                                     cv_text = extract_resume_from_url(resume_link)
                                 
                                 cv_score = 0
@@ -1498,38 +1487,34 @@ elif selected == "Screening":
                                 
                                 candidate_result = {
                                     "Candidate Name": candidate_name,
-                                    "Candidate Email": row.get("Alamat Email") or row.get("Candidate Email") or row.get("Email", ""),
-                                    "Phone": row.get("Nomor Handphone") or row.get("Phone") or row.get("Telepon", ""),
+                                    "Candidate Email": row["Candidate Email"],
+                                    "Phone": row["Phone"],
                                     "Job Position": selected_job,
                                     "Match Score": cv_score,
                                     "AI Summary": summary,
                                     "Strengths": ", ".join(strengths) if strengths else "",
                                     "Weaknesses": ", ".join(weaknesses) if weaknesses else "",
                                     "Gaps": ", ".join(gaps) if gaps else "",
-                                    "Latest Job Title": candidate_info.get("latest_job_title") or row.get("Jabatan Terakhir") or row.get("Latest Job Title") or "",
-                                    "Latest Company": candidate_info.get("latest_company") or row.get("Perusahaan Terakhir") or row.get("Latest Company") or "",
-                                    "Education": candidate_info.get("education") or row.get("Tingkat Pendidikan") or row.get("Education") or "",
-                                    "University": candidate_info.get("university") or row.get("Universitas") or row.get("University") or "",
-                                    "Major": candidate_info.get("major") or row.get("Jurusan") or row.get("Major") or "",
-                                    "Kalibrr Profile": row.get("Link Profil Kalibrr") or row.get("Kalibrr Profile") or row.get("Profile", ""),
-                                    "Application Link": row.get("Link Aplikasi Pekerjaan") or row.get("Application Link") or row.get("Application", ""),
+                                    "Latest Job Title": candidate_info.get("latest_job_title") or row["Latest Job Title"],
+                                    "Latest Company": candidate_info.get("latest_company") or row["Latest Company"],
+                                    "Education": candidate_info.get("education") or row["Education"],
+                                    "University": candidate_info.get("university") or row["University"],
+                                    "Major": candidate_info.get("major") or row["Major"],
+                                    "Kalibrr Profile": row["Kalibrr Profile"],
+                                    "Application Link": row["Application Link"],
                                     "Resume Link": resume_link,
                                     "Recruiter Feedback": "",
                                     "Shortlisted": False,
                                     "Candidate Status": "",
                                     "Interview Status": "",
                                     "Rejection Reason": "",
-                                    "Date Applied": parse_kalibrr_date(
-                                        row.get("Date Application Started (mm/dd/yy hr:mn)") or
-                                        row.get("Tanggal Mulai Melamar") or
-                                        row.get("application.created_at") or ""
-                                    ),
+                                    "Date Applied": row["Date Applied"],
                                     "Date Processed": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                                 }
                                 
                                 try:
                                     result_df = pd.DataFrame([candidate_result])
-                                    if save_results_to_github(result_df, job_position=selected_job):
+                                    if results_store.append(selected_job, result_df):
                                         successfully_saved += 1
                                         save_status.success(f"Saved {candidate_name} ({successfully_saved}/{i+1})")
                                         # Log successful CV processing
@@ -1586,7 +1571,7 @@ elif selected == "Dashboard":
     st.markdown("<h2 style='text-align:center;color:#0b3d91;'>Screening Dashboard</h2>", unsafe_allow_html=True)
 
     # Load job positions for the dropdown (lightweight - only loads job_positions.csv)
-    jobs_df = load_job_positions_from_github()
+    jobs_df = _job_positions()
 
     # Check if we have any job positions
     if jobs_df is None or jobs_df.empty or "Job Position" not in jobs_df.columns:
@@ -1609,13 +1594,9 @@ elif selected == "Dashboard":
     
     selected_job = st.selectbox("Pilih posisi untuk melihat hasil screening", job_positions)
     
-    # Load results only for the selected position (efficient - loads single file)
-    # Check session state first for freshly saved data (avoids CDN cache delay on raw.githubusercontent.com)
-    _fresh_key = f"_fresh_results_{selected_job}"
-    if _fresh_key in st.session_state:
-        df = st.session_state.pop(_fresh_key)
-    else:
-        df = load_results_for_position(selected_job)
+    # Load results only for the selected position (efficient - loads single file),
+    # without the long AI text columns; the detail panel loads those on demand
+    df = results_store.load(selected_job, columns=RESULTS_LIST_COLUMNS)
     
     # Check for errors (None means authentication/connection error)
     if df is None:
@@ -1630,8 +1611,23 @@ elif selected == "Dashboard":
     # Data loaded successfully
     st.session_state["results"] = df
 
+    # Full rows (with the long AI text) by candidate key, loaded on first use
+    full_results = {}
+
+    def get_candidate_details(candidate_row):
+        """Long AI text columns of one candidate, from the full results row."""
+        if "df" not in full_results:
+            full_df = results_store.load(selected_job)
+            full_results["df"] = full_df.set_index(result_row_keys(full_df)) if full_df is not None else pd.DataFrame()
+        full_df = full_results["df"]
+        key = result_row_keys(pd.DataFrame([candidate_row])).iloc[0]
+        if key not in full_df.index:
+            return {}
+        match = full_df.loc[[key]].iloc[0]
+        return {col: match.get(col) for col in RESULTS_LONG_TEXT_COLUMNS}
+
     # Ensure columns exist
-    for col in ["Recruiter Feedback", "Strengths", "Weaknesses", "Gaps", "AI Summary", "Shortlisted", "Candidate Status", "Interview Status", "Rejection Reason"]:
+    for col in ["Recruiter Feedback", "Shortlisted", "Candidate Status", "Interview Status", "Rejection Reason"]:
         if col not in df.columns:
             if col == "Shortlisted":
                 df[col] = False
@@ -1817,7 +1813,7 @@ elif selected == "Dashboard":
     
     # Helper function to update candidate status in the full dataframe
     def update_candidate_status_in_df(df_to_update, candidate_email_val, candidate_name_val, new_status, new_shortlisted, job_position, rejection_reason="", interview_status=""):
-        """Update candidate status in dataframe and save to GitHub.
+        """Update candidate status in dataframe and save it as a status patch.
         
         Uses email + job position as primary identifier, falls back to name + job position.
         """
@@ -1834,11 +1830,17 @@ elif selected == "Dashboard":
             df_to_update.loc[mask, "Shortlisted"] = new_shortlisted
             df_to_update.loc[mask, "Rejection Reason"] = rejection_reason
             df_to_update.loc[mask, "Interview Status"] = interview_status
-            result = update_results_in_github(df_to_update, job_position=job_position)
-            if result:
-                # Store updated df in session state so the next rerun uses it
-                # instead of fetching from GitHub's CDN cache (which may be stale)
-                st.session_state[f"_fresh_results_{job_position}"] = df_to_update.copy()
+            # Logged as a row-level status patch; concurrent recruiters' clicks are kept
+            result = results_store.update_status(
+                job_position, candidate_email_val, candidate_name_val,
+                {
+                    "Candidate Status": new_status,
+                    "Shortlisted": new_shortlisted,
+                    "Rejection Reason": rejection_reason,
+                    "Interview Status": interview_status,
+                },
+                author=_current_user(),
+            )
             return result
         return False
 
@@ -1918,40 +1920,43 @@ elif selected == "Dashboard":
 
             # --- Evaluation: Strengths | Weaknesses | Gaps (3 columns) ---
             st.markdown("---")
-            eval_col1, eval_col2, eval_col3 = st.columns(3)
-
-            with eval_col1:
-                st.markdown("**Strengths**")
-                strengths = str(row.get("Strengths", "")) if pd.notna(row.get("Strengths")) else ""
-                if strengths and strengths.strip():
-                    for s in re.split(r'\.[;,]\s+', strengths.strip()):
-                        if s.strip():
-                            st.markdown(f"- {s.strip().rstrip('.')}")
-                else:
-                    st.caption("—")
-
-            with eval_col2:
-                st.markdown("**Weaknesses**")
-                weaknesses = str(row.get("Weaknesses", "")) if pd.notna(row.get("Weaknesses")) else ""
-                if weaknesses and weaknesses.strip():
-                    for w in re.split(r'\.[;,]\s+', weaknesses.strip()):
-                        if w.strip():
-                            st.markdown(f"- {w.strip().rstrip('.')}")
-                else:
-                    st.caption("—")
-
-            with eval_col3:
-                st.markdown("**Gaps**")
-                gaps = str(row.get("Gaps", "")) if pd.notna(row.get("Gaps")) else ""
-                if gaps and gaps.strip():
-                    for g in re.split(r'\.[;,]\s+', gaps.strip()):
-                        if g.strip():
-                            st.markdown(f"- {g.strip().rstrip('.')}")
-                else:
-                    st.caption("—")
+            details = {}
+            if st.toggle("Show AI evaluation", key=f"evaluation_{sanitize_key(str(candidate_name))}_{idx}"):
+                details = get_candidate_details(row)
+                eval_col1, eval_col2, eval_col3 = st.columns(3)
+
+                with eval_col1:
+                    st.markdown("**Strengths**")
+                    strengths = str(details.get("Strengths", "")) if pd.notna(details.get("Strengths")) else ""
+                    if strengths and strengths.strip():
+                        for s in re.split(r'\.[;,]\s+', strengths.strip()):
+                            if s.strip():
+                                st.markdown(f"- {s.strip().rstrip('.')}")
+                    else:
+                        st.caption("—")
+
+                with eval_col2:
+                    st.markdown("**Weaknesses**")
+                    weaknesses = str(details.get("Weaknesses", "")) if pd.notna(details.get("Weaknesses")) else ""
+                    if weaknesses and weaknesses.strip():
+                        for w in re.split(r'\.[;,]\s+', weaknesses.strip()):
+                            if w.strip():
+                                st.markdown(f"- {w.strip().rstrip('.')}")
+                    else:
+                        st.caption("—")
+
+                with eval_col3:
+                    st.markdown("**Gaps**")
+                    gaps = str(details.get("Gaps", "")) if pd.notna(details.get("Gaps")) else ""
+                    if gaps and gaps.strip():
+                        for g in re.split(r'\.[;,]\s+', gaps.strip()):
+                            if g.strip():
+                                st.markdown(f"- {g.strip().rstrip('.')}")
+                    else:
+                        st.caption("—")
 
             # --- Summary ---
-            ai_summary = row.get("AI Summary")
+            ai_summary = details.get("AI Summary")
             if pd.notna(ai_summary) and str(ai_summary).strip():
                 st.markdown("---")
                 st.markdown(f"**Summary:** {ai_summary}")
@@ -2138,7 +2143,7 @@ elif selected == "Pooling":
     st.markdown("<h2 style='text-align:center;color:#0b3d91;'>Position Pooling</h2>", unsafe_allow_html=True)
     
     # Load job positions
-    jobs_df = load_job_positions_from_github()
+    jobs_df = _job_positions()
 
     if jobs_df is None or jobs_df.empty or "Job Position" not in jobs_df.columns:
         st.info("No job positions available.")
@@ -2162,7 +2167,7 @@ elif selected == "Pooling":
     selected_job = st.selectbox("Select Position", job_positions, label_visibility="collapsed")
     
     # Load results for the selected position
-    df_pooled = load_results_for_position(selected_job)
+    df_pooled = results_store.load(selected_job)
     
     # Check for errors
     if df_pooled is None:
@@ -2563,3 +2568,20 @@ elif selected == "Usage Log":
         cost_col3.metric("Est. Cost (High)", f"${estimated_cost_high:.2f}")
     else:
         st.info("No historical data available yet.")
+    
+    st.divider()
+    
+    # GitHub API calls made by this app process, per dashboard action
+    st.markdown("### GitHub API Calls")
+    github_stats = github_call_stats()
+    if github_stats["operations"]:
+        budget_col1, budget_col2 = st.columns(2)
+        budget_col1.metric("Rate Limit Remaining", github_stats["remaining"] if github_stats["remaining"] is not None else "-")
+        budget_col2.metric("Rate Limit Waits", f"{github_stats['rate_wait_seconds']:.0f}s")
+        github_calls_df = pd.DataFrame([
+            {"Operation": name, "API Calls": op["calls"], "Runs": op["runs"], "Max Calls per Run": op["max_calls"]}
+            for name, op in github_stats["operations"].items()
+        ])
+        st.dataframe(github_calls_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No GitHub API calls made since the app started.")
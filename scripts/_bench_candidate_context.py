@@ -0,0 +1,38 @@
+"""Benchmark per-row build_candidate_context vs batch build_candidate_contexts.
+
+Usage: python scripts/_bench_candidate_context.py [csv_path] [repeat]
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pandas as pd
+from src.services.candidate_processor import build_candidate_context, build_candidate_contexts
+
+csv_path = sys.argv[1] if len(sys.argv) > 1 else 'data/raw/Software_Engineer.csv'
+repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+df = pd.read_csv(csv_path)
+print(f'{csv_path}: {len(df)} rows x {len(df.columns)} columns, {repeat} repeats')
+
+# Output must be identical to the per-row version
+per_row = [build_candidate_context(row) for _, row in df.iterrows()]
+batch = build_candidate_contexts(df)
+mismatches = [i for i, (a, b) in enumerate(zip(per_row, batch)) if a != b]
+assert list(batch.index) == list(df.index)
+assert not mismatches, f'{len(mismatches)} mismatched rows, first at {mismatches[0]}'
+print(f'✅ Outputs identical for all {len(df)} rows')
+
+start = time.perf_counter()
+for _ in range(repeat):
+    [build_candidate_context(row) for _, row in df.iterrows()]
+per_row_s = (time.perf_counter() - start) / repeat
+
+start = time.perf_counter()
+for _ in range(repeat):
+    build_candidate_contexts(df)
+batch_s = (time.perf_counter() - start) / repeat
+
+print(f'Per-row (iterrows): {per_row_s * 1000:8.2f} ms')
+print(f'Batch:              {batch_s * 1000:8.2f} ms')
+print(f'Speedup:            {per_row_s / batch_s:8.1f}x')
@@ -0,0 +1,42 @@
+"""Benchmark _deduplicate_candidates on the merged results dataset (all data/processed/results_*.csv).
+
+Usage: python scripts/_bench_dedup.py [copies] [repeat]
+"""
+import glob
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pandas as pd
+from src.repositories.github_utils import _deduplicate_candidates
+
+copies = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+frames = [pd.read_csv(path) for path in sorted(glob.glob("data/processed/results_*.csv"))]
+merged = pd.concat(frames * copies, ignore_index=True)
+
+
+def legacy_deduplicate(df):
+    """Previous implementation: split by email presence, drop_duplicates per group, sort the kept indices."""
+    df = df.reset_index(drop=True)
+    has_email = df["Candidate Email"].notna() & (df["Candidate Email"] != "")
+    keep = df.loc[has_email].drop_duplicates(subset=["Candidate Email", "Job Position"]).index.tolist()
+    keep += df.loc[~has_email].drop_duplicates(subset=["Candidate Name", "Phone", "Job Position"]).index.tolist()
+    return df.loc[sorted(keep)].reset_index(drop=True)
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        df = func(merged)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"{label:<24} {elapsed:8.2f} ms  ({len(df)} rows kept)")
+    return elapsed, df
+
+
+print(f"{len(frames)} results files, {len(merged)} rows x {len(merged.columns)} cols")
+legacy_ms, legacy_df = timed("legacy (two passes)", legacy_deduplicate)
+new_ms, new_df = timed("composite key", _deduplicate_candidates)
+pd.testing.assert_frame_equal(new_df, legacy_df)
+print(f"Speedup: {legacy_ms / new_ms:.1f}x (identical output)")
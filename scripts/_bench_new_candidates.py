@@ -0,0 +1,107 @@
+"""Benchmark per-row new-candidate detection vs match_existing_candidates.
+
+Compares against the loops previously used in auto_screen.screen_position
+(email, else name+phone) and app.py Step 2/3 (email, else name+phone if a
+phone exists, else name only).
+
+Usage: python scripts/_bench_new_candidates.py [raw_csv] [results_csv] [repeat]
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pandas as pd
+from src.services.column_schema import to_canonical, match_existing_candidates
+
+raw_path = sys.argv[1] if len(sys.argv) > 1 else 'data/raw/Software_Engineer.csv'
+results_path = sys.argv[2] if len(sys.argv) > 2 else 'data/processed/results_Software_Engineer.csv'
+repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+
+def per_row_new(candidates, existing_results, name_only_fallback):
+    """Previous logic: iterrows over both frames."""
+    existing_emails, existing_name_phone, existing_names = set(), set(), set()
+    if existing_results is not None and not existing_results.empty:
+        existing_emails = set(
+            existing_results[existing_results["Candidate Email"].notna()]["Candidate Email"].astype(str).str.lower()
+        )
+        for _, row in existing_results.iterrows():
+            name = row.get("Candidate Name", "")
+            phone = row.get("Phone", "")
+            if pd.notna(name) and pd.notna(phone) and str(name).strip() and str(phone).strip():
+                existing_name_phone.add(f"{str(name).strip().lower()}_{str(phone).strip()}")
+            if pd.notna(name) and str(name).strip():
+                existing_names.add(str(name).strip().lower())
+
+    new = []
+    for idx, row in candidates.iterrows():
+        email, phone = row["Candidate Email"], row["Phone"]
+        if name_only_fallback:
+            name = row["Candidate Name"]
+            if email:
+                duplicate = email.lower() in existing_emails
+            elif phone:
+                duplicate = f"{name.lower()}_{phone}" in existing_name_phone
+            elif name:
+                duplicate = name.lower() in existing_names
+            else:
+                duplicate = False
+        else:
+            name = row["Candidate Name"] or "Unknown"
+            if email:
+                duplicate = email.lower() in existing_emails
+            else:
+                duplicate = f"{name.lower()}_{phone}" in existing_name_phone
+        if not duplicate:
+            new.append(idx)
+    return new
+
+
+def vectorized_new(candidates, existing_results, name_only_fallback):
+    match = match_existing_candidates(
+        candidates, existing_results,
+        name_only_fallback=name_only_fallback,
+        fallback_name="" if name_only_fallback else "Unknown",
+    )
+    return list(candidates.index[match == ""])
+
+
+raw = pd.read_csv(raw_path)
+existing = pd.read_csv(results_path)
+candidates = to_canonical(raw)
+print(f'{raw_path}: {len(raw)} candidates; {results_path}: {len(existing)} results; {repeat} repeats')
+
+# Variants that exercise every branch: half the results missing, and
+# candidates/results without emails or phones
+partial = existing.iloc[::2].copy()
+partial.loc[partial.index[::3], "Candidate Email"] = None
+stripped = candidates.copy()
+stripped.loc[stripped.index[::4], "Candidate Email"] = ""
+stripped.loc[stripped.index[::8], "Phone"] = ""
+stripped.loc[stripped.index[::16], "Candidate Name"] = ""
+cases = [
+    ("full", candidates, existing),
+    ("partial", candidates, partial),
+    ("no-email", stripped, partial),
+    ("no-results", candidates, None),
+]
+for label, cands, results in cases:
+    for fallback in (False, True):
+        expected = per_row_new(cands, results, fallback)
+        got = vectorized_new(cands, results, fallback)
+        assert got == expected, f'{label} (name_only_fallback={fallback}): {len(got)} vs {len(expected)} new'
+    print(f'✅ {label}: identical new-candidate rows ({len(expected)} new)')
+
+start = time.perf_counter()
+for _ in range(repeat):
+    per_row_new(candidates, existing, True)
+per_row_s = (time.perf_counter() - start) / repeat
+
+start = time.perf_counter()
+for _ in range(repeat):
+    vectorized_new(candidates, existing, True)
+batch_s = (time.perf_counter() - start) / repeat
+
+print(f'Per-row (iterrows): {per_row_s * 1000:8.2f} ms')
+print(f'Vectorized:         {batch_s * 1000:8.2f} ms')
+print(f'Speedup:            {per_row_s / batch_s:8.1f}x')
@@ -0,0 +1,40 @@
+"""Benchmark reading a results file: CSV parse vs Parquet sidecar (full and projected).
+
+Usage: python scripts/_bench_results_sidecar.py [results_csv] [repeat]
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from io import StringIO
+import pandas as pd
+from src.repositories.github_utils import RESULTS_LIST_COLUMNS
+from src.repositories.results_sidecar import HAS_PYARROW, build_sidecar, git_blob_sha, read_sidecar
+
+results_path = sys.argv[1] if len(sys.argv) > 1 else 'data/processed/results_Software_Engineer.csv'
+repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+if not HAS_PYARROW:
+    print("pyarrow is not installed; nothing to compare")
+    sys.exit(0)
+
+with open(results_path, "r", encoding="utf-8") as f:
+    csv_text = f.read()
+sidecar = build_sidecar(csv_text)
+csv_sha = git_blob_sha(csv_text)
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        df = func()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"{label:<28} {elapsed:8.2f} ms  ({len(df)} rows x {len(df.columns)} cols)")
+    return elapsed
+
+
+print(f"{results_path}: {len(csv_text.encode('utf-8')) / 1e6:.2f} MB CSV, {len(sidecar) / 1e6:.2f} MB Parquet")
+csv_ms = timed("CSV read_csv", lambda: pd.read_csv(StringIO(csv_text)))
+full_ms = timed("Parquet (all columns)", lambda: read_sidecar(sidecar, csv_sha))
+list_ms = timed("Parquet (list columns)", lambda: read_sidecar(sidecar, csv_sha, RESULTS_LIST_COLUMNS))
+print(f"Speedup: {csv_ms / full_ms:.1f}x full, {csv_ms / list_ms:.1f}x projected")
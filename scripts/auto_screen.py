@@ -19,37 +19,87 @@ import os
 import sys
 import pandas as pd
 from datetime import datetime
+import time
+import threading
 import traceback
+import argparse
 
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.services.candidate_processor import (
     fetch_candidates_from_google_sheets,
-    build_candidate_context,
+    build_candidate_contexts,
     get_candidate_identifier,
-    extract_resume_from_url
+    extract_resume_from_pdf_bytes,
+    get_position_index
 )
+from src.services.resume_fetcher import get_resume_fetcher
+from src.services.candidate_registry import get_candidate_registry, start_candidate_registry
 from src.services.extractor import extract_text_from_pdf
-from src.pipelines.scorer import score_candidate_pipeline
-from src.repositories.github_utils import (
-    load_job_positions_from_github,
-    load_results_from_github,
-    save_results_to_github,
-    parse_kalibrr_date
+from src.services.cv_parser import ParseCoverage
+from src.services.column_schema import to_canonical, match_existing_candidates
+from src.pipelines.scorer import (
+    extract_and_classify_cv,
+    score_classified_candidate,
+    score_unclassified_candidate
 )
-from src.utils.usage_logger import log_cv_processing, print_daily_summary
+from src.pipelines.cost_estimator import PLAN_CV_SAMPLE, estimate_position, plan_summary_lines
+from src.pipelines.run_planner import RunPlanner
+from src.pipelines.scheduler import run_positions
+from src.pipelines.stages import Stage, run_stages, stage_summary_lines
+from src.repositories.github_utils import RESULTS_LIST_COLUMNS, load_job_positions_from_github
+from src.repositories.checkpoint_journal import (
+    STAGE_STEP1,
+    STAGE_STEP2,
+    CheckpointJournal,
+    candidate_key,
+    cv_hash
+)
+from src.repositories.export_manifest import DELTA_CHANGED, DELTA_INSERTED, DELTA_UNCHANGED, ExportManifest
+from src.repositories.git_commit_builder import GitCommitBuilder
+from src.repositories.result_writer import BufferedResultWriter
+from src.repositories.results_store import get_results_store
+from src.repositories.status_patches import compact_all_status_patches
+from src.utils.github_client import github_call_summary_lines
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.run_profiler import profile_span, start_run_profiler
+from src.utils.usage_logger import log_cv_processing, print_daily_summary, set_log_commit_builder
 import requests
 
 
 # Project root directory (for resolving relative paths)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-# Maximum number of new candidates to screen per position per run
+# Maximum number of new candidates per position when screen_position() is
+# called without a run planner (helper scripts); main() plans by deadline instead
 MAX_CANDIDATES_PER_POSITION = 100
 
-# Priority order for screening (processed first to last)
-# Positions not in this list will be processed after all priority positions
+# Wall-clock budget for a whole run (GitHub Actions jobs are killed at 360 min)
+DEFAULT_DEADLINE_MINUTES = 330
+
+# Worker threads per screening pipeline stage (see src/pipelines/stages.py).
+# Extraction stays at 1 because PyMuPDF is not thread-safe; persistence stays
+# at 1 so results are appended to the position CSV one at a time.
+PIPELINE_STAGE_WORKERS = {
+    "fetch": 6,
+    "extract": 1,
+    "context": 1,
+    "step1": 3,
+    "step2": 3,
+    "persist": 1,
+}
+
+# Capacity of the bounded queue in front of each stage (backpressure)
+PIPELINE_QUEUE_SIZE = 8
+
+# Number of positions screened concurrently (see src/pipelines/scheduler.py)
+POSITION_CONCURRENCY = 3
+
+# Priority order for screening (started first to last)
+# Positions not in this list start after all priority positions. Positions
+# running at the same time share the LLM budget by weight: earlier entries
+# get a larger share (see _priority_weights)
 PRIORITY_ORDER = [
     "Marketing Communication Officer KG Media",
     "Reporter Megapolitan",
@@ -330,7 +380,265 @@ def get_results_filename(job_position):
     return f"data/processed/results_{safe_name}.csv"
 
 
-def screen_position(position_name, job_description, job_id, csv_url=None):
+# Serializes progress lines printed from pipeline stage threads
+_PRINT_LOCK = threading.Lock()
+
+
+def _log_candidate(job, message):
+    """Print a progress line prefixed with the candidate (stages interleave output)."""
+    line = f"   [{job['idx']}/{job['total']}] {job['name']}: {message}"
+    with _PRINT_LOCK:
+        print(line, flush=True)
+
+
+def _build_screening_stages(position_name, job_description, writer, tally, checkpoints, planner=None):
+    """Build the screening pipeline stages for one position.
+    
+    Args:
+        position_name: Job position name
+        job_description: Job description text
+        writer: BufferedResultWriter that batches result rows to GitHub
+        checkpoints: CheckpointJournal for resuming Step 1 / Step 2 outputs
+        planner: Optional RunPlanner told when each candidate leaves the pipeline
+        tally: Dict with failed_count / parse_coverage, updated by the
+            persistence stage (saved rows are counted by the writer's on_flush)
+    
+    Returns:
+        list[Stage]: fetch → extract → context → step1 → step2 → persist
+    """
+    fetcher = get_resume_fetcher()
+    registry = get_candidate_registry()
+    
+    def fetch(job):
+        job["resume_link"] = job["candidate"]["Resume Link"]
+        job["pdf_bytes"] = None
+        job["shared_cv"] = None
+        if not job["resume_link"]:
+            return job
+        # Same resume already fetched for another position in this run?
+        if registry is not None:
+            status, job["shared_cv"] = registry.claim(job["candidate"]["Candidate Email"], position_name, job["resume_link"])
+            job["registry_owner"] = status == "owner"
+            if job["shared_cv"] is not None:
+                return job
+        job["pdf_bytes"] = fetcher.fetch(job["resume_link"])
+        return job
+    
+    def extract(job):
+        job["cv_text"] = ""
+        job["parsed_cv"] = None
+        if not job["resume_link"]:
+            _log_candidate(job, "⚠ No resume link available")
+            return job
+        pdf_bytes = job.pop("pdf_bytes")
+        shared_cv = job.pop("shared_cv")
+        if shared_cv is None and registry is not None and pdf_bytes:
+            # Identical resume uploaded under another link
+            shared_cv = registry.extracted(job["candidate"]["Candidate Email"], pdf_bytes)
+        if shared_cv is not None:
+            job["cv_text"], job["parsed_cv"] = shared_cv
+            if job.pop("registry_owner", False):
+                registry.publish(job["candidate"]["Candidate Email"], job["resume_link"], None, job["cv_text"], job["parsed_cv"])
+            _log_candidate(job, f"♻️  CV shared from another position ({len(job['cv_text'])} characters)")
+            return job
+        try:
+            # Extract CV (download already failed fast on errors),
+            # plus the local layout parse used to shrink the Step 1 prompt
+            job["cv_text"], job["parsed_cv"] = extract_resume_from_pdf_bytes(pdf_bytes, parse_layout=True)
+            if job["cv_text"]:
+                _log_candidate(job, f"✓ CV extracted ({len(job['cv_text'])} characters)")
+            else:
+                _log_candidate(job, "⚠ CV extraction failed - scoring without CV")
+        except Exception:
+            # Catch all errors including MuPDF/parsing issues
+            _log_candidate(job, "⚠ CV extraction error - scoring without CV")
+            job["cv_text"] = ""
+            job["parsed_cv"] = None
+        if job.pop("registry_owner", False):
+            registry.publish(job["candidate"]["Candidate Email"], job["resume_link"], pdf_bytes,
+                             job["cv_text"], job["parsed_cv"])
+        return job
+    
+    def context(job):
+        # Build candidate context from CSV data (computed in one batch beforehand)
+        job["context"] = job.pop("context_value")
+        return job
+    
+    def step1(job):
+        job["classified"] = None
+        job["scoring_error"] = None
+        job["checkpoint_score"] = None
+        if job["cv_text"].strip():
+            job["cv_sha1"] = cv_hash(job["cv_text"])
+            # Resume after the furthest stage journaled by an earlier run (same CV only)
+            saved_score = checkpoints.get(job["key"], STAGE_STEP2, job["cv_sha1"])
+            if saved_score is not None:
+                job["checkpoint_score"] = tuple(saved_score)
+                _log_candidate(job, "↩️  Step 1 + Step 2 restored from checkpoint")
+                return job
+            job["classified"] = checkpoints.get(job["key"], STAGE_STEP1, job["cv_sha1"])
+            if job["classified"] is not None:
+                _log_candidate(job, "↩️  Step 1 restored from checkpoint")
+                return job
+            try:
+                # Step 1: Extract & Classify (Flash)
+                job["classified"] = extract_and_classify_cv(
+                    job["cv_text"], job["context"], position_name, job_description, parsed_cv=job["parsed_cv"]
+                )
+                if job["classified"] is not None:
+                    checkpoints.record(job["key"], STAGE_STEP1, job["cv_sha1"], job["classified"])
+            except Exception as e:
+                job["scoring_error"] = e
+        return job
+    
+    def step2(job):
+        # Score with AI (Gemini)
+        job["score"] = (0, "No resume available", [], [], [], {
+            "latest_job_title": "",
+            "latest_company": "",
+            "education": "",
+            "university": "",
+            "major": ""
+        })
+        if not job["cv_text"].strip():
+            return job
+        if job["checkpoint_score"] is not None:
+            job["score"] = job["checkpoint_score"]
+            _log_candidate(job, f"✓ AI Score: {job['score'][0]}/100 (checkpoint)")
+            return job
+        try:
+            if job["scoring_error"] is not None:
+                raise job["scoring_error"]
+            if job["classified"] is None:
+                job["score"] = score_unclassified_candidate(job["cv_text"], position_name, job_description)
+            else:
+                # Step 2: Evaluate & Score (Pro) → Step 3: ceiling
+                job["score"] = score_classified_candidate(job["classified"], position_name, job_description)
+            checkpoints.record(job["key"], STAGE_STEP2, job["cv_sha1"], list(job["score"]))
+            _log_candidate(job, f"✓ AI Score: {job['score'][0]}/100")
+        except Exception as e:
+            _log_candidate(job, f"❌ AI scoring error: {str(e)}")
+            job["score"] = (0, f"Scoring failed: {str(e)}") + job["score"][2:]
+        return job
+    
+    def persist(job):
+        if job.pop("registry_owner", False):
+            # Failed before extraction: let other positions fetch this resume themselves
+            registry.release(job["resume_link"])
+        if planner is not None:
+            planner.candidate_finished(position_name, time.monotonic() - job["fed_at"])
+        candidate = job["candidate"]
+        candidate_name = job["name"]
+        
+        if job.get("error") is not None:
+            error_msg = str(job["error"])[:150]  # Truncate very long error messages
+            _log_candidate(job, f"❌ Skipping candidate due to error: {error_msg}")
+            if "MuPDF" in str(job["error"]) or "fitz" in str(job["error"]):
+                print(f"       (PDF parsing error - candidate will be skipped)")
+            tally["failed_count"] += 1
+            return job
+        
+        if job["cv_text"]:
+            tally["parse_coverage"].record(job["cv_text"], job["parsed_cv"])
+        
+        cv_score, summary, strengths, weaknesses, gaps, candidate_info = job["score"]
+        
+        # Build result row
+        result = {
+            "Candidate Name": candidate_name,
+            "Candidate Email": candidate["Candidate Email"],
+            "Phone": candidate["Phone"],
+            "Job Position": position_name,
+            "Match Score": cv_score,
+            "AI Summary": summary,
+            "Strengths": "; ".join(strengths) if strengths else "",
+            "Weaknesses": "; ".join(weaknesses) if weaknesses else "",
+            "Gaps": "; ".join(gaps) if gaps else "",
+            "Latest Job Title": candidate_info.get("latest_job_title") or candidate["Latest Job Title"],
+            "Latest Company": candidate_info.get("latest_company") or candidate["Latest Company"],
+            "Education": candidate_info.get("education") or candidate["Education"],
+            "University": candidate_info.get("university") or candidate["University"],
+            "Major": candidate_info.get("major") or candidate["Major"],
+            "Kalibrr Profile": candidate["Kalibrr Profile"],
+            "Application Link": candidate["Application Link"],
+            "Resume Link": job["resume_link"],
+            "Recruiter Feedback": "",
+            "Shortlisted": False,
+            "Candidate Status": "",
+            "Interview Status": "",
+            "Rejection Reason": "",
+            "Date Applied": candidate["Date Applied"],
+            "Date Processed": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        
+        # Buffer the result; the writer saves it with the next batch
+        _log_candidate(job, "✓ Queued for save")
+        writer.add(result)
+        return job
+    
+    workers = PIPELINE_STAGE_WORKERS
+    return [
+        Stage("fetch", _profiled("download", fetch), workers["fetch"], PIPELINE_QUEUE_SIZE),
+        Stage("extract", _profiled("extract", extract), workers["extract"], PIPELINE_QUEUE_SIZE),
+        Stage("context", context, workers["context"], PIPELINE_QUEUE_SIZE),
+        Stage("step1", _profiled("step1", step1), workers["step1"], PIPELINE_QUEUE_SIZE),
+        Stage("step2", _profiled("step2", step2), workers["step2"], PIPELINE_QUEUE_SIZE),
+        Stage("persist", _profiled("persist", persist), workers["persist"], PIPELINE_QUEUE_SIZE, handles_errors=True),
+    ]
+
+
+def _profiled(stage, func):
+    """Wrap a pipeline stage function so each call is timed by the run profiler."""
+    def run(job):
+        with profile_span(stage):
+            return func(job)
+    return run
+
+
+def _load_position_candidates(position_name, csv_url):
+    """Load a position's Kalibrr export, falling back to data/raw/<position>.csv.
+    
+    Returns:
+        DataFrame or None
+    """
+    print(f"📋 Loading candidates from sheet_positions.csv...")
+    with profile_span("export_load"):
+        candidates_df = fetch_candidates_from_sheet_csv(csv_url)
+    
+    # Fallback: if CSV load failed, try local CSV in kalibrr_exports/
+    if candidates_df is None or candidates_df.empty:
+        safe_name = (position_name
+                     .replace(" ", "_")
+                     .replace(".", "")
+                     .replace("/", "_")
+                     .replace("(", "")
+                     .replace(")", ""))
+        local_csv_screen = os.path.join(PROJECT_ROOT, 'data', 'raw', f'{safe_name}.csv')
+        if os.path.isfile(local_csv_screen):
+            print(f"   📂 Falling back to local CSV: {local_csv_screen}")
+            with profile_span("export_load"):
+                candidates_df = fetch_candidates_from_sheet_csv(local_csv_screen)
+    return candidates_df
+
+
+def _plan_position(task, sample_size):
+    """Dry-run estimate for one position (no LLM calls, nothing saved)."""
+    position_name = task["name"]
+    print(f"\n🧮 {position_name}")
+    candidates_df = _load_position_candidates(position_name, task["csv_url"])
+    if candidates_df is None or candidates_df.empty:
+        return estimate_position(position_name, task["job_description"], pd.DataFrame(), pd.DataFrame())
+    
+    candidates = to_canonical(candidates_df)
+    inserted = ExportManifest(position_name).delta(candidates)[0] == DELTA_INSERTED
+    existing_results = get_results_store().load(position_name, columns=RESULTS_LIST_COLUMNS) if inserted.any() else None
+    match = match_existing_candidates(candidates, existing_results, fallback_name="Unknown")
+    new_frame = candidates[inserted & (match == "")]
+    print(f"   {len(candidates_df)} in export, {len(candidates_df) - len(new_frame)} already analyzed, {len(new_frame)} new")
+    return estimate_position(position_name, task["job_description"], candidates_df, new_frame, sample_size)
+
+
+def screen_position(position_name, job_description, job_id, csv_url=None, planner=None, builder=None, store=None):
     """
     Screen new candidates for a specific position.
     
@@ -339,6 +647,12 @@ def screen_position(position_name, job_description, job_id, csv_url=None):
         job_description: Full job description text
         job_id: Job ID from Kalibrr (for reference)
         csv_url: Direct CSV URL from sheet_positions.csv File Storage column
+        planner: Optional RunPlanner deciding how many candidates fit in the
+            run's time/quota budget (default: MAX_CANDIDATES_PER_POSITION)
+        builder: Optional GitCommitBuilder shared by the run; result batches
+            are staged in it instead of committed one by one
+        store: Results store to read existing results from (and, when it is
+            local, to write results to); defaults to get_results_store()
         
     Returns:
         int: Number of candidates successfully screened
@@ -349,21 +663,7 @@ def screen_position(position_name, job_description, job_id, csv_url=None):
     
     try:
         # 1. Fetch candidates from pre-exported CSV in sheet_positions.csv
-        print(f"📋 Loading candidates from sheet_positions.csv...")
-        candidates_df = fetch_candidates_from_sheet_csv(csv_url)
-        
-        # Fallback: if CSV load failed, try local CSV in kalibrr_exports/
-        if candidates_df is None or candidates_df.empty:
-            safe_name = (position_name
-                         .replace(" ", "_")
-                         .replace(".", "")
-                         .replace("/", "_")
-                         .replace("(", "")
-                         .replace(")", ""))
-            local_csv_screen = os.path.join(PROJECT_ROOT, 'data', 'raw', f'{safe_name}.csv')
-            if os.path.isfile(local_csv_screen):
-                print(f"   📂 Falling back to local CSV: {local_csv_screen}")
-                candidates_df = fetch_candidates_from_sheet_csv(local_csv_screen)
+        candidates_df = _load_position_candidates(position_name, csv_url)
         
         if candidates_df is None or candidates_df.empty:
             print(f"⏭️  No candidates found for this position")
@@ -371,76 +671,102 @@ def screen_position(position_name, job_description, job_id, csv_url=None):
         
         print(f"   Total candidates: {len(candidates_df)}")
         
-        # 2. Load existing results to identify already-processed candidates
-        print("🔍 Checking existing results...")
+        # 2. Compare the export with the last run's row hashes
+        # Map the export header (UI / API / legacy Indonesian) to canonical columns once
+        with profile_span("dedup"):
+            candidates = to_canonical(candidates_df)
+            manifest = ExportManifest(position_name)
+            delta, row_keys, row_hashes, removed = manifest.delta(candidates)
+        inserted = delta == DELTA_INSERTED
+        changed = delta == DELTA_CHANGED
+        print(f"   🧾 Export delta: {int(inserted.sum())} inserted, {int(changed.sum())} changed, "
+              f"{int((delta == DELTA_UNCHANGED).sum())} unchanged, {len(removed)} removed")
+        if changed.any():
+            # Already screened; queued in the manifest for optional re-extraction
+            manifest.queue_changed(row_keys[changed], row_hashes[changed])
+            print(f"   ✏️  {int(changed.sum())} changed candidate(s) queued for re-extraction in {manifest.path.name}")
+        manifest.forget(removed)
+        hash_by_key = dict(zip(row_keys[inserted], row_hashes[inserted]))
+        
+        # 3. Load existing results to check the inserted rows (skipped when nothing was inserted)
+        store = store or get_results_store()
         position_results_file = get_results_filename(position_name)
-        existing_results = load_results_from_github(path=position_results_file)
+        existing_results = None
+        if inserted.any():
+            print("🔍 Checking existing results...")
+            with profile_span("results_load"):
+                existing_results = store.load(position_name, columns=RESULTS_LIST_COLUMNS)
         
-        processed_emails = set()
-        if existing_results is not None and not existing_results.empty:
-            # Build set of processed candidate emails (case-insensitive)
-            # Ensure column is string type before using .str accessor
-            email_col = existing_results["Candidate Email"].astype(str).replace('nan', pd.NA)
-            processed_emails = set(
-                email_col[email_col.notna()].str.lower()
-            )
-            print(f"   Found {len(processed_emails)} already-processed candidates")
-        else:
-            print(f"   No existing results found (first run for this position)")
+        # Rows journaled by an interrupted run are saved with the first batch
+        tally = {
+            "results": [],
+            "successfully_processed": 0,
+            "failed_count": 0,
+            "parse_coverage": ParseCoverage(position_name),
+            "deferred": 0,
+        }
         
-        # 3. Filter new candidates only (by email OR by name+phone if no email)
-        new_candidates = []
-        skipped_candidates = []  # Track skipped candidates for reporting
+        # The manifest is saved when the position finishes; rows whose commit
+        # lands later (batch commit, results store sync) save it again
+        manifest_lock = threading.Lock()
+        manifest_saved = {"done": False}
+
+        def save_manifest():
+            with manifest_lock:
+                manifest.save()
+                manifest_saved["done"] = True
+
+        def on_flush(rows):
+            with _PRINT_LOCK:
+                print(f"   💾 Saved {len(rows)} result(s) to {position_results_file}", flush=True)
+            for row in rows:
+                tally["results"].append(row)
+                tally["successfully_processed"] += 1
+                log_cv_processing(
+                    source="github_action",
+                    candidate_name=row.get("Candidate Name", ""),
+                    position=position_name,
+                    success=True
+                )
+        
+        def on_saved(rows):
+            # Only rows that are on GitHub count as persisted / screened
+            keys = [candidate_key(row.get("Candidate Email"), row.get("Candidate Name"), row.get("Phone")) for row in rows]
+            for key in keys:
+                checkpoints.mark_persisted(key)
+            with manifest_lock:
+                manifest.remember(keys, [hash_by_key.get(key) for key in keys])
+                if manifest_saved["done"]:
+                    manifest.save()
+        
+        checkpoints = CheckpointJournal(position_name)
+        writer = BufferedResultWriter(position_name, on_flush=on_flush, builder=builder, store=store, on_saved=on_saved)
+        if writer.pending:
+            existing_results = pd.concat(
+                [existing_results, pd.DataFrame(writer.buffered_rows())], ignore_index=True
+            ) if existing_results is not None else pd.DataFrame(writer.buffered_rows())
         
-        # Also track by name+phone for candidates without email
-        processed_name_phone = set()
         if existing_results is not None and not existing_results.empty:
-            for _, row in existing_results.iterrows():
-                name = row.get("Candidate Name", "")
-                phone = row.get("Phone", "")
-                if pd.notna(name) and pd.notna(phone) and str(name).strip() and str(phone).strip():
-                    key = f"{str(name).strip().lower()}_{str(phone).strip()}"
-                    processed_name_phone.add(key)
-        
-        for idx, row in candidates_df.iterrows():
-            # Kalibrr export column names: "Alamat Email", etc.
-            candidate_email = (
-                row.get("Alamat Email") or 
-                row.get("Email Address") or 
-                row.get("Email Pelamar") or 
-                row.get("Candidate Email") or 
-                row.get("Email", "")
-            )
-            
-            # Get candidate name for reporting
-            first_name = row.get("Nama Depan") or row.get("First Name") or ""
-            last_name = row.get("Nama Belakang") or row.get("Last Name") or ""
-            candidate_name = f"{first_name} {last_name}".strip()
-            if not candidate_name:
-                candidate_name = row.get("Candidate Name", "") or row.get("Name", "") or "Unknown"
-            
-            # Check by email first
-            if pd.notna(candidate_email) and str(candidate_email).strip():
-                email_lower = str(candidate_email).strip().lower()
-                if email_lower in processed_emails:
-                    skipped_candidates.append(candidate_name)
-                    continue
-            else:
-                # No email, check by name+phone
-                candidate_phone = (
-                    row.get("Nomor Handphone") or
-                    row.get("Phone Number") or
-                    row.get("Telepon") or
-                    row.get("Phone", "")
-                )
-                
-                if pd.notna(candidate_name) and pd.notna(candidate_phone):
-                    name_phone_key = f"{str(candidate_name).strip().lower()}_{str(candidate_phone).strip()}"
-                    if name_phone_key in processed_name_phone:
-                        skipped_candidates.append(candidate_name)
-                        continue
-            
-            new_candidates.append(row)
+            processed_emails = existing_results["Candidate Email"].dropna().astype(str).str.lower()
+            print(f"   Found {processed_emails.nunique()} already-processed candidates")
+        elif inserted.any():
+            print(f"   No existing results found (first run for this position)")
+        
+        # 4. Filter new candidates only (by email OR by name+phone if no email);
+        #    changed/unchanged rows are already in the results file
+        with profile_span("dedup"):
+            match = match_existing_candidates(candidates, existing_results, fallback_name="Unknown")
+            match[~inserted] = "manifest"
+        is_new = match == ""
+        # Inserted rows that already have a result go into the manifest right away
+        already_screened = inserted & ~is_new
+        manifest.remember(row_keys[already_screened], row_hashes[already_screened])
+        skipped_candidates = candidates.loc[~is_new, "Candidate Name"].replace("", "Unknown").tolist()
+        # Earliest applicants first (candidates without a date last)
+        new_frame = candidates[is_new].sort_values(
+            "Date Applied", key=lambda dates: dates.replace("", "9999"), kind="stable"
+        )
+        new_candidates = [row for _, row in new_frame.iterrows()]
         
         if skipped_candidates:
             print(f"\n   ⏩ Skipping {len(skipped_candidates)} already-analyzed candidates:")
@@ -451,178 +777,108 @@ def screen_position(position_name, job_description, job_id, csv_url=None):
                 print(f"      ... and {len(skipped_candidates) - 10} more")
         
         if not new_candidates:
+            writer.close()
+            checkpoints.close()
+            save_manifest()
             print(f"\n✅ All {len(candidates_df)} candidates already analyzed (no new candidates to screen)")
-            return 0
+            return tally["successfully_processed"]
         
-        # Cap at MAX_CANDIDATES_PER_POSITION per run
+        # Cap to what fits in the run's time/quota budget (or MAX_CANDIDATES_PER_POSITION)
         total_new = len(new_candidates)
-        if total_new > MAX_CANDIDATES_PER_POSITION:
-            new_candidates = new_candidates[:MAX_CANDIDATES_PER_POSITION]
+        limit = planner.grant(position_name, total_new) if planner is not None else MAX_CANDIDATES_PER_POSITION
+        if limit == 0:
+            writer.close()
+            checkpoints.close()
+            save_manifest()
+            print(f"\n⏳ No time/quota left in this run - {total_new} new candidates deferred to next run")
+            return tally["successfully_processed"]
+        if total_new > limit:
+            new_candidates = new_candidates[:limit]
             print(f"\n🚀 Starting screening for {len(new_candidates)} new candidates (capped from {total_new})")
-            print(f"   ({len(skipped_candidates)} already analyzed, {total_new - MAX_CANDIDATES_PER_POSITION} deferred to next run)\n")
+            print(f"   ({len(skipped_candidates)} already analyzed, {total_new - limit} deferred to next run)\n")
         else:
             print(f"\n🚀 Starting screening for {len(new_candidates)} new candidates")
             print(f"   ({len(skipped_candidates)} already analyzed, {len(new_candidates)} remaining)\n")
         
-        # 4. Process each new candidate
-        results = []
-        successfully_processed = 0
-        failed_count = 0
+        # 5. Process new candidates through the staged pipeline
+        #    fetch → extract → context → Step 1 → Step 2 + ceiling → persist
+        # Build every candidate's CSV context in one column-wise pass
+        candidate_contexts = build_candidate_contexts(
+            candidates_df.loc[[candidate.name for candidate in new_candidates]]
+        )
         
-        for idx, candidate in enumerate(new_candidates, 1):
-            try:
-                # Extract candidate info from Kalibrr export columns
-                first_name = candidate.get("Nama Depan") or candidate.get("First Name") or ""
-                last_name = candidate.get("Nama Belakang") or candidate.get("Last Name") or ""
-                candidate_name = f"{first_name} {last_name}".strip()
-                if not candidate_name:
-                    candidate_name = candidate.get("Nama") or candidate.get("Name") or "Unknown"
-                
-                candidate_email = (
-                    candidate.get("Alamat Email") or 
-                    candidate.get("Email Address") or 
-                    candidate.get("Email Pelamar") or 
-                    candidate.get("Candidate Email") or 
-                    candidate.get("Email", "")
-                )
-                
-                print(f"   [{idx}/{len(new_candidates)}] Processing: {candidate_name}")
-                
-                # Download and extract CV
-                # Kalibrr export uses "Link Resume" (not "Resume Link")
-                resume_link = (
-                    candidate.get("Link Resume") or 
-                    candidate.get("Resume Link") or 
-                    candidate.get("Tautan Resume") or 
-                    candidate.get("Resume", "")
-                )
-                
-                cv_text = ""
-                if pd.notna(resume_link) and str(resume_link).strip():
-                    try:
-                        # Extract CV with minimal retry (fail fast on errors)
-                        cv_text = extract_resume_from_url(resume_link)
-                        if cv_text:
-                            print(f"       ✓ CV extracted ({len(cv_text)} characters)")
-                        else:
-                            print(f"       ⚠ CV extraction failed - skipping to next candidate")
-                    except KeyboardInterrupt:
-                        # Allow manual interruption
-                        raise
-                    except Exception as e:
-                        # Catch all errors including MuPDF/parsing issues
-                        print(f"       ⚠ CV extraction error - skipping to next candidate")
-                        # Continue processing without CV text
-                        cv_text = ""
-                else:
-                    print(f"       ⚠ No resume link available")
-                
-                # Build candidate context from CSV data
-                context = build_candidate_context(candidate)
-                
-                # Score with AI (Gemini)
-                cv_score = 0
-                summary = "No resume available"
-                strengths = []
-                weaknesses = []
-                gaps = []
-                candidate_info = {
-                    "latest_job_title": "",
-                    "latest_company": "",
-                    "education": "",
-                    "university": "",
-                    "major": ""
-                }
-                
-                if cv_text.strip():
-                    try:
-                        # Use new 3-step pipeline: Extract & Classify (Flash) → Evaluate & Score (Pro) → Ceiling
-                        cv_score, summary, strengths, weaknesses, gaps, candidate_info = score_candidate_pipeline(
-                            cv_text, context, position_name, job_description
-                        )
-                        print(f"       ✓ AI Score: {cv_score}/100")
-                        print(f"       ✓ Extracted candidate info from CV")
-                    except Exception as e:
-                        print(f"       ❌ AI scoring error: {str(e)}")
-                        summary = f"Scoring failed: {str(e)}"
-                
-                # Build result row
-                result = {
-                    "Candidate Name": candidate_name,
-                    "Candidate Email": candidate_email,
-                    "Phone": candidate.get("Nomor Handphone") or candidate.get("Mobile Number") or candidate.get("Telp") or candidate.get("Phone") or "",
-                    "Job Position": position_name,
-                    "Match Score": cv_score,
-                    "AI Summary": summary,
-                    "Strengths": "; ".join(strengths) if strengths else "",
-                    "Weaknesses": "; ".join(weaknesses) if weaknesses else "",
-                    "Gaps": "; ".join(gaps) if gaps else "",
-                    "Latest Job Title": candidate_info.get("latest_job_title") or candidate.get("Latest Job Title") or candidate.get("Jabatan Terakhir") or "",
-                    "Latest Company": candidate_info.get("latest_company") or candidate.get("Latest Company") or candidate.get("Perusahaan Terakhir") or "",
-                    "Education": candidate_info.get("education") or candidate.get("Tingkat Pendidikan") or candidate.get("Latest Educational Attainment") or candidate.get("Pendidikan") or "",
-                    "University": candidate_info.get("university") or candidate.get("Latest School/University") or candidate.get("Universitas") or "",
-                    "Major": candidate_info.get("major") or candidate.get("Latest Major/Course") or candidate.get("Jurusan") or "",
-                    "Kalibrr Profile": candidate.get("Link Profil Kalibrr") or candidate.get("Kalibrr Profile Link") or candidate.get("Profil Kalibrr") or "",
-                    "Application Link": candidate.get("Link Aplikasi Pekerjaan") or candidate.get("Job Application Link") or candidate.get("Tautan Lamaran") or "",
-                    "Resume Link": resume_link,
-                    "Recruiter Feedback": "",
-                    "Shortlisted": False,
-                    "Candidate Status": "",
-                    "Interview Status": "",
-                    "Rejection Reason": "",
-                    "Date Applied": parse_kalibrr_date(
-                        candidate.get("Date Application Started (mm/dd/yy hr:mn)") or
-                        candidate.get("Tanggal Mulai Melamar") or
-                        candidate.get("application.created_at") or ""
-                    ),
-                    "Date Processed": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                
-                # Append result immediately to CSV file
-                result_df = pd.DataFrame([result])
-                if save_results_to_github(result_df, job_position=position_name):
-                    print(f"       ✓ Appended to {position_results_file}")
-                    results.append(result)
-                    successfully_processed += 1
-                    # Log successful CV processing
-                    log_cv_processing(
-                        source="github_action",
-                        candidate_name=candidate_name,
-                        position=position_name,
-                        success=True
-                    )
-                else:
-                    print(f"       ⚠ Failed to append result")
-                    failed_count += 1
-                    # Log failed CV processing
-                    log_cv_processing(
-                        source="github_action",
-                        candidate_name=candidate_name,
-                        position=position_name,
-                        success=False
-                    )
-                
-            except KeyboardInterrupt:
-                # Allow manual interruption
-                print(f"\n⚠️  Processing interrupted by user")
-                raise
-            except Exception as e:
-                error_msg = str(e)[:150]  # Truncate very long error messages
-                print(f"       ❌ Skipping candidate due to error: {error_msg}")
-                if "MuPDF" in str(e) or "fitz" in str(e):
-                    print(f"       (PDF parsing error - candidate will be skipped)")
-                failed_count += 1
-                # Continue to next candidate - don't let one failure stop the whole process
-                continue
+        jobs = [
+            {
+                "idx": idx,
+                "total": len(new_candidates),
+                "candidate": candidate,
+                "name": candidate["Candidate Name"] or "Unknown",
+                "context_value": candidate_contexts.iloc[idx - 1],
+                "key": candidate_key(candidate["Candidate Email"], candidate["Candidate Name"] or "Unknown", candidate["Phone"]),
+                "cv_sha1": None,
+                "error": None,
+            }
+            for idx, candidate in enumerate(new_candidates, 1)
+        ]
         
-        # Summary for this position (results already saved individually)
+        def feed():
+            # The planner stops feeding once new work would overrun the deadline/quota
+            for job in jobs:
+                if planner is not None and not planner.should_feed():
+                    tally["deferred"] += 1
+                    continue
+                job["fed_at"] = time.monotonic()
+                yield job
+        
+        stages = _build_screening_stages(position_name, job_description, writer, tally, checkpoints, planner)
+        pipeline_started = time.perf_counter()
+        llm_calls_before = get_rate_limiter().granted.get(position_name, 0)
+        try:
+            run_stages(feed(), stages)
+        except KeyboardInterrupt:
+            # Allow manual interruption (buffered rows stay in the journal)
+            print(f"\n⚠️  Processing interrupted by user")
+            raise
+        finally:
+            # Save whatever is still buffered
+            if not writer.close():
+                print(f"   ⚠ {writer.pending} result(s) could not be saved; kept in {writer.journal_path}")
+                tally["failed_count"] += writer.pending
+            checkpoints.close()
+            save_manifest()
+        pipeline_seconds = time.perf_counter() - pipeline_started
+        if planner is not None:
+            planner.position_finished(
+                position_name,
+                get_rate_limiter().granted.get(position_name, 0) - llm_calls_before,
+                len(jobs) - tally["deferred"],
+            )
+        
+        successfully_processed = tally["successfully_processed"]
+        failed_count = tally["failed_count"]
+        parse_coverage = tally["parse_coverage"]
+        
+        # Summary for this position (results already saved in batches)
         print(f"\n📊 Position Summary:")
         print(f"   • Total candidates found: {len(candidates_df)}")
         print(f"   • Already analyzed (skipped): {len(skipped_candidates)}")
         print(f"   • New candidates screened: {successfully_processed}")
         if failed_count > 0:
             print(f"   • Failed to process: {failed_count}")
+        if tally["deferred"]:
+            print(f"   • Deferred by run planner (deadline/quota): {tally['deferred']}")
         print(f"   • Total analyzed to date: {len(skipped_candidates) + successfully_processed}")
+        if writer.store is not None:
+            print(f"   • Result batches: {writer.flush_count} (written to the local results store, synced at the end of the run)")
+        elif builder is not None:
+            print(f"   • Result batches: {writer.flush_count} (committed with the run's batch commits)")
+        else:
+            print(f"   • GitHub saves: {writer.flush_count} batch(es)")
+        print(f"   • {checkpoints.summary_line()}")
+        for line in parse_coverage.summary_lines():
+            print(f"   • {line}")
+        for line in stage_summary_lines(stages, pipeline_seconds):
+            print(f"   • {line}")
         
         return successfully_processed
         
@@ -632,23 +888,78 @@ def screen_position(position_name, job_description, job_id, csv_url=None):
         return 0
 
 
+def _priority_weights(position_names):
+    """LLM fair-share weight per position: PRIORITY_ORDER entries get more.
+    
+    The first priority position gets len(PRIORITY_ORDER) + 1, the last one 2,
+    and positions outside the list 1.
+    """
+    weights = {}
+    for name in position_names:
+        if name in PRIORITY_ORDER:
+            weights[name] = len(PRIORITY_ORDER) - PRIORITY_ORDER.index(name) + 1
+        else:
+            weights[name] = 1
+    return weights
+
+
 def main():
     """Main entry point for automated screening."""
+    parser = argparse.ArgumentParser(description="Screen new candidates for all active positions")
+    parser.add_argument(
+        "--deadline-minutes",
+        type=float,
+        default=float(os.getenv("SCREENING_DEADLINE_MINUTES", DEFAULT_DEADLINE_MINUTES)),
+        help=f"Wall-clock budget for the run (default: {DEFAULT_DEADLINE_MINUTES}, env SCREENING_DEADLINE_MINUTES)",
+    )
+    parser.add_argument(
+        "--llm-budget",
+        type=int,
+        default=int(os.getenv("SCREENING_LLM_BUDGET", 0)) or None,
+        help="Maximum number of LLM calls for the run (default: unlimited, env SCREENING_LLM_BUDGET)",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Dry run: estimate LLM calls, tokens and wall time for the new candidates without screening",
+    )
+    parser.add_argument(
+        "--plan-sample",
+        type=int,
+        default=PLAN_CV_SAMPLE,
+        help=f"CVs downloaded per position to measure CV length in --plan mode (default: {PLAN_CV_SAMPLE})",
+    )
+    args = parser.parse_args()
+    
     print("="*70)
-    print("AUTOMATED CV SCREENING")
+    print("AUTOMATED CV SCREENING" + (" - PLAN (dry run, no LLM calls)" if args.plan else ""))
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
     
-    # Check for required API keys
-    if not os.getenv("GEMINI_API_KEY"):
+    # Check for required API keys (not needed for a dry run)
+    if not args.plan and not os.getenv("GEMINI_API_KEY"):
         print("❌ ERROR: No API key found!")
         print("   Please set GEMINI_API_KEY environment variable")
         return 1
     
+    # Per-stage timings for this run (written to outputs/profiles/ at the end)
+    profiler = None if args.plan else start_run_profiler()
+    # Share resume downloads/extractions between positions an applicant applied to
+    registry = None if args.plan else start_candidate_registry()
+    # Commit result files (and the usage log) for all positions together
+    # through the Git Data API instead of one Contents API commit per save
+    builder = None
+    if not args.plan and os.getenv("GITHUB_TOKEN"):
+        builder = GitCommitBuilder(f"🤖 Automated CV screening results - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+        set_log_commit_builder(builder)
+    # Where results are read and written (RESULTS_STORE=github|sqlite)
+    store = get_results_store()
+    
     # 1. Load job positions
     print("\n📂 Loading job positions...")
     try:
-        jobs_df = load_job_positions_from_github()
+        with profile_span("positions_load"):
+            jobs_df = load_job_positions_from_github()
         if jobs_df is None or jobs_df.empty:
             print("❌ No job positions found in job_positions.csv")
             return 1
@@ -701,17 +1012,19 @@ def main():
     # 3. Load sheet_positions.csv to get File Storage URLs
     print(f"\n📊 Loading sheet_positions.csv for CSV URLs...")
     try:
-        sheet_df = pd.read_csv(os.path.join(PROJECT_ROOT, 'data', 'sheet_positions.csv'))
+        with profile_span("sheet_load"):
+            sheet_df = pd.read_csv(os.path.join(PROJECT_ROOT, 'data', 'sheet_positions.csv'))
         print(f"   Loaded {len(sheet_df)} positions from data/sheet_positions.csv\n")
     except Exception as e:
         print(f"   ⚠️  Could not load data/sheet_positions.csv: {e}")
         print(f"   Will proceed without File Storage URLs\n")
         sheet_df = None
     
-    # 4. Screen each active position
-    total_screened = 0
-    positions_with_new_candidates = 0
+    # Index sheet positions once (instead of scanning sheet_df per position)
+    sheet_index = get_position_index(sheet_df) if sheet_df is not None else None
     
+    # 4. Collect the positions to screen
+    tasks = []
     for idx, row in active_positions.iterrows():
         position_name = row['Job Position']
         job_description = row['Job Description']
@@ -730,10 +1043,8 @@ def main():
         
         # Get CSV URL from sheet_positions.csv
         csv_url = None
-        if sheet_df is not None:
-            match = sheet_df[sheet_df['Nama Posisi'] == position_name]
-            if not match.empty:
-                csv_url = match.iloc[0].get('File Storage')
+        if sheet_index is not None:
+            csv_url = sheet_index.file_storage_url(position_name, exact=True)
         
         # Fallback: check for local CSV in kalibrr_exports/
         if not csv_url or pd.isna(csv_url) or str(csv_url).strip() == '':
@@ -751,16 +1062,61 @@ def main():
                 print(f"\n⚠️  Skipping '{position_name}' - No File Storage URL or local CSV")
                 continue
         
-        try:
-            screened = screen_position(position_name, job_description, job_id, csv_url)
-            total_screened += screened
-            if screened > 0:
-                positions_with_new_candidates += 1
-        except Exception as e:
-            print(f"❌ Error screening position '{position_name}': {str(e)}")
-            print(f"   Stack trace: {traceback.format_exc()}")
-            # Continue with next position even if this one fails
-            continue
+        tasks.append({
+            "name": position_name,
+            "job_description": job_description,
+            "job_id": job_id,
+            "csv_url": csv_url,
+        })
+    
+    # 5. Plan the run: how many candidates fit before the deadline / quota
+    weights = _priority_weights([task["name"] for task in tasks])
+    limiter = get_rate_limiter()
+    planner = RunPlanner(
+        args.deadline_minutes * 60,
+        llm_call_budget=args.llm_budget,
+        calls_used=lambda: sum(limiter.granted.values()),
+    )
+    planner.register(weights)
+    budget = f", LLM budget {args.llm_budget} call(s)" if args.llm_budget else ""
+    print(f"\n⏱️  Deadline {args.deadline_minutes:g} min{budget} → ~{planner.capacity()} candidate(s) fit")
+    
+    if args.plan:
+        # Dry run: count new candidates and estimate cost, nothing is screened or saved
+        estimates = [_plan_position(task, args.plan_sample) for task in tasks]
+        print("\n" + "="*70)
+        print("SCREENING PLAN")
+        print("="*70)
+        for line in plan_summary_lines(estimates, planner.telemetry, POSITION_CONCURRENCY, planner.capacity()):
+            print(line)
+        return 0
+    
+    # 6. Screen positions concurrently (output is grouped per position)
+    print(f"\n🚦 Screening {len(tasks)} position(s), {POSITION_CONCURRENCY} at a time")
+    outcomes = run_positions(
+        tasks,
+        lambda task: screen_position(
+            task["name"], task["job_description"], task["job_id"], task["csv_url"],
+            planner=planner, builder=builder, store=store,
+        ),
+        weights=weights,
+        concurrency=POSITION_CONCURRENCY,
+    )
+    planner.telemetry.save()
+    if store.local and builder is not None:
+        # Export the positions written to the local store into the batch commit
+        store.sync(builder)
+    if builder is not None:
+        # Fold recruiters' status patch logs into the results CSVs in the same commit
+        compacted = compact_all_status_patches(builder)
+        if compacted:
+            print(f"📝 Compacting status updates of {compacted} position(s) into their results files")
+    if builder is not None:
+        if not builder.commit():
+            print("⚠️  Final batch commit failed; unsaved rows are kept in outputs/result_journal/ for the next run")
+        set_log_commit_builder(None)
+    total_screened = sum(screened or 0 for _, screened, _ in outcomes)
+    positions_with_new_candidates = sum(1 for _, screened, _ in outcomes if screened)
     
     # Final summary
     print("\n" + "="*70)
@@ -772,6 +1128,21 @@ def main():
         print(f"  • Pooled positions (excluded): {pooled_count}")
     print(f"Total candidates screened: {total_screened}")
     print(f"Positions with new candidates: {positions_with_new_candidates}")
+    for line in planner.summary_lines():
+        print(line)
+    print(registry.summary_line())
+    if builder is not None:
+        print(f"GitHub batch commits: {builder.commits} ({builder.api_calls} API call(s))")
+    github_lines = github_call_summary_lines(top=5)
+    if github_lines:
+        print("GitHub API calls by operation:")
+        for line in github_lines:
+            print(f"  • {line}")
+    profile_path = profiler.write()
+    if profile_path:
+        print(f"Stage profile: {os.path.relpath(profile_path, PROJECT_ROOT)} (slowest stages below)")
+        for line in profiler.summary_lines(top=5):
+            print(f"  • {line}")
     print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
     
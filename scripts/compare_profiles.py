@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compare two auto_screen stage profiles (outputs/profiles/run_*.json).
+
+Prints count, total, p50 and p90 per stage for both runs and the change,
+followed by event counts (LLM 429s, GitHub 409s). With --positions the same
+table is printed for every position found in either run.
+
+Usage:
+    python scripts/compare_profiles.py BEFORE.json AFTER.json [--positions]
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_profile(path):
+    """Load a profile JSON written by RunProfiler.write()."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _change(before, after):
+    if not before:
+        return "new" if after else ""
+    return f"{(after - before) / before * 100:+.0f}%"
+
+
+def stage_lines(before, after):
+    """Table lines comparing two {stage: stats} dicts."""
+    lines = [
+        f"{'Stage':<28} {'Count':>11} {'Total (s)':>19} {'p50 (s)':>15} {'p90 (s)':>15} {'Δ total':>8}",
+    ]
+    empty = {"count": 0, "total": 0.0, "p50": 0.0, "p90": 0.0}
+    stages = sorted(set(before) | set(after), key=lambda s: -max(before.get(s, empty)["total"], after.get(s, empty)["total"]))
+    for stage in stages:
+        b, a = before.get(stage, empty), after.get(stage, empty)
+        lines.append(
+            f"{stage[:28]:<28} {b['count']:>5}→{a['count']:<5} "
+            f"{b['total']:>9.1f}→{a['total']:<9.1f} "
+            f"{b['p50']:>7.2f}→{a['p50']:<7.2f} {b['p90']:>7.2f}→{a['p90']:<7.2f} "
+            f"{_change(b['total'], a['total']):>8}"
+        )
+    return lines
+
+
+def event_lines(before, after):
+    """Lines comparing two {event: count} dicts."""
+    return [
+        f"{name:<28} {before.get(name, 0):>5}→{after.get(name, 0):<5}"
+        for name in sorted(set(before) | set(after))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff two auto_screen stage profiles")
+    parser.add_argument("before", help="Profile of the baseline run")
+    parser.add_argument("after", help="Profile of the run to compare")
+    parser.add_argument("--positions", action="store_true", help="Also compare each position")
+    args = parser.parse_args()
+
+    try:
+        before, after = load_profile(args.before), load_profile(args.after)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not load profile: {e}")
+        return 1
+
+    print("=" * 70)
+    print(f"BEFORE: {args.before} ({before['meta']['started_at']}, {before['meta']['wall_seconds'] / 60:.1f} min)")
+    print(f"AFTER:  {args.after} ({after['meta']['started_at']}, {after['meta']['wall_seconds'] / 60:.1f} min)")
+    print("=" * 70)
+    for line in stage_lines(before["run"], after["run"]):
+        print(line)
+
+    events = event_lines(before["events"]["run"], after["events"]["run"])
+    if events:
+        print("\nEvents")
+        for line in events:
+            print(line)
+
+    if args.positions:
+        for position in sorted(set(before["positions"]) | set(after["positions"])):
+            print(f"\n📌 {position}")
+            for line in stage_lines(before["positions"].get(position, {}), after["positions"].get(position, {})):
+                print(line)
+            events = event_lines(
+                before["events"]["positions"].get(position, {}),
+                after["events"]["positions"].get(position, {}),
+            )
+            for line in events:
+                print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -41,14 +41,19 @@ import pandas as pd
 import requests
 from io import BytesIO
 from pathlib import Path
-import re
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.column_schema import to_canonical
+from src.repositories.github_utils import get_results_filename
+from src.repositories.results_store import get_results_store
 
 
 # Constants
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 SHEET_POSITIONS_FILE = PROJECT_ROOT / "data" / "sheet_positions.csv"
 JOB_POSITIONS_FILE = PROJECT_ROOT / "data" / "job_positions.csv"
-RESULTS_DIR = "data/processed"
 
 
 def load_sheet_positions():
@@ -137,31 +142,24 @@ def _truncate_str(s, max_len):
     return f"{s_str[:max_len]}..." if len(s_str) > max_len else s_str
 
 
-def get_column_value(row, english_name, indonesian_name, default=''):
-    """Get column value supporting both English and Indonesian column names."""
-    if english_name in row and pd.notna(row.get(english_name)):
-        return row.get(english_name, default)
-    return row.get(indonesian_name, default)
-
-
 def load_existing_results(position_name):
-    """Load existing results for a specific position."""
-    # Generate the position-specific filename
-    safe_name = re.sub(r'[^\w\s-]', '', position_name)
-    safe_name = re.sub(r'[-\s]+', '_', safe_name)
-    results_file = os.path.join(RESULTS_DIR, f"results_{safe_name}.csv")
+    """Load existing results for a specific position.
     
-    if not os.path.exists(results_file):
-        print(f"ℹ️ No existing results file found: {results_file}")
-        return None, results_file
+    Reads from the results store (RESULTS_STORE, default: the local
+    data/processed CSVs committed by the workflow).
+    """
+    results_file = get_results_filename(position_name)
+    df = get_results_store(default="local").load(position_name)
     
-    try:
-        df = pd.read_csv(results_file)
-        print(f"✅ Loaded {len(df)} existing results from {results_file}")
-        return df, results_file
-    except Exception as e:
-        print(f"❌ Error loading {results_file}: {e}")
+    if df is None:
+        print(f"❌ Error loading {results_file}")
         return None, results_file
+    if df.empty:
+        print(f"ℹ️ No existing results found: {results_file}")
+        return None, results_file
+    
+    print(f"✅ Loaded {len(df)} existing results from {results_file}")
+    return df, results_file
 
 
 def update_cv_links_for_position(position_name, file_storage_url):
@@ -202,16 +200,15 @@ def update_cv_links_for_position(position_name, file_storage_url):
     email_to_links = {}
     name_to_links = {}
     
-    for _, row in fresh_candidates.iterrows():
-        email = get_column_value(row, "Email Address", "Alamat Email", "").strip()
-        resume_link = get_column_value(row, "Resume Link", "Link Resume", "")
-        profile_link = get_column_value(row, "Kalibrr Profile Link", "Link Profil Kalibrr", "")
-        app_link = get_column_value(row, "Job Application Link", "Link Aplikasi Pekerjaan", "")
-        
+    # Map the export header (UI / API / legacy Indonesian) to canonical columns once
+    candidates = to_canonical(fresh_candidates)
+    
+    for _, row in candidates.iterrows():
+        email = row["Candidate Email"]
         links = {
-            "resume": resume_link,
-            "profile": profile_link,
-            "application": app_link,
+            "resume": row["Resume Link"],
+            "profile": row["Kalibrr Profile"],
+            "application": row["Application Link"],
             "email": email,
         }
         
@@ -219,10 +216,8 @@ def update_cv_links_for_position(position_name, file_storage_url):
             email_to_links[email.lower()] = links
         
         # Build name key: "FirstName LastName" for fallback matching
-        first = str(get_column_value(row, "First Name", "Nama Depan", "")).strip()
-        last = str(get_column_value(row, "Last Name", "Nama Belakang", "")).strip()
-        if first:
-            full_name = " ".join(f"{first} {last}".split()).lower()
+        if row["First Name"]:
+            full_name = " ".join(row["Candidate Name"].split()).lower()
             name_to_links[full_name] = links
     
     print(f"📋 Found {len(email_to_links)} emails + {len(name_to_links)} names in fresh data")
@@ -277,14 +272,11 @@ def update_cv_links_for_position(position_name, file_storage_url):
     
     # Save updated results back to file
     if updated_count > 0:
-        try:
-            existing_results.to_csv(results_file, index=False)
-            print(f"💾 Saved {updated_count} link(s) updated to {results_file}")
-            if emails_backfilled > 0:
-                print(f"   📧 Backfilled {emails_backfilled} missing email(s)")
-        except Exception as e:
-            print(f"❌ Error saving results: {e}")
+        if not get_results_store(default="local").replace(position_name, existing_results):
             return 0
+        print(f"💾 Saved {updated_count} link(s) updated to {results_file}")
+        if emails_backfilled > 0:
+            print(f"   📧 Backfilled {emails_backfilled} missing email(s)")
     else:
         print(f"ℹ️ No matching candidates found in fresh data for {position_name}")
     
@@ -395,6 +387,11 @@ def main():
     print(f"Total CV links updated: {total_updated}")
     print("="*60)
     
+    # Local SQLite store: push the updated positions to GitHub
+    if not get_results_store(default="local").sync():
+        print("⚠️ Results store sync failed; updated links are kept in the local store")
+        return 1
+    
     return 0
 
 
@@ -17,10 +17,17 @@ DATA_PROCESSED_DIR = DATA_DIR / "processed"  # Screening results
 # Config / seed data at data root
 JOB_POSITIONS_FILE = DATA_DIR / "job_positions.csv"
 SHEET_POSITIONS_FILE = DATA_DIR / "sheet_positions.csv"
+MANIFEST_DIR = DATA_DIR / "manifests"    # Per-position row hashes of Kalibrr exports (delta detection)
 
 # ── Outputs ──────────────────────────────────────────────────────────────────
 OUTPUTS_DIR = ROOT / "outputs"
 CV_DOWNLOAD_DIR = OUTPUTS_DIR / "cv"
+HTTP_CACHE_DIR = OUTPUTS_DIR / "http_cache"   # Conditional-GET cache (sheet / File Storage CSVs)
+RESULT_JOURNAL_DIR = OUTPUTS_DIR / "result_journal"  # Buffered result rows not yet saved
+CHECKPOINT_DIR = OUTPUTS_DIR / "checkpoints"   # Per-candidate Step 1/Step 2 checkpoints (auto_screen)
+SCREENING_TELEMETRY_FILE = OUTPUTS_DIR / "screening_telemetry.json"  # Per-candidate cost EWMAs (run planner)
+PROFILE_DIR = OUTPUTS_DIR / "profiles"        # Per-run stage timing profiles (auto_screen)
+RESULTS_DB_FILE = OUTPUTS_DIR / "results.db"  # Local SQLite results store (RESULTS_STORE=sqlite)
 
 # ── Logs ─────────────────────────────────────────────────────────────────────
 LOGS_DIR = ROOT / "logs"
@@ -29,3 +36,4 @@ API_USAGE_LOG = LOGS_DIR / "api_usage_log.json"
 # ── String versions (for GitHub API paths — must be repo-relative) ───────────
 RESULTS_DIR = "data/processed"          # used in github_utils as GitHub path prefix
 EXPORT_DIR_NAME = "data/raw"            # used in kalibrr_core / update_cv_links
+STATUS_PATCHES_DIR = "data/status_patches"  # Recruiter status patch files (status_patches)
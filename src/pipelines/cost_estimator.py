@@ -0,0 +1,153 @@
+"""
+Dry-run cost and time estimate for batch screening (auto_screen --plan).
+
+No LLM is called. For each position the estimate uses:
+- the number of new candidates (export minus existing results)
+- the real Step 1 prompt, built with _build_step1_prompt() from the new
+  candidates' average application-form context and a small sample of
+  downloaded, cleaned CVs (which stand in for the rest)
+- the Step 2 prompt built from the job description plus a typical Step 1
+  output size
+
+Calls and tokens are projected for Flash (Step 1) and Pro (Step 2). Wall time
+is the larger of the rate-limit floor (LLM_REQUESTS_PER_MINUTE) and the run
+throughput measured by the run planner's telemetry.
+"""
+
+from src.pipelines.scorer import (
+    GEMINI_MODEL_FLASH,
+    GEMINI_MODEL_PRO,
+    LLM_REQUESTS_PER_MINUTE,
+    _build_step1_prompt,
+    _build_step2_prompt,
+)
+from src.services.candidate_processor import build_candidate_contexts, extract_resume_from_pdf_bytes
+from src.services.cv_parser import CHARS_PER_TOKEN
+from src.services.resume_fetcher import get_resume_fetcher
+
+# CVs downloaded per position to measure cleaned CV length
+PLAN_CV_SAMPLE = 5
+
+# Used when no sampled CV could be downloaded
+DEFAULT_CV_CHARS = 4000
+
+# Typical Step 1 output size rendered into the Step 2 prompt (3 experiences)
+STEP2_PROFILE_CHARS = 1200
+
+# Typical completion sizes (tokens)
+STEP1_OUTPUT_TOKENS = 1500
+STEP2_OUTPUT_TOKENS = 700
+
+
+def _sample_cvs(new_frame, sample_size):
+    """Download and extract up to sample_size CVs as (cv_text, parsed_cv) pairs."""
+    if sample_size <= 0:
+        return []
+    fetcher = get_resume_fetcher()
+    links = [link for link in new_frame["Resume Link"] if link][:sample_size]
+    futures = fetcher.prefetch(links)
+    samples = []
+    for link in links:
+        try:
+            cv_text, parsed_cv = extract_resume_from_pdf_bytes(futures[link].result(), parse_layout=True)
+        except Exception:
+            continue
+        if cv_text:
+            samples.append((cv_text, parsed_cv))
+    return samples
+
+
+def estimate_position(position_name, job_description, candidates_df, new_frame, sample_size=PLAN_CV_SAMPLE):
+    """Estimate Step 1 / Step 2 prompt tokens for one position's new candidates.
+
+    Args:
+        position_name (str): Job position
+        job_description (str): Job description text
+        candidates_df (DataFrame): Raw Kalibrr export (for candidate contexts)
+        new_frame (DataFrame): Canonical rows of the new candidates
+        sample_size (int): CVs to download for the length sample
+
+    Returns:
+        dict: new, sampled, avg_cv_chars, step1_prompt_tokens and
+            step2_prompt_tokens (average per candidate)
+    """
+    estimate = {
+        "position": position_name,
+        "new": len(new_frame),
+        "sampled": 0,
+        "avg_cv_chars": 0,
+        "step1_prompt_tokens": 0,
+        "step2_prompt_tokens": 0,
+    }
+    if new_frame.empty:
+        return estimate
+
+    contexts = build_candidate_contexts(candidates_df.loc[new_frame.index])
+    samples = _sample_cvs(new_frame, sample_size)
+    estimate["sampled"] = len(samples)
+    if not samples:
+        samples = [("x" * DEFAULT_CV_CHARS, None)]
+    estimate["avg_cv_chars"] = sum(len(cv) for cv, _ in samples) // len(samples)
+
+    # Fixed prompt + sampled CVs, with the average application-form context
+    avg_context = int(contexts.str.len().mean())
+    context = "x" * min(avg_context, 2000)
+    step1_chars = [
+        len(_build_step1_prompt(cv, context, position_name, job_description, parsed_cv)[0])
+        for cv, parsed_cv in samples
+    ]
+    estimate["step1_prompt_tokens"] = (sum(step1_chars) // len(step1_chars)) // CHARS_PER_TOKEN
+
+    step2_chars = len(_build_step2_prompt({}, position_name, job_description)) + STEP2_PROFILE_CHARS
+    estimate["step2_prompt_tokens"] = step2_chars // CHARS_PER_TOKEN
+    return estimate
+
+
+def plan_summary_lines(estimates, telemetry, position_concurrency, capacity=None):
+    """Projected calls, tokens and wall time for a set of position estimates.
+
+    Args:
+        estimates (list[dict]): estimate_position() results
+        telemetry (RunTelemetry): Run planner cost estimates
+        position_concurrency (int): Positions screened at once
+        capacity (int): Optional candidates that fit in one run (RunPlanner.capacity())
+
+    Returns:
+        list[str]: Report lines
+    """
+    lines = [
+        f"{'Position':<45} {'New':>5} {'CV chars':>9} {'Step 1 in':>10} {'Step 2 in':>10}",
+    ]
+    for e in estimates:
+        sample = f"{e['avg_cv_chars']:,}" + ("" if e["sampled"] else "*")
+        lines.append(
+            f"{e['position'][:45]:<45} {e['new']:>5} {sample:>9} "
+            f"{e['step1_prompt_tokens']:>10,} {e['step2_prompt_tokens']:>10,}"
+        )
+
+    total = sum(e["new"] for e in estimates)
+    flash_in = sum(e["new"] * e["step1_prompt_tokens"] for e in estimates)
+    pro_in = sum(e["new"] * e["step2_prompt_tokens"] for e in estimates)
+    retry_factor = max(telemetry.get("llm_calls_per_candidate") / 2, 1.0)
+    calls = total * 2 * retry_factor
+
+    rate_floor = calls * 60.0 / LLM_REQUESTS_PER_MINUTE
+    throughput = total * telemetry.get("seconds_per_candidate")
+    wall = max(rate_floor, throughput) + (telemetry.get("candidate_latency") if total else 0)
+
+    lines += [
+        "",
+        f"New candidates: {total:,} across {len(estimates)} position(s)"
+        + (" (* = no CV sampled, default length used)" if any(not e["sampled"] for e in estimates) else ""),
+        f"Flash ({GEMINI_MODEL_FLASH}): {total:,} call(s), ~{flash_in:,} input + ~{total * STEP1_OUTPUT_TOKENS:,} output tokens",
+        f"Pro ({GEMINI_MODEL_PRO}): {total:,} call(s), ~{pro_in:,} input + ~{total * STEP2_OUTPUT_TOKENS:,} output tokens",
+        f"Total LLM calls incl. retries (telemetry x{retry_factor:.2f}): ~{calls:,.0f}",
+        f"Wall time: ~{wall / 60:.1f} min "
+        f"(rate limit {LLM_REQUESTS_PER_MINUTE}/min → {rate_floor / 60:.1f} min floor; "
+        f"throughput {telemetry.get('seconds_per_candidate'):.1f}s/candidate with "
+        f"{position_concurrency} position(s) at a time)",
+    ]
+    if capacity is not None:
+        runs = -(-total // capacity) if capacity else float("inf")
+        lines.append(f"One run fits ~{capacity:,} candidate(s) → {runs} run(s) to clear the backlog")
+    return lines
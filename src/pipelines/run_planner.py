@@ -0,0 +1,217 @@
+"""
+Deadline- and quota-aware planning for batch screening runs.
+
+Instead of screening a fixed number of candidates per position, auto_screen
+gets a wall-clock deadline and an optional LLM call budget. RunPlanner turns
+them into per-position candidate allowances:
+
+- Cost per candidate comes from RunTelemetry: EWMAs of run throughput
+  (wall seconds per finished candidate across concurrent positions), of
+  end-to-end latency of one candidate, and of LLM calls per candidate.
+  They are loaded from outputs/screening_telemetry.json and updated as the run
+  finishes candidates, so the plan is recomputed from actual timings.
+- When a position starts, grant() gives it a weighted share (PRIORITY_ORDER
+  weights) of the remaining capacity, after subtracting work already granted
+  to running positions. Capacity a position does not use goes to later ones.
+- should_feed() is checked before each candidate enters the pipeline. New
+  candidates stop being fed once the remaining time (or quota) only covers
+  the work already in flight plus a safety margin. In-flight candidates then
+  finish, and their Step 1/Step 2 outputs are already in the checkpoint journal.
+"""
+
+import json
+import threading
+import time
+
+from src.config.paths import SCREENING_TELEMETRY_FILE
+
+# Smoothing factor for telemetry EWMAs (weight of the newest observation)
+TELEMETRY_ALPHA = 0.3
+
+# Cold-start estimates used until a run has recorded telemetry
+DEFAULT_TELEMETRY = {
+    "seconds_per_candidate": 10.0,   # Run throughput (wall seconds per finished candidate)
+    "candidate_latency": 60.0,       # Fetch → persist for one candidate (seconds)
+    "llm_calls_per_candidate": 2.2,  # Step 1 + Step 2 (+ occasional retries)
+}
+
+# Time kept free at the end of the run (results flush, git commit, artifact upload)
+DEFAULT_SAFETY_MARGIN_SECONDS = 300
+
+
+class RunTelemetry:
+    """Per-candidate cost estimates persisted between runs."""
+
+    def __init__(self, path=SCREENING_TELEMETRY_FILE):
+        self.path = path
+        self.values = dict(DEFAULT_TELEMETRY)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            self.values.update({k: float(v) for k, v in saved.items() if k in DEFAULT_TELEMETRY and v})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, name):
+        with self._lock:
+            return self.values[name]
+
+    def observe(self, name, value, alpha=TELEMETRY_ALPHA):
+        """Blend a new observation into the EWMA for `name`."""
+        if value is None or value <= 0:
+            return
+        with self._lock:
+            self.values[name] = (1 - alpha) * self.values[name] + alpha * float(value)
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                data = {k: round(v, 3) for k, v in self.values.items()}
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            print(f"⚠ Could not save screening telemetry: {e}")
+
+
+class RunPlanner:
+    """Shares a time/quota budget between the positions of one screening run."""
+
+    def __init__(self, deadline_seconds, llm_call_budget=None, telemetry=None,
+                 safety_margin=DEFAULT_SAFETY_MARGIN_SECONDS, calls_used=None):
+        """
+        Args:
+            deadline_seconds (float): Wall-clock budget for the whole run
+            llm_call_budget (int): Optional maximum number of LLM calls
+            telemetry (RunTelemetry): Cost estimates (loaded from disk by default)
+            safety_margin (float): Seconds kept free before the deadline
+            calls_used (callable): Returns the number of LLM calls made so far
+        """
+        self.started = time.monotonic()
+        self.deadline = self.started + deadline_seconds
+        self.llm_call_budget = llm_call_budget
+        self.telemetry = telemetry or RunTelemetry()
+        self.safety_margin = safety_margin
+        self._calls_used = calls_used or (lambda: 0)
+        self._calls_at_start = self._calls_used()
+        self._weights = {}
+        self._granted = {}
+        self._finished = {}
+        self._in_flight = 0
+        self._done = 0
+        self._first_finish = None
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    # ── Budget ────────────────────────────────────────────────────────────
+    def remaining_seconds(self):
+        return self.deadline - time.monotonic() - self.safety_margin
+
+    def remaining_calls(self):
+        if self.llm_call_budget is None:
+            return None
+        return self.llm_call_budget - (self._calls_used() - self._calls_at_start)
+
+    def capacity(self):
+        """Candidates that still fit in the remaining time and quota."""
+        fits = self.remaining_seconds() / self.telemetry.get("seconds_per_candidate")
+        calls = self.remaining_calls()
+        if calls is not None:
+            fits = min(fits, calls / self.telemetry.get("llm_calls_per_candidate"))
+        return max(0, int(fits))
+
+    # ── Allocation ────────────────────────────────────────────────────────
+    def register(self, weights):
+        """Declare the positions of this run with their priority weights."""
+        with self._lock:
+            self._weights.update(weights)
+
+    def grant(self, position, wanted):
+        """Number of candidates `position` may screen now (out of `wanted`)."""
+        with self._lock:
+            outstanding = sum(
+                max(self._granted[name] - self._finished.get(name, 0), 0)
+                for name in self._granted if name != position
+            )
+            pending_weight = sum(
+                weight for name, weight in self._weights.items()
+                if name not in self._granted or name == position
+            ) or 1
+            free = max(self.capacity() - outstanding, 0)
+            share = free * self._weights.get(position, 1) / pending_weight
+            # Never strand capacity: round up, and take everything if alone
+            granted = min(wanted, int(share) + 1 if free else 0)
+            if pending_weight == self._weights.get(position, 1):
+                granted = min(wanted, free)
+            self._granted[position] = granted
+            return granted
+
+    # ── Live control ──────────────────────────────────────────────────────
+    def should_feed(self):
+        """False once a new candidate would not finish before the deadline/quota."""
+        with self._lock:
+            if self._stopped:
+                return False
+            in_flight = self._in_flight
+        latency = self.telemetry.get("candidate_latency")
+        throughput = self.telemetry.get("seconds_per_candidate")
+        # In-flight work drains at the run throughput, but the newest
+        # candidate still needs one full latency
+        needed = max(latency, (in_flight + 1) * throughput)
+        reason = None
+        if self.remaining_seconds() < needed:
+            reason = f"deadline ({self.remaining_seconds() / 60:.1f} min left)"
+        calls = self.remaining_calls()
+        if calls is not None and calls < (in_flight + 1) * self.telemetry.get("llm_calls_per_candidate"):
+            reason = f"LLM quota ({calls} call(s) left)"
+        if reason:
+            with self._lock:
+                first = not self._stopped
+                self._stopped = True
+            if first:
+                print(f"⏳ Run planner: no new candidates - {reason}")
+            return False
+        with self._lock:
+            self._in_flight += 1
+        return True
+
+    def candidate_finished(self, position, latency_seconds):
+        """Record a candidate leaving the pipeline and update the estimates."""
+        now = time.monotonic()
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+            self._done += 1
+            self._finished[position] = self._finished.get(position, 0) + 1
+            if self._first_finish is None:
+                self._first_finish = now
+            done, first_finish = self._done, self._first_finish
+        self.telemetry.observe("candidate_latency", latency_seconds)
+        # Throughput between completions (excludes the pipeline fill time);
+        # only meaningful once a few candidates have finished
+        if done >= 4:
+            self.telemetry.observe("seconds_per_candidate", (now - first_finish) / (done - 1))
+
+    def position_finished(self, position, llm_calls, candidates):
+        """Record the LLM calls a finished position used for its candidates."""
+        if candidates:
+            self.telemetry.observe("llm_calls_per_candidate", llm_calls / candidates)
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    def summary_lines(self):
+        elapsed = time.monotonic() - self.started
+        lines = [
+            f"Run planner: {self._done} candidate(s) in {elapsed / 60:.1f} min, "
+            f"{max(self.deadline - time.monotonic(), 0) / 60:.1f} min before deadline"
+            + (" (stopped early)" if self._stopped else ""),
+            f"Estimates: {self.telemetry.get('seconds_per_candidate'):.1f}s/candidate throughput, "
+            f"{self.telemetry.get('candidate_latency'):.1f}s latency, "
+            f"{self.telemetry.get('llm_calls_per_candidate'):.1f} LLM calls/candidate",
+        ]
+        calls = self.remaining_calls()
+        if calls is not None:
+            lines.append(f"LLM quota left: {calls} of {self.llm_call_budget} call(s)")
+        return lines
@@ -0,0 +1,103 @@
+"""
+Cross-position scheduler for batch screening.
+
+Screens several positions at once so one large position (e.g. Software
+Engineer) no longer delays every position queued behind it. Positions start
+in the order given (priority order) and share:
+- the global LLM budget (src/utils/rate_limiter.py), where each position is
+  billed under its own name with its priority weight
+- the resume download pool (get_resume_fetcher() is process-wide)
+
+Everything a position prints, including from its pipeline stage threads, is
+captured in a per-position buffer and written as one block when the position
+finishes. While positions run, only one-line start/finish notices appear.
+"""
+
+import contextvars
+import io
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.rate_limiter import set_rate_owner
+
+# Default number of positions screened at the same time
+DEFAULT_POSITION_CONCURRENCY = 3
+
+# Output buffer of the position running in the current context (None = console)
+_OUTPUT_BUFFER = contextvars.ContextVar("position_output", default=None)
+
+
+class _RoutedStream:
+    """sys.stdout/sys.stderr proxy that writes to the current position's buffer."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        buffer = _OUTPUT_BUFFER.get()
+        if buffer is None:
+            return self._stream.write(text)
+        return buffer.write(text)
+
+    def flush(self):
+        if _OUTPUT_BUFFER.get() is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def run_positions(tasks, run, weights=None, concurrency=DEFAULT_POSITION_CONCURRENCY):
+    """Screen positions concurrently with grouped output.
+
+    Args:
+        tasks (list[dict]): One dict per position with at least "name", in start order
+        run (callable): run(task) -> result, executed once per task
+        weights (dict): Optional {position name: LLM fair-share weight}
+        concurrency (int): Maximum number of positions running at once
+
+    Returns:
+        list: (task, result, seconds) tuples in task order; result is None
+            if run() raised (the traceback is part of that position's output)
+    """
+    weights = weights or {}
+    console_out, console_err = sys.stdout, sys.stderr
+    console_lock = threading.Lock()
+
+    def announce(message):
+        with console_lock:
+            console_out.write(message + "\n")
+            console_out.flush()
+
+    def run_one(task):
+        name = task["name"]
+        buffer = io.StringIO()
+        _OUTPUT_BUFFER.set(buffer)
+        set_rate_owner(name, weights.get(name, 1))
+        announce(f"▶️  Started: {name}")
+        started = time.perf_counter()
+        result = None
+        try:
+            result = run(task)
+        except Exception as e:
+            print(f"❌ Error screening position '{name}': {str(e)}")
+            print(f"   Stack trace: {traceback.format_exc()}")
+        seconds = time.perf_counter() - started
+        # Write this position's output as one block
+        with console_lock:
+            console_out.write(buffer.getvalue())
+            console_out.write(f"⏱️  Finished: {name} in {seconds:.1f}s\n")
+            console_out.flush()
+        return task, result, seconds
+
+    sys.stdout, sys.stderr = _RoutedStream(console_out), _RoutedStream(console_err)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, int(concurrency)), thread_name_prefix="position") as pool:
+            # Each task gets a fresh copy of this context (pool threads are reused)
+            futures = [pool.submit(contextvars.copy_context().run, run_one, task) for task in tasks]
+            return [future.result() for future in futures]
+    finally:
+        sys.stdout, sys.stderr = console_out, console_err
@@ -21,6 +21,10 @@ except ImportError:
 
 from openai import OpenAI, RateLimitError
 
+from src.services.cv_parser import PROFILE_FIELDS, is_usable, profile_for_prompt
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.run_profiler import profile_event, profile_span
+
 # Logging helper functions for dual-mode operation
 def _log_error(message):
     """Log error message - uses st.error in Streamlit, prints to stderr otherwise"""
@@ -49,7 +53,8 @@ GEMINI_MODEL_FLASH = "gemini-2.5-flash"   # Fast model for extraction & classifi
 GEMINI_MODEL_PRO = "gemini-2.5-pro"       # Deep model for evaluation & scoring
 
 # Rate limiting configuration (Gemini paid tier)
-REQUEST_DELAY = 2.0  # Delay between requests in seconds (Gemini paid tier allows higher RPM)
+REQUEST_DELAY = 2.0  # Delay before re-asking after a malformed Step 1 response (seconds)
+LLM_REQUESTS_PER_MINUTE = 60  # Global request budget shared by all threads (see src/utils/rate_limiter.py)
 MAX_RETRIES = 3  # Maximum number of retries for rate limit errors
 RETRY_DELAY = 60  # Initial retry delay for 429 errors in seconds
 
@@ -107,18 +112,21 @@ def call_api_with_retry(client, **kwargs):
         Exception: If all retries fail
     """
     last_error = None
+    limiter = get_rate_limiter()
     
     for attempt in range(MAX_RETRIES):
         try:
-            response = client.chat.completions.create(**kwargs)
-            
-            # Add delay after successful request to prevent hitting rate limit on next call
-            time.sleep(REQUEST_DELAY)
+            # Wait for a slot in the global request budget (shared by all threads/positions)
+            with profile_span("llm_wait"):
+                limiter.acquire()
+            with profile_span(f"llm_call:{kwargs.get('model', '')}"):
+                response = client.chat.completions.create(**kwargs)
             
             return response
             
         except RateLimitError as e:
             last_error = e
+            profile_event("llm_429")
             error_msg = str(e)
             
             # Extract retry delay from error message if available
@@ -130,7 +138,8 @@ def call_api_with_retry(client, **kwargs):
             # Show warning to user
             if attempt < MAX_RETRIES - 1:
                 _log_warning(f"⚠️ Rate limit reached (429). Waiting {retry_delay} seconds before retry {attempt + 1}/{MAX_RETRIES}...")
-                time.sleep(retry_delay)
+                # Hold every thread, not just this one: the quota is shared
+                limiter.pause(retry_delay)
             else:
                 _log_error(f"❌ Rate limit error after {MAX_RETRIES} attempts. Please try again later.")
         
@@ -667,17 +676,121 @@ UNIVERSITY_BONUS = [
 ]
 
 
-def extract_and_classify_cv(cv_text, csv_context, job_position, job_description):
-    """Step 1: Extract structured data from CV and classify relevance using Gemini Flash.
+def _step1_response_schema(parsed_cv):
+    """Build the JSON response template for Step 1.
     
-    Returns dict with candidate info, work experiences with relevance classification,
-    role_function_match, and industry_match.
+    Without a usable local parse this is the full profile schema. With one,
+    only the fields the local parser could not resolve are requested, and
+    pre-parsed experiences are classified by index instead of re-extracted.
     """
-    client = get_gemini_client()
+    unresolved = set(parsed_cv["unresolved"]) if parsed_cv else set(PROFILE_FIELDS)
+    lines = []
+    if "candidate_name" in unresolved:
+        lines.append('  "candidate_name": "Full Name",')
+    if "latest_job_title" in unresolved:
+        lines.append('  "latest_job_title": "Most recent job title",')
+    if "latest_company" in unresolved:
+        lines.append('  "latest_company": "Most recent company",')
+    edu_fields = [
+        f'    "{key}": "{label}"'
+        for key, label in (("degree", "S1/S2/etc"), ("university", "University name"), ("major", "Field of study"))
+        if f"education.{key}" in unresolved
+    ]
+    if edu_fields:
+        lines.append('  "education": {\n' + ",\n".join(edu_fields) + "\n  },")
+    lines.append('  "is_preferred_university": true/false,')
+    if "work_experiences" in unresolved:
+        lines.append("""  "work_experiences": [
+    {
+      "title": "Job title",
+      "company": "Company name",
+      "duration": "Duration or date range",
+      "responsibilities": "Brief summary of key tasks",
+      "relevance": "direct|partial|tangential|none",
+      "reasoning": "Why this relevance level"
+    }
+  ],""")
+    else:
+        lines.append("""  "experience_classification": [
+    {
+      "index": 0,
+      "responsibilities": "Brief summary of key tasks",
+      "relevance": "direct|partial|tangential|none",
+      "reasoning": "Why this relevance level"
+    }
+  ],""")
+    lines.append('  "total_relevant_years": 0,')
+    lines.append('  "role_function_match": "same|adjacent|different",')
+    lines.append('  "industry_match": "same|related|different"')
+    return "{\n" + "\n".join(lines) + "\n}"
+
+
+def _merge_parsed_profile(data, parsed_cv):
+    """Fill a Step 1 response with the fields resolved by the local CV parser.
+    
+    Experiences come from the local parse; the model's per-index
+    classification is attached to them.
+    """
+    profile = parsed_cv["profile"]
+    resolved = set(parsed_cv["resolved"])
+    for field in ("candidate_name", "latest_job_title", "latest_company"):
+        if field in resolved:
+            data[field] = profile[field]
+    education = data.get("education") if isinstance(data.get("education"), dict) else {}
+    for key in ("degree", "university", "major"):
+        if f"education.{key}" in resolved:
+            education[key] = profile["education"][key]
+        education.setdefault(key, "")
+    data["education"] = education
+    
+    if "work_experiences" in resolved:
+        classification = {}
+        for item in data.pop("experience_classification", None) or []:
+            if isinstance(item, dict):
+                try:
+                    classification[int(item.get("index"))] = item
+                except (TypeError, ValueError):
+                    continue
+        experiences = []
+        for i, exp in enumerate(profile["work_experiences"]):
+            cls = classification.get(i, {})
+            experiences.append({
+                "title": exp["title"],
+                "company": exp["company"],
+                "duration": exp["duration"],
+                "responsibilities": cls.get("responsibilities") or exp.get("responsibilities", ""),
+                "relevance": cls.get("relevance", "none"),
+                "reasoning": cls.get("reasoning", ""),
+            })
+        data["work_experiences"] = experiences
+    return data
+
+
+def _build_step1_prompt(cv_text, csv_context, job_position, job_description, parsed_cv=None):
+    """Build the Step 1 (extract & classify) prompt.
+    
+    Returns:
+        tuple: (prompt, parsed_cv) where parsed_cv is None if it was not usable
+    """
+    if not is_usable(parsed_cv, cv_text):
+        parsed_cv = None
     
-    cv_limited = cv_text[:5000] if len(cv_text) > 5000 else cv_text
     csv_limited = csv_context[:2000] if csv_context and len(csv_context) > 2000 else (csv_context or "")
     
+    if parsed_cv:
+        compact = parsed_cv["compact_text"]
+        cv_section = f"""=== Pre-parsed Candidate Profile (extracted locally from the CV layout — treat as correct, do not repeat) ===
+{profile_for_prompt(parsed_cv)}
+
+=== Candidate CV (compact) ===
+{compact[:5000]}"""
+        experience_rule = "- Pre-parsed work experiences are listed by index. Classify EVERY one of them in experience_classification using the same index."
+    else:
+        cv_limited = cv_text[:5000] if len(cv_text) > 5000 else cv_text
+        cv_section = f"""=== Candidate CV ===
+{cv_limited}"""
+        experience_rule = "- Extract ALL work experiences, not just the latest."
+    
     uni_list = ", ".join(UNIVERSITY_TOP_TIER + UNIVERSITY_STRONG + UNIVERSITY_BONUS)
     
     prompt = f"""You are a data extraction and classification assistant for HR screening.
@@ -685,7 +798,7 @@ def extract_and_classify_cv(cv_text, csv_context, job_position, job_description)
 Extract structured information from the candidate's CV and classify how relevant their experience is to the target job.
 
 RULES:
-- Extract ALL work experiences, not just the latest.
+{experience_rule}
 - For each experience, classify relevance to the target job:
   - "direct": Same role function AND related industry/tasks
   - "partial": Similar function OR transferable skills with significant overlap
@@ -708,30 +821,7 @@ CRITICAL — Avoid false positives:
 Preferred universities (QS Asia rankings): {uni_list}
 
 Return ONLY a valid JSON object:
-{{
-  "candidate_name": "Full Name",
-  "latest_job_title": "Most recent job title",
-  "latest_company": "Most recent company",
-  "education": {{
-    "degree": "S1/S2/etc",
-    "university": "University name",
-    "major": "Field of study"
-  }},
-  "is_preferred_university": true/false,
-  "work_experiences": [
-    {{
-      "title": "Job title",
-      "company": "Company name",
-      "duration": "Duration or date range",
-      "responsibilities": "Brief summary of key tasks",
-      "relevance": "direct|partial|tangential|none",
-      "reasoning": "Why this relevance level"
-    }}
-  ],
-  "total_relevant_years": 0,
-  "role_function_match": "same|adjacent|different",
-  "industry_match": "same|related|different"
-}}
+{_step1_response_schema(parsed_cv)}
 
 === Target Job Position ===
 {job_position}
@@ -739,14 +829,33 @@ Return ONLY a valid JSON object:
 === Job Description ===
 {job_description}
 
-=== Candidate CV ===
-{cv_limited}
+{cv_section}
 
 === Additional Candidate Data (from application form) ===
 {csv_limited}
 
 Return JSON only:"""
+    return prompt, parsed_cv
 
+
+def extract_and_classify_cv(cv_text, csv_context, job_position, job_description, parsed_cv=None):
+    """Step 1: Extract structured data from CV and classify relevance using Gemini Flash.
+    
+    Args:
+        cv_text: Cleaned CV text
+        csv_context: Candidate context built from the application form
+        job_position: Target job position name
+        job_description: Target job description
+        parsed_cv: (Optional) Result of cv_parser.parse_cv_layout(). When usable,
+            the prompt carries the locally resolved fields and a compact CV
+            rendering instead of the raw text, and asks only for what is missing.
+    
+    Returns dict with candidate info, work experiences with relevance classification,
+    role_function_match, and industry_match.
+    """
+    client = get_gemini_client()
+    prompt, parsed_cv = _build_step1_prompt(cv_text, csv_context, job_position, job_description, parsed_cv)
+    
     # Retry Step 1 up to 3 attempts before giving up
     last_error = None
     max_tokens_step1 = 8192
@@ -775,6 +884,8 @@ Return JSON only:"""
             data = _try_parse_json(output)
             
             if isinstance(data, dict):
+                if parsed_cv:
+                    data = _merge_parsed_profile(data, parsed_cv)
                 # Ensure required fields exist
                 data.setdefault("candidate_name", "")
                 data.setdefault("latest_job_title", "")
@@ -806,16 +917,8 @@ Return JSON only:"""
     return None
 
 
-def evaluate_and_score(classified_data, job_position, job_description):
-    """Step 2: Evaluate and score the candidate using structured data via Gemini Pro.
-    
-    Takes the structured classification from Step 1 (NOT raw CV text) and produces
-    a score with evaluation summary.
-    
-    Returns tuple: (score, summary, strengths, weaknesses, gaps)
-    """
-    client = get_gemini_client()
-    
+def _build_step2_prompt(classified_data, job_position, job_description):
+    """Build the Step 2 (evaluate & score) prompt from Step 1 output."""
     # Format the classified data as readable text for the evaluator
     edu = classified_data.get("education", {})
     experiences_text = ""
@@ -871,7 +974,20 @@ Respond with a valid JSON object only:
 }}
 
 ALL content must be in Bahasa Indonesia. Include at least 1 item per field."""
+    return prompt
+
 
+def evaluate_and_score(classified_data, job_position, job_description):
+    """Step 2: Evaluate and score the candidate using structured data via Gemini Pro.
+    
+    Takes the structured classification from Step 1 (NOT raw CV text) and produces
+    a score with evaluation summary.
+    
+    Returns tuple: (score, summary, strengths, weaknesses, gaps)
+    """
+    client = get_gemini_client()
+    prompt = _build_step2_prompt(classified_data, job_position, job_description)
+    
     try:
         response = call_api_with_retry(
             client,
@@ -928,24 +1044,11 @@ def _apply_score_ceiling(score, classified_data):
     return score
 
 
-def score_candidate_pipeline(cv_text, csv_context, job_position, job_description):
-    """Main pipeline: Extract & Classify (Flash) → Evaluate & Score (Pro) → Ceiling enforcement.
+def score_classified_candidate(classified_data, job_position, job_description):
+    """Steps 2 and 3: Evaluate & Score (Pro) a Step 1 result, then enforce the score ceiling.
     
     Returns tuple: (score, summary, strengths, weaknesses, gaps, candidate_info)
-    where candidate_info is a dict with latest_job_title, latest_company, education, university, major.
     """
-    # Step 1: Extract and classify with Gemini Flash
-    classified_data = extract_and_classify_cv(cv_text, csv_context, job_position, job_description)
-    
-    if classified_data is None:
-        # Fallback to legacy scoring
-        _log_info("ℹ️ Pipeline Step 1 failed, falling back to legacy scoring...")
-        score, summary, strengths, weaknesses, gaps = score_with_openrouter(
-            cv_text, job_position, job_description
-        )
-        candidate_info = extract_candidate_info_from_cv(cv_text)
-        return score, summary, strengths, weaknesses, gaps, candidate_info
-    
     # Step 2: Evaluate and score with Gemini Pro
     score, summary, strengths, weaknesses, gaps = evaluate_and_score(
         classified_data, job_position, job_description
@@ -953,7 +1056,8 @@ def score_candidate_pipeline(cv_text, csv_context, job_position, job_description
     
     # Step 3: Apply Python-level score ceiling
     original_score = score
-    score = _apply_score_ceiling(score, classified_data)
+    with profile_span("ceiling"):
+        score = _apply_score_ceiling(score, classified_data)
     
     if score != original_score:
         role_match = classified_data.get("role_function_match", "")
@@ -970,3 +1074,40 @@ def score_candidate_pipeline(cv_text, csv_context, job_position, job_description
     }
     
     return score, summary, strengths, weaknesses, gaps, candidate_info
+
+
+def score_unclassified_candidate(cv_text, job_position, job_description):
+    """Legacy scoring used when Step 1 fails.
+    
+    Returns tuple: (score, summary, strengths, weaknesses, gaps, candidate_info)
+    """
+    _log_info("ℹ️ Pipeline Step 1 failed, falling back to legacy scoring...")
+    score, summary, strengths, weaknesses, gaps = score_with_openrouter(
+        cv_text, job_position, job_description
+    )
+    candidate_info = extract_candidate_info_from_cv(cv_text)
+    return score, summary, strengths, weaknesses, gaps, candidate_info
+
+
+def score_candidate_pipeline(cv_text, csv_context, job_position, job_description, parsed_cv=None):
+    """Main pipeline: Extract & Classify (Flash) → Evaluate & Score (Pro) → Ceiling enforcement.
+    
+    parsed_cv is the optional local layout parse (see src/services/cv_parser.py)
+    used to shrink the Step 1 prompt.
+    
+    The steps are also exposed individually (extract_and_classify_cv,
+    score_classified_candidate, score_unclassified_candidate) so that
+    auto_screen can run them as separate pipeline stages.
+    
+    Returns tuple: (score, summary, strengths, weaknesses, gaps, candidate_info)
+    where candidate_info is a dict with latest_job_title, latest_company, education, university, major.
+    """
+    # Step 1: Extract and classify with Gemini Flash
+    classified_data = extract_and_classify_cv(cv_text, csv_context, job_position, job_description, parsed_cv=parsed_cv)
+    
+    if classified_data is None:
+        # Fallback to legacy scoring
+        return score_unclassified_candidate(cv_text, job_position, job_description)
+    
+    # Steps 2 + 3: Evaluate and score with Gemini Pro, then ceiling
+    return score_classified_candidate(classified_data, job_position, job_description)
@@ -0,0 +1,150 @@
+"""
+Staged producer/consumer runner for the screening pipeline.
+
+Each Stage runs its own pool of worker threads and is connected to the next
+stage by a bounded queue. A slow stage (e.g. Step 2 on Gemini Pro) fills its
+input queue and blocks the stages before it (backpressure), while faster
+stages keep working on other candidates. A position therefore finishes in
+roughly the time of its slowest stage instead of the sum of all stages.
+
+Jobs are plain dicts. If a stage function raises, the exception is stored in
+job["error"] and later stages pass the job through untouched, except stages
+created with handles_errors=True (typically the final persistence sink).
+
+Worker threads run in a copy of the caller's contextvars context, so
+per-position state set by the caller (LLM rate owner, output buffer) applies
+to every stage.
+"""
+
+import contextvars
+import queue
+import threading
+import time
+
+# Marker telling a worker that its input queue is finished
+_DONE = object()
+
+# Default bound for queues between stages
+DEFAULT_QUEUE_SIZE = 8
+
+
+class Stage:
+    """One pipeline stage: a function applied to each job by N worker threads."""
+
+    def __init__(self, name, func, workers=1, queue_size=DEFAULT_QUEUE_SIZE, handles_errors=False):
+        """
+        Args:
+            name (str): Stage name used in timing summaries
+            func (callable): func(job) -> job (may mutate and return the same dict)
+            workers (int): Number of concurrent worker threads
+            queue_size (int): Capacity of this stage's input queue
+            handles_errors (bool): Also call func for jobs that failed earlier
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.queue_size = max(1, int(queue_size))
+        self.handles_errors = handles_errors
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _record(self, elapsed):
+        with self._lock:
+            self.processed += 1
+            self.busy_seconds += elapsed
+
+
+def run_stages(jobs, stages, stop_event=None):
+    """Run jobs through the stages concurrently.
+
+    Args:
+        jobs (iterable): Job dicts fed into the first stage
+        stages (list[Stage]): Stages in order
+        stop_event (threading.Event): Optional; when set, remaining jobs are dropped
+
+    Returns:
+        list: Jobs that left the last stage, in completion order
+    """
+    stop_event = stop_event or threading.Event()
+    queues = [queue.Queue(maxsize=stage.queue_size) for stage in stages]
+    remaining = [stage.workers for stage in stages]
+    remaining_lock = threading.Lock()
+    completed = []
+
+    def worker(position):
+        stage = stages[position]
+        inbox = queues[position]
+        outbox = queues[position + 1] if position + 1 < len(stages) else None
+        while True:
+            job = inbox.get()
+            if job is _DONE:
+                with remaining_lock:
+                    remaining[position] -= 1
+                    last_worker = remaining[position] == 0
+                # Last worker out closes the next stage's queue
+                if last_worker and outbox is not None:
+                    for _ in range(stages[position + 1].workers):
+                        outbox.put(_DONE)
+                return
+            if stop_event.is_set():
+                continue
+
+            if job.get("error") is None or stage.handles_errors:
+                started = time.perf_counter()
+                try:
+                    job = stage.func(job)
+                except Exception as e:
+                    job["error"] = e
+                    job.setdefault("error_stage", stage.name)
+                stage._record(time.perf_counter() - started)
+
+            if outbox is not None:
+                outbox.put(job)  # Blocks when the next stage is behind
+            else:
+                completed.append(job)
+
+    threads = []
+    for position, stage in enumerate(stages):
+        for n in range(stage.workers):
+            thread = threading.Thread(
+                target=contextvars.copy_context().run, args=(worker, position),
+                name=f"stage-{stage.name}-{n}", daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+
+    def feed():
+        for job in jobs:
+            if stop_event.is_set():
+                break
+            queues[0].put(job)
+        for _ in range(stages[0].workers):
+            queues[0].put(_DONE)
+
+    feeder = threading.Thread(target=contextvars.copy_context().run, args=(feed,), name="stage-feeder", daemon=True)
+    feeder.start()
+
+    try:
+        # Join with a timeout so KeyboardInterrupt reaches the main thread
+        for thread in [feeder] + threads:
+            while thread.is_alive():
+                thread.join(0.5)
+    except KeyboardInterrupt:
+        stop_event.set()
+        raise
+
+    return completed
+
+
+def stage_summary_lines(stages, wall_seconds):
+    """Per-stage timing lines, e.g. for a position summary."""
+    lines = []
+    for stage in stages:
+        lines.append(
+            f"{stage.name}: {stage.processed} job(s), {stage.busy_seconds:.1f}s busy "
+            f"across {stage.workers} worker(s)"
+        )
+    total_busy = sum(stage.busy_seconds for stage in stages)
+    lines.append(f"Pipeline wall time: {wall_seconds:.1f}s (sequential would be ~{total_busy:.1f}s)")
+    return lines
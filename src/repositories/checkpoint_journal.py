@@ -0,0 +1,162 @@
+"""
+Checkpoint Journal
+Write-ahead journal of per-candidate screening progress for auto_screen.
+
+Step 1 (Flash) and Step 2 (Pro) are the paid parts of screening. If a run dies
+after Step 1 but before its result reaches GitHub, the next run would pay for
+them again. CheckpointJournal appends each finished stage to a JSONL file in
+outputs/checkpoints/ (one file per position), fsync'd before the pipeline
+moves on:
+
+    {"key": ..., "stage": "step1", "cv_sha1": ..., "data": {...}}
+    {"key": ..., "stage": "step2", "cv_sha1": ..., "data": [score, summary, ...]}
+    {"key": ..., "stage": "persisted"}
+
+On the next run the candidate's CV is downloaded and extracted again, and if
+its text hash matches, screening resumes after the furthest journaled stage.
+close() compacts the file down to candidates that are not persisted yet. The
+Actions workflow uploads outputs/checkpoints/ as an artifact and the next run
+downloads it.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+
+from src.config.paths import CHECKPOINT_DIR
+from src.repositories.github_utils import get_results_filename
+
+# Journaled stages, in pipeline order
+STAGE_STEP1 = "step1"
+STAGE_STEP2 = "step2"
+STAGE_PERSISTED = "persisted"
+
+
+def candidate_key(email, name, phone):
+    """Journal key for a candidate: email (lower-case), else "name_phone"."""
+    email = str(email or "").strip().lower()
+    if email:
+        return email
+    return f"{str(name or '').strip().lower()}_{str(phone or '').strip()}"
+
+
+def cv_hash(cv_text):
+    """SHA-1 of the extracted CV text (checkpoints are reused only for the same CV)."""
+    return hashlib.sha1((cv_text or "").encode("utf-8")).hexdigest()
+
+
+class CheckpointJournal:
+    """Per-position JSONL journal of completed screening stages."""
+
+    def __init__(self, job_position, journal_dir=CHECKPOINT_DIR):
+        """
+        Args:
+            job_position (str): Position being screened
+            journal_dir (Path): Directory holding the journal files
+        """
+        results_file = os.path.basename(get_results_filename(job_position))
+        self.path = journal_dir / (results_file.rsplit(".", 1)[0] + ".jsonl")
+        self.reused = {STAGE_STEP1: 0, STAGE_STEP2: 0}
+        self._state = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _apply(self, record):
+        key, stage = record.get("key"), record.get("stage")
+        if not key or not stage:
+            return
+        if stage == STAGE_PERSISTED:
+            self._state.setdefault(key, {})["persisted"] = True
+            return
+        state = self._state.get(key)
+        # A different CV invalidates everything journaled for the candidate
+        if state is None or state.get("cv_sha1") != record.get("cv_sha1"):
+            state = {"cv_sha1": record.get("cv_sha1")}
+            self._state[key] = state
+        state[stage] = record.get("data")
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        count = 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                        count += 1
+                    except ValueError:
+                        # Torn last line from a crash mid-write
+                        continue
+        except OSError as e:
+            print(f"⚠ Could not read checkpoint journal {self.path}: {e}")
+            return
+        pending = sum(1 for state in self._state.values() if not state.get("persisted"))
+        if pending:
+            print(f"   ↩️  Checkpoint journal: {pending} candidate(s) with saved progress ({count} record(s))")
+
+    def _append(self, record):
+        record["at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._apply(record)
+
+    def get(self, key, stage, cv_sha1):
+        """Journaled output of a stage for this CV, or None.
+
+        Args:
+            key (str): candidate_key() of the candidate
+            stage (str): STAGE_STEP1 or STAGE_STEP2
+            cv_sha1 (str): cv_hash() of the freshly extracted CV text
+        """
+        with self._lock:
+            state = self._state.get(key)
+            if not state or state.get("cv_sha1") != cv_sha1:
+                return None
+            data = state.get(stage)
+        if data is not None:
+            self.reused[stage] += 1
+        return data
+
+    def record(self, key, stage, cv_sha1, data):
+        """Journal a completed stage output (must be JSON-serializable)."""
+        self._append({"key": key, "stage": stage, "cv_sha1": cv_sha1, "data": data})
+
+    def mark_persisted(self, key):
+        """Journal that the candidate's result row has been saved to GitHub."""
+        self._append({"key": key, "stage": STAGE_PERSISTED})
+
+    def close(self):
+        """Compact the journal to candidates whose result is not saved yet."""
+        with self._lock:
+            pending = {key: state for key, state in self._state.items() if not state.get("persisted")}
+            if not pending:
+                try:
+                    self.path.unlink()
+                except FileNotFoundError:
+                    pass
+                return
+            tmp_path = self.path.with_suffix(".jsonl.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for key, state in pending.items():
+                    for stage in (STAGE_STEP1, STAGE_STEP2):
+                        if state.get(stage) is not None:
+                            f.write(json.dumps({
+                                "key": key, "stage": stage,
+                                "cv_sha1": state.get("cv_sha1"), "data": state[stage],
+                            }, ensure_ascii=False, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+    def summary_line(self):
+        """One-line reuse summary for the position summary."""
+        return (f"Checkpoints reused: {self.reused[STAGE_STEP1]} Step 1, "
+                f"{self.reused[STAGE_STEP2]} Step 2 (journal: {self.path.name})")
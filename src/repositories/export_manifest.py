@@ -0,0 +1,152 @@
+"""
+Export Manifest
+Per-position row hashes of Kalibrr exports, for delta detection in auto_screen.
+
+Each run reloads the full export and used to find new candidates by comparing
+every row with the position's results CSV, which also had to be downloaded.
+Candidates whose resume or profile changed after screening went unnoticed.
+
+ExportManifest keeps, in data/manifests/manifest_<position>.json, a stable hash
+of every candidate already screened (or found in the results file), keyed the
+same way as the checkpoint journal (email, else "name_phone"):
+
+    {"rows": {key: row_hash}, "changed": {key: {"hash": ..., "detected": ...}}}
+
+The hash covers the canonical profile fields and the resume URL path (the
+query string holds short-lived download tokens). delta() classifies the whole
+export in one vectorized pass:
+- inserted: key not in the manifest. Checked against the results file, then
+  screened if new.
+- changed: key known, hash differs. Queued in "changed" for optional
+  re-extraction; the results row is kept.
+- unchanged: skipped without loading the results file.
+Keys in the manifest that are missing from the export are reported as removed.
+"""
+
+import os
+import json
+from datetime import datetime
+
+import pandas as pd
+
+from src.config.paths import MANIFEST_DIR
+from src.repositories.github_utils import get_results_filename
+
+# Canonical fields covered by the row hash (plus the resume URL path)
+MANIFEST_FIELDS = [
+    "Candidate Name",
+    "Candidate Email",
+    "Phone",
+    "Latest Job Title",
+    "Latest Company",
+    "Education",
+    "University",
+    "Major",
+    "Date Applied",
+]
+
+# Delta kinds returned by ExportManifest.delta()
+DELTA_INSERTED = "inserted"
+DELTA_CHANGED = "changed"
+DELTA_UNCHANGED = "unchanged"
+
+
+def export_row_keys(candidates, fallback_name="Unknown"):
+    """Vectorized checkpoint_journal.candidate_key() for a canonical frame."""
+    email = candidates["Candidate Email"].str.strip().str.lower()
+    name = candidates["Candidate Name"].where(candidates["Candidate Name"] != "", fallback_name)
+    name_phone = name.str.strip().str.lower() + "_" + candidates["Phone"].str.strip()
+    return email.where(email != "", name_phone)
+
+
+def resume_path(links):
+    """Resume URLs without scheme, host, query string or fragment."""
+    return (links.str.strip()
+            .str.replace(r"[?#].*$", "", regex=True)
+            .str.replace(r"^[A-Za-z][A-Za-z0-9+.-]*://[^/]*", "", regex=True))
+
+
+def export_row_hashes(candidates):
+    """Stable 64-bit hex hash per row over MANIFEST_FIELDS and the resume path."""
+    frame = candidates[MANIFEST_FIELDS].copy()
+    frame["Resume Path"] = resume_path(candidates["Resume Link"])
+    hashes = pd.util.hash_pandas_object(frame.astype(str), index=False)
+    return hashes.map("{:016x}".format)
+
+
+class ExportManifest:
+    """Row-hash manifest of one position's Kalibrr export."""
+
+    def __init__(self, job_position, manifest_dir=MANIFEST_DIR):
+        """
+        Args:
+            job_position (str): Position the export belongs to
+            manifest_dir (Path): Directory holding the manifest files
+        """
+        results_file = os.path.basename(get_results_filename(job_position))
+        stem = results_file.rsplit(".", 1)[0].replace("results_", "manifest_", 1)
+        self.path = manifest_dir / f"{stem}.json"
+        self.rows = {}
+        self.changed = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            self.rows = dict(saved.get("rows", {}))
+            self.changed = dict(saved.get("changed", {}))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not read export manifest {self.path} (treating all rows as inserted): {e}")
+
+    def delta(self, candidates):
+        """Classify export rows against the manifest.
+
+        Args:
+            candidates (DataFrame): Canonical frame from to_canonical()
+
+        Returns:
+            tuple: (kind, keys, hashes, removed) where kind is a Series of
+                DELTA_* values aligned with candidates, keys/hashes are the
+                row keys and hashes, and removed lists manifest keys that are
+                no longer in the export
+        """
+        keys = export_row_keys(candidates)
+        hashes = export_row_hashes(candidates)
+        previous = keys.map(self.rows)
+        kind = pd.Series(DELTA_UNCHANGED, index=candidates.index, dtype=object)
+        kind[previous.isna()] = DELTA_INSERTED
+        kind[previous.notna() & (previous != hashes)] = DELTA_CHANGED
+        removed = sorted(set(self.rows) - set(keys))
+        return kind, keys, hashes, removed
+
+    def remember(self, keys, hashes):
+        """Record rows as screened (or present in the results file)."""
+        for key, row_hash in zip(keys, hashes):
+            if key and row_hash:
+                self.rows[key] = row_hash
+                self.changed.pop(key, None)
+
+    def queue_changed(self, keys, hashes):
+        """Queue changed rows for optional re-extraction (the stored hash is kept)."""
+        detected = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for key, row_hash in zip(keys, hashes):
+            queued = self.changed.get(key)
+            if queued is None or queued.get("hash") != row_hash:
+                self.changed[key] = {"hash": row_hash, "detected": detected}
+
+    def forget(self, keys):
+        """Drop candidates that left the export (they count as inserted if they return)."""
+        for key in keys:
+            self.rows.pop(key, None)
+            self.changed.pop(key, None)
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"rows": dict(sorted(self.rows.items())), "changed": dict(sorted(self.changed.items()))},
+                          f, indent=1, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠ Could not save export manifest: {e}")
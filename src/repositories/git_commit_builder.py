@@ -0,0 +1,270 @@
+"""
+Git Commit Builder
+Commit changes to many files at once through the GitHub Git Data API.
+
+save_results_to_github(), update_results_in_github(),
+save_job_positions_to_github() and the usage log each do a GET (for the
+file SHA) and a PUT on the Contents API. Every call is a separate commit and
+costs at least two round trips. A run that touches 20 position files, plus a
+usage-log update per candidate, makes hundreds of calls.
+
+GitCommitBuilder collects changes and commits them together:
+
+    builder = GitCommitBuilder("🤖 Automated CV screening results")
+    save_results_to_github(rows, path=..., builder=builder)     # staged merge
+    builder.put("logs/api_usage_log.json", text)                # staged replace
+    builder.commit()
+
+commit() reads the branch head (ref, commit and, for merges, the tree), reads
+only the merged files whose blob changed since this builder last wrote them,
+then creates one tree (file contents are sent inline, so no separate blob
+calls) and one commit, and moves the ref once. If the ref update loses the
+race (another commit landed), it rebases: merges are re-applied onto the new
+head and the commit is rebuilt. Typically 5-6 API calls per commit however
+many files it touches, plus one blob upload per results CSV for its Parquet
+sidecar (see results_sidecar; skipped without pyarrow).
+"""
+
+import base64
+import threading
+import time
+
+import requests
+
+from src.repositories.github_utils import _get_config, _log_error, _log_warning
+from src.repositories.results_sidecar import build_sidecar, git_blob_sha, sidecar_path
+from src.utils.github_client import get_github_client, github_operation
+from src.utils.run_profiler import profile_event, profile_span
+
+# Attempts to move the branch ref before giving up (each retry rebases)
+COMMIT_MAX_RETRIES = 4
+
+# Regular file mode in git trees
+FILE_MODE = "100644"
+
+
+class GitCommitBuilder:
+    """Stages file changes and commits them as a single commit."""
+
+    def __init__(self, message, repo=None, branch=None, token=None, max_retries=COMMIT_MAX_RETRIES):
+        """
+        Args:
+            message (str): Commit message
+            repo (str): "owner/name" (defaults to GITHUB_REPO)
+            branch (str): Branch to commit to (defaults to GITHUB_BRANCH)
+            token (str): GitHub token (defaults to GITHUB_TOKEN)
+            max_retries (int): Ref update attempts (each retry rebases)
+        """
+        self.message = message
+        self.repo = repo or _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
+        self.branch = branch or _get_config("GITHUB_BRANCH", "main")
+        self.token = token or _get_config("GITHUB_TOKEN")
+        self.max_retries = max_retries
+        self.api_calls = 0
+        self.commits = 0
+        self.last_commit_sha = None
+        self._last_commit_at = time.monotonic()
+        self._changes = {}     # path -> ("put", text) | ("merge", [merge_fn, ...]) | ("delete", None)
+        self._callbacks = []   # called after the staged changes are committed
+        self._known = {}       # path -> (blob sha, text) last written or read by this builder
+        self._lock = threading.Lock()         # guards staging
+        self._commit_lock = threading.Lock()  # one commit at a time
+
+    # ── Staging ───────────────────────────────────────────────────────────
+    def put(self, path, content, on_commit=None):
+        """Replace a file's content (str)."""
+        with self._lock:
+            self._changes[path] = ("put", content)
+            if on_commit is not None:
+                self._callbacks.append(on_commit)
+
+    def merge(self, path, merge_fn, on_commit=None):
+        """Stage merge_fn(current_text or None) -> new_text for a file.
+
+        Merges are applied in staging order on top of the branch head (or of
+        a put() staged for the same path), and re-applied on rebase.
+        """
+        with self._lock:
+            kind, value = self._changes.get(path, ("merge", []))
+            if kind == "merge":
+                self._changes[path] = ("merge", value + [merge_fn])
+            else:
+                base = value
+                self._changes[path] = ("put", merge_fn(base))
+            if on_commit is not None:
+                self._callbacks.append(on_commit)
+
+    def delete(self, path, on_commit=None):
+        """Remove a file."""
+        with self._lock:
+            self._changes[path] = ("delete", None)
+            if on_commit is not None:
+                self._callbacks.append(on_commit)
+
+    def commit_if_due(self, interval):
+        """Commit if the last commit (or the builder's creation) is `interval` seconds old."""
+        if self.pending and time.monotonic() - self._last_commit_at >= interval:
+            return self.commit()
+        return True
+
+    @property
+    def pending(self):
+        """Number of paths staged for the next commit."""
+        return len(self._changes)
+
+    # ── API ───────────────────────────────────────────────────────────────
+    def _request(self, method, url, **kwargs):
+        self.api_calls += 1
+        headers = {
+            "Authorization": f"token {self.token}",
+            "Accept": kwargs.pop("accept", "application/vnd.github+json"),
+        }
+        return get_github_client().request(method, f"/repos/{self.repo}{url}", headers=headers, **kwargs)
+
+    def _head(self):
+        """(commit sha, tree sha) of the branch head."""
+        r = self._request("GET", f"/git/ref/heads/{self.branch}")
+        r.raise_for_status()
+        commit_sha = r.json()["object"]["sha"]
+        r = self._request("GET", f"/git/commits/{commit_sha}")
+        r.raise_for_status()
+        return commit_sha, r.json()["tree"]["sha"]
+
+    def _blob_shas(self, tree_sha, paths):
+        """Current blob sha of each path in the tree (None if absent)."""
+        r = self._request("GET", f"/git/trees/{tree_sha}", params={"recursive": "1"})
+        r.raise_for_status()
+        blobs = {entry["path"]: entry["sha"] for entry in r.json().get("tree", []) if entry.get("type") == "blob"}
+        return {path: blobs.get(path) for path in paths}
+
+    def _read(self, path, blob_sha):
+        """Text of a blob, from this builder's cache when it wrote/read it last."""
+        if blob_sha is None:
+            return None
+        known = self._known.get(path)
+        if known and known[0] == blob_sha:
+            return known[1]
+        r = self._request("GET", f"/git/blobs/{blob_sha}")
+        r.raise_for_status()
+        text = base64.b64decode(r.json()["content"]).decode("utf-8")
+        self._known[path] = (blob_sha, text)
+        return text
+
+    def _tree_entries(self, changes, tree_sha):
+        """Tree entries for the staged changes applied on top of tree_sha."""
+        merged_paths = [path for path, (kind, _) in changes.items() if kind == "merge"]
+        current = self._blob_shas(tree_sha, merged_paths) if merged_paths else {}
+        entries, written = [], {}
+        for path, (kind, value) in changes.items():
+            if kind == "delete":
+                entries.append({"path": path, "mode": FILE_MODE, "type": "blob", "sha": None})
+                continue
+            if kind == "merge":
+                text = self._read(path, current[path])
+                for merge_fn in value:
+                    text = merge_fn(text)
+            else:
+                text = value
+            entries.append({"path": path, "mode": FILE_MODE, "type": "blob", "content": text})
+            written[path] = (git_blob_sha(text), text)
+            sidecar = self._sidecar_entry(path, text)
+            if sidecar is not None:
+                entries.append(sidecar)
+        return entries, written
+
+    def _sidecar_entry(self, path, text):
+        """Tree entry for the Parquet sidecar of a results CSV (binary, so uploaded as a blob)."""
+        target = sidecar_path(path)
+        data = build_sidecar(text) if target else None
+        if data is None:
+            return None
+        r = self._request("POST", "/git/blobs", json={
+            "content": base64.b64encode(data).decode("ascii"), "encoding": "base64",
+        })
+        r.raise_for_status()
+        return {"path": target, "mode": FILE_MODE, "type": "blob", "sha": r.json()["sha"]}
+
+    def _snapshot(self):
+        with self._lock:
+            changes = {
+                path: (kind, list(value) if kind == "merge" else value)
+                for path, (kind, value) in self._changes.items()
+            }
+            return changes, list(self._callbacks)
+
+    def _drop_committed(self, changes, callbacks):
+        """Unstage what was committed, keeping changes staged during the commit."""
+        with self._lock:
+            for path, (kind, value) in changes.items():
+                current = self._changes.get(path)
+                if current is None:
+                    continue
+                if kind == "merge" and current[0] == "merge":
+                    remaining = current[1][len(value):]
+                    if remaining:
+                        self._changes[path] = ("merge", remaining)
+                    else:
+                        del self._changes[path]
+                elif current[0] == kind and current[1] is value:
+                    del self._changes[path]
+            self._callbacks = self._callbacks[len(callbacks):]
+
+    @github_operation("batch_commit")
+    def commit(self, message=None):
+        """Commit everything staged so far as one commit.
+
+        Staging stays possible while a commit is in flight; those changes go
+        into the next commit.
+
+        Returns:
+            bool: True if there was nothing to commit or the commit landed on
+                the branch. On failure the changes stay staged for a later call.
+        """
+        with self._commit_lock:
+            changes, callbacks = self._snapshot()
+            if not changes:
+                return True
+            if not self.token:
+                _log_warning("⚠️ GitCommitBuilder: no GITHUB_TOKEN, changes not committed")
+                return False
+
+            with profile_span("github_commit"):
+                for attempt in range(self.max_retries):
+                    try:
+                        head_sha, tree_sha = self._head()
+                        entries, written = self._tree_entries(changes, tree_sha)
+                        r = self._request("POST", "/git/trees", json={"base_tree": tree_sha, "tree": entries})
+                        r.raise_for_status()
+                        r = self._request("POST", "/git/commits", json={
+                            "message": message or self.message, "tree": r.json()["sha"], "parents": [head_sha],
+                        })
+                        r.raise_for_status()
+                        commit_sha = r.json()["sha"]
+                        r = self._request("PATCH", f"/git/refs/heads/{self.branch}",
+                                          json={"sha": commit_sha, "force": False})
+                        if r.status_code == 200:
+                            break
+                        if r.status_code in (409, 422):
+                            # Branch moved since we read it: rebase onto the new head
+                            profile_event("github_ref_conflict")
+                            time.sleep(0.5 * (2 ** attempt))
+                            continue
+                        r.raise_for_status()
+                    except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                        if attempt == self.max_retries - 1:
+                            _log_error(f"❌ Batch commit failed ({len(changes)} file(s)): {e}")
+                            return False
+                        time.sleep(0.5 * (2 ** attempt))
+                else:
+                    _log_error(f"❌ Batch commit failed after {self.max_retries} attempts: branch kept moving")
+                    return False
+
+            self.last_commit_sha = commit_sha
+            self._last_commit_at = time.monotonic()
+            self.commits += 1
+            self._known.update(written)
+            self._drop_committed(changes, callbacks)
+
+        for callback in callbacks:
+            callback()
+        return True
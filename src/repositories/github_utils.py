@@ -1,4 +1,6 @@
 import base64
+import codecs
+import contextvars
 import json
 import os
 import sys
@@ -6,8 +8,20 @@ import requests
 import pandas as pd
 from io import StringIO
 import time
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from src.repositories.results_sidecar import (
+    HAS_PYARROW,
+    read_local_sidecar,
+    read_sidecar,
+    sidecar_path,
+    write_local_sidecar,
+)
+from src.utils.github_client import GITHUB_TIMEOUT, get_github_client, github_operation
+from src.utils.http_cache import SOURCE_STALE, cached_get
+from src.utils.run_profiler import profile_event, profile_span
+
 # Try to import streamlit, but it's optional (for GitHub Actions compatibility)
 try:
     import streamlit as st
@@ -94,6 +108,10 @@ RESULTS_COLUMNS = [
     "Date Applied", "Date Processed"
 ]
 
+# Long free-text columns; list views and duplicate checks load results without them
+RESULTS_LONG_TEXT_COLUMNS = ["AI Summary", "Strengths", "Weaknesses", "Gaps"]
+RESULTS_LIST_COLUMNS = [col for col in RESULTS_COLUMNS if col not in RESULTS_LONG_TEXT_COLUMNS]
+
 
 def parse_kalibrr_date(raw_date):
     """Parse Kalibrr date format (mm/dd/yy hr:mn) to YYYY-MM-DD HH:MM.
@@ -135,16 +153,22 @@ def parse_kalibrr_date(raw_date):
     except ValueError:
         return raw_date  # Return as-is if unparseable
 
-# Network timeout for GitHub API requests (in seconds)
-GITHUB_TIMEOUT = 30
-
 # GitHub Contents API size limit for inline content (bytes)
-# Files larger than this should be downloaded via raw URL
+# Files larger than this are read by blob SHA (see _read_github_blob)
 GITHUB_CONTENTS_API_SIZE_LIMIT = 1_000_000  # 1MB
 
+# Chunk size for streaming blob downloads (bytes)
+GITHUB_BLOB_CHUNK_SIZE = 64 * 1024
+
 # Maximum number of parallel downloads for fetching CSV files
 MAX_PARALLEL_DOWNLOADS = 8
 
+# load_all_results_from_github: parsed results files by name -> (blob sha, DataFrame),
+# and the last merged frame with the blob shas it was built from
+_RESULT_FILES_CACHE = {}
+_RESULTS_MERGED = {"shas": None, "df": None}
+_RESULT_FILES_LOCK = threading.Lock()
+
 # Results directory path (repo-relative, used as GitHub API path prefix)
 RESULTS_DIR = "data/processed"
 
@@ -156,6 +180,10 @@ def _deduplicate_candidates(df):
     For rows without emails: deduplicates by candidate name + phone + job position.
     Preserves original row order.
     
+    Each row gets one composite key (whether it has an email, email or name,
+    phone, job position) and a single vectorized duplicated() pass keeps the
+    first row of every key.
+    
     Args:
         df: DataFrame with candidate data
         
@@ -169,40 +197,27 @@ def _deduplicate_candidates(df):
         # Reset index to ensure consistent indexing for order preservation
         df = df.reset_index(drop=True)
         
-        # Separate rows with valid emails from those without
-        has_email = df["Candidate Email"].notna() & (df["Candidate Email"] != "")
+        email = df["Candidate Email"].astype(object)
+        has_email = email.notna() & (email != "")
         
-        # Get indices to keep from rows with emails
-        df_with_email = df.loc[has_email]
-        if not df_with_email.empty:
-            keep_email_indices = df_with_email.drop_duplicates(
-                subset=["Candidate Email", "Job Position"], keep="first"
-            ).index.tolist()
+        # Rows without emails use candidate name + phone (or name only);
+        # without a name they are never duplicates of each other
+        if "Candidate Name" in df.columns:
+            fallback = df["Candidate Name"].astype(object)
         else:
-            keep_email_indices = []
-        
-        # Get indices to keep from rows without emails (use candidate name + phone instead)
-        df_without_email = df.loc[~has_email]
-        if not df_without_email.empty:
-            if "Candidate Name" in df.columns and "Phone" in df.columns:
-                # Use name + phone for better deduplication
-                keep_name_indices = df_without_email.drop_duplicates(
-                    subset=["Candidate Name", "Phone", "Job Position"], keep="first"
-                ).index.tolist()
-            elif "Candidate Name" in df.columns:
-                # Fallback to name only if phone not available
-                keep_name_indices = df_without_email.drop_duplicates(
-                    subset=["Candidate Name", "Job Position"], keep="first"
-                ).index.tolist()
-            else:
-                # No deduplication possible without email or name
-                keep_name_indices = df_without_email.index.tolist()
+            fallback = pd.Series(range(len(df)), index=df.index, dtype=object)
+        if "Candidate Name" in df.columns and "Phone" in df.columns:
+            phone = df["Phone"].astype(object).where(~has_email)
         else:
-            keep_name_indices = []
+            phone = pd.Series(None, index=df.index, dtype=object)
         
-        # Combine indices and sort to preserve original order
-        all_keep_indices = sorted(keep_email_indices + keep_name_indices)
-        return df.loc[all_keep_indices].reset_index(drop=True)
+        key = pd.DataFrame({
+            "has_email": has_email,
+            "id": email.where(has_email, fallback),
+            "phone": phone,
+            "position": df["Job Position"],
+        })
+        return df.loc[~key.duplicated(keep="first").to_numpy()].reset_index(drop=True)
     
     elif "Filename" in df.columns and "Job Position" in df.columns:
         return df.drop_duplicates(subset=["Filename", "Job Position"], keep="first")
@@ -228,28 +243,64 @@ def get_results_filename(job_position):
     return f"{RESULTS_DIR}/results_{safe_name}.csv"
 
 
+def _merge_results(old_df, new_rows):
+    """Append new_rows to an existing results file, deduplicate and sort.
+    
+    Existing rows win on duplicates (keeps their shortlist/status edits).
+    Rows are sorted by Date Applied (latest first), then Date Processed.
+    """
+    df = pd.concat([old_df, new_rows], ignore_index=True) if not old_df.empty else new_rows
+    df = _deduplicate_candidates(df)
+    if "Date Applied" in df.columns:
+        df = df.sort_values(
+            by=["Date Applied", "Date Processed"],
+            ascending=[False, False],
+            na_position="last"
+        ).reset_index(drop=True)
+    return df
+
+
+def merge_results_csv(existing_csv, new_rows):
+    """Merged CSV text for a results file (used by GitCommitBuilder.merge).
+    
+    Args:
+        existing_csv (str): Current file content, or None if the file does not exist
+        new_rows (DataFrame): Rows to add
+    
+    Returns:
+        str: CSV text to commit
+    """
+    if existing_csv is None:
+        return new_rows.to_csv(index=False)
+    try:
+        old_df = pd.read_csv(StringIO(existing_csv))
+    except pd.errors.EmptyDataError:
+        old_df = pd.DataFrame()
+    except (pd.errors.ParserError, ValueError) as e:
+        _log_warning(f"⚠️ Could not parse existing data (using new data only): {str(e)}")
+        old_df = pd.DataFrame()
+    return _merge_results(old_df, new_rows).to_csv(index=False)
+
+
 def _save_results_locally(df, path):
     """Save results to a local CSV file (fallback when GitHub is unavailable)."""
     try:
         os.makedirs(os.path.dirname(path), exist_ok=True)
         if os.path.exists(path):
-            old_df = pd.read_csv(path)
-            df = pd.concat([old_df, df], ignore_index=True)
-            df = _deduplicate_candidates(df)
-            if "Date Applied" in df.columns:
-                df = df.sort_values(
-                    by=["Date Applied", "Date Processed"],
-                    ascending=[False, False],
-                    na_position="last"
-                ).reset_index(drop=True)
-        df.to_csv(path, index=False)
+            df = _merge_results(pd.read_csv(path), df)
+        csv_text = df.to_csv(index=False)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(csv_text)
+        write_local_sidecar(path, csv_text)
         return True
     except Exception as e:
         _log_error(f"❌ Local save failed: {e}")
         return False
 
 
-def save_results_to_github(df, path=None, job_position=None, max_retries=3):
+@github_operation("save_results")
+def save_results_to_github(df, path=None, job_position=None, max_retries=3,
+                           commit_message="📊 Update results.csv via Streamlit app", builder=None):
     """Save or update results in GitHub repo, storing each job position in a separate file.
     
     Args:
@@ -257,6 +308,12 @@ def save_results_to_github(df, path=None, job_position=None, max_retries=3):
         path: (Optional) Explicit path to CSV file. If not provided, uses job_position to generate filename.
         job_position: (Optional) Job position name to generate filename (e.g., "Account Executive")
         max_retries: Maximum number of retry attempts on failure
+        commit_message: (Optional) Commit message for the GitHub update
+        builder: (Optional) GitCommitBuilder; the merge is staged in its next
+            batch commit (together with the Parquet sidecar) instead of being
+            committed on its own. Without one only the CSV is committed; its
+            sidecar no longer matches and readers use the CSV until the next
+            batch commit rewrites it.
     
     Returns:
         bool: True if save was successful, False otherwise.
@@ -288,6 +345,11 @@ def save_results_to_github(df, path=None, job_position=None, max_retries=3):
                 return False
         path = get_results_filename(job_position)
     
+    if builder is not None:
+        new_rows = df
+        builder.merge(path, lambda existing_csv: merge_results_csv(existing_csv, new_rows))
+        return True
+    
     token = _get_config("GITHUB_TOKEN")
     repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
     branch = _get_config("GITHUB_BRANCH", "main")
@@ -302,40 +364,44 @@ def save_results_to_github(df, path=None, job_position=None, max_retries=3):
     }
 
     url = f"https://api.github.com/repos/{repo}/contents/{path}"
+    
+    # Rows being saved; every attempt re-merges only these onto the latest remote file
+    new_rows = df
 
     # Retry loop
     for attempt in range(max_retries):
         try:
+            df = new_rows
+            
             # 1️⃣ Cek apakah file sudah ada
-            r = requests.get(url, headers=headers, timeout=GITHUB_TIMEOUT)
+            r = get_github_client().get(url, headers=headers)
             sha = None
             if r.status_code == 200:
                 content = r.json()
                 sha = content["sha"]
                 file_size = content.get("size", 0)
                 
-                # Handle large files (>1MB) using raw URL instead of Contents API
-                # GitHub Contents API excludes content field for files >1MB
-                if file_size > GITHUB_CONTENTS_API_SIZE_LIMIT or "content" not in content:
-                    # Use raw.githubusercontent.com for large files (with auth for private repos)
-                    raw_url = f"https://raw.githubusercontent.com/{repo}/{branch}/{path}"
-                    r_raw = requests.get(raw_url, headers=headers, timeout=GITHUB_TIMEOUT)
-                    if r_raw.status_code == 200:
-                        existing_csv = r_raw.text
-                    else:
-                        _log_error(f"❌ CRITICAL: Could not download large file ({file_size:,} bytes). Data loss may occur!")
-                        existing_csv = None
+                # Handle large files (>1MB) through the Git blob API
+                # GitHub Contents API excludes content field for files >1MB;
+                # the blob is exactly the version whose sha the PUT targets
+                if file_size > GITHUB_CONTENTS_API_SIZE_LIMIT or not content.get("content"):
+                    existing_csv = _read_github_blob(repo, sha, headers)
+                    if existing_csv is None:
+                        # Never overwrite a file we could not read: its rows would be lost
+                        if attempt < max_retries - 1:
+                            time.sleep(2)
+                            continue
+                        _log_error(f"❌ GitHub save failed: could not download existing file ({file_size:,} bytes)")
+                        return False
                 else:
                     # File is small enough, use Contents API
                     existing_csv = base64.b64decode(content["content"]).decode("utf-8")
                 
                 # Parse existing data if available
+                old_df = pd.DataFrame()
                 if existing_csv:
                     try:
                         old_df = pd.read_csv(StringIO(existing_csv))
-                        # Merge if old_df has data, otherwise just use new data
-                        if not old_df.empty:
-                            df = pd.concat([old_df, df], ignore_index=True)
                     except pd.errors.EmptyDataError:
                         # Existing file is completely empty (no header), just use the new data
                         pass
@@ -344,17 +410,9 @@ def save_results_to_github(df, path=None, job_position=None, max_retries=3):
                         if attempt == max_retries - 1:
                             _log_warning(f"⚠️ Could not parse existing data (using new data only): {str(e)}")
                 
-                # Apply deduplication to remove duplicates (handles both merged and new-only data)
-                # Keep 'first' to preserve existing records and their shortlist status
-                df = _deduplicate_candidates(df)
-                
-                # Sort by Date Applied (latest first), then Date Processed as fallback
-                if "Date Applied" in df.columns:
-                    df = df.sort_values(
-                        by=["Date Applied", "Date Processed"],
-                        ascending=[False, False],
-                        na_position="last"
-                    ).reset_index(drop=True)
+                # Merge, deduplicate (keep 'first' to preserve existing records and
+                # their shortlist status) and sort by Date Applied / Date Processed
+                df = _merge_results(old_df, df)
             elif r.status_code == 401:
                 _log_warning(f"⚠️ GitHub auth failed, saving locally instead.")
                 return _save_results_locally(df, path)
@@ -369,7 +427,7 @@ def save_results_to_github(df, path=None, job_position=None, max_retries=3):
 
             # 3️⃣ Siapkan payload
             data = {
-                "message": "📊 Update results.csv via Streamlit app",
+                "message": commit_message,
                 "content": encoded,
                 "branch": branch
             }
@@ -377,11 +435,14 @@ def save_results_to_github(df, path=None, job_position=None, max_retries=3):
                 data["sha"] = sha
 
             # 4️⃣ Upload ke GitHub
-            res = requests.put(url, headers=headers, data=json.dumps(data), timeout=GITHUB_TIMEOUT)
+            with profile_span("github_put"):
+                res = get_github_client().put(url, headers=headers, data=json.dumps(data))
             if res.status_code in [200, 201]:
                 return True
             elif res.status_code == 409:
+                profile_event("github_409")
                 # Conflict - file was updated by someone else, retry
+                # (next attempt re-reads the file and merges new_rows again)
                 if attempt < max_retries - 1:
                     time.sleep(1)  # Wait before retrying
                     continue
@@ -415,7 +476,146 @@ def save_results_to_github(df, path=None, job_position=None, max_retries=3):
     return False
 
 
-def load_results_from_github(path="results.csv"):
+def _project_columns(df, columns):
+    """Keep only the requested columns that exist (all columns if columns is None)."""
+    if df is None or not columns:
+        return df
+    return df[[col for col in columns if col in df.columns]]
+
+
+def _list_github_dir(directory, headers, repo, branch):
+    """{name: listing item} of a repo directory, via a conditional request.
+    
+    Returns:
+        tuple: (items dict or None if unavailable, stale flag)
+    """
+    url = f"https://api.github.com/repos/{repo}/contents/{directory}?ref={branch}"
+    content, source = cached_get(url, headers=headers, timeout=GITHUB_TIMEOUT, max_retries=1,
+                                 session=get_github_client())
+    if content is None:
+        return None, False
+    try:
+        files = json.loads(content)
+    except ValueError:
+        return None, False
+    if not isinstance(files, list):
+        return None, False
+    return {item.get("name", ""): item for item in files}, source == SOURCE_STALE
+
+
+def _read_github_blob(repo, blob_sha, headers):
+    """Text of a git blob, streamed with the raw media type.
+    
+    raw.githubusercontent.com is a CDN and can serve the previous version of
+    a file for minutes after a commit. A blob is addressed by its sha, so
+    this returns exactly the version the sha was read for (the one a save
+    then writes against). The body is decoded chunk by chunk, without the
+    charset detection requests runs on raw responses.
+    
+    Args:
+        repo: "owner/name"
+        blob_sha: Blob sha from the Contents API or a directory listing
+        headers: Authorization headers
+    
+    Returns:
+        str: Blob content, or None if it could not be downloaded
+    """
+    try:
+        r = get_github_client().get(
+            f"https://api.github.com/repos/{repo}/git/blobs/{blob_sha}",
+            headers={**headers, "Accept": "application/vnd.github.raw"},
+            stream=True,
+        )
+        try:
+            if r.status_code != 200:
+                return None
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            parts = [decoder.decode(chunk) for chunk in r.iter_content(chunk_size=GITHUB_BLOB_CHUNK_SIZE)]
+            parts.append(decoder.decode(b"", final=True))
+            return "".join(parts)
+        finally:
+            r.close()
+    except (requests.exceptions.RequestException, UnicodeDecodeError):
+        return None
+
+
+def _fetch_results_sidecar(headers, repo, listing, csv_name, columns=None):
+    """Rows of a results CSV from its Parquet sidecar on GitHub, or None.
+    
+    The sidecar is fetched by blob SHA (never a stale CDN copy) and used only
+    if it was built from the CSV blob in the listing.
+    """
+    csv_item = listing.get(csv_name)
+    sidecar_item = listing.get(os.path.basename(sidecar_path(csv_name) or ""))
+    if not csv_item or not sidecar_item:
+        return None
+    try:
+        r = get_github_client().get(
+            f"https://api.github.com/repos/{repo}/git/blobs/{sidecar_item['sha']}",
+            headers={**headers, "Accept": "application/vnd.github.raw"},
+        )
+    except requests.exceptions.RequestException:
+        return None
+    if r.status_code != 200:
+        return None
+    return read_sidecar(r.content, csv_item.get("sha"), columns)
+
+
+def get_results_blob_sha(path):
+    """Git blob SHA of a results file on GitHub, from the cached directory listing.
+    
+    An unchanged directory costs a 304, so this is a cheap way to notice that
+    a file changed.
+    
+    Returns:
+        str: The blob SHA, "" if the file does not exist, or None if unknown
+            (no token, or GitHub could not be reached)
+    """
+    token = _get_config("GITHUB_TOKEN")
+    if not token:
+        return None
+    repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
+    branch = _get_config("GITHUB_BRANCH", "main")
+    headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
+    listing, stale = _list_github_dir(os.path.dirname(path), headers, repo, branch)
+    if listing is None or stale:
+        return None
+    item = listing.get(os.path.basename(path))
+    return item.get("sha", "") if item else ""
+
+
+@github_operation("load_results")
+def load_results_from_github(path="results.csv", columns=None):
+    """Load a results file, preferring its Parquet sidecar when it is current.
+    
+    Args:
+        path: Repo-relative CSV path
+        columns: (Optional) Only these columns, e.g. RESULTS_LIST_COLUMNS for
+            views and duplicate checks that do not need the long text
+    
+    Returns:
+        pd.DataFrame: DataFrame with results, or empty DataFrame with expected columns if file is empty/not found
+        None: Only if there's a critical error and no fallback is available
+    """
+    if HAS_PYARROW and sidecar_path(path):
+        token = _get_config("GITHUB_TOKEN")
+        if token:
+            repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
+            branch = _get_config("GITHUB_BRANCH", "main")
+            headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
+            listing, stale = _list_github_dir(os.path.dirname(path), headers, repo, branch)
+            if listing is not None and not stale:
+                df = _fetch_results_sidecar(headers, repo, listing, os.path.basename(path), columns)
+                if df is not None:
+                    return df
+        elif os.path.exists(path):
+            df = read_local_sidecar(path, columns)
+            if df is not None:
+                return df
+    return _project_columns(_load_results_csv(path), columns)
+
+
+def _load_results_csv(path="results.csv"):
     """Load results.csv from GitHub repo, with fallback to local file.
     
     Returns:
@@ -437,21 +637,19 @@ def load_results_from_github(path="results.csv"):
         url = f"https://api.github.com/repos/{repo}/contents/{path}?ref={branch}"
         
         try:
-            r = requests.get(url, headers=headers, timeout=GITHUB_TIMEOUT)
+            r = get_github_client().get(url, headers=headers)
             
             if r.status_code == 200:
                 content = r.json()
                 file_size = content.get("size", 0)
                 
                 # GitHub Contents API has a size limit for inline content
-                # For files larger than this, download via raw URL instead
-                if file_size > GITHUB_CONTENTS_API_SIZE_LIMIT:
-                    # Use raw.githubusercontent.com for large files (with auth for private repos)
-                    raw_url = f"https://raw.githubusercontent.com/{repo}/{branch}/{path}"
-                    r_raw = requests.get(raw_url, headers=headers, timeout=GITHUB_TIMEOUT)
-                    if r_raw.status_code == 200:
+                # For files larger than this, read the blob by its sha instead
+                if file_size > GITHUB_CONTENTS_API_SIZE_LIMIT or not content.get("content"):
+                    text = _read_github_blob(repo, content["sha"], headers)
+                    if text is not None:
                         try:
-                            df = pd.read_csv(StringIO(r_raw.text))
+                            df = pd.read_csv(StringIO(text))
                             return df
                         except pd.errors.EmptyDataError:
                             return pd.DataFrame(columns=RESULTS_COLUMNS)
@@ -459,7 +657,7 @@ def load_results_from_github(path="results.csv"):
                             _log_warning(f"⚠️ Failed to parse large GitHub file: {str(e)}. Trying local file.")
                             # Fall through to local file fallback
                     else:
-                        _log_warning(f"⚠️ Failed to download large file from GitHub ({r_raw.status_code}). Trying local file.")
+                        _log_warning(f"⚠️ Failed to download large file from GitHub. Trying local file.")
                         # Fall through to local file fallback
                 else:
                     # File is small enough, use Contents API
@@ -501,46 +699,46 @@ def load_results_from_github(path="results.csv"):
         return pd.DataFrame(columns=RESULTS_COLUMNS)
 
 
-def _fetch_csv_from_url(session, url, timeout):
-    """Helper function to fetch a single CSV from a URL.
+def _fetch_results_blob(repo, blob_sha, headers):
+    """Helper function to fetch and parse a single results CSV by blob sha.
     
     Args:
-        session: requests.Session object for connection reuse
-        url: URL to fetch
-        timeout: Request timeout in seconds
+        repo: "owner/name"
+        blob_sha: Blob sha from the directory listing
+        headers: Authorization headers
         
     Returns:
         pd.DataFrame or None if fetch fails
     """
-    try:
-        resp = session.get(url, timeout=timeout)
-        if resp.status_code == 200:
-            try:
-                csv_text = resp.text
-                df = pd.read_csv(StringIO(csv_text))
-                # Ensure expected columns exist
-                for col in RESULTS_COLUMNS:
-                    if col not in df.columns:
-                        df[col] = ""
-                return df
-            except (pd.errors.EmptyDataError, pd.errors.ParserError):
-                # CSV is empty or malformed
-                return None
+    csv_text = _read_github_blob(repo, blob_sha, headers)
+    if csv_text is None:
         return None
-    except (requests.exceptions.RequestException, requests.exceptions.Timeout):
-        # Network error or timeout - skip this file
+    try:
+        df = pd.read_csv(StringIO(csv_text))
+    except (pd.errors.EmptyDataError, pd.errors.ParserError):
+        # CSV is empty or malformed
         return None
+    # Ensure expected columns exist
+    for col in RESULTS_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    return df
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+@github_operation("load_all_results")
 def load_all_results_from_github():
     """Load all results from GitHub by finding and merging all results_*.csv files.
     
     Optimizations:
-    - Uses st.cache_data to cache results for 5 minutes (prevents re-fetching on every rerun)
-    - Uses download_url (raw) directly to avoid extra API calls
-    - Downloads CSVs in parallel using ThreadPoolExecutor to reduce latency
-    - Uses a session for TCP connection reuse
+    - Lists the directory with a conditional request (If-None-Match); an
+      unchanged listing costs a 304 and no download
+    - Keeps every parsed file keyed by its blob SHA from the listing, so only
+      files whose SHA changed are downloaded and parsed again (and the merged
+      frame is reused when no SHA changed), so a rerun costs one 304 and a
+      commit from anywhere is seen on the next load (no time-based cache)
+    - Reads a file's Parquet sidecar instead of the CSV when it matches the listed CSV
+    - Downloads changed CSVs by blob SHA (never a stale CDN copy of the listed version)
+    - Downloads changed CSVs in parallel using ThreadPoolExecutor, over the pooled GitHub client
     
     This function discovers all position-specific result files (results/results_*.csv) and merges them
     into a single DataFrame for the Dashboard "All" view.
@@ -559,52 +757,72 @@ def load_all_results_from_github():
             "Accept": "application/vnd.github+json"
         }
     
-    # Get list of files in the results/ directory
-    url = f"https://api.github.com/repos/{repo}/contents/{RESULTS_DIR}?ref={branch}"
-    
-    try:
-        r = requests.get(url, headers=headers, timeout=GITHUB_TIMEOUT)
-        if r.status_code != 200:
-            return pd.DataFrame(columns=RESULTS_COLUMNS)
-        files = r.json()
-    except Exception:
+    # Get list of files in the results/ directory (304 when nothing changed)
+    listing, stale = _list_github_dir(RESULTS_DIR, headers, repo, branch)
+    if listing is None:
         return pd.DataFrame(columns=RESULTS_COLUMNS)
+    if stale:
+        _log_warning("⚠️ Could not list results on GitHub; showing the last known results.")
+    
+    # Blob SHA of every results_*.csv file
+    listed = {
+        name: item["sha"]
+        for name, item in listing.items()
+        if name.startswith("results_") and name.endswith(".csv") and item.get("sha")
+    }
     
-    # Collect download URLs for all results_*.csv files
-    download_tasks = []
-    for item in files:
-        name = item.get("name", "")
-        if name.startswith("results_") and name.endswith(".csv"):
-            # Prefer direct download_url (raw) to avoid extra API calls
-            download_url = item.get("download_url")
-            if download_url:
-                download_tasks.append(download_url)
-    
-    if not download_tasks:
+    if not listed:
         return pd.DataFrame(columns=RESULTS_COLUMNS)
     
-    # Create session to reuse TCP connections
-    session = requests.Session()
-    if headers.get("Authorization"):
-        session.headers.update({"Authorization": headers["Authorization"]})
+    shas = tuple(sorted(listed.items()))
+    with _RESULT_FILES_LOCK:
+        if _RESULTS_MERGED["shas"] == shas:
+            return _RESULTS_MERGED["df"].copy()
+        # Forget files that were removed from the directory
+        for name in set(_RESULT_FILES_CACHE) - set(listed):
+            del _RESULT_FILES_CACHE[name]
+        download_tasks = {
+            name: sha
+            for name, sha in listed.items()
+            if _RESULT_FILES_CACHE.get(name, (None,))[0] != sha
+        }
     
-    dfs = []
+    if download_tasks:
+        def fetch(name, sha):
+            # Parquet sidecar when it matches the listed CSV, else the CSV itself
+            df = None
+            if HAS_PYARROW and token:
+                df = _fetch_results_sidecar(headers, repo, listing, name)
+            if df is None:
+                return _fetch_results_blob(repo, sha, headers)
+            for col in RESULTS_COLUMNS:
+                if col not in df.columns:
+                    df[col] = ""
+            return df
+        
+        # Parallel fetch for better performance
+        max_workers = min(MAX_PARALLEL_DOWNLOADS, len(download_tasks))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_name = {
+                # Copy the context so the downloads are billed to this operation
+                executor.submit(contextvars.copy_context().run, fetch, name, sha): name
+                for name, sha in download_tasks.items()
+            }
+            for future in as_completed(future_to_name):
+                name = future_to_name[future]
+                try:
+                    df = future.result()
+                except Exception:
+                    # Silently skip failed downloads - the file may be malformed or inaccessible
+                    continue
+                if df is not None:
+                    with _RESULT_FILES_LOCK:
+                        _RESULT_FILES_CACHE[name] = (download_tasks[name], df)
     
-    # Parallel fetch for better performance
-    max_workers = min(MAX_PARALLEL_DOWNLOADS, len(download_tasks))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {
-            executor.submit(_fetch_csv_from_url, session, url, GITHUB_TIMEOUT): url 
-            for url in download_tasks
-        }
-        for future in as_completed(future_to_url):
-            try:
-                df = future.result()
-                if df is not None and not df.empty:
-                    dfs.append(df)
-            except Exception:
-                # Silently skip failed downloads - the file may be malformed or inaccessible
-                continue
+    with _RESULT_FILES_LOCK:
+        dfs = [_RESULT_FILES_CACHE[name][1] for name in sorted(listed) if name in _RESULT_FILES_CACHE]
+        complete = all(name in _RESULT_FILES_CACHE for name in listed)
+    dfs = [df for df in dfs if not df.empty]
     
     if not dfs:
         return pd.DataFrame(columns=RESULTS_COLUMNS)
@@ -618,26 +836,42 @@ def load_all_results_from_github():
         # If deduplication fails, return the merged data without deduplication
         pass
     
+    if complete:
+        with _RESULT_FILES_LOCK:
+            _RESULTS_MERGED["shas"], _RESULTS_MERGED["df"] = shas, merged
+        return merged.copy()
     return merged
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_results_for_position(job_position):
+def load_results_for_position(job_position, columns=None):
     """Load results for a specific job position from GitHub.
     
     This is more efficient than load_all_results_from_github when filtering by position,
     as it only downloads the single file for that position.
     
+    The parsed file is cached by its blob SHA (from the directory listing, a
+    304 when nothing changed), so a commit to the file from anywhere (another
+    session, auto_screen, a status patch compaction) is seen on the next load
+    instead of after the cache expires.
+    
     Args:
         job_position: The job position name to load results for
+        columns: (Optional) Only these columns (see load_results_from_github)
         
     Returns:
         pd.DataFrame: DataFrame with results for the position, or empty DataFrame if not found
     """
     filename = get_results_filename(job_position)
-    df = load_results_from_github(path=filename)
+    return _load_results_version(job_position, get_results_blob_sha(filename), columns)
+
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes (only matters when the blob SHA is unknown)
+def _load_results_version(job_position, blob_sha, columns=None):
+    """load_results_for_position for one version of the file (blob_sha is the cache key)."""
+    filename = get_results_filename(job_position)
+    df = load_results_from_github(path=filename, columns=columns)
     if df is None:
-        return pd.DataFrame(columns=RESULTS_COLUMNS)
+        return pd.DataFrame(columns=columns or RESULTS_COLUMNS)
     return df
 
 
@@ -646,202 +880,130 @@ def clear_results_cache():
     
     Call this after saving new results to ensure the dashboard shows fresh data.
     """
-    load_all_results_from_github.clear()
-    load_results_for_position.clear()
+    if not HAS_STREAMLIT:
+        return
+    _load_results_version.clear()
 
 
-def save_job_positions_to_github(df, path="data/job_positions.csv"):
-    """Save or update job_positions.csv in GitHub repo.
+def _merge_job_positions(old_df, df, report=True):
+    """Merge new/updated job positions into the existing job_positions.csv rows.
     
-    Returns:
-        bool: True if save was successful, False otherwise.
+    Rows with a Job ID are deduplicated by Job ID, rows without one by Job
+    Position name (existing rows win). report=False skips the duplicate
+    name warnings (for a merge that was already reported).
     """
-    token = _get_config("GITHUB_TOKEN")
-    repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
-    branch = _get_config("GITHUB_BRANCH", "main")
-
-    if not token:
-        _log_error("❌ Missing GITHUB_TOKEN in Streamlit secrets.")
-        return False
-
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github+json"
-    }
+    # Ensure string columns to avoid float64 dtype issues
+    for col in ["Job ID", "Pooling Status", "Last Modified"]:
+        if col in old_df.columns:
+            old_df[col] = old_df[col].fillna("").astype(str)
+    
+    # Ensure Job ID column exists in both dataframes
+    if "Job ID" not in old_df.columns:
+        old_df["Job ID"] = ""
+    
+    if "Job ID" not in df.columns:
+        df["Job ID"] = ""
+    
+    # Merge the dataframes
+    df = pd.concat([old_df, df], ignore_index=True)
+    
+    # Remove duplicates:
+    # - For rows WITH Job ID: deduplicate by Job ID
+    # - For rows WITHOUT Job ID: deduplicate by Job Position name
+    # This prevents losing old positions that don't have Job IDs yet
+    
+    # Separate rows with and without Job ID
+    has_job_id = df["Job ID"].notna() & (df["Job ID"] != "")
+    
+    # Deduplicate rows WITH Job ID
+    df_with_id = df[has_job_id].copy()
+    if not df_with_id.empty:
+        df_with_id = df_with_id.drop_duplicates(subset=["Job ID"], keep="first")
+    
+    # Deduplicate rows WITHOUT Job ID by Job Position name
+    df_without_id = df[~has_job_id].copy()
+    if not df_without_id.empty:
+        df_without_id = df_without_id.drop_duplicates(subset=["Job Position"], keep="first")
+    
+    # Combine back
+    df = pd.concat([df_with_id, df_without_id], ignore_index=True)
+    
+    # Check for duplicate active (non-pooled) Job Position names with different IDs
+    # This allows pooled positions to have same name as active positions
+    pooling_status = df["Pooling Status"] if "Pooling Status" in df.columns else pd.Series("", index=df.index)
+    active_positions = df[pooling_status != 'Pooled']
+    duplicate_active_positions = active_positions[active_positions.duplicated(subset=["Job Position"], keep=False)]
+    if report and not duplicate_active_positions.empty:
+        _log_warning(f"⚠️ Found duplicate active job position names: {', '.join(duplicate_active_positions['Job Position'].unique())}")
+    
+    # Log info about pooled positions with same names (this is allowed)
+    pooled_positions = df[pooling_status == 'Pooled']
+    if report and not pooled_positions.empty and not active_positions.empty:
+        same_name_pooled = set(pooled_positions['Job Position'].unique()) & set(active_positions['Job Position'].unique())
+        if same_name_pooled:
+            _log_info(f"ℹ️ Positions with both active and pooled versions: {', '.join(same_name_pooled)}")
+    return df
 
-    url = f"https://api.github.com/repos/{repo}/contents/{path}"
 
-    # Check if file exists
-    r = requests.get(url, headers=headers)
-    sha = None
-    if r.status_code == 200:
-        content = r.json()
-        sha = content["sha"]
-        existing_csv = base64.b64decode(content["content"]).decode("utf-8")
-        try:
-            old_df = pd.read_csv(StringIO(existing_csv))
-            
-            # Ensure string columns to avoid float64 dtype issues
-            for col in ["Job ID", "Pooling Status", "Last Modified"]:
-                if col in old_df.columns:
-                    old_df[col] = old_df[col].fillna("").astype(str)
-            
-            # Ensure Job ID column exists in both dataframes
-            if "Job ID" not in old_df.columns:
-                old_df["Job ID"] = ""
-            
-            if "Job ID" not in df.columns:
-                df["Job ID"] = ""
-            
-            # Merge the dataframes
-            df = pd.concat([old_df, df], ignore_index=True)
-            
-            # Remove duplicates:
-            # - For rows WITH Job ID: deduplicate by Job ID
-            # - For rows WITHOUT Job ID: deduplicate by Job Position name
-            # This prevents losing old positions that don't have Job IDs yet
-            
-            # Separate rows with and without Job ID
-            has_job_id = df["Job ID"].notna() & (df["Job ID"] != "")
-            
-            # Deduplicate rows WITH Job ID
-            df_with_id = df[has_job_id].copy()
-            if not df_with_id.empty:
-                df_with_id = df_with_id.drop_duplicates(subset=["Job ID"], keep="first")
-            
-            # Deduplicate rows WITHOUT Job ID by Job Position name
-            df_without_id = df[~has_job_id].copy()
-            if not df_without_id.empty:
-                df_without_id = df_without_id.drop_duplicates(subset=["Job Position"], keep="first")
-            
-            # Combine back
-            df = pd.concat([df_with_id, df_without_id], ignore_index=True)
-            
-            # Check for duplicate active (non-pooled) Job Position names with different IDs
-            # This allows pooled positions to have same name as active positions
-            active_positions = df[df.get('Pooling Status', '') != 'Pooled']
-            duplicate_active_positions = active_positions[active_positions.duplicated(subset=["Job Position"], keep=False)]
-            if not duplicate_active_positions.empty:
-                _log_warning(f"⚠️ Found duplicate active job position names: {', '.join(duplicate_active_positions['Job Position'].unique())}")
-            
-            # Log info about pooled positions with same names (this is allowed)
-            pooled_positions = df[df.get('Pooling Status', '') == 'Pooled']
-            if not pooled_positions.empty and not active_positions.empty:
-                same_name_pooled = set(pooled_positions['Job Position'].unique()) & set(active_positions['Job Position'].unique())
-                if same_name_pooled:
-                    _log_info(f"ℹ️ Positions with both active and pooled versions: {', '.join(same_name_pooled)}")
-                
-        except pd.errors.EmptyDataError:
-            # Existing file is empty, just use the new data
-            # Ensure Job ID column exists
-            if "Job ID" not in df.columns:
-                df["Job ID"] = ""
-    elif r.status_code == 401:
-        _log_error(f"❌ GitHub authentication failed: {r.status_code} - {r.text}")
-        return False
-    elif r.status_code != 404:
-        _log_warning(f"⚠️ Could not check existing file: {r.status_code} - {r.text}")
-
-    # Encode CSV
-    csv_bytes = df.to_csv(index=False).encode("utf-8")
-    encoded = base64.b64encode(csv_bytes).decode("utf-8")
+def merge_job_positions_csv(existing_csv, df):
+    """Merged job_positions.csv text (used by GitCommitBuilder.merge).
+    
+    Args:
+        existing_csv (str): Current file content, or None if the file does not exist
+        df (DataFrame): New or updated positions
+    
+    Returns:
+        str: CSV text to commit
+    """
+    df = df.copy()
+    try:
+        if existing_csv is not None:
+            df = _merge_job_positions(pd.read_csv(StringIO(existing_csv)), df)
+    except pd.errors.EmptyDataError:
+        if "Job ID" not in df.columns:
+            df["Job ID"] = ""
+    return df.to_csv(index=False)
 
-    # Prepare payload
-    data = {
-        "message": "📋 Update job_positions.csv via Streamlit app",
-        "content": encoded,
-        "branch": branch
-    }
-    if sha:
-        data["sha"] = sha
 
-    # Upload to GitHub
-    res = requests.put(url, headers=headers, data=json.dumps(data))
-    if res.status_code in [200, 201]:
+@github_operation("save_job_positions")
+def save_job_positions_to_github(df, path="data/job_positions.csv", builder=None):
+    """Save or update job_positions.csv in GitHub repo.
+    
+    Args:
+        df: New or updated positions
+        path: (Optional) Path to job_positions.csv in the repo
+        builder: (Optional) GitCommitBuilder; the merge is staged in its next
+            batch commit instead of being committed on its own
+    
+    Returns:
+        bool: True if save was successful, False otherwise.
+    """
+    if builder is not None:
+        builder.merge(path, lambda existing_csv: merge_job_positions_csv(existing_csv, df))
+        return True
+    
+    from src.repositories.job_positions_repository import get_job_positions_repository
+    
+    edits = get_job_positions_repository(path).edits()
+    if edits.add(df) and edits.flush():
         _log_success("✅ Job positions successfully saved to GitHub!")
         return True
-    else:
-        _log_error(f"❌ GitHub save failed: {res.status_code} - {res.text}")
-        return False
+    return False
 
 
+@github_operation("load_job_positions")
 def load_job_positions_from_github(path="data/job_positions.csv"):
-    """Load job_positions.csv from GitHub repo, with fallback to local file."""
-    token = _get_config("GITHUB_TOKEN")
-    repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
-    branch = _get_config("GITHUB_BRANCH", "main")
-
-    # Try to load from GitHub first
-    if token:
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github+json"
-        }
-
-        url = f"https://api.github.com/repos/{repo}/contents/{path}?ref={branch}"
-        
-        try:
-            r = requests.get(url, headers=headers, timeout=GITHUB_TIMEOUT)
-            
-            if r.status_code == 200:
-                content = r.json()
-                file_size = content.get("size", 0)
-                
-                # GitHub Contents API has a size limit for inline content
-                # For files larger than this, download via raw URL instead
-                if file_size > GITHUB_CONTENTS_API_SIZE_LIMIT:
-                    # Use raw.githubusercontent.com for large files (with auth for private repos)
-                    raw_url = f"https://raw.githubusercontent.com/{repo}/{branch}/{path}"
-                    r_raw = requests.get(raw_url, headers=headers, timeout=GITHUB_TIMEOUT)
-                    if r_raw.status_code == 200:
-                        try:
-                            df = pd.read_csv(StringIO(r_raw.text))
-                            return df
-                        except pd.errors.EmptyDataError:
-                            return pd.DataFrame(columns=["Job Position", "Job Description", "Date Created"])
-                        except Exception as e:
-                            _log_warning(f"⚠️ Failed to parse large GitHub file: {str(e)}. Trying local file.")
-                            # Fall through to local file fallback
-                    else:
-                        _log_warning(f"⚠️ Failed to download large file from GitHub ({r_raw.status_code}). Trying local file.")
-                        # Fall through to local file fallback
-                else:
-                    # File is small enough, use Contents API
-                    try:
-                        decoded = base64.b64decode(content["content"]).decode("utf-8")
-                        return pd.read_csv(StringIO(decoded))
-                    except pd.errors.EmptyDataError:
-                        # Empty file, return empty DataFrame with expected columns
-                        return pd.DataFrame(columns=["Job Position", "Job Description", "Date Created"])
-                    except Exception as e:
-                        _log_warning(f"⚠️ Failed to parse GitHub file: {str(e)}. Trying local file.")
-                        # Fall through to local file fallback
-            elif r.status_code == 404:
-                # File not found in GitHub branch, fall through to local file fallback
-                pass
-            else:
-                # GitHub load failed, fall through to local file fallback
-                pass
-                
-        except requests.exceptions.RequestException:
-            # Failed to connect to GitHub, fall through to local file fallback
-            pass
+    """Load job_positions.csv from GitHub repo, with fallback to local file.
     
-    # Fallback to local file
-    if os.path.exists(path):
-        try:
-            df = pd.read_csv(path)
-            if not df.empty:
-                return df
-        except pd.errors.EmptyDataError:
-            return pd.DataFrame(columns=["Job Position", "Job Description", "Date Created"])
-        except Exception:
-            return None
-    else:
-        # Neither GitHub nor local file exists - return empty DataFrame with expected columns
-        return pd.DataFrame(columns=["Job Position", "Job Description", "Date Created"])
+    Served from the process-wide JobPositionsRepository cache, which
+    revalidates against GitHub by blob SHA.
+    """
+    from src.repositories.job_positions_repository import get_job_positions_repository
+    
+    return get_job_positions_repository(path).load()
 
 
+@github_operation("delete_job_position")
 def delete_job_position_from_github(job_position, path="data/job_positions.csv"):
     """Delete a specific job position from GitHub repo.
     
@@ -852,64 +1014,14 @@ def delete_job_position_from_github(job_position, path="data/job_positions.csv")
     Returns:
         bool: True if delete was successful, False otherwise.
     """
-    token = _get_config("GITHUB_TOKEN")
-    repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
-    branch = _get_config("GITHUB_BRANCH", "main")
-
-    if not token:
-        _log_error("❌ Missing GITHUB_TOKEN in Streamlit secrets.")
-        return False
-
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github+json"
-    }
-
-    url = f"https://api.github.com/repos/{repo}/contents/{path}"
-
-    # Load existing data
-    r = requests.get(url, headers=headers)
-    if r.status_code != 200:
-        _log_error(f"❌ Could not load job positions: {r.status_code}")
-        return False
-    
-    content = r.json()
-    sha = content["sha"]
-    existing_csv = base64.b64decode(content["content"]).decode("utf-8")
-    try:
-        df = pd.read_csv(StringIO(existing_csv))
-    except pd.errors.EmptyDataError:
-        _log_error(f"❌ Cannot delete from empty file")
-        return False
+    from src.repositories.job_positions_repository import get_job_positions_repository
     
-    # Ensure string columns to avoid float64 dtype issues
-    for col in ["Job ID", "Pooling Status", "Last Modified"]:
-        if col in df.columns:
-            df[col] = df[col].fillna("").astype(str)
-    
-    # Remove the job position
-    df = df[df["Job Position"] != job_position]
-    
-    # Encode and save
-    csv_bytes = df.to_csv(index=False).encode("utf-8")
-    encoded = base64.b64encode(csv_bytes).decode("utf-8")
-
-    data = {
-        "message": f"🗑️ Delete job position: {job_position}",
-        "content": encoded,
-        "branch": branch,
-        "sha": sha
-    }
+    edits = get_job_positions_repository(path).edits()
+    return edits.delete(job_position) and edits.flush()
 
-    res = requests.put(url, headers=headers, data=json.dumps(data))
-    if res.status_code in [200, 201]:
-        return True
-    else:
-        _log_error(f"❌ GitHub delete failed: {res.status_code} - {res.text}")
-        return False
 
-
-def update_results_in_github(df, path=None, job_position=None, max_retries=3, silent=False):
+@github_operation("update_results")
+def update_results_in_github(df, path=None, job_position=None, max_retries=3, silent=False, builder=None):
     """Replace the entire results file with the provided DataFrame for a specific position.
     
     This is different from save_results_to_github which appends/merges data.
@@ -921,6 +1033,9 @@ def update_results_in_github(df, path=None, job_position=None, max_retries=3, si
         job_position: (Optional) Job position name to generate filename
         max_retries: Maximum number of retry attempts on failure
         silent: (Optional) If True, suppresses error messages for better performance
+        builder: (Optional) GitCommitBuilder; the new content is staged in its
+            next batch commit (together with the Parquet sidecar) instead of
+            being committed on its own. Without one only the CSV is committed.
     
     Returns:
         bool: True if update was successful, False otherwise.
@@ -948,6 +1063,10 @@ def update_results_in_github(df, path=None, job_position=None, max_retries=3, si
                 return False
         path = get_results_filename(job_position)
     
+    if builder is not None:
+        builder.put(path, df.to_csv(index=False))
+        return True
+    
     token = _get_config("GITHUB_TOKEN")
     repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
     branch = _get_config("GITHUB_BRANCH", "main")
@@ -972,7 +1091,7 @@ def update_results_in_github(df, path=None, job_position=None, max_retries=3, si
     for attempt in range(max_retries):
         try:
             # Get the current file SHA (required for updates)
-            r = requests.get(url, headers=headers, timeout=GITHUB_TIMEOUT)
+            r = get_github_client().get(url, headers=headers)
             sha = None
             if r.status_code == 200:
                 content = r.json()
@@ -995,10 +1114,11 @@ def update_results_in_github(df, path=None, job_position=None, max_retries=3, si
                 data["sha"] = sha
 
             # Upload to GitHub
-            res = requests.put(url, headers=headers, data=json.dumps(data), timeout=GITHUB_TIMEOUT)
+            res = get_github_client().put(url, headers=headers, data=json.dumps(data))
             if res.status_code in [200, 201]:
                 return True
             elif res.status_code == 409:
+                profile_event("github_409")
                 # Conflict - file was updated by someone else, retry with exponential backoff
                 if attempt < max_retries - 1:
                     time.sleep(0.5 * (2 ** attempt))  # Exponential backoff: 0.5s, 1s, 2s
@@ -1036,6 +1156,7 @@ def update_results_in_github(df, path=None, job_position=None, max_retries=3, si
     return False
 
 
+@github_operation("update_job_position")
 def update_job_position_in_github(old_position, new_position, new_description, new_job_id=None, path="data/job_positions.csv"):
     """Update a specific job position in GitHub repo.
     
@@ -1049,80 +1170,13 @@ def update_job_position_in_github(old_position, new_position, new_description, n
     Returns:
         bool: True if update was successful, False otherwise.
     """
-    token = _get_config("GITHUB_TOKEN")
-    repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
-    branch = _get_config("GITHUB_BRANCH", "main")
-
-    if not token:
-        _log_error("❌ Missing GITHUB_TOKEN in Streamlit secrets.")
-        return False
-
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github+json"
-    }
-
-    url = f"https://api.github.com/repos/{repo}/contents/{path}"
-
-    # Load existing data
-    r = requests.get(url, headers=headers)
-    if r.status_code != 200:
-        _log_error(f"❌ Could not load job positions: {r.status_code}")
-        return False
-    
-    content = r.json()
-    sha = content["sha"]
-    existing_csv = base64.b64decode(content["content"]).decode("utf-8")
-    try:
-        df = pd.read_csv(StringIO(existing_csv))
-    except pd.errors.EmptyDataError:
-        _log_error(f"❌ Cannot update from empty file")
-        return False
-    
-    # Ensure string columns to avoid float64 dtype issues with pandas 2.x
-    for col in ["Job Position", "Job Description", "Job ID", "Pooling Status", "Last Modified"]:
-        if col in df.columns:
-            df[col] = df[col].fillna("").astype(str)
-    
-    # Update the job position
-    mask = df["Job Position"] == old_position
-    if mask.sum() == 0:
-        _log_error(f"❌ Job position '{old_position}' not found")
-        return False
-    
-    df.loc[mask, "Job Position"] = new_position
-    df.loc[mask, "Job Description"] = new_description
-    
-    # Update Job ID if provided
-    if new_job_id is not None:
-        if "Job ID" not in df.columns:
-            df["Job ID"] = ""
-        df.loc[mask, "Job ID"] = new_job_id
+    from src.repositories.job_positions_repository import get_job_positions_repository
     
-    # Keep the original Date Created, add Last Modified
-    if "Last Modified" not in df.columns:
-        df["Last Modified"] = ""
-    df.loc[mask, "Last Modified"] = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Encode and save
-    csv_bytes = df.to_csv(index=False).encode("utf-8")
-    encoded = base64.b64encode(csv_bytes).decode("utf-8")
-
-    data = {
-        "message": f"✏️ Update job position: {old_position} → {new_position}",
-        "content": encoded,
-        "branch": branch,
-        "sha": sha
-    }
-
-    res = requests.put(url, headers=headers, data=json.dumps(data))
-    if res.status_code in [200, 201]:
-        return True
-    else:
-        _log_error(f"❌ GitHub update failed: {res.status_code} - {res.text}")
-        return False
+    edits = get_job_positions_repository(path).edits()
+    return edits.update(old_position, new_position, new_description, new_job_id) and edits.flush()
 
 
+@github_operation("toggle_pooling")
 def toggle_job_pooling_status(job_position, pooling_status, path="data/job_positions.csv"):
     """Toggle pooling status for a specific job position.
     
@@ -1134,68 +1188,7 @@ def toggle_job_pooling_status(job_position, pooling_status, path="data/job_posit
     Returns:
         bool: True if update was successful, False otherwise.
     """
-    token = _get_config("GITHUB_TOKEN")
-    repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
-    branch = _get_config("GITHUB_BRANCH", "main")
-
-    if not token:
-        _log_error("❌ Missing GITHUB_TOKEN in Streamlit secrets.")
-        return False
-
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github+json"
-    }
-
-    url = f"https://api.github.com/repos/{repo}/contents/{path}"
-
-    # Load existing data
-    r = requests.get(url, headers=headers)
-    if r.status_code != 200:
-        _log_error(f"❌ Failed to load job positions: {r.status_code}")
-        return False
-
-    content = r.json()
-    sha = content["sha"]
-    existing_csv = base64.b64decode(content["content"]).decode("utf-8")
-    
-    try:
-        df = pd.read_csv(StringIO(existing_csv))
-    except pd.errors.EmptyDataError:
-        _log_error("❌ Job positions file is empty")
-        return False
-    
-    # Ensure string columns to avoid float64 dtype issues
-    for col in ["Job ID", "Pooling Status", "Last Modified"]:
-        if col in df.columns:
-            df[col] = df[col].fillna("").astype(str)
-    
-    # Ensure Pooling Status column exists
-    if "Pooling Status" not in df.columns:
-        df["Pooling Status"] = ""
-    
-    # Find and update the job position
-    mask = df["Job Position"] == job_position
-    if mask.sum() == 0:
-        _log_error(f"❌ Job position '{job_position}' not found")
-        return False
-    
-    df.loc[mask, "Pooling Status"] = pooling_status
+    from src.repositories.job_positions_repository import get_job_positions_repository
     
-    # Encode and save
-    csv_bytes = df.to_csv(index=False).encode("utf-8")
-    encoded = base64.b64encode(csv_bytes).decode("utf-8")
-
-    data = {
-        "message": f"📦 Toggle pooling status for: {job_position}",
-        "content": encoded,
-        "branch": branch,
-        "sha": sha
-    }
-
-    res = requests.put(url, headers=headers, data=json.dumps(data))
-    if res.status_code in [200, 201]:
-        return True
-    else:
-        _log_error(f"❌ GitHub update failed: {res.status_code} - {res.text}")
-        return False
+    edits = get_job_positions_repository(path).edits()
+    return edits.set_pooling(job_position, pooling_status) and edits.flush()
@@ -0,0 +1,429 @@
+"""
+Job Positions Repository
+Cached, versioned copy of data/job_positions.csv with batched edits.
+
+Adding, deleting, editing or (un)pooling a position used to download
+job_positions.csv and PUT it back, one commit per click, and the app read
+the file again on nearly every page render. JobPositionsRepository keeps one
+copy per process, versioned by the file's git blob SHA, and edits are staged
+in a JobPositionEdits batch owned by one caller (one Streamlit session):
+
+    positions = get_job_positions_repository()
+    jobs_df = positions.load()                    # cached rows
+    edits = positions.edits()
+    edits.set_pooling("Data Analyst", "Pooled")
+    edits.delete("Old Position")                  # applied in memory, staged
+    edits.load()                                  # cached rows + these edits
+    edits.flush()                                 # one commit for both
+
+- load() revalidates at most every JOB_POSITIONS_REVALIDATE_SECONDS with a
+  conditional request (an unchanged file costs a 304) and parses the file
+  again only when its blob SHA changed.
+- A batch only shows its edits through its own load() (the app reads every
+  page through its session's batch), and flush() commits only its edits,
+  so one recruiter's unsaved changes are never committed by another's save. The edits are re-applied to the latest file, so a
+  position added by someone else in the meantime is kept. Edits that fail
+  to commit stay staged.
+- subscribe(name, callback) calls callback(old_sha, new_sha) whenever the
+  SHA changes (a new remote version, or our own commit), so the app clears
+  the caches built from the positions only when they actually changed.
+
+Without a GITHUB_TOKEN the local data/job_positions.csv is read and written.
+"""
+
+import os
+import json
+import time
+import base64
+import threading
+from io import StringIO
+
+import pandas as pd
+
+from src.repositories.git_commit_builder import GitCommitBuilder
+from src.repositories.github_utils import (
+    GITHUB_TIMEOUT,
+    _get_config,
+    _log_error,
+    _log_warning,
+    _merge_job_positions,
+    _read_github_blob,
+)
+from src.repositories.results_sidecar import git_blob_sha
+from src.utils.github_client import get_github_client
+from src.utils.http_cache import cached_get
+
+JOB_POSITIONS_PATH = "data/job_positions.csv"
+
+# Columns of an empty job_positions.csv
+JOB_POSITIONS_COLUMNS = ["Job Position", "Job Description", "Date Created"]
+
+# Revalidate the cached copy against GitHub at most this often (seconds)
+JOB_POSITIONS_REVALIDATE_SECONDS = 30
+
+# Read as text before editing (avoids float64 dtype issues with pandas)
+_TEXT_COLUMNS = ["Job Position", "Job Description", "Job ID", "Pooling Status", "Last Modified"]
+
+
+def _read_positions(text):
+    """DataFrame of job_positions.csv text (empty frame for an empty file)."""
+    try:
+        return pd.read_csv(StringIO(text))
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame(columns=JOB_POSITIONS_COLUMNS)
+
+
+def _as_text(df):
+    df = df.copy()
+    for col in _TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].fillna("").astype(str)
+    return df
+
+
+# Edits take the current positions and return the edited frame, or None
+# when they do not apply (the position is not there)
+
+def _add_edit(new_rows):
+    reported = []
+
+    def edit(df):
+        # The edit is re-applied on every load; warn about duplicates once
+        merged = _merge_job_positions(_as_text(df), new_rows.copy(), report=not reported)
+        reported.append(True)
+        return merged
+    return edit
+
+
+def _delete_edit(job_position):
+    def edit(df):
+        df = _as_text(df)
+        return df[df["Job Position"] != job_position]
+    return edit
+
+
+def _update_edit(old_position, new_position, new_description, new_job_id, modified_at):
+    def edit(df):
+        df = _as_text(df)
+        mask = df["Job Position"] == old_position
+        if not mask.any():
+            return None
+        df.loc[mask, "Job Position"] = new_position
+        df.loc[mask, "Job Description"] = new_description
+        if new_job_id is not None:
+            if "Job ID" not in df.columns:
+                df["Job ID"] = ""
+            df.loc[mask, "Job ID"] = new_job_id
+        # Keep the original Date Created, add Last Modified
+        if "Last Modified" not in df.columns:
+            df["Last Modified"] = ""
+        df.loc[mask, "Last Modified"] = modified_at
+        return df
+    return edit
+
+
+def _pooling_edit(job_position, pooling_status):
+    def edit(df):
+        df = _as_text(df)
+        if "Pooling Status" not in df.columns:
+            df["Pooling Status"] = ""
+        mask = df["Job Position"] == job_position
+        if not mask.any():
+            return None
+        df.loc[mask, "Pooling Status"] = pooling_status
+        return df
+    return edit
+
+
+def _apply_edits(df, edits):
+    for edit in edits:
+        edited = edit(df)
+        if edited is not None:
+            df = edited
+    return df
+
+
+class JobPositionsRepository:
+    """Process-wide cached job_positions.csv."""
+
+    def __init__(self, path=JOB_POSITIONS_PATH, revalidate_seconds=JOB_POSITIONS_REVALIDATE_SECONDS):
+        self.path = path
+        self.revalidate_seconds = revalidate_seconds
+        self.sha = None          # blob SHA of the cached copy
+        self.version = 0         # bumped whenever the SHA changes
+        self._df = None
+        self._checked_at = None
+        self._listeners = {}
+        self._lock = threading.RLock()
+
+    # ── Reading ───────────────────────────────────────────────────────────
+    def subscribe(self, name, callback):
+        """Call callback(old_sha, new_sha) when the file changes.
+
+        Subscribing the same name again replaces the callback (Streamlit
+        re-runs the app script on every interaction).
+        """
+        with self._lock:
+            self._listeners[name] = callback
+
+    def _set(self, df, sha):
+        with self._lock:
+            old_sha = self.sha
+            self._df, self.sha = df, sha
+            self._checked_at = time.monotonic()
+            changed = old_sha is not None and sha != old_sha
+            if changed:
+                self.version += 1
+            listeners = list(self._listeners.values())
+        if changed:
+            for callback in listeners:
+                callback(old_sha, sha)
+
+    def _fetch(self):
+        """(text, sha) of the current file; text is None when the SHA is unchanged or nothing is available."""
+        token = _get_config("GITHUB_TOKEN")
+        if token:
+            repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
+            branch = _get_config("GITHUB_BRANCH", "main")
+            headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
+            content, _ = cached_get(f"https://api.github.com/repos/{repo}/contents/{self.path}?ref={branch}",
+                                    headers=headers, timeout=GITHUB_TIMEOUT, max_retries=1,
+                                    session=get_github_client())
+            if content:
+                try:
+                    item = json.loads(content)
+                    sha = item["sha"]
+                    if sha == self.sha:
+                        return None, sha
+                    if item.get("content"):
+                        return base64.b64decode(item["content"]).decode("utf-8"), sha
+                    # Files over 1 MB come without inline content
+                    text = _read_github_blob(repo, sha, headers)
+                    if text is not None:
+                        return text, sha
+                    _log_warning("⚠️ Could not download job positions from GitHub. Trying local file.")
+                except (KeyError, TypeError, ValueError) as e:
+                    _log_warning(f"⚠️ Could not read job positions from GitHub: {e}. Trying local file.")
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "rb") as f:
+                    data = f.read()
+                return data.decode("utf-8"), git_blob_sha(data)
+            except (OSError, UnicodeDecodeError):
+                pass
+        return None, None
+
+    def refresh(self):
+        """Revalidate the cached copy now."""
+        text, sha = self._fetch()
+        if text is None:
+            with self._lock:
+                self._checked_at = time.monotonic()
+                if self._df is None and sha is None:
+                    # Neither GitHub nor a local file: no positions yet
+                    self._df = pd.DataFrame(columns=JOB_POSITIONS_COLUMNS)
+            return
+        try:
+            df = _read_positions(text)
+        except (pd.errors.ParserError, ValueError) as e:
+            _log_warning(f"⚠️ Could not parse job positions: {e}")
+            with self._lock:
+                self._checked_at = time.monotonic()
+            return
+        self._set(df, sha)
+
+    def load(self, fresh=False, edits=None):
+        """Job positions, with a batch's staged edits applied.
+
+        Args:
+            fresh (bool): Revalidate now instead of trusting a recent check
+            edits (JobPositionEdits): Apply this batch's staged edits
+
+        Returns:
+            pd.DataFrame: A copy of the positions (empty with the expected
+                columns when there is no file)
+        """
+        with self._lock:
+            due = (fresh or self._df is None or self._checked_at is None
+                   or time.monotonic() - self._checked_at >= self.revalidate_seconds)
+        if due:
+            self.refresh()
+        with self._lock:
+            df = self._df.copy()
+        return _apply_edits(df, edits.staged_edits()) if edits is not None else df
+
+    def edits(self):
+        """A new, empty batch of edits to this file."""
+        return JobPositionEdits(self)
+
+    # ── Committing ────────────────────────────────────────────────────────
+    def commit(self, message, edits, builder=None, on_commit=None):
+        """Apply edit functions to the latest file and commit them as one commit.
+
+        Args:
+            message (str): Commit message
+            edits (list): Edit functions, applied in order
+            builder (GitCommitBuilder): Stage the change in this builder (the
+                caller commits it); without one it is committed here
+            on_commit (callable): Called once the change is committed
+
+        Returns:
+            bool: True if the edits were committed (or staged in builder)
+        """
+        if not _get_config("GITHUB_TOKEN"):
+            self.refresh()
+            with self._lock:
+                df = _apply_edits(self._df.copy(), edits)
+            text = df.to_csv(index=False)
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "w", encoding="utf-8") as f:
+                    f.write(text)
+            except OSError as e:
+                _log_error(f"❌ Could not save job positions: {e}")
+                return False
+            self._set(df, git_blob_sha(text))
+            if on_commit is not None:
+                on_commit()
+            return True
+
+        written = {}
+
+        def merge(existing_csv):
+            df = _read_positions(existing_csv) if existing_csv is not None else pd.DataFrame(columns=JOB_POSITIONS_COLUMNS)
+            written["text"] = _apply_edits(df, edits).to_csv(index=False)
+            return written["text"]
+
+        def committed():
+            self._set(_read_positions(written["text"]), git_blob_sha(written["text"]))
+            if on_commit is not None:
+                on_commit()
+
+        own_builder = builder is None
+        if own_builder:
+            builder = GitCommitBuilder(message)
+        builder.merge(self.path, merge, on_commit=committed)
+        return builder.commit() if own_builder else True
+
+
+class JobPositionEdits:
+    """Edits to job positions staged by one caller and committed together."""
+
+    def __init__(self, repository):
+        self.repository = repository
+        self._pending = []       # [(commit message, edit)]
+        self._generation = 0     # bumped whenever _pending changes
+        self._loaded = None      # ((file sha, generation), edited positions)
+        self._lock = threading.Lock()
+
+    def staged_edits(self):
+        """Edit functions staged so far, in order."""
+        with self._lock:
+            return [edit for _, edit in self._pending]
+
+    def load(self, fresh=False):
+        """Job positions with these edits applied (see JobPositionsRepository.load).
+
+        The edited frame is kept until the file or the edits change, so a
+        page that reads the positions on every rerun applies the edits once.
+        """
+        df = self.repository.load(fresh)
+        with self._lock:
+            key = (self.repository.sha, self._generation)
+            if self._loaded is not None and self._loaded[0] == key:
+                return self._loaded[1].copy()
+            edits = [edit for _, edit in self._pending]
+        df = _apply_edits(df, edits)
+        with self._lock:
+            if self._generation == key[1]:
+                self._loaded = (key, df)
+        return df.copy()
+
+    def _stage(self, message, edit):
+        if edit(self.load()) is None:
+            return False
+        with self._lock:
+            self._pending.append((message, edit))
+            self._generation += 1
+        return True
+
+    def add(self, new_rows):
+        """Stage new or updated positions (merged like save_job_positions_to_github)."""
+        return self._stage("📋 Update job_positions.csv via Streamlit app", _add_edit(new_rows))
+
+    def delete(self, job_position):
+        """Stage removing a position."""
+        return self._stage(f"🗑️ Delete job position: {job_position}", _delete_edit(job_position))
+
+    def update(self, old_position, new_position, new_description, new_job_id=None):
+        """Stage renaming / editing a position.
+
+        Returns:
+            bool: False if the position does not exist
+        """
+        edit = _update_edit(old_position, new_position, new_description, new_job_id,
+                            pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"))
+        if not self._stage(f"✏️ Update job position: {old_position} → {new_position}", edit):
+            _log_error(f"❌ Job position '{old_position}' not found")
+            return False
+        return True
+
+    def set_pooling(self, job_position, pooling_status):
+        """Stage a pooling status change ("Pooled" or "" to unpool).
+
+        Returns:
+            bool: False if the position does not exist
+        """
+        if not self._stage(f"📦 Toggle pooling status for: {job_position}", _pooling_edit(job_position, pooling_status)):
+            _log_error(f"❌ Job position '{job_position}' not found")
+            return False
+        return True
+
+    @property
+    def pending(self):
+        """Number of staged edits."""
+        with self._lock:
+            return len(self._pending)
+
+    def discard(self):
+        """Drop every staged edit."""
+        with self._lock:
+            self._pending = []
+            self._generation += 1
+
+    def _drop(self, staged):
+        with self._lock:
+            self._pending = [entry for entry in self._pending if not any(entry is done for done in staged)]
+            self._generation += 1
+
+    def flush(self, builder=None):
+        """Commit the staged edits as one commit.
+
+        Args:
+            builder (GitCommitBuilder): Stage the change in this builder (the
+                caller commits it); without one it is committed here
+
+        Returns:
+            bool: True if there was nothing to commit or the edits were
+                committed (or staged). On failure the edits stay staged.
+        """
+        with self._lock:
+            staged = list(self._pending)
+        if not staged:
+            return True
+        message = staged[0][0] if len(staged) == 1 else f"📋 Update job_positions.csv ({len(staged)} changes)"
+        edits = [edit for _, edit in staged]
+        return self.repository.commit(message, edits, builder, on_commit=lambda: self._drop(staged))
+
+
+_REPOSITORIES = {}
+_REPOSITORIES_LOCK = threading.Lock()
+
+
+def get_job_positions_repository(path=JOB_POSITIONS_PATH):
+    """The process-wide repository for a job positions file."""
+    with _REPOSITORIES_LOCK:
+        if path not in _REPOSITORIES:
+            _REPOSITORIES[path] = JobPositionsRepository(path)
+        return _REPOSITORIES[path]
@@ -0,0 +1,278 @@
+"""
+Buffered Result Writer
+Micro-batches screening results before saving them to GitHub.
+
+save_results_to_github() downloads, merges, deduplicates and re-uploads the
+whole position CSV on every call, so saving one candidate at a time costs a
+full read-modify-write (and a commit) per candidate. BufferedResultWriter
+collects rows and saves them together every FLUSH_ROWS rows or FLUSH_SECONDS
+seconds, and once more at close(). The age check runs on a background timer
+as well as on add(), so rows are saved on time even while the pipeline
+stalls (a slow Step 2, a rate-limit pause).
+
+Every buffered row is also appended to a local JSONL journal
+(outputs/result_journal/) before it is acknowledged. A run that crashes
+before flushing leaves its rows in the journal, and the next writer for the
+same position replays them into its buffer.
+
+With a shared GitCommitBuilder (auto_screen passes one to every position),
+a flush stages the merge instead of committing it. The builder commits all
+positions' staged rows together at most every BATCH_COMMIT_SECONDS, and
+once more at the end of the run. Staged rows stay in the journal until
+that commit lands.
+
+With a local results store (RESULTS_STORE=sqlite), a flush writes the rows
+to the store; the store syncs them to GitHub at the end of the run. The
+rows stay in the journal until that sync commit lands (results.db is not
+kept between workflow runs).
+"""
+
+import os
+import json
+import time
+import threading
+
+import pandas as pd
+
+from src.config.paths import RESULT_JOURNAL_DIR
+from src.repositories.github_utils import get_results_filename, merge_results_csv, save_results_to_github
+from src.utils.run_profiler import profile_span
+
+# Flush after this many buffered rows...
+FLUSH_ROWS = 10
+# ...or when the oldest buffered row has waited this long (seconds)
+FLUSH_SECONDS = 120
+
+# With a shared GitCommitBuilder: commit staged rows at most this often (seconds)
+BATCH_COMMIT_SECONDS = 300
+
+
+class BufferedResultWriter:
+    """Accumulate result rows for one position and save them in batches."""
+
+    def __init__(self, job_position, flush_rows=FLUSH_ROWS, flush_seconds=FLUSH_SECONDS,
+                 on_flush=None, journal_dir=RESULT_JOURNAL_DIR, builder=None,
+                 commit_seconds=BATCH_COMMIT_SECONDS, store=None, on_saved=None):
+        """
+        Args:
+            job_position (str): Position whose results file is written
+            flush_rows (int): Flush when this many rows are buffered
+            flush_seconds (float): Flush when the oldest buffered row is this old
+            on_flush (callable): Optional on_flush(rows) called after each successful flush
+            journal_dir (Path): Directory for the local JSONL journal
+            builder (GitCommitBuilder): Optional shared builder; flushes are
+                staged in it and committed in batches
+            commit_seconds (float): With a builder, minimum time between commits
+            store (ResultsStore): Optional local results store; flushes are
+                appended to it (and synced by the caller) instead of GitHub
+            on_saved (callable): Optional on_saved(rows) called once rows are
+                on GitHub (after the save, or once the builder commit / store
+                sync commit that holds them lands)
+        """
+        self.job_position = job_position
+        self.path = get_results_filename(job_position)
+        self.flush_rows = max(1, int(flush_rows))
+        self.flush_seconds = flush_seconds
+        self.on_flush = on_flush
+        self.on_saved = on_saved
+        self.journal_path = journal_dir / (os.path.basename(self.path).rsplit(".", 1)[0] + ".jsonl")
+        self.builder = builder
+        self.commit_seconds = commit_seconds
+        self.store = store if store is not None and store.local else None
+        self.flush_count = 0
+        self._staged = []   # batches staged in the builder, not committed yet
+        self._buffer = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()   # one flush (and on_flush) at a time
+        self._stop = threading.Event()
+        self._timer = None
+        self._replay_journal()
+        if self._buffer:
+            self._start_timer()
+
+    def _replay_journal(self):
+        """Load rows left in the journal by a previous run that did not flush."""
+        if not self.journal_path.exists():
+            return
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not read result journal {self.journal_path}: {e}")
+            return
+        if rows:
+            print(f"   ↩️  Recovered {len(rows)} unsaved result(s) from {self.journal_path.name}")
+            self._buffer.extend(rows)
+            self._oldest = time.monotonic()
+
+    def _append_journal(self, row):
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+            f.flush()
+
+    def _reset_journal(self):
+        try:
+            self.journal_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _rewrite_journal(self):
+        """Keep only rows that are staged or buffered (called under the lock)."""
+        rows = [row for batch in self._staged for row in batch] + self._buffer
+        if not rows:
+            self._reset_journal()
+            return
+        tmp_path = self.journal_path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        os.replace(tmp_path, self.journal_path)
+
+    def _committed(self, rows):
+        """Builder / store callback: the staged batch is on the branch."""
+        with self._lock:
+            self._staged = [batch for batch in self._staged if batch is not rows]
+            self._rewrite_journal()
+        if self.on_saved is not None:
+            self.on_saved(rows)
+
+    def _stage(self, rows):
+        """Stage rows in the shared builder (journal is kept until the commit)."""
+        frame = pd.DataFrame(rows)
+        self.builder.merge(
+            self.path,
+            lambda existing_csv: merge_results_csv(existing_csv, frame),
+            on_commit=lambda: self._committed(rows),
+        )
+        self._staged.append(rows)
+        return True
+
+    def _start_timer(self):
+        """Start the background age check (once; not after close())."""
+        if not self.flush_seconds or self.flush_seconds <= 0 or self._stop.is_set():
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Thread(target=self._run_timer, name=f"result-flush-{self.job_position}", daemon=True)
+            self._timer.start()
+
+    def _seconds_until_due(self):
+        with self._lock:
+            if not self._buffer or self._oldest is None:
+                return self.flush_seconds
+            return max(0.0, self._oldest + self.flush_seconds - time.monotonic())
+
+    def _run_timer(self):
+        wait = self._seconds_until_due()
+        while not self._stop.wait(wait):
+            wait = self._seconds_until_due()
+            if wait > 0:
+                continue
+            try:
+                saved = self.flush()
+            except Exception as e:
+                print(f"⚠ Timed flush of {self.job_position} results failed: {e}")
+                saved = False
+            # A failed flush is retried after another FLUSH_SECONDS
+            wait = self._seconds_until_due() if saved else self.flush_seconds
+
+    @property
+    def pending(self):
+        """Number of rows buffered but not yet saved."""
+        return len(self._buffer)
+
+    def buffered_rows(self):
+        """Copy of the rows buffered but not yet saved (including replayed ones)."""
+        with self._lock:
+            return list(self._buffer)
+
+    def add(self, row):
+        """Buffer one result row (dict); flushes if a threshold is reached.
+
+        Returns:
+            bool: False only if a triggered flush failed (rows stay buffered)
+        """
+        with self._lock:
+            self._append_journal(row)
+            self._buffer.append(row)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+        self._start_timer()
+        if self._should_flush():
+            return self.flush()
+        return True
+
+    def _should_flush(self):
+        with self._lock:
+            if not self._buffer:
+                return False
+            if len(self._buffer) >= self.flush_rows:
+                return True
+            return self._oldest is not None and time.monotonic() - self._oldest >= self.flush_seconds
+
+    def flush(self):
+        """Save all buffered rows with a single read-modify-write.
+
+        On failure the rows stay buffered (and journaled) for the next flush.
+        Called from add(), the background timer and close(); flushes (and
+        on_flush) never run concurrently.
+
+        Returns:
+            bool: True if there was nothing to save or the save succeeded
+        """
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self):
+        with self._lock:
+            if not self._buffer:
+                return True
+            rows = list(self._buffer)
+            if self.store is not None:
+                success = self.store.append(self.job_position, pd.DataFrame(rows))
+                if success:
+                    # Journal is kept until the store's sync commit lands
+                    self._staged.append(rows)
+            elif self.builder is not None:
+                success = self._stage(rows)
+            else:
+                with profile_span("github_save"):
+                    success = save_results_to_github(
+                        pd.DataFrame(rows),
+                        path=self.path,
+                        commit_message=f"📊 Add {len(rows)} screening result(s) for {self.job_position}",
+                    )
+            if success:
+                self._buffer = []
+                self._oldest = None
+                if self.store is None and self.builder is None:
+                    self._reset_journal()
+                self.flush_count += 1
+            else:
+                print(f"⚠ Could not save {len(rows)} buffered result(s); will retry on next flush")
+        if success and self.store is None and self.builder is None and self.on_saved is not None:
+            self.on_saved(rows)
+        if success and self.store is not None:
+            self.store.when_synced(self.job_position, lambda: self._committed(rows))
+        if success and self.on_flush is not None:
+            self.on_flush(rows)
+        if success and self.store is None and self.builder is not None:
+            self.builder.commit_if_due(self.commit_seconds)
+        return success
+
+    def close(self):
+        """Flush remaining rows at the end of the run.
+
+        With a builder the rows are staged; the caller commits the builder.
+
+        Returns:
+            bool: True if everything buffered was saved (or staged)
+        """
+        self._stop.set()
+        timer = self._timer
+        if timer is not None and timer is not threading.current_thread():
+            timer.join()
+        return self.flush()
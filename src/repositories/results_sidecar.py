@@ -0,0 +1,136 @@
+"""
+Results Sidecar
+Parquet copies of the results_*.csv files for fast, column-projected reads.
+
+Parsing the 1-2 MB results CSVs (AI Summary, Strengths, Weaknesses and Gaps
+are long free text) dominates dashboard load time. Whenever a results CSV is
+written, a Parquet sidecar with the same rows is written next to it:
+
+    data/processed/results_Data_Analyst.csv      (source of truth)
+    data/processed/results_Data_Analyst.parquet  (sidecar)
+
+The sidecar records the git blob SHA of the CSV it was built from. Readers
+only use a sidecar whose SHA matches the current CSV, so a CSV edited by
+hand, or committed without its sidecar, is simply read as CSV again. Readers
+can ask for a subset of columns (RESULTS_LIST_COLUMNS skips the long text),
+which Parquet reads without touching the other columns.
+
+pyarrow is optional (it comes with streamlit). Without it no sidecars are
+written or read.
+"""
+
+import hashlib
+import os
+from io import StringIO
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Parquet schema metadata key holding the git blob SHA of the source CSV
+SIDECAR_SHA_KEY = b"csv_blob_sha"
+
+SIDECAR_COMPRESSION = "zstd"
+
+
+def git_blob_sha(data):
+    """SHA git assigns to a blob with this content (bytes or str)."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def sidecar_path(csv_path):
+    """Sidecar path for a results CSV, or None for any other file."""
+    path = str(csv_path)
+    if not (os.path.basename(path).startswith("results_") and path.endswith(".csv")):
+        return None
+    return path[:-len(".csv")] + ".parquet"
+
+
+def build_sidecar(csv_text):
+    """Parquet bytes with the rows of a results CSV.
+
+    Args:
+        csv_text (str): CSV content exactly as written
+
+    Returns:
+        bytes: Parquet file, or None without pyarrow or for an unparsable CSV
+    """
+    if not HAS_PYARROW:
+        return None
+    try:
+        df = pd.read_csv(StringIO(csv_text))
+    except (pd.errors.EmptyDataError, pd.errors.ParserError, ValueError):
+        return None
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SIDECAR_SHA_KEY] = git_blob_sha(csv_text).encode("ascii")
+    table = table.replace_schema_metadata(metadata)
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression=SIDECAR_COMPRESSION)
+    return sink.getvalue().to_pybytes()
+
+
+def read_sidecar(data, csv_sha=None, columns=None):
+    """DataFrame from sidecar bytes.
+
+    Args:
+        data (bytes): Parquet file
+        csv_sha (str): Blob SHA of the current CSV; a sidecar built from
+            another version is rejected
+        columns (list): Read only these columns (missing ones are skipped)
+
+    Returns:
+        pd.DataFrame: Rows, or None if the sidecar is stale, unreadable or
+            pyarrow is missing
+    """
+    if not HAS_PYARROW or not data:
+        return None
+    try:
+        parquet = pq.ParquetFile(pa.BufferReader(data))
+        schema = parquet.schema_arrow
+        if csv_sha and (schema.metadata or {}).get(SIDECAR_SHA_KEY, b"").decode("ascii") != csv_sha:
+            return None
+        names = [name for name in columns if name in schema.names] if columns else None
+        return parquet.read(columns=names).to_pandas()
+    except (pa.ArrowException, OSError, ValueError):
+        return None
+
+
+def write_local_sidecar(csv_path, csv_text):
+    """Write (or remove, if it cannot be built) the sidecar of a local results CSV."""
+    path = sidecar_path(csv_path)
+    if path is None or not HAS_PYARROW:
+        return
+    data = build_sidecar(csv_text)
+    try:
+        if data is None:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠ Could not write results sidecar {path}: {e}")
+
+
+def read_local_sidecar(csv_path, columns=None):
+    """Rows of a local results CSV from its sidecar, or None if missing or stale."""
+    path = sidecar_path(csv_path)
+    if path is None or not HAS_PYARROW or not os.path.exists(path):
+        return None
+    try:
+        with open(csv_path, "rb") as f:
+            csv_sha = git_blob_sha(f.read())
+        with open(path, "rb") as f:
+            return read_sidecar(f.read(), csv_sha, columns)
+    except OSError:
+        return None
@@ -0,0 +1,585 @@
+"""
+Results Store
+Pluggable storage for per-position screening results.
+
+Results have always lived in data/processed/results_<position>.csv on GitHub,
+read and written as whole base64 blobs through the Contents API (a status
+change in the app re-uploads the whole file). ResultsStore puts one interface
+in front of that so callers do not care where the rows live:
+
+    store = get_results_store()          # RESULTS_STORE=github|sqlite|local
+    df = store.load("Data Analyst")
+    store.append("Data Analyst", new_rows)     # existing rows win
+    store.upsert("Data Analyst", edited_rows)  # matching rows are replaced
+    store.sync()                               # push local changes to GitHub
+
+Backends:
+- GitHubCSVStore: the existing github_utils functions (default for the app
+  and auto_screen).
+- LocalCSVStore: results CSVs in the working tree (default for
+  update_cv_links, whose workflow commits the files with git).
+- SQLiteResultsStore: one local SQLite database (outputs/results.db) with a
+  row per (position, candidate key), indexed on email and Date Applied.
+  Reads and status updates are local queries. A position is pulled from
+  GitHub the first time it is read, and again whenever its CSV's blob SHA
+  changed (checked at most every RESULTS_REMOTE_CHECK_SECONDS), so results
+  written by auto_screen show up. sync() (at the end of a run, or every
+  RESULTS_SYNC_SECONDS from a ResultsSyncer) exports the changed positions as
+  CSV and merges them into GitHub in a single GitCommitBuilder commit.
+
+Candidate keys follow the checkpoint journal: lower-cased email, else
+"name_phone".
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from io import StringIO
+
+import pandas as pd
+
+from src.config.paths import DATA_PROCESSED_DIR, RESULTS_DB_FILE
+from src.repositories.results_sidecar import read_local_sidecar, write_local_sidecar
+from src.repositories.status_patches import (
+    apply_status_patches,
+    load_all_status_patches,
+    load_status_patches,
+    make_status_patch,
+    record_status_update,
+    status_patch_mask,
+)
+from src.repositories.github_utils import (
+    RESULTS_COLUMNS,
+    _get_config,
+    _merge_results,
+    _project_columns,
+    get_results_blob_sha,
+    get_results_filename,
+    load_all_results_from_github,
+    load_results_for_position,
+    load_results_from_github,
+    save_results_to_github,
+    update_results_in_github,
+)
+
+# Backends selectable with RESULTS_STORE
+RESULTS_STORE_BACKENDS = ("github", "sqlite", "local")
+
+# ResultsSyncer: seconds between background syncs to GitHub
+RESULTS_SYNC_SECONDS = 300
+
+# SQLiteResultsStore: check GitHub for newer results (e.g. from auto_screen)
+# at most this often per position (seconds)
+RESULTS_REMOTE_CHECK_SECONDS = 60
+
+
+def result_row_keys(df):
+    """Candidate key per results row: lower-cased email, else "name_phone"."""
+    def column(name):
+        if name not in df.columns:
+            return pd.Series("", index=df.index, dtype=object)
+        return df[name].fillna("").astype(str).str.strip()
+
+    email = column("Candidate Email").str.lower()
+    name_phone = column("Candidate Name").str.lower() + "_" + column("Phone")
+    return email.where(email != "", name_phone)
+
+
+def _as_text(df):
+    """df as CSV cell text (what a CSV round trip would store), '' for missing."""
+    return pd.read_csv(StringIO(df.to_csv(index=False)), dtype=str, keep_default_na=False)
+
+
+class ResultsStore(ABC):
+    """Interface shared by the results backends."""
+
+    # True when writes stay on this machine until sync()
+    local = False
+
+    @abstractmethod
+    def load(self, job_position, fresh=False, columns=None):
+        """Results of one position (empty frame with RESULTS_COLUMNS if none).
+
+        Args:
+            job_position (str): Position name
+            fresh (bool): Bypass caches and re-read the source of truth
+            columns (list): Only these columns (e.g. RESULTS_LIST_COLUMNS)
+
+        Returns:
+            pd.DataFrame: Results, or None if the backend could not be read
+        """
+
+    @abstractmethod
+    def load_all(self):
+        """Results of every position in one frame."""
+
+    @abstractmethod
+    def append(self, job_position, df):
+        """Add rows; rows already stored for the same candidate are kept.
+
+        Returns:
+            bool: True if saved
+        """
+
+    @abstractmethod
+    def upsert(self, job_position, df):
+        """Add rows, replacing stored rows of the same candidates.
+
+        Returns:
+            bool: True if saved
+        """
+
+    @abstractmethod
+    def replace(self, job_position, df):
+        """Replace all results of a position with df.
+
+        Returns:
+            bool: True if saved
+        """
+
+    def update_status(self, job_position, email, name, fields, author=None):
+        """Set recruiter status fields (STATUS_FIELDS) of one candidate.
+
+        Args:
+            job_position (str): Position of the candidate
+            email (str): Candidate email, matched case-insensitively
+            name (str): Candidate name, matched when there is no email
+            fields (dict): Status columns to set
+            author (str): Who made the change
+
+        Returns:
+            bool: True if saved
+        """
+        df = self.load(job_position)
+        if df is None:
+            return False
+        patch = make_status_patch(job_position, email, name, fields, author)
+        mask = status_patch_mask(df, patch)
+        if not mask.any():
+            return False
+        return self.upsert(job_position, apply_status_patches(df[mask], [patch]))
+
+    def sync(self, builder=None):
+        """Push local changes to GitHub (no-op for backends that write through).
+
+        Returns:
+            bool: True if everything is synced
+        """
+        return True
+
+    def when_synced(self, job_position, callback):
+        """Call callback() once the position's writes so far are on GitHub.
+
+        Backends that write through call it at once.
+        """
+        callback()
+
+
+class GitHubCSVStore(ResultsStore):
+    """Position CSVs on GitHub through the Contents API (github_utils).
+
+    Status updates are saved as status patch files and applied on load,
+    instead of rewriting the CSV.
+    """
+
+    def load(self, job_position, fresh=False, columns=None):
+        if fresh:
+            df = load_results_from_github(path=get_results_filename(job_position), columns=columns)
+        else:
+            df = load_results_for_position(job_position, columns=columns)
+        return apply_status_patches(df, load_status_patches(job_position))
+
+    def load_all(self):
+        return apply_status_patches(load_all_results_from_github(), load_all_status_patches())
+
+    def update_status(self, job_position, email, name, fields, author=None):
+        return record_status_update(job_position, email, name, fields, author)
+
+    def append(self, job_position, df):
+        return save_results_to_github(df, job_position=job_position)
+
+    def upsert(self, job_position, df):
+        existing = self.load(job_position, fresh=True)
+        if existing is None:
+            return False
+        return update_results_in_github(_merge_results(df, existing), job_position=job_position)
+
+    def replace(self, job_position, df):
+        return update_results_in_github(df, job_position=job_position)
+
+
+class LocalCSVStore(ResultsStore):
+    """Position CSVs in a local directory (committed by the caller's workflow)."""
+
+    local = True
+
+    def __init__(self, directory=DATA_PROCESSED_DIR):
+        self.directory = directory
+
+    def path(self, job_position):
+        """Local file holding a position's results."""
+        return self.directory / os.path.basename(get_results_filename(job_position))
+
+    def load(self, job_position, fresh=False, columns=None):
+        path = self.path(job_position)
+        if not path.exists():
+            return pd.DataFrame(columns=columns or RESULTS_COLUMNS)
+        df = read_local_sidecar(path, columns)
+        if df is not None:
+            return df
+        try:
+            return _project_columns(pd.read_csv(path), columns)
+        except pd.errors.EmptyDataError:
+            return pd.DataFrame(columns=RESULTS_COLUMNS)
+        except (OSError, pd.errors.ParserError, ValueError) as e:
+            print(f"❌ Error loading {path}: {e}")
+            return None
+
+    def load_all(self):
+        frames = [pd.read_csv(path) for path in sorted(self.directory.glob("results_*.csv"))]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=RESULTS_COLUMNS)
+        return pd.concat(frames, ignore_index=True, sort=False)
+
+    def _write(self, job_position, df):
+        try:
+            path = self.path(job_position)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            csv_text = df.to_csv(index=False)
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(csv_text)
+            write_local_sidecar(path, csv_text)
+            return True
+        except OSError as e:
+            print(f"❌ Error saving results: {e}")
+            return False
+
+    def append(self, job_position, df):
+        existing = self.load(job_position)
+        if existing is None:
+            return False
+        return self._write(job_position, _merge_results(existing, df))
+
+    def upsert(self, job_position, df):
+        existing = self.load(job_position)
+        if existing is None:
+            return False
+        return self._write(job_position, _merge_results(df, existing))
+
+    def replace(self, job_position, df):
+        return self._write(job_position, df)
+
+
+class SQLiteResultsStore(ResultsStore):
+    """Results of all positions in one SQLite database, synced to GitHub CSVs."""
+
+    local = True
+
+    def __init__(self, db_path=RESULTS_DB_FILE):
+        """
+        Args:
+            db_path (Path): Database file (created if missing)
+        """
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._checked = {}          # position -> monotonic time of the last remote check
+        self._sync_callbacks = {}   # position -> [(version, callback)] waiting for a sync
+        self._all_checked = None    # monotonic time load_all() last pulled GitHub
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f'"{column}" TEXT' for column in RESULTS_COLUMNS)
+        with self._db:
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS results (position TEXT NOT NULL, row_key TEXT NOT NULL, "
+                f"{columns}, extra TEXT, PRIMARY KEY (position, row_key))"
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS results_email ON results ("Candidate Email")')
+            self._db.execute('CREATE INDEX IF NOT EXISTS results_applied ON results (position, "Date Applied")')
+            # version counts local writes; synced_version is the last one on GitHub
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state (position TEXT PRIMARY KEY, "
+                "version INTEGER NOT NULL DEFAULT 0, synced_version INTEGER NOT NULL DEFAULT 0)"
+            )
+            # remote_sha is the blob SHA of the GitHub CSV last pulled
+            state_columns = {row[1] for row in self._db.execute("PRAGMA table_info(sync_state)")}
+            if "remote_sha" not in state_columns:
+                self._db.execute("ALTER TABLE sync_state ADD COLUMN remote_sha TEXT")
+
+    # ── Rows ──────────────────────────────────────────────────────────────
+    def _records(self, job_position, df):
+        """(position, row_key, *RESULTS_COLUMNS, extra) tuples, first row per key."""
+        text = _as_text(df)
+        text["_key"] = result_row_keys(text).values
+        text = text.drop_duplicates(subset="_key", keep="first")
+        extras = [column for column in text.columns if column not in RESULTS_COLUMNS and column != "_key"]
+        records = []
+        for row in text.to_dict("records"):
+            values = [row.get(column) or None for column in RESULTS_COLUMNS]
+            extra = {column: row[column] for column in extras if row[column]}
+            records.append((job_position, row["_key"], *values, json.dumps(extra, ensure_ascii=False) if extra else None))
+        return records, extras
+
+    def _write(self, job_position, df, mode):
+        """Insert rows with mode "ignore" (keep stored) or "update" (replace stored)."""
+        if df is None or df.empty:
+            return True
+        records, extras = self._records(job_position, df)
+        names = ", ".join(f'"{column}"' for column in ["position", "row_key", *RESULTS_COLUMNS, "extra"])
+        marks = ", ".join("?" * (len(RESULTS_COLUMNS) + 3))
+        if mode == "ignore":
+            sql = f"INSERT OR IGNORE INTO results ({names}) VALUES ({marks})"
+        else:
+            updated = [column for column in RESULTS_COLUMNS if column in df.columns] + (["extra"] if extras else [])
+            assignments = ", ".join(f'"{column}" = excluded."{column}"' for column in updated)
+            sql = (f"INSERT INTO results ({names}) VALUES ({marks}) "
+                   f"ON CONFLICT (position, row_key) DO UPDATE SET {assignments}")
+        self._db.executemany(sql, records)
+        return True
+
+    def _touch(self, job_position):
+        """Count a local write to the position (it needs a sync)."""
+        self._db.execute(
+            "INSERT INTO sync_state (position, version) VALUES (?, 1) "
+            "ON CONFLICT (position) DO UPDATE SET version = version + 1",
+            (job_position,),
+        )
+
+    def _pull(self, job_position, df, remote_sha=None):
+        """Merge rows read from GitHub; local rows win."""
+        self._write(job_position, df, "ignore")
+        self._db.execute("INSERT OR IGNORE INTO sync_state (position) VALUES (?)", (job_position,))
+        if remote_sha:
+            self._db.execute("UPDATE sync_state SET remote_sha = ? WHERE position = ?", (remote_sha, job_position))
+
+    def _ensure(self, job_position, fresh=False):
+        """Pull a position from GitHub when it is new here, its CSV changed, or fresh.
+
+        The CSV's blob SHA is checked at most every RESULTS_REMOTE_CHECK_SECONDS.
+        """
+        known = self._db.execute("SELECT remote_sha FROM sync_state WHERE position = ?", (job_position,)).fetchone()
+        path = get_results_filename(job_position)
+        now = time.monotonic()
+        if known and not fresh:
+            checked = self._checked.get(job_position)
+            if checked is not None and now - checked < RESULTS_REMOTE_CHECK_SECONDS:
+                return True
+        remote_sha = get_results_blob_sha(path)
+        self._checked[job_position] = now
+        if known and not fresh and (remote_sha is None or remote_sha == "" or remote_sha == known[0]):
+            return True
+        remote = load_results_from_github(path=path)
+        if remote is None:
+            return bool(known)
+        with self._db:
+            self._pull(job_position, remote, remote_sha)
+        return True
+
+    def _frame(self, rows, columns):
+        """DataFrame with the dtypes a CSV load of the same rows would give."""
+        extras = [json.loads(row[-1]) if row[-1] else {} for row in rows]
+        extra_columns = list(dict.fromkeys(column for extra in extras for column in extra))
+        data = [list(row[:-1]) + [extra.get(column) for column in extra_columns] for row, extra in zip(rows, extras)]
+        frame = pd.DataFrame(data, columns=columns + extra_columns)
+        if frame.empty:
+            return pd.DataFrame(columns=columns + extra_columns)
+        return pd.read_csv(StringIO(frame.to_csv(index=False)))
+
+    def _select(self, where="", params=()):
+        names = ", ".join(f'"{column}"' for column in RESULTS_COLUMNS)
+        rows = self._db.execute(
+            f'SELECT {names}, extra FROM results {where} ORDER BY "Date Applied" DESC, "Date Processed" DESC',
+            params,
+        ).fetchall()
+        return self._frame(rows, list(RESULTS_COLUMNS))
+
+    # ── ResultsStore ──────────────────────────────────────────────────────
+    def load(self, job_position, fresh=False, columns=None):
+        with self._lock:
+            if not self._ensure(job_position, fresh):
+                return None
+            return _project_columns(self._select("WHERE position = ?", (job_position,)), columns)
+
+    def load_all(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._all_checked is None or now - self._all_checked >= RESULTS_REMOTE_CHECK_SECONDS:
+                # Only changed files are downloaded again; pulling keeps local rows
+                remote = load_all_results_from_github()
+                if remote is not None and "Job Position" in remote.columns:
+                    with self._db:
+                        for position, rows in remote.groupby("Job Position", sort=False):
+                            self._pull(position, rows)
+                self._all_checked = now
+            return self._select()
+
+    def append(self, job_position, df):
+        with self._lock:
+            self._ensure(job_position)
+            with self._db:
+                self._write(job_position, df, "ignore")
+                self._touch(job_position)
+            return True
+
+    def upsert(self, job_position, df):
+        with self._lock:
+            self._ensure(job_position)
+            with self._db:
+                self._write(job_position, df, "update")
+                self._touch(job_position)
+            return True
+
+    def replace(self, job_position, df):
+        with self._lock:
+            with self._db:
+                self._db.execute("DELETE FROM results WHERE position = ?", (job_position,))
+                self._write(job_position, df, "ignore")
+                self._db.execute("INSERT OR IGNORE INTO sync_state (position) VALUES (?)", (job_position,))
+                self._touch(job_position)
+            return True
+
+    def dirty_positions(self):
+        """{position: version} of positions with writes not yet on GitHub."""
+        with self._lock:
+            rows = self._db.execute("SELECT position, version FROM sync_state WHERE version > synced_version")
+            return dict(rows.fetchall())
+
+    def _mark_synced(self, job_position, version):
+        with self._lock:
+            with self._db:
+                self._db.execute(
+                    "UPDATE sync_state SET synced_version = MAX(synced_version, ?) WHERE position = ?",
+                    (version, job_position),
+                )
+            waiting = self._sync_callbacks.pop(job_position, [])
+            done = [callback for needed, callback in waiting if needed <= version]
+            still_waiting = [(needed, callback) for needed, callback in waiting if needed > version]
+            if still_waiting:
+                self._sync_callbacks[job_position] = still_waiting
+        for callback in done:
+            callback()
+
+    def when_synced(self, job_position, callback):
+        """Call callback() once the position's local writes so far are synced.
+
+        BufferedResultWriter keeps its journal until then: results.db is not
+        kept between workflow runs, so rows only in it would be lost if the
+        sync commit failed.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT version, synced_version FROM sync_state WHERE position = ?", (job_position,)
+            ).fetchone()
+            if row is not None and row[0] > row[1]:
+                self._sync_callbacks.setdefault(job_position, []).append((row[0], callback))
+                return
+        callback()
+
+    def sync(self, builder=None):
+        """Merge every changed position into its GitHub CSV.
+
+        Local rows win over GitHub rows of the same candidate; rows only on
+        GitHub (e.g. saved by another run) are kept.
+
+        Args:
+            builder (GitCommitBuilder): Stage the files in this builder (the
+                caller commits it). Without one, a builder is created and
+                committed here.
+
+        Returns:
+            bool: True if nothing was dirty, the changes were staged, or the
+                commit landed
+        """
+        from src.repositories.git_commit_builder import GitCommitBuilder
+
+        dirty = self.dirty_positions()
+        if not dirty:
+            return True
+        own_builder = builder is None
+        if own_builder:
+            builder = GitCommitBuilder(f"📊 Sync screening results for {len(dirty)} position(s)")
+        for position, version in dirty.items():
+            local_df = self.load(position)
+            builder.merge(
+                get_results_filename(position),
+                lambda existing_csv, local_df=local_df: _merge_results(
+                    local_df,
+                    pd.read_csv(StringIO(existing_csv)) if existing_csv else pd.DataFrame(),
+                ).to_csv(index=False),
+                on_commit=lambda position=position, version=version: self._mark_synced(position, version),
+            )
+        print(f"🔄 Syncing {len(dirty)} position(s) from {os.path.basename(self.db_path)} to GitHub")
+        return builder.commit() if own_builder else True
+
+
+class ResultsSyncer:
+    """Background thread calling store.sync() every interval seconds."""
+
+    def __init__(self, store, interval=RESULTS_SYNC_SECONDS):
+        self.store = store
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="results-sync", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.store.sync()
+            except Exception as e:
+                print(f"⚠️ Background results sync failed (will retry): {e}")
+
+    def stop(self):
+        """Stop the thread and sync one last time."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        return self.store.sync()
+
+
+_STORES = {}
+_SYNCER = None
+_STORES_LOCK = threading.Lock()
+
+
+def get_results_store(default="github"):
+    """The process-wide store selected by RESULTS_STORE (or default).
+
+    Args:
+        default (str): Backend when RESULTS_STORE is not set: "github",
+            "sqlite" or "local"
+
+    Returns:
+        ResultsStore: Shared store instance for that backend
+    """
+    kind = str(_get_config("RESULTS_STORE") or default).strip().lower()
+    if kind not in RESULTS_STORE_BACKENDS:
+        print(f"⚠️ Unknown RESULTS_STORE '{kind}', using '{default}'")
+        kind = default
+    with _STORES_LOCK:
+        if kind not in _STORES:
+            if kind == "sqlite":
+                _STORES[kind] = SQLiteResultsStore()
+            elif kind == "local":
+                _STORES[kind] = LocalCSVStore()
+            else:
+                _STORES[kind] = GitHubCSVStore()
+        return _STORES[kind]
+
+
+def start_results_syncer(store, interval=RESULTS_SYNC_SECONDS):
+    """Start the background syncer once per process for a local store (else None)."""
+    global _SYNCER
+    if not store.local or isinstance(store, LocalCSVStore):
+        return None
+    with _STORES_LOCK:
+        if _SYNCER is None:
+            _SYNCER = ResultsSyncer(store, interval).start()
+        return _SYNCER
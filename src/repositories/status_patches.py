@@ -0,0 +1,336 @@
+"""
+Status Patches
+Recruiter status updates stored as one small file per click, merged into
+results when read.
+
+Clicking OK / Reject in the dashboard used to re-encode and PUT the whole
+position CSV, and a recruiter working from an older copy overwrote the
+clicks of everyone else. Each click now creates one new file in the
+position's patch directory instead:
+
+    data/status_patches/patches_<position>/<time_ns>-<id>.json
+    {"id": ..., "position": ..., "email": ..., "name": ..., "fields": {...},
+     "at": "2026-10-18 09:12:00", "author": ...}
+
+Creating a file is a single Contents API PUT (no read of existing patches,
+and two recruiters never write the same file). Readers list the directory
+(a 304 when nothing changed), fetch patches they have not seen by blob SHA,
+and apply them in file-name order on top of the results CSV: rows match by
+email (case-insensitive), else by candidate name, within the position, and
+later patches win.
+
+Once a position holds STATUS_PATCH_COMPACT_ROWS patches, or when
+auto_screen finishes a run, the patches are compacted: one GitCommitBuilder
+commit applies them to the results CSV and deletes exactly those patch files
+(patches created meanwhile stay).
+"""
+
+import os
+import json
+import time
+import uuid
+import base64
+import threading
+from datetime import datetime
+from io import StringIO
+
+import pandas as pd
+import requests
+
+from src.config.paths import STATUS_PATCHES_DIR
+from src.repositories.github_utils import (
+    _get_config,
+    _list_github_dir,
+    _log_error,
+    _read_github_blob,
+    clear_results_cache,
+    get_results_filename,
+)
+from src.utils.github_client import get_github_client, github_operation
+
+# Status columns a patch may set
+STATUS_FIELDS = ["Candidate Status", "Shortlisted", "Rejection Reason", "Interview Status"]
+
+# Compact a position's log into its results CSV once it holds this many patches
+STATUS_PATCH_COMPACT_ROWS = 50
+
+# Attempts to create a patch file when the branch keeps moving underneath
+STATUS_PATCH_MAX_RETRIES = 4
+
+# Patch files are immutable, so a parsed patch is kept by its blob SHA
+_PATCH_BLOBS = {}
+_PATCH_BLOBS_LOCK = threading.Lock()
+
+
+def patch_dir(job_position):
+    """Repo-relative patch directory of a position (named like its results file)."""
+    results_name = os.path.basename(get_results_filename(job_position))
+    stem = results_name.rsplit(".", 1)[0].replace("results_", "patches_", 1)
+    return f"{STATUS_PATCHES_DIR}/{stem}"
+
+
+def patch_file_path(patch):
+    """Repo-relative file of a patch; names sort in the order patches were made."""
+    return f"{patch_dir(patch['position'])}/{time.time_ns():020d}-{patch['id']}.json"
+
+
+def make_status_patch(job_position, email, name, fields, author=None):
+    """One status patch record.
+
+    Args:
+        job_position (str): Position of the results row
+        email (str): Candidate email (preferred match key)
+        name (str): Candidate name (used when there is no email)
+        fields (dict): STATUS_FIELDS values to set
+        author (str): Who made the change
+
+    Returns:
+        dict: Patch record
+    """
+    email = "" if pd.isna(email) else str(email).strip()
+    name = "" if pd.isna(name) else str(name).strip()
+    return {
+        "id": uuid.uuid4().hex,
+        "position": job_position,
+        "email": email,
+        "name": name,
+        "fields": {field: value for field, value in fields.items() if field in STATUS_FIELDS},
+        "at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "author": author or "unknown",
+    }
+
+
+def status_patch_mask(df, patch):
+    """Rows a patch applies to."""
+    in_position = df["Job Position"] == patch["position"] if "Job Position" in df.columns else True
+    if patch.get("email") and "Candidate Email" in df.columns:
+        emails = df["Candidate Email"].fillna("").astype(str).str.strip().str.lower()
+        return (emails == patch["email"].lower()) & in_position
+    if patch.get("name") and "Candidate Name" in df.columns:
+        names = df["Candidate Name"].fillna("").astype(str).str.strip()
+        return (names == patch["name"]) & in_position
+    return pd.Series(False, index=df.index)
+
+
+def apply_status_patches(df, patches):
+    """Results with the patches applied in order (a new frame; df is unchanged)."""
+    if df is None or df.empty or not patches:
+        return df
+    df = df.copy()
+    for patch in patches:
+        mask = status_patch_mask(df, patch)
+        if not mask.any():
+            continue
+        for field, value in patch.get("fields", {}).items():
+            if field not in df.columns:
+                continue
+            if df[field].dtype != object:
+                df[field] = df[field].astype(object)
+            df.loc[mask, field] = value
+    return df
+
+
+def _headers(token):
+    return {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
+
+
+def _read_patch(text):
+    try:
+        patch = json.loads(text)
+    except ValueError:
+        return None
+    return patch if isinstance(patch, dict) else None
+
+
+def _local_patch_files(directory):
+    """(path, patch) of the local patch files in a directory, in order."""
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+    except OSError:
+        return []
+    files = []
+    for name in names:
+        path = f"{directory}/{name}"
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                patch = _read_patch(f.read())
+        except OSError:
+            continue
+        if patch is not None:
+            files.append((path, patch))
+    return files
+
+
+def _github_patch_files(directory, token, repo, branch):
+    """(path, patch) of the patch files in a directory on GitHub, in order.
+
+    Returns:
+        list: [] if the directory is missing or could not be listed. A stale
+            listing is not used: it may still hold compacted patches
+    """
+    headers = _headers(token)
+    listing, stale = _list_github_dir(directory, headers, repo, branch)
+    if listing is None or stale:
+        return []
+    files = []
+    for name, item in sorted(listing.items()):
+        if not name.endswith(".json") or not item.get("sha"):
+            continue
+        with _PATCH_BLOBS_LOCK:
+            patch = _PATCH_BLOBS.get(item["sha"])
+        if patch is None:
+            patch = _read_patch(_read_github_blob(repo, item["sha"], headers) or "")
+            if patch is None:
+                continue
+            with _PATCH_BLOBS_LOCK:
+                _PATCH_BLOBS[item["sha"]] = patch
+        files.append((f"{directory}/{name}", patch))
+    return files
+
+
+def _patch_files(job_position):
+    """(path, patch) of a position's patches not yet compacted, in order."""
+    token = _get_config("GITHUB_TOKEN")
+    if not token:
+        return _local_patch_files(patch_dir(job_position))
+    repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
+    branch = _get_config("GITHUB_BRANCH", "main")
+    return _github_patch_files(patch_dir(job_position), token, repo, branch)
+
+
+def load_status_patches(job_position):
+    """Patches of a position not yet compacted into its results CSV.
+
+    Returns:
+        list: Patch records in the order they were made ([] if there are none
+            or they could not be read)
+    """
+    return [patch for _, patch in _patch_files(job_position)]
+
+
+def load_all_status_patches():
+    """Patches of every position, in order, for the "All" results view."""
+    token = _get_config("GITHUB_TOKEN")
+    if not token:
+        return []
+    repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
+    branch = _get_config("GITHUB_BRANCH", "main")
+    listing, _ = _list_github_dir(STATUS_PATCHES_DIR, _headers(token), repo, branch)
+    patches = []
+    for name, item in sorted((listing or {}).items()):
+        if item.get("type") != "dir":
+            continue
+        files = _github_patch_files(f"{STATUS_PATCHES_DIR}/{name}", token, repo, branch)
+        patches.extend(patch for _, patch in files)
+    return patches
+
+
+def append_status_patch(patch):
+    """Save one patch as a new file in its position's patch directory.
+
+    One PUT (one commit) per click: existing patches are not read or
+    rewritten, and a new file never conflicts with another recruiter's. The
+    directory is then listed (with a conditional request the dashboard's
+    next load reuses as a 304) to count the pending patches.
+
+    Returns:
+        tuple: (success, number of patches pending for the position)
+    """
+    path = patch_file_path(patch)
+    text = json.dumps(patch, ensure_ascii=False) + "\n"
+    token = _get_config("GITHUB_TOKEN")
+    if not token:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        except OSError as e:
+            _log_error(f"❌ Could not save status update: {e}")
+            return False, 0
+        return True, len(_local_patch_files(os.path.dirname(path)))
+
+    repo = _get_config("GITHUB_REPO", "netrialiarahmi/cv-matching-auto")
+    branch = _get_config("GITHUB_BRANCH", "main")
+    url = f"https://api.github.com/repos/{repo}/contents/{path}"
+    payload = json.dumps({
+        "message": f"📝 Status update: {patch['name'] or patch['email']} ({patch['position']})",
+        "content": base64.b64encode(text.encode("utf-8")).decode("utf-8"),
+        "branch": branch,
+    })
+    for attempt in range(STATUS_PATCH_MAX_RETRIES):
+        try:
+            res = get_github_client().put(url, headers=_headers(token), data=payload)
+            if res.status_code in [200, 201]:
+                return True, len(_github_patch_files(os.path.dirname(path), token, repo, branch))
+            if res.status_code != 409:
+                _log_error(f"❌ Status update failed: {res.status_code} - {res.text}")
+                return False, 0
+        except requests.exceptions.RequestException as e:
+            if attempt == STATUS_PATCH_MAX_RETRIES - 1:
+                _log_error(f"❌ Status update failed: {e}")
+                return False, 0
+        # The branch moved while the file was committed: try again
+        time.sleep(0.5 * (2 ** attempt))
+    _log_error(f"❌ Status update failed after {STATUS_PATCH_MAX_RETRIES} attempts: branch kept changing")
+    return False, 0
+
+
+def _apply_to_csv(existing_csv, patches):
+    if not existing_csv:
+        return existing_csv
+    df = pd.read_csv(StringIO(existing_csv))
+    return apply_status_patches(df, patches).to_csv(index=False)
+
+
+@github_operation("compact_status_patches")
+def compact_status_patches(job_position, builder=None):
+    """Apply a position's patches to its results CSV and remove them from the log.
+
+    Args:
+        job_position (str): Position to compact
+        builder (GitCommitBuilder): Stage the change in this builder (the
+            caller commits it); without one it is committed here
+
+    Returns:
+        bool: True if there was nothing to compact or the compaction was
+            committed (or staged)
+    """
+    from src.repositories.git_commit_builder import GitCommitBuilder
+
+    files = _patch_files(job_position)
+    if not files or not _get_config("GITHUB_TOKEN"):
+        return True
+    patches = [patch for _, patch in files]
+    own_builder = builder is None
+    if own_builder:
+        builder = GitCommitBuilder(f"📝 Compact {len(patches)} status update(s) for {job_position}")
+    # Cached results of this process are dropped once the patches are gone
+    builder.merge(get_results_filename(job_position), lambda text: _apply_to_csv(text, patches),
+                  on_commit=clear_results_cache)
+    for path, _ in files:
+        builder.delete(path)
+    return builder.commit() if own_builder else True
+
+
+def compact_all_status_patches(builder=None):
+    """Compact every position that has pending patches (see compact_status_patches).
+
+    Returns:
+        int: Number of positions compacted (or staged)
+    """
+    positions = list(dict.fromkeys(patch["position"] for patch in load_all_status_patches() if patch.get("position")))
+    return sum(1 for position in positions if compact_status_patches(position, builder))
+
+
+@github_operation("status_update")
+def record_status_update(job_position, email, name, fields, author=None):
+    """Log a recruiter status change; compacts the log once it is long.
+
+    Returns:
+        bool: True if the patch was saved
+    """
+    patch = make_status_patch(job_position, email, name, fields, author)
+    saved, pending = append_status_patch(patch)
+    if saved and pending >= STATUS_PATCH_COMPACT_ROWS:
+        compact_status_patches(job_position)
+    return saved
@@ -1,9 +1,11 @@
+import numpy as np
 import pandas as pd
-import requests
 from io import BytesIO
 import re
 import os
 import sys
+import hashlib
+import threading
 
 # Optional streamlit import - not available in GitHub Actions
 try:
@@ -13,6 +15,9 @@ except ImportError:
     HAS_STREAMLIT = False
 
 from src.services.extractor import extract_text_from_pdf
+from src.services.cv_parser import parse_cv_layout
+from src.services.resume_fetcher import get_resume_fetcher
+from src.utils.http_cache import cached_get
 
 # Logging helper functions for dual-mode operation
 def _log_error(message):
@@ -35,20 +40,29 @@ GOOGLE_SHEETS_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vRKC_5lHg9y
 # Local cached positions file (synced weekly from Google Sheets)
 SHEET_POSITIONS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "sheet_positions.csv")
 
+# Sheet columns holding the position name / candidate CSV URL (first present wins)
+POSITION_COLUMNS = ["Nama Posisi", "Job Position", "Position"]
+FILE_STORAGE_COLUMNS = ["File Storage", "file_storage"]
 
-def _load_cached_sheet_positions():
+# Number of sheet versions to keep position indexes for
+POSITION_INDEX_CACHE_SIZE = 4
+
+
+def _load_cached_position_index():
     """
-    Load cached sheet positions from local CSV file.
+    Load the PositionIndex for the cached sheet_positions.csv.
     This file is synced weekly from Google Sheets via GitHub Actions.
     
     Returns:
-        DataFrame or None if file doesn't exist
+        PositionIndex or None if the file is missing or empty
     """
     if not os.path.exists(SHEET_POSITIONS_FILE):
         return None
     
     try:
-        return pd.read_csv(SHEET_POSITIONS_FILE)
+        with open(SHEET_POSITIONS_FILE, "rb") as f:
+            content = f.read()
+        return _position_index_from_content(content)
     except Exception:
         return None
 
@@ -76,6 +90,116 @@ def _normalize_position_name(name):
     return name
 
 
+def _normalize_position_names(names):
+    """Vectorized _normalize_position_name() for a Series of position names."""
+    return (names.astype(str).str.lower().str.strip()
+            .str.replace(r'[^a-z0-9\s]', '', regex=True)
+            .str.replace(r'\s+', ' ', regex=True))
+
+
+class PositionIndex:
+    """Lookup of sheet rows by position name, built once per sheet version.
+    
+    Holds the first row for each exact and each normalized position name
+    (see _normalize_position_name), plus the detected position and
+    File Storage columns.
+    """
+    
+    def __init__(self, sheet_df):
+        # Expected format: Nama Posisi, JOB_ID, UPLOAD_ID, File Storage
+        self.position_column = next(
+            (c for c in POSITION_COLUMNS if c in sheet_df.columns), None
+        )
+        self.file_storage_column = next(
+            (c for c in FILE_STORAGE_COLUMNS if c in sheet_df.columns), None
+        )
+        self.exact = {}
+        self.normalized = {}
+        
+        if self.position_column is None:
+            return
+        
+        # Filter out NaN values first before string operations
+        valid = sheet_df[sheet_df[self.position_column].notna()]
+        records = valid.to_dict("records")
+        normalized_names = _normalize_position_names(valid[self.position_column]).tolist()
+        
+        # Keep the first row per name (same as matching_rows.iloc[0])
+        for name, normalized_name, record in zip(valid[self.position_column].tolist(), normalized_names, records):
+            self.exact.setdefault(name, record)
+            self.normalized.setdefault(normalized_name, record)
+    
+    def lookup(self, position_name, exact=False):
+        """Return the sheet row (dict) for a position, or None if not found."""
+        if exact:
+            return self.exact.get(position_name)
+        return self.normalized.get(_normalize_position_name(position_name))
+    
+    def file_storage_url(self, position_name, exact=False):
+        """Return the non-empty File Storage URL for a position, or None."""
+        row = self.lookup(position_name, exact=exact)
+        if row is None or self.file_storage_column is None:
+            return None
+        url = row.get(self.file_storage_column)
+        if pd.isna(url) or not str(url).strip():
+            return None
+        return url
+
+
+# Position indexes keyed by sheet content hash (shared across calls / app session)
+_POSITION_INDEX_CACHE = {}
+_POSITION_INDEX_LOCK = threading.Lock()
+
+
+def get_position_index(sheet_df, content_hash=None):
+    """Return the PositionIndex for a sheet, building it once per sheet version.
+    
+    Args:
+        sheet_df (DataFrame): Positions sheet (Google Sheet or sheet_positions.csv)
+        content_hash (str): Hash of the raw sheet content; computed from the
+            DataFrame when not given
+    
+    Returns:
+        PositionIndex
+    """
+    if content_hash is None:
+        hashed = pd.util.hash_pandas_object(sheet_df, index=False).to_numpy().tobytes()
+        content_hash = hashlib.sha1(hashed + str(list(sheet_df.columns)).encode("utf-8")).hexdigest()
+    
+    with _POSITION_INDEX_LOCK:
+        index = _POSITION_INDEX_CACHE.get(content_hash)
+    if index is not None:
+        return index
+    
+    index = PositionIndex(sheet_df)
+    with _POSITION_INDEX_LOCK:
+        # Sheet versions rarely change; keep only the most recent few
+        if len(_POSITION_INDEX_CACHE) >= POSITION_INDEX_CACHE_SIZE:
+            _POSITION_INDEX_CACHE.pop(next(iter(_POSITION_INDEX_CACHE)))
+        _POSITION_INDEX_CACHE[content_hash] = index
+    return index
+
+
+def _position_index_from_content(content):
+    """Return the PositionIndex for raw sheet CSV bytes.
+    
+    The bytes are hashed first, so an unchanged sheet is not parsed again.
+    
+    Returns:
+        PositionIndex or None if the sheet is empty
+    """
+    content_hash = hashlib.sha1(content).hexdigest()
+    with _POSITION_INDEX_LOCK:
+        index = _POSITION_INDEX_CACHE.get(content_hash)
+    if index is not None:
+        return index
+    
+    sheet_df = pd.read_csv(BytesIO(content))
+    if sheet_df.empty:
+        return None
+    return get_position_index(sheet_df, content_hash)
+
+
 def fetch_candidates_from_google_sheets(job_position_name, max_retries=3):
     """
     Fetch candidate data from Google Sheets by:
@@ -83,8 +207,12 @@ def fetch_candidates_from_google_sheets(job_position_name, max_retries=3):
     2. Downloading the CSV from the File Storage URL
     3. Returning the candidate data from that CSV
     
+    Both downloads go through the conditional-GET cache (src/utils/http_cache.py),
+    so unchanged content is revalidated with a 304 and the last good copy is
+    served if the network fails.
+    
     Falls back to cached sheet_positions.csv if:
-    - Google Sheets is unavailable, or
+    - Google Sheets is unavailable and has never been cached, or
     - Google Sheets has the position but File Storage URL is empty
     
     Args:
@@ -94,178 +222,74 @@ def fetch_candidates_from_google_sheets(job_position_name, max_retries=3):
     Returns:
         DataFrame with candidates from the File Storage CSV, or None if fetch fails.
     """
-    import time
-    
-    sheet_df = None
+    sheet_index = None
     use_cached = False
     
-    for attempt in range(max_retries):
+    # Step 1: Fetch the main sheet to get File Storage URLs
+    # (conditional GET - served from the HTTP cache on 304 or when the network fails)
+    sheet_content, _ = cached_get(GOOGLE_SHEETS_URL, timeout=30, max_retries=max_retries)
+    if sheet_content is not None:
         try:
-            # Step 1: Fetch the main sheet to get File Storage URLs
-            response = requests.get(GOOGLE_SHEETS_URL, timeout=30)
-            
-            if response.status_code != 200:
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                    continue
-                # Try cached file as fallback after all retries exhausted
-                break
-                
-            # Parse the sheet content
-            sheet_df = pd.read_csv(BytesIO(response.content))
-            
-            if sheet_df.empty:
-                # Google Sheets is empty, trying cached file
-                break
-            
-            # Successfully fetched from Google Sheets
-            break
-            
-        except requests.exceptions.Timeout:
-            if attempt < max_retries - 1:
-                time.sleep(3)
-                continue
-            break
-        except requests.exceptions.RequestException:
-            if attempt < max_retries - 1:
-                time.sleep(2)
-                continue
-            break
+            sheet_index = _position_index_from_content(sheet_content)
         except Exception:
-            break
-    
-    # If Google Sheets failed, try cached file
-    if sheet_df is None or sheet_df.empty:
-        sheet_df = _load_cached_sheet_positions()
-        if sheet_df is not None and not sheet_df.empty:
-            use_cached = True
-        else:
+            sheet_index = None
+    
+    # If Google Sheets failed and nothing was cached yet, try the synced positions file
+    if sheet_index is None:
+        sheet_index = _load_cached_position_index()
+        if sheet_index is None:
             return None
+        use_cached = True
     
-    # Step 2: Find the row matching the job position name
-    # Look for columns that might contain position name
-    # Expected format: Nama Posisi, JOB_ID, UPLOAD_ID, File Storage
-    position_column = None
-    if "Nama Posisi" in sheet_df.columns:
-        position_column = "Nama Posisi"
-    elif "Job Position" in sheet_df.columns:
-        position_column = "Job Position"
-    elif "Position" in sheet_df.columns:
-        position_column = "Position"
-    
-    if position_column is None:
+    # Step 2: Find the row matching the job position name (normalized lookup)
+    if sheet_index.position_column is None:
         # If no position column, can't match
         return None
     
-    # Find matching row using flexible matching
-    # Filter out NaN values first before string operations
-    valid_positions = sheet_df[position_column].notna()
-    
-    # Normalize the target position name for flexible matching
-    normalized_target = _normalize_position_name(job_position_name)
-    
-    # Find matching row by normalizing each position on-the-fly (more efficient)
-    matching_mask = valid_positions & sheet_df[position_column].apply(
-        lambda x: _normalize_position_name(x) == normalized_target
-    )
-    matching_rows = sheet_df[matching_mask]
-    
-    if matching_rows.empty:
+    if sheet_index.lookup(job_position_name) is None:
         return None
     
     # Step 3: Get the File Storage URL from the matching row
-    file_storage_column = None
-    if "File Storage" in sheet_df.columns:
-        file_storage_column = "File Storage"
-    elif "file_storage" in sheet_df.columns:
-        file_storage_column = "file_storage"
-    
-    if file_storage_column is None:
+    if sheet_index.file_storage_column is None:
         # No data source column found
         return None
     
-    # Get the first matching row's File Storage URL
-    file_storage_url = matching_rows.iloc[0][file_storage_column]
+    file_storage_url = sheet_index.file_storage_url(job_position_name)
     
-    if pd.isna(file_storage_url) or not str(file_storage_url).strip():
+    if file_storage_url is None:
         # If we haven't tried cached file yet, try it as fallback
         if not use_cached:
-            cached_df = _load_cached_sheet_positions()
-            if cached_df is not None and not cached_df.empty:
-                # Try to find position in cached file
-                cached_position_column = None
-                if "Nama Posisi" in cached_df.columns:
-                    cached_position_column = "Nama Posisi"
-                elif "Job Position" in cached_df.columns:
-                    cached_position_column = "Job Position"
-                elif "Position" in cached_df.columns:
-                    cached_position_column = "Position"
-                
-                if cached_position_column:
-                    cached_valid = cached_df[cached_position_column].notna()
-                    # Reuse normalized_target from earlier in the function
-                    cached_matching = cached_valid & cached_df[cached_position_column].apply(
-                        lambda x: _normalize_position_name(x) == normalized_target
-                    )
-                    cached_rows = cached_df[cached_matching]
-                    
-                    if not cached_rows.empty:
-                        cached_fs_column = None
-                        if "File Storage" in cached_df.columns:
-                            cached_fs_column = "File Storage"
-                        elif "file_storage" in cached_df.columns:
-                            cached_fs_column = "file_storage"
-                        
-                        if cached_fs_column:
-                            cached_url = cached_rows.iloc[0][cached_fs_column]
-                            if pd.notna(cached_url) and str(cached_url).strip():
-                                file_storage_url = cached_url
+            cached_index = _load_cached_position_index()
+            if cached_index is not None:
+                file_storage_url = cached_index.file_storage_url(job_position_name)
         
         # If still no URL, show error
-        if pd.isna(file_storage_url) or not str(file_storage_url).strip():
+        if file_storage_url is None:
             # No File Storage URL found
             return None
     
     # Step 4: Download the CSV from the File Storage URL (with retry)
     # Don't display the URL to users for security
     
-    for attempt in range(max_retries):
-        try:
-            # Add proper headers for Google Storage API
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/csv,application/csv,text/plain,*/*'
-            }
-            csv_response = requests.get(str(file_storage_url).strip(), headers=headers, timeout=60)
-            
-            if csv_response.status_code != 200:
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                    continue
-                return None
-            
-            # Parse the candidate CSV data
-            candidates_df = pd.read_csv(BytesIO(csv_response.content))
-            
-            if candidates_df.empty:
-                return None
-            
-            return candidates_df
-            
-        except requests.exceptions.Timeout:
-            if attempt < max_retries - 1:
-                time.sleep(3)
-                continue
-            return None
-        except requests.exceptions.RequestException:
-            if attempt < max_retries - 1:
-                time.sleep(2)
-                continue
-            return None
-        except Exception:
-            return None
+    # Add proper headers for Google Storage API
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept': 'text/csv,application/csv,text/plain,*/*'
+    }
+    csv_content, _ = cached_get(str(file_storage_url).strip(), headers=headers, timeout=60, max_retries=max_retries)
+    if csv_content is None:
+        return None
     
-    return None
+    try:
+        # Parse the candidate CSV data
+        candidates_df = pd.read_csv(BytesIO(csv_content))
+    except Exception:
+        return None
+    
+    if candidates_df.empty:
+        return None
+    
+    return candidates_df
 
 
 def parse_candidate_csv(uploaded_file):
@@ -278,72 +302,65 @@ def parse_candidate_csv(uploaded_file):
         return None
 
 
-def extract_resume_from_url(url, max_retries=1):
-    """Download and extract text from resume URL (PDF) with minimal retry.
+def download_resume_pdf(url, max_retries=1):
+    """Download a resume PDF with minimal retry.
+    
+    Uses the shared pooled session from src/services/resume_fetcher.py
+    (keep-alive, Kalibrr cookies set once, per-host concurrency limit,
+    streaming size guard).
     
     Args:
         url: URL to the resume PDF
         max_retries: Maximum number of retry attempts on failure (default 1 for speed)
     
     Returns:
-        str: Extracted text from the PDF, or empty string on failure
+        bytes: Raw PDF content, or None on failure
     """
-    if pd.isna(url) or not url.strip():
-        return ""
+    if pd.isna(url) or not str(url).strip():
+        return None
     
-    import time
+    return get_resume_fetcher().fetch(str(url).strip(), max_retries=max_retries)
+
+
+def extract_resume_from_pdf_bytes(pdf_bytes, parse_layout=False):
+    """Extract text (and optionally a local layout parse) from resume PDF bytes.
     
-    for attempt in range(max_retries):
-        try:
-            # Add proper headers for better compatibility
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'application/pdf,*/*'
-            }
-            
-            # Add Kalibrr auth cookies for kalibrr.com URLs
-            cookies = {}
-            if 'kalibrr.com' in url:
-                kaid = os.getenv("KAID", "")
-                kb = os.getenv("KB", "")
-                if kaid:
-                    cookies["kaid"] = kaid
-                if kb:
-                    cookies["kb"] = kb
-            
-            response = requests.get(url, headers=headers, cookies=cookies, timeout=30)
-            if response.status_code == 200:
-                pdf_file = BytesIO(response.content)
-                # Create a file-like object that mimics uploaded_file
-                class PDFFile:
-                    def __init__(self, content):
-                        self.content = content
-                    def read(self):
-                        return self.content
-                
-                pdf_obj = PDFFile(response.content)
-                text = extract_text_from_pdf(pdf_obj)
-                return text
-            elif response.status_code == 429:  # Too many requests
-                if attempt < max_retries - 1:
-                    time.sleep(2)  # Wait 2 seconds before retrying
-                    continue
-                else:
-                    return ""
-            else:
-                # Don't retry on other HTTP errors - fail fast
-                return ""
-        except requests.exceptions.Timeout:
-            # Don't retry on timeout - fail fast
-            return ""
-        except requests.exceptions.RequestException as e:
-            # Don't retry on network errors - fail fast
-            return ""
-        except Exception as e:
-            # Non-network errors (like PDF parsing errors) should not retry
-            return ""
-    
-    return ""
+    Args:
+        pdf_bytes: Raw PDF content
+        parse_layout: If True, also run the local section parser
+            (src/services/cv_parser.py) over the PyMuPDF layout
+    
+    Returns:
+        str: Extracted text, or empty string on failure.
+        When parse_layout is True, returns a tuple (text, parsed_cv) instead,
+        where parsed_cv is None if nothing could be extracted.
+    """
+    if not pdf_bytes:
+        return ("", None) if parse_layout else ""
+    try:
+        if not parse_layout:
+            return extract_text_from_pdf(BytesIO(pdf_bytes))
+        text, layout_lines = extract_text_from_pdf(BytesIO(pdf_bytes), with_layout=True)
+        return text, (parse_cv_layout(layout_lines) if text else None)
+    except Exception:
+        # Non-network errors (like PDF parsing errors) should not retry
+        return ("", None) if parse_layout else ""
+
+
+def extract_resume_from_url(url, max_retries=1, parse_layout=False):
+    """Download and extract text from resume URL (PDF) with minimal retry.
+    
+    Args:
+        url: URL to the resume PDF
+        max_retries: Maximum number of retry attempts on failure (default 1 for speed)
+        parse_layout: If True, also return the local layout parse of the CV
+    
+    Returns:
+        str: Extracted text from the PDF, or empty string on failure.
+        When parse_layout is True, returns a tuple (text, parsed_cv) instead.
+    """
+    pdf_bytes = download_resume_pdf(url, max_retries=max_retries)
+    return extract_resume_from_pdf_bytes(pdf_bytes, parse_layout=parse_layout)
 
 
 def _get_column_value(row, english_name, indonesian_name, default=''):
@@ -420,6 +437,122 @@ def build_candidate_context(row):
     return "\n".join(context_parts)
 
 
+def _resolve_context_column(df, english_name, indonesian_name, default=''):
+    """Column-wise equivalent of _get_column_value() for a whole DataFrame.
+    
+    The English/Indonesian choice is made once per DataFrame: English values
+    are used where present, otherwise the Indonesian column (including its
+    NaN values, exactly like the per-row lookup), otherwise the default.
+    
+    Returns:
+        tuple: (text, truthy) - values rendered with str() and their Python
+        truthiness, both as numpy arrays aligned with df
+    """
+    if indonesian_name in df.columns:
+        values = df[indonesian_name].to_numpy(dtype=object)
+    else:
+        values = np.full(len(df), default, dtype=object)
+    
+    if english_name in df.columns:
+        english = df[english_name]
+        values = np.where(english.notna().to_numpy(), english.to_numpy(dtype=object), values)
+    
+    return values.astype(str).astype(object), values.astype(bool)
+
+
+def _append_context_line(text, has_lines, mask, line):
+    """Append line (joined with a newline) to text where mask is True."""
+    separator = np.where(has_lines, "\n", "").astype(object)
+    text = np.where(mask, text + separator + line, text)
+    return text, has_lines | mask
+
+
+def build_candidate_contexts(df):
+    """Build candidate contexts for every row of a DataFrame at once.
+    
+    Batch version of build_candidate_context(): column names are resolved once
+    per DataFrame and the strings are built column-wise. Output is identical
+    to calling build_candidate_context() on each row from df.iterrows().
+    
+    Args:
+        df (DataFrame): Kalibrr candidate export (English or Indonesian columns)
+    
+    Returns:
+        Series: Context string per candidate, aligned with df.index
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+    
+    def col(english_name, indonesian_name, default=''):
+        return _resolve_context_column(df, english_name, indonesian_name, default)
+    
+    text = np.full(len(df), "", dtype=object)
+    has_lines = np.zeros(len(df), dtype=bool)
+    
+    # Basic info
+    first_name, has_first_name = col("First Name", "Nama Depan")
+    last_name, _ = col("Last Name", "Nama Belakang")
+    text, has_lines = _append_context_line(text, has_lines, has_first_name, "Name: " + first_name + " " + last_name)
+    
+    # Work experience
+    latest_job, has_latest_job = col("Latest Job Title", "Jabatan Pekerjaan Terakhir")
+    latest_company, _ = col("Latest Company", "Perusahaan Terakhir", 'N/A')
+    start_period, _ = col("Latest Job Starting Period", "Periode Mulai Kerja", 'N/A')
+    end_period, _ = col("Latest Job Ending Period", "Periode Akhir Kerja", 'N/A')
+    job_desc, has_job_desc = col("Latest Job Description", "Deskripsi Pekerjaan")
+    
+    prev_job_1, has_prev_job_1 = col("Previous Job Title (1)", "Jabatan Pekerjaan Sebelumnya (1)")
+    prev_company_1, _ = col("Previous Company (1)", "Perusahaan Sebelumnya (1)", 'N/A')
+    prev_start_1, _ = col("Previous Job Starting Period (1)", "Periode Mulai Kerja (1)", 'N/A')
+    prev_end_1, _ = col("Previous Job Ending Period (1)", "Periode Akhir Kerja (1)", 'N/A')
+    
+    prev_job_2, has_prev_job_2 = col("Previous Job Title (2)", "Jabatan Pekerjaan Sebelumnya (2)")
+    prev_company_2, _ = col("Previous Company (2)", "Perusahaan Sebelumnya (2)", 'N/A')
+    prev_start_2, _ = col("Previous Job Starting Period (2)", "Periode Mulai Kerja (2)", 'N/A')
+    prev_end_2, _ = col("Previous Job Ending Period (2)", "Periode Akhir Kerja (2)", 'N/A')
+    
+    has_work = has_latest_job | has_prev_job_1 | has_prev_job_2
+    text, has_lines = _append_context_line(text, has_lines, has_work, "Work Experience:")
+    text, has_lines = _append_context_line(
+        text, has_lines, has_latest_job,
+        "- " + latest_job + " at " + latest_company + " (" + start_period + " - " + end_period + ")"
+    )
+    text, has_lines = _append_context_line(
+        text, has_lines, has_latest_job & has_job_desc, "  Description: " + job_desc
+    )
+    text, has_lines = _append_context_line(
+        text, has_lines, has_prev_job_1,
+        "- " + prev_job_1 + " at " + prev_company_1 + " (" + prev_start_1 + " - " + prev_end_1 + ")"
+    )
+    text, has_lines = _append_context_line(
+        text, has_lines, has_prev_job_2,
+        "- " + prev_job_2 + " at " + prev_company_2 + " (" + prev_start_2 + " - " + prev_end_2 + ")"
+    )
+    
+    # Education
+    latest_edu, has_latest_edu = col("Latest Educational Attainment", "Tingkat Pendidikan Tertinggi")
+    latest_school, _ = col("Latest School/University", "Sekolah/Universitas", 'N/A')
+    latest_major, _ = col("Latest Major/Course", "Jurusan/Program Studi", 'N/A')
+    edu_start, _ = col("Latest Education Starting Period", "Periode Mulai Studi", 'N/A')
+    edu_end, _ = col("Latest Education Ending Period", "Periode Akhir Studi", 'N/A')
+    
+    prev_edu_1, has_prev_edu_1 = col("Previous Educational Attainment (1)", "Tingkat Pendidikan Sebelumnya (1)")
+    prev_school_1, _ = col("Previous School/University (1)", "Sekolah/Universitas (1)", 'N/A')
+    prev_major_1, _ = col("Previous Major/Course (1)", "Jurusan/Program Studi (1)", 'N/A')
+    
+    text, has_lines = _append_context_line(text, has_lines, has_latest_edu | has_prev_edu_1, "Education:")
+    text, has_lines = _append_context_line(
+        text, has_lines, has_latest_edu,
+        "- " + latest_edu + " - " + latest_major + " at " + latest_school + " (" + edu_start + " - " + edu_end + ")"
+    )
+    text, has_lines = _append_context_line(
+        text, has_lines, has_prev_edu_1,
+        "- " + prev_edu_1 + " - " + prev_major_1 + " at " + prev_school_1
+    )
+    
+    return pd.Series(text, index=df.index, dtype=object)
+
+
 def get_candidate_identifier(row):
     """Generate unique identifier for candidate to avoid duplicates."""
     email = _get_column_value(row, "Email Address", "Alamat Email", "").strip()
@@ -0,0 +1,141 @@
+"""
+Run-scoped candidate registry shared by all positions of one auto_screen run.
+
+The same person often applies to several roles (Reporter Nasional and Reporter
+Megapolitan, the AE variants, ...). Without sharing, every application
+downloads the resume again and runs PyMuPDF and the layout parser again.
+
+CandidateRegistry keeps, for the duration of the run:
+- resume link -> the cleaned CV text and parsed_cv produced by the first
+  application that fetched it. Later applications (in any position) skip the
+  download and the extraction. If two positions reach the same link at the
+  same time, the second waits for the first instead of downloading too.
+- (normalized email, SHA-1 of the PDF bytes) -> cleaned CV text and parsed_cv,
+  so a resume re-uploaded under a different link is extracted only once.
+
+parsed_cv (the local layout parse: contacts, education, experiences) does not
+depend on the job, so it is shared as is. Step 1 classifies experience against
+the target job description and is still run for every position.
+
+When no registry is started (Streamlit app, helper scripts) nothing is shared.
+"""
+
+import hashlib
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+# How long a position waits for another position's download/extraction of the
+# same resume before fetching it itself (seconds)
+REGISTRY_WAIT_SECONDS = 180
+
+
+def normalize_email(email):
+    """Registry key for an email address (lower-case, stripped; '' if missing)."""
+    email = str(email or "").strip().lower()
+    return "" if email in ("nan", "none") else email
+
+
+def resume_hash(pdf_bytes):
+    """SHA-1 of the raw resume bytes."""
+    return hashlib.sha1(pdf_bytes or b"").hexdigest()
+
+
+class CandidateRegistry:
+    """Shares resume downloads and extractions between positions of one run."""
+
+    def __init__(self, wait_seconds=REGISTRY_WAIT_SECONDS):
+        self.wait_seconds = wait_seconds
+        self._links = {}                      # resume link -> Future[(cv_text, parsed_cv) or None]
+        self._extracted = {}                  # (email, pdf sha1) -> (cv_text, parsed_cv)
+        self._positions = defaultdict(set)    # email -> positions it applied to this run
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "downloads_saved": 0, "extractions_saved": 0}
+
+    def claim(self, email, position, resume_link):
+        """Look up a resume before downloading it.
+
+        Args:
+            email (str): Candidate email
+            position (str): Position the application belongs to
+            resume_link (str): Resume URL from the export
+
+        Returns:
+            tuple: ("hit", (cv_text, parsed_cv)) when the resume was already
+                extracted this run, or ("owner", None) when the caller must
+                download and extract it and then call publish()
+        """
+        email = normalize_email(email)
+        with self._lock:
+            self.stats["lookups"] += 1
+            if email:
+                self._positions[email].add(position)
+            future = self._links.get(resume_link)
+            if future is None:
+                self._links[resume_link] = Future()
+                return "owner", None
+
+        # Another application fetched (or is fetching) this link
+        try:
+            shared = future.result(timeout=self.wait_seconds)
+        except FutureTimeoutError:
+            shared = None
+        if shared is None:
+            return "owner", None
+        with self._lock:
+            self.stats["downloads_saved"] += 1
+            self.stats["extractions_saved"] += 1
+        return "hit", shared
+
+    def extracted(self, email, pdf_bytes):
+        """Extraction of identical resume bytes from the same applicant, or None."""
+        key = (normalize_email(email), resume_hash(pdf_bytes))
+        with self._lock:
+            shared = self._extracted.get(key)
+            if shared is not None:
+                self.stats["extractions_saved"] += 1
+        return shared
+
+    def publish(self, email, resume_link, pdf_bytes, cv_text, parsed_cv):
+        """Share the extraction of a claimed resume (cv_text '' = failed, not shared)."""
+        shared = (cv_text, parsed_cv) if cv_text else None
+        with self._lock:
+            if shared is not None and pdf_bytes:
+                self._extracted[(normalize_email(email), resume_hash(pdf_bytes))] = shared
+            future = self._links.get(resume_link)
+            if future is not None and not future.done():
+                if shared is None:
+                    # Let the next application of this link try again itself
+                    del self._links[resume_link]
+                future.set_result(shared)
+
+    def release(self, resume_link):
+        """Unblock waiters if the claiming application failed before publish()."""
+        self.publish("", resume_link, None, "", None)
+
+    def summary_line(self):
+        """One-line reuse report for the run summary."""
+        with self._lock:
+            lookups = self.stats["lookups"]
+            multi = sum(1 for positions in self._positions.values() if len(positions) > 1)
+            downloads = self.stats["downloads_saved"]
+            extractions = self.stats["extractions_saved"]
+        rate = (extractions / lookups * 100) if lookups else 0.0
+        return (f"Candidate reuse: {multi} applicant(s) in 2+ positions, "
+                f"{downloads} download(s) and {extractions} extraction(s) saved "
+                f"of {lookups} resume(s) ({rate:.0f}% reuse)")
+
+
+_REGISTRY = None
+
+
+def start_candidate_registry():
+    """Start a registry for this run (replaces any previous one) and return it."""
+    global _REGISTRY
+    _REGISTRY = CandidateRegistry()
+    return _REGISTRY
+
+
+def get_candidate_registry():
+    """The active registry, or None when sharing is off."""
+    return _REGISTRY
@@ -0,0 +1,189 @@
+"""
+Canonical column schema for Kalibrr candidate exports.
+
+Kalibrr candidate CSVs reach the pipeline in three shapes:
+- UI export (English headers: "First Name", "Email Address", "Link Resume", ...)
+- API export normalized by kalibrr_core._normalize_export_df (UI headers plus
+  raw API fields such as "application.created_at")
+- Legacy Indonesian export ("Nama Depan", "Alamat Email", "Tautan Resume", ...)
+
+Instead of evaluating `row.get("Alamat Email") or row.get("Email Address") or ...`
+chains on every row, to_canonical() inspects the header once, picks the source
+columns that exist for each canonical field, and coalesces them column-wise.
+The result uses the same column names as the screening results CSV, so
+auto_screen, app.py and update_cv_links read candidates with plain column access.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.repositories.github_utils import parse_kalibrr_date
+
+
+# Canonical field -> source columns in priority order (first non-blank wins)
+CANONICAL_COLUMNS = {
+    "First Name": ["First Name", "Nama Depan"],
+    "Last Name": ["Last Name", "Nama Belakang"],
+    "Full Name": ["Nama", "Candidate Name", "Name"],
+    "Candidate Email": ["Email Address", "Alamat Email", "Email Pelamar", "Candidate Email", "Email"],
+    "Phone": ["Mobile Number", "Nomor Handphone", "Phone Number", "Telp", "Telepon", "Phone"],
+    "Resume Link": ["Link Resume", "Resume Link", "Tautan Resume", "Resume"],
+    "Kalibrr Profile": ["Link Profil Kalibrr", "Kalibrr Profile Link", "Kalibrr Profile", "Profil Kalibrr", "Profile"],
+    "Application Link": ["Link Aplikasi Pekerjaan", "Job Application Link", "Application Link", "Tautan Lamaran", "Application"],
+    "Date Applied": ["Date Application Started (mm/dd/yy hr:mn)", "Tanggal Mulai Melamar", "application.created_at"],
+    "Latest Job Title": ["Latest Job Title", "Jabatan Pekerjaan Terakhir", "Jabatan Terakhir"],
+    "Latest Company": ["Latest Company", "Perusahaan Terakhir"],
+    "Education": ["Latest Educational Attainment", "Tingkat Pendidikan Tertinggi", "Tingkat Pendidikan", "Pendidikan", "Education"],
+    "University": ["Latest School/University", "Sekolah/Universitas", "Universitas", "University"],
+    "Major": ["Latest Major/Course", "Jurusan/Program Studi", "Jurusan", "Major"],
+}
+
+# Export format markers
+FORMAT_API = "api"
+FORMAT_UI = "ui"
+FORMAT_LEGACY = "legacy"
+
+
+def detect_export_format(columns):
+    """Detect which Kalibrr export shape a header belongs to.
+
+    Args:
+        columns: DataFrame columns (or any iterable of column names)
+
+    Returns:
+        str: "api", "ui" or "legacy"
+    """
+    columns = set(columns)
+    if "application.created_at" in columns or "application.job_id" in columns:
+        return FORMAT_API
+    if "Nama Depan" in columns or "Alamat Email" in columns:
+        return FORMAT_LEGACY
+    return FORMAT_UI
+
+
+def resolve_column_schema(columns):
+    """Map each canonical field to the source columns present in a header.
+
+    Args:
+        columns: DataFrame columns
+
+    Returns:
+        dict: {canonical field: [present source columns in priority order]}
+    """
+    present = set(columns)
+    return {
+        field: [source for source in sources if source in present]
+        for field, sources in CANONICAL_COLUMNS.items()
+    }
+
+
+def _coalesce_text(df, sources):
+    """First non-blank value across source columns, as stripped text ('' if none)."""
+    result = np.full(len(df), "", dtype=object)
+    # Lowest priority first so higher-priority columns overwrite
+    for source in reversed(sources):
+        values = df[source]
+        text = np.where(values.notna().to_numpy(), values.to_numpy(dtype=object).astype(str), "")
+        text = np.char.strip(text.astype(str)).astype(object)
+        result = np.where(text != "", text, result)
+    return result
+
+
+def to_canonical(df):
+    """Build the canonical candidate frame for a Kalibrr export.
+
+    Args:
+        df (DataFrame): Candidate export in any supported format
+
+    Returns:
+        DataFrame: Same index as df with one str column per canonical field
+            (missing values are ''), plus:
+            - "Candidate Name": "First Last", falling back to the full-name column
+            - "Date Applied": normalized with parse_kalibrr_date()
+            The detected export format is stored in .attrs["export_format"].
+    """
+    schema = resolve_column_schema(df.columns)
+    canonical = pd.DataFrame(
+        {field: _coalesce_text(df, sources) for field, sources in schema.items()},
+        index=df.index,
+        dtype=object,
+    )
+
+    full_name = (canonical["First Name"] + " " + canonical["Last Name"]).str.strip()
+    canonical["Candidate Name"] = full_name.where(full_name != "", canonical["Full Name"])
+    canonical["Date Applied"] = canonical["Date Applied"].map(parse_kalibrr_date)
+
+    canonical.attrs["export_format"] = detect_export_format(df.columns)
+    return canonical
+
+
+# Match kinds returned by match_existing_candidates ('' = new candidate)
+MATCH_EMAIL = "email"
+MATCH_NAME_PHONE = "phone"
+MATCH_NAME = "name"
+
+
+def _existing_text(existing_results, column):
+    """Stripped text of a results column, or None where the value is missing/blank."""
+    if column not in existing_results.columns:
+        return pd.Series(None, index=existing_results.index, dtype=object)
+    values = existing_results[column]
+    text = values.astype(str).str.strip()
+    return text.where(values.notna() & (text != ""))
+
+
+def _existing_keys(existing_results):
+    """Email, name+phone and name-only key sets of already-screened candidates."""
+    if existing_results is None or existing_results.empty:
+        return set(), set(), set()
+
+    emails = existing_results.get("Candidate Email")
+    if emails is None:
+        email_keys = set()
+    else:
+        emails = emails[emails.notna()]
+        email_keys = set(emails.astype(str).str.lower())
+
+    name = _existing_text(existing_results, "Candidate Name")
+    phone = _existing_text(existing_results, "Phone")
+    has_name_phone = name.notna() & phone.notna()
+    name_phone_keys = set(name[has_name_phone].str.lower() + "_" + phone[has_name_phone])
+    name_keys = set(name[name.notna()].str.lower())
+    return email_keys, name_phone_keys, name_keys
+
+
+def match_existing_candidates(candidates, existing_results, name_only_fallback=False, fallback_name=""):
+    """Find which candidates already have a screening result.
+
+    A candidate with an email is matched by email only (case-insensitive).
+    Without an email it is matched by "name_phone"; with name_only_fallback,
+    the name+phone check needs a phone and candidates with neither email nor
+    phone are matched by name alone (app.py behaviour).
+
+    Args:
+        candidates (DataFrame): Canonical candidate frame from to_canonical()
+        existing_results (DataFrame): Results CSV for the position (or None)
+        name_only_fallback (bool): Enable the phone-required / name-only rules
+        fallback_name (str): Name used in the name+phone key when a
+            candidate has no name (auto_screen uses "Unknown")
+
+    Returns:
+        Series: Same index as candidates; '' for new candidates, otherwise
+            "email", "phone" or "name" (the rule that matched)
+    """
+    email_keys, name_phone_keys, name_keys = _existing_keys(existing_results)
+
+    email = candidates["Candidate Email"]
+    phone = candidates["Phone"]
+    name = candidates["Candidate Name"]
+    key_name = name.where(name != "", fallback_name).str.lower()
+
+    has_email = email != ""
+    name_phone_rule = ~has_email & (phone != "") if name_only_fallback else ~has_email
+    name_rule = (~has_email & (phone == "") & (name != "")) if name_only_fallback else pd.Series(False, index=candidates.index)
+
+    match = pd.Series("", index=candidates.index, dtype=object)
+    match[has_email & email.str.lower().isin(email_keys)] = MATCH_EMAIL
+    match[name_phone_rule & (key_name + "_" + phone).isin(name_phone_keys)] = MATCH_NAME_PHONE
+    match[name_rule & name.str.lower().isin(name_keys)] = MATCH_NAME
+    return match
@@ -0,0 +1,496 @@
+"""
+Local rule-based CV section parser.
+
+Many Kalibrr CVs are exported from templates (Kalibrr profile PDF, Canva,
+Word) with a predictable layout: a large name at the top, bold or upper-case
+section headers, and experience entries that start with a bold title line
+followed by company and date range lines.
+
+This module works on the layout lines produced by
+``extract_text_from_pdf(..., with_layout=True)`` (font size, bold flag and
+position of every line from PyMuPDF's ``get_text("dict")``) and builds a
+partial Step 1 profile locally. Step 1 then only asks Gemini Flash for the
+fields that could not be resolved, plus the relevance classification, and
+receives a compact rendering of the CV instead of the raw text.
+
+No AI calls are made here.
+"""
+
+import re
+import json
+from statistics import median
+
+
+# Approximate characters per token for mixed English/Indonesian CV text
+# (same ratio used for the 5000-character CV limit in the scorer)
+CHARS_PER_TOKEN = 5
+
+# Same CV limit used by extract_and_classify_cv()
+CV_PROMPT_CHAR_LIMIT = 5000
+
+# Profile fields Step 1 returns that can be resolved locally
+PROFILE_FIELDS = [
+    "candidate_name",
+    "latest_job_title",
+    "latest_company",
+    "education.degree",
+    "education.university",
+    "education.major",
+    "work_experiences",
+]
+
+# Section header keywords (English + Indonesian), matched on the whole line
+SECTION_KEYWORDS = {
+    "experience": [
+        "work experience", "working experience", "experience", "experiences",
+        "professional experience", "employment history", "employment",
+        "work history", "career history", "pengalaman kerja", "pengalaman",
+        "riwayat pekerjaan", "pengalaman profesional",
+    ],
+    "education": [
+        "education", "educational background", "academic background",
+        "pendidikan", "riwayat pendidikan", "latar belakang pendidikan",
+    ],
+    "summary": [
+        "summary", "profile", "professional summary", "about me", "about",
+        "objective", "career objective", "profil", "tentang saya", "ringkasan",
+    ],
+    "skills": [
+        "skills", "skill", "technical skills", "hard skills", "soft skills",
+        "keahlian", "kemampuan", "keterampilan",
+    ],
+    "certifications": [
+        "certifications", "certification", "certificates", "licenses",
+        "sertifikasi", "sertifikat", "courses", "training", "pelatihan",
+    ],
+    "organization": [
+        "organizational experience", "organization", "organizations",
+        "organisasi", "pengalaman organisasi", "volunteer", "volunteering",
+        "leadership",
+    ],
+    "projects": ["projects", "project", "portfolio", "proyek", "portofolio"],
+    "languages": ["languages", "language", "bahasa"],
+    "achievements": ["achievements", "awards", "honors", "prestasi", "penghargaan"],
+    "contact": ["contact", "contacts", "kontak", "personal information", "data diri"],
+    "references": ["references", "referensi"],
+}
+
+_HEADER_LOOKUP = {
+    keyword: section
+    for section, keywords in SECTION_KEYWORDS.items()
+    for keyword in keywords
+}
+
+_MONTHS = (
+    r"jan(?:uary|uari)?|feb(?:ruary|ruari)?|mar(?:ch|et)?|apr(?:il)?|mei|may|"
+    r"jun(?:e|i)?|jul(?:y|i)?|aug(?:ust)?|agu(?:stus)?|agt|sep(?:t(?:ember)?)?|"
+    r"oct(?:ober)?|okt(?:ober)?|nov(?:ember)?|dec(?:ember)?|des(?:ember)?"
+)
+_DATE_TOKEN = rf"(?:(?:{_MONTHS})\.?\s+)?(?:\d{{1,2}}/)?(?:19|20)\d{{2}}"
+_PRESENT = r"present|current|now|sekarang|saat ini|kini"
+DATE_RANGE_RE = re.compile(
+    rf"({_DATE_TOKEN})\s*(?:-|–|—|to|s/d|sampai|hingga)\s*({_DATE_TOKEN}|{_PRESENT})",
+    re.IGNORECASE,
+)
+
+DEGREE_PATTERNS = [
+    (r"\b(?:s3|ph\.?\s?d|doctor(?:ate)?|doktor)\b", "S3"),
+    (r"\b(?:s2|master(?:'s)?|magister|m\.\s?(?:sc|kom|m|b\.?a|t|si)\b|mba)\b", "S2"),
+    (r"\b(?:s1|bachelor(?:'s)?|sarjana|b\.\s?(?:sc|a|eng|com)\b|s\.\s?(?:kom|e|t|si|h|psi|sos|ikom|i\.kom|ds|pd)\b)", "S1"),
+    (r"\b(?:d4|diploma iv|sarjana terapan)\b", "D4"),
+    (r"\b(?:d3|diploma iii|diploma|associate)\b", "D3"),
+    (r"\b(?:sma|smk|high school|senior high|ma)\b", "SMA"),
+]
+
+INSTITUTION_RE = re.compile(
+    r"\b(universitas|university|univ\.?|institut|institute|politeknik|polytechnic|"
+    r"college|sekolah tinggi|stie|stmik|akademi|academy|school|sma|smk)\b",
+    re.IGNORECASE,
+)
+
+_MAJOR_RE = re.compile(
+    r"(?:\bin\b|\bof\b|jurusan|program studi|prodi|major|majoring in)\s*[:\-]?\s*([A-Za-z&/ ,.'()-]{3,80})",
+    re.IGNORECASE,
+)
+
+_TITLE_COMPANY_SEPARATORS = [" at ", " @ ", " | ", " — ", " – ", " - ", ", "]
+
+_BULLET_RE = re.compile(r"^\s*(?:[•·▪●◦‣∙*\-–]|\d+[.)])\s*")
+_CONTACT_RE = re.compile(r"@|https?://|www\.|linkedin|\+?\d[\d\s\-()]{7,}", re.IGNORECASE)
+
+
+def _normalize_header(text):
+    """Lower-case a line and strip decoration so it can be matched against SECTION_KEYWORDS."""
+    text = re.sub(r"[^a-z\s]", " ", str(text).lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _body_font_size(lines):
+    """Character-weighted median font size, used as the baseline for header detection."""
+    sizes = []
+    for line in lines:
+        sizes.extend([line["size"]] * max(1, min(len(line["text"]), 200)))
+    return median(sizes) if sizes else 0
+
+
+def _section_for_line(line, body_size):
+    """Return the section name if this line looks like a section header, else None.
+
+    A header must match a known keyword AND stand out typographically
+    (larger than body text, bold, or upper-case) so that sentences such as
+    "Experience in SQL" inside a bullet list are not mistaken for headers.
+    """
+    text = line["text"].strip()
+    if len(text) > 40 or len(text.split()) > 4:
+        return None
+    section = _HEADER_LOOKUP.get(_normalize_header(text))
+    if section is None:
+        return None
+    letters = [c for c in text if c.isalpha()]
+    is_upper = bool(letters) and all(c.isupper() for c in letters)
+    if line["size"] > body_size + 0.5 or line["bold"] or is_upper:
+        return section
+    return None
+
+
+def _detect_name(lines, body_size):
+    """Pick the candidate name: the largest-font line among the first lines of page 1."""
+    head = [ln for ln in lines[:12] if ln["page"] == 0]
+    best = None
+    for line in head:
+        text = line["text"].strip()
+        words = text.split()
+        if not 2 <= len(words) <= 5:
+            continue
+        if _CONTACT_RE.search(text) or any(ch.isdigit() for ch in text):
+            continue
+        if _HEADER_LOOKUP.get(_normalize_header(text)):
+            continue
+        if not all(re.match(r"^[A-Za-z.'\-]+$", w) for w in words):
+            continue
+        if best is None or line["size"] > best["size"]:
+            best = line
+    if best is not None and (best["size"] > body_size + 1 or best["bold"]):
+        return " ".join(best["text"].split()).title() if best["text"].isupper() else " ".join(best["text"].split())
+    return ""
+
+
+def _split_sections(lines, body_size):
+    """Group layout lines under the section header that precedes them."""
+    sections = {}
+    order = []
+    current = "header"
+    for line in lines:
+        section = _section_for_line(line, body_size)
+        if section:
+            current = section
+            if current not in sections:
+                order.append(current)
+                sections[current] = []
+            continue
+        sections.setdefault(current, []).append(line)
+        if current not in order:
+            order.append(current)
+    return sections, order
+
+
+def _split_title_company(text):
+    """Split a single "Title at Company" / "Title | Company" line into its parts."""
+    for sep in _TITLE_COMPANY_SEPARATORS:
+        if sep in text:
+            left, right = text.split(sep, 1)
+            if left.strip() and right.strip():
+                return left.strip(), right.strip()
+    return text.strip(), ""
+
+
+def _parse_experience_entries(lines):
+    """Parse experience entries from the lines of an experience section.
+
+    An entry starts at a bold, non-bullet line (the job title). The lines that
+    follow until the first bullet or plain sentence make up the entry header
+    (company and date range); everything after that is responsibilities.
+    """
+    entries = []
+    current = None
+    in_header = False
+    for line in lines:
+        text = line["text"].strip()
+        is_bullet = bool(_BULLET_RE.match(text))
+        if line["bold"] and not is_bullet and len(text) <= 120:
+            # A bold line opens a new entry unless we are still reading the
+            # header of the current one (e.g. a bold company under a bold title)
+            if current is None or not in_header or current["duration"]:
+                if current is not None:
+                    entries.append(current)
+                current = {"title_lines": [], "duration": "", "bullets": []}
+                in_header = True
+        if current is None:
+            continue
+        if in_header and not is_bullet:
+            date_match = DATE_RANGE_RE.search(text)
+            if date_match:
+                current["duration"] = date_match.group(0).strip()
+                remainder = (text[:date_match.start()] + text[date_match.end():]).strip(" |,-–—()")
+                if remainder and len(current["title_lines"]) < 2:
+                    current["title_lines"].append(remainder)
+                # The date range closes the entry header
+                in_header = not current["title_lines"]
+                continue
+            if len(current["title_lines"]) < 2 and len(text) <= 100:
+                current["title_lines"].append(text)
+                continue
+        in_header = False
+        current["bullets"].append(_BULLET_RE.sub("", text))
+    if current is not None:
+        entries.append(current)
+
+    experiences = []
+    for entry in entries:
+        if not entry["title_lines"]:
+            continue
+        if len(entry["title_lines"]) >= 2:
+            title, company = entry["title_lines"][0], entry["title_lines"][1]
+        else:
+            title, company = _split_title_company(entry["title_lines"][0])
+        # Entries without a date range or company are too ambiguous to trust
+        if not (entry["duration"] and company):
+            continue
+        experiences.append({
+            "title": title,
+            "company": company,
+            "duration": entry["duration"],
+            "responsibilities": " ".join(b for b in entry["bullets"] if b)[:400],
+        })
+    return experiences
+
+
+def _parse_education(lines):
+    """Extract degree, university and major from the first entry of an education section."""
+    education = {"degree": "", "university": "", "major": ""}
+    for line in lines[:8]:
+        text = line["text"].strip()
+        lowered = text.lower()
+        if not education["university"] and INSTITUTION_RE.search(text):
+            university = DATE_RANGE_RE.sub("", text)
+            university = re.sub(r"\b(?:19|20)\d{2}\b", "", university).strip(" |,-–—()")
+            # "S1 Ilmu Komunikasi - Universitas Indonesia" → keep only the institution part
+            for sep in [" - ", " – ", " | ", ", "]:
+                if sep in university:
+                    parts = [p.strip() for p in university.split(sep)]
+                    inst = [p for p in parts if INSTITUTION_RE.search(p)]
+                    rest = [p for p in parts if not INSTITUTION_RE.search(p)]
+                    if inst:
+                        university = inst[0]
+                        if rest and not education["major"]:
+                            candidate = rest[0]
+                            for pattern, _degree in DEGREE_PATTERNS:
+                                candidate = re.sub(pattern, "", candidate, flags=re.IGNORECASE)
+                            candidate = candidate.strip(" .,-–")
+                            if len(candidate) >= 3 and not re.search(r"\d", candidate):
+                                education["major"] = candidate
+                    break
+            education["university"] = university
+        if not education["degree"]:
+            for pattern, degree in DEGREE_PATTERNS:
+                if re.search(pattern, lowered):
+                    education["degree"] = degree
+                    if not education["major"]:
+                        major_match = _MAJOR_RE.search(text)
+                        if major_match:
+                            education["major"] = major_match.group(1).strip(" .,-–")
+                        else:
+                            remainder = re.sub(pattern, "", text, flags=re.IGNORECASE)
+                            remainder = DATE_RANGE_RE.sub("", remainder).strip(" .,-–—|()")
+                            if remainder and not INSTITUTION_RE.search(remainder) and not re.search(r"\d", remainder):
+                                education["major"] = remainder
+                    break
+        if all(education.values()):
+            break
+    return education
+
+
+def _render_compact(sections, order, profile):
+    """Render a compact text version of the CV for the Step 1 prompt.
+
+    Resolved experience entries are rendered as one line each (their bullets
+    collapsed), headers become short markers, and contact/reference sections
+    are dropped because Step 1 does not use them.
+    """
+    parts = []
+    for section in order:
+        if section in ("contact", "references"):
+            continue
+        lines = sections.get(section, [])
+        if section == "experience" and profile["work_experiences"]:
+            parts.append("[EXPERIENCE]")
+            for i, exp in enumerate(profile["work_experiences"]):
+                parts.append(f"{i}. {exp['title']} | {exp['company']} | {exp['duration']}")
+                if exp["responsibilities"]:
+                    parts.append(f"   {exp['responsibilities']}")
+            continue
+        texts = [_BULLET_RE.sub("", ln["text"]).strip() for ln in lines]
+        texts = [t for t in texts if t and not (section == "header" and _CONTACT_RE.search(t))]
+        if not texts:
+            continue
+        if section != "header":
+            parts.append(f"[{section.upper()}]")
+        parts.append("; ".join(texts))
+    return "\n".join(parts)
+
+
+def parse_cv_layout(layout_lines):
+    """Build a partial Step 1 profile from PyMuPDF layout lines.
+
+    Args:
+        layout_lines: List of line dicts from extract_text_from_pdf(..., with_layout=True)
+
+    Returns:
+        dict with:
+            - "profile": partial profile using the same keys as Step 1 output
+              (candidate_name, latest_job_title, latest_company, education,
+              work_experiences). Unresolved values are left empty.
+            - "resolved": list of PROFILE_FIELDS resolved locally
+            - "unresolved": list of PROFILE_FIELDS Gemini still has to extract
+            - "coverage": resolved fraction (0.0 - 1.0)
+            - "compact_text": compact rendering of the CV for the prompt
+            - "template_detected": True if at least one known section header was found
+    """
+    profile = {
+        "candidate_name": "",
+        "latest_job_title": "",
+        "latest_company": "",
+        "education": {"degree": "", "university": "", "major": ""},
+        "work_experiences": [],
+    }
+    result = {
+        "profile": profile,
+        "resolved": [],
+        "unresolved": list(PROFILE_FIELDS),
+        "coverage": 0.0,
+        "compact_text": "",
+        "template_detected": False,
+    }
+    if not layout_lines:
+        return result
+
+    body_size = _body_font_size(layout_lines)
+    sections, order = _split_sections(layout_lines, body_size)
+    result["template_detected"] = any(s != "header" for s in order)
+
+    profile["candidate_name"] = _detect_name(layout_lines, body_size)
+    if "experience" in sections:
+        profile["work_experiences"] = _parse_experience_entries(sections["experience"])
+    if profile["work_experiences"]:
+        # Templates list the most recent role first
+        profile["latest_job_title"] = profile["work_experiences"][0]["title"]
+        profile["latest_company"] = profile["work_experiences"][0]["company"]
+    if "education" in sections:
+        profile["education"] = _parse_education(sections["education"])
+
+    resolved = []
+    for field in PROFILE_FIELDS:
+        if field.startswith("education."):
+            value = profile["education"].get(field.split(".", 1)[1])
+        else:
+            value = profile.get(field)
+        if value:
+            resolved.append(field)
+    result["resolved"] = resolved
+    result["unresolved"] = [f for f in PROFILE_FIELDS if f not in resolved]
+    result["coverage"] = len(resolved) / len(PROFILE_FIELDS)
+
+    if result["template_detected"]:
+        result["compact_text"] = _render_compact(sections, order, profile)
+    return result
+
+
+def profile_for_prompt(parsed):
+    """Return the resolved part of a parsed profile as a JSON string for the Step 1 prompt."""
+    profile = parsed["profile"]
+    resolved = set(parsed["resolved"])
+    payload = {}
+    for field in ("candidate_name", "latest_job_title", "latest_company"):
+        if field in resolved:
+            payload[field] = profile[field]
+    education = {
+        key: profile["education"][key]
+        for key in ("degree", "university", "major")
+        if f"education.{key}" in resolved
+    }
+    if education:
+        payload["education"] = education
+    if "work_experiences" in resolved:
+        payload["work_experiences"] = [
+            {"index": i, "title": e["title"], "company": e["company"], "duration": e["duration"]}
+            for i, e in enumerate(profile["work_experiences"])
+        ]
+    return json.dumps(payload, ensure_ascii=False, indent=1)
+
+
+def compact_prompt_chars(parsed):
+    """Characters the profile JSON and the compact CV put in the Step 1 prompt."""
+    return min(len(parsed["compact_text"]), CV_PROMPT_CHAR_LIMIT) + len(profile_for_prompt(parsed))
+
+
+def is_usable(parsed, cv_text=None, min_coverage=0.4):
+    """Whether a parsed profile is good enough to replace the raw CV in Step 1.
+
+    The compact rendering only replaces the raw text when a template was
+    recognised, experience entries were parsed, and enough fields resolved.
+    Given the raw CV text, it must also make the prompt shorter: a short CV
+    can be smaller than its profile JSON plus compact text.
+    """
+    usable = bool(
+        parsed
+        and parsed.get("template_detected")
+        and parsed.get("compact_text")
+        and "work_experiences" in parsed.get("resolved", [])
+        and parsed.get("coverage", 0) >= min_coverage
+    )
+    if usable and cv_text is not None:
+        return compact_prompt_chars(parsed) < min(len(cv_text), CV_PROMPT_CHAR_LIMIT)
+    return usable
+
+
+class ParseCoverage:
+    """Accumulates local-parse coverage and prompt savings for one position."""
+
+    def __init__(self, position_name=""):
+        self.position_name = position_name
+        self.candidates = 0
+        self.templates = 0
+        self.used = 0
+        self.fields_resolved = 0
+        self.raw_chars = 0
+        self.sent_chars = 0
+
+    def record(self, cv_text, parsed):
+        """Record one candidate's parse result and the CV characters it puts in the prompt."""
+        self.candidates += 1
+        raw = min(len(cv_text or ""), CV_PROMPT_CHAR_LIMIT)
+        self.raw_chars += raw
+        if parsed and parsed.get("template_detected"):
+            self.templates += 1
+        if is_usable(parsed, cv_text or ""):
+            self.used += 1
+            self.fields_resolved += len(parsed["resolved"])
+            self.sent_chars += compact_prompt_chars(parsed)
+        else:
+            self.sent_chars += raw
+
+    @property
+    def tokens_saved(self):
+        return max(0, self.raw_chars - self.sent_chars) // CHARS_PER_TOKEN
+
+    def summary_lines(self):
+        """Human-readable lines for the position summary."""
+        if not self.candidates:
+            return []
+        avg_fields = (self.fields_resolved / self.used) if self.used else 0
+        return [
+            f"Local CV parse: {self.used}/{self.candidates} used "
+            f"({self.templates} template layouts, avg {avg_fields:.1f}/{len(PROFILE_FIELDS)} fields resolved)",
+            f"Step 1 CV prompt: {self.sent_chars:,} chars sent vs {self.raw_chars:,} raw "
+            f"(~{self.tokens_saved:,} tokens saved)",
+        ]
@@ -2,6 +2,11 @@ import fitz  # PyMuPDF
 import sys
 import os
 import re
+import threading
+
+# PyMuPDF is not thread-safe, and the stderr redirect below swaps the
+# process-wide fd 2, so extractions from pipeline threads run one at a time
+_EXTRACT_LOCK = threading.Lock()
 
 
 def clean_cv_text(raw_text):
@@ -33,45 +38,88 @@ def clean_cv_text(raw_text):
     return text.strip()
 
 
-def extract_text_from_pdf(uploaded_file, timeout_seconds=30):
+def _layout_lines_from_page(page, page_num):
+    """Flatten one page of ``page.get_text("dict")`` into layout lines.
+    
+    Each line keeps the font information needed by the local section parser:
+    the largest span size on the line and whether most of its characters are bold.
+    """
+    lines = []
+    layout = page.get_text("dict")
+    for block in layout.get("blocks", []):
+        # Image blocks (type 1) have no lines
+        if block.get("type", 0) != 0:
+            continue
+        for line in block.get("lines", []):
+            spans = [s for s in line.get("spans", []) if s.get("text", "").strip()]
+            if not spans:
+                continue
+            text = " ".join(s["text"].strip() for s in spans)
+            total_chars = sum(len(s["text"].strip()) for s in spans)
+            bold_chars = sum(
+                len(s["text"].strip()) for s in spans
+                if (s.get("flags", 0) & 16) or "bold" in s.get("font", "").lower()
+            )
+            x0, y0 = line.get("bbox", (0, 0, 0, 0))[:2]
+            lines.append({
+                "text": text,
+                "size": round(max(s.get("size", 0) for s in spans), 1),
+                "bold": total_chars > 0 and bold_chars * 2 >= total_chars,
+                "page": page_num,
+                "x0": round(x0, 1),
+                "y0": round(y0, 1),
+            })
+    return lines
+
+
+def extract_text_from_pdf(uploaded_file, timeout_seconds=30, with_layout=False):
     """Extract plain text from a PDF file stream with timeout.
     
     Args:
         uploaded_file: File-like object containing PDF data
         timeout_seconds: Maximum time to spend extracting (default 30s)
+        with_layout: If True, also collect per-line font/position information
+            from ``get_text("dict")`` for the local section parser
     
     Returns:
-        str: Extracted text, or empty string on failure
+        str: Extracted text, or empty string on failure.
+        When with_layout is True, returns a tuple (text, layout_lines) instead.
     """
     text = ""
+    layout_lines = []
     
-    # Suppress MuPDF errors by redirecting stderr at OS level
-    old_stderr = os.dup(2)  # Save original stderr file descriptor
-    devnull = os.open(os.devnull, os.O_WRONLY)
-    
-    try:
-        # Redirect stderr to devnull (suppresses MuPDF warnings)
-        os.dup2(devnull, 2)
+    with _EXTRACT_LOCK:
+        # Suppress MuPDF errors by redirecting stderr at OS level
+        old_stderr = os.dup(2)  # Save original stderr file descriptor
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        
+        try:
+            # Redirect stderr to devnull (suppresses MuPDF warnings)
+            os.dup2(devnull, 2)
         
-        with fitz.open(stream=uploaded_file.read(), filetype="pdf") as doc:
-            # Limit number of pages to prevent excessive processing
-            max_pages = min(len(doc), 50)  # Process max 50 pages
+            with fitz.open(stream=uploaded_file.read(), filetype="pdf") as doc:
+                # Limit number of pages to prevent excessive processing
+                max_pages = min(len(doc), 50)  # Process max 50 pages
             
-            for page_num in range(max_pages):
-                try:
-                    page = doc[page_num]
-                    text += page.get_text("text") + "\n"
-                except Exception:
-                    # Skip problematic pages
-                    continue
+                for page_num in range(max_pages):
+                    try:
+                        page = doc[page_num]
+                        text += page.get_text("text") + "\n"
+                        if with_layout:
+                            layout_lines.extend(_layout_lines_from_page(page, page_num))
+                    except Exception:
+                        # Skip problematic pages
+                        continue
                     
-    except Exception:
-        # Return whatever we managed to extract
-        pass
-    finally:
-        # Restore original stderr
-        os.dup2(old_stderr, 2)
-        os.close(devnull)
-        os.close(old_stderr)
+        except Exception:
+            # Return whatever we managed to extract
+            pass
+        finally:
+            # Restore original stderr
+            os.dup2(old_stderr, 2)
+            os.close(devnull)
+            os.close(old_stderr)
     
+    if with_layout:
+        return clean_cv_text(text), layout_lines
     return clean_cv_text(text)
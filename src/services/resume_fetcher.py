@@ -0,0 +1,202 @@
+"""
+Bulk resume fetcher with connection pooling and per-host concurrency limits.
+
+All resume downloads go through one shared ``requests.Session`` so TCP/TLS
+connections to kalibrr.com and storage.googleapis.com are kept alive and
+reused, and the Kalibrr ``kaid``/``kb`` cookies are set once on the session
+instead of being rebuilt for every request.
+
+``ResumeFetcher.prefetch()`` submits a whole position's resume URLs to a
+thread pool and returns futures, so ``screen_position`` can download CVs in
+the background while earlier candidates are being scored. Each host has its
+own concurrency cap so the bulk download never floods Kalibrr.
+
+Downloads are streamed and aborted once they exceed ``MAX_RESUME_BYTES``.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Same browser-like headers previously sent by extract_resume_from_url()
+RESUME_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/pdf,*/*'
+}
+
+# Maximum concurrent downloads per host (matched on domain suffix)
+HOST_CONCURRENCY = {
+    "kalibrr.com": 4,
+    "storage.googleapis.com": 8,
+}
+
+# Concurrency for any host not listed above
+DEFAULT_HOST_CONCURRENCY = 4
+
+# Worker threads shared by all hosts
+MAX_FETCH_WORKERS = 12
+
+# Resumes larger than this are abandoned mid-stream (CVs are rarely > 5 MB)
+MAX_RESUME_BYTES = 20 * 1024 * 1024
+
+# Streaming chunk size
+CHUNK_SIZE = 64 * 1024
+
+# (connect, read) timeout in seconds - read timeout applies per chunk
+REQUEST_TIMEOUT = (10, 30)
+
+
+def _host_key(url):
+    """Return the concurrency bucket for a URL (configured suffix or hostname)."""
+    host = (urlparse(str(url)).hostname or "").lower()
+    for suffix in HOST_CONCURRENCY:
+        if host == suffix or host.endswith("." + suffix):
+            return suffix
+    return host
+
+
+class ResumeFetcher:
+    """Pooled resume downloader shared by the screening loop."""
+
+    def __init__(self, max_workers=MAX_FETCH_WORKERS, host_limits=None, max_bytes=MAX_RESUME_BYTES):
+        self.max_workers = max_workers
+        self.host_limits = dict(HOST_CONCURRENCY if host_limits is None else host_limits)
+        self.max_bytes = max_bytes
+        self.session = self._build_session()
+        self._executor = None
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _build_session(self):
+        """Create the keep-alive session with Kalibrr cookies attached once."""
+        session = requests.Session()
+        session.headers.update(RESUME_REQUEST_HEADERS)
+
+        # Pool sized for the worker count so threads never wait on a connection
+        adapter = HTTPAdapter(pool_connections=len(HOST_CONCURRENCY) + 4, pool_maxsize=self.max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        # Kalibrr auth cookies - scoped to the kalibrr.com domain only
+        for name, env_var in (("kaid", "KAID"), ("kb", "KB")):
+            value = os.getenv(env_var, "")
+            if value:
+                session.cookies.set(name, value, domain=".kalibrr.com")
+        return session
+
+    def _semaphore_for(self, url):
+        """Get (or lazily create) the semaphore for the URL's host bucket."""
+        key = _host_key(url)
+        with self._lock:
+            if key not in self._semaphores:
+                limit = self.host_limits.get(key, DEFAULT_HOST_CONCURRENCY)
+                self._semaphores[key] = threading.BoundedSemaphore(max(1, limit))
+            return self._semaphores[key]
+
+    def _read_limited(self, response):
+        """Stream the response body, returning None if it exceeds max_bytes."""
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > self.max_bytes:
+            return None
+
+        chunks = []
+        total = 0
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if not chunk:
+                continue
+            total += len(chunk)
+            if total > self.max_bytes:
+                return None
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def fetch(self, url, max_retries=1):
+        """Download one resume (blocking), honouring the per-host limit.
+
+        Args:
+            url: URL to the resume PDF
+            max_retries: Maximum attempts; only HTTP 429 is retried (fail fast otherwise)
+
+        Returns:
+            bytes: Raw PDF content, or None on failure / oversize
+        """
+        if not url or not str(url).strip():
+            return None
+        url = str(url).strip()
+
+        for attempt in range(max_retries):
+            try:
+                with self._semaphore_for(url):
+                    with self.session.get(url, timeout=REQUEST_TIMEOUT, stream=True) as response:
+                        if response.status_code == 200:
+                            return self._read_limited(response)
+                        status = response.status_code
+                if status == 429 and attempt < max_retries - 1:
+                    time.sleep(2)  # Back off outside the semaphore
+                    continue
+                # Don't retry on other HTTP errors - fail fast
+                return None
+            except requests.exceptions.RequestException:
+                # Don't retry on timeouts/network errors - fail fast
+                return None
+        return None
+
+    def prefetch(self, urls, max_retries=1):
+        """Start downloading all URLs in the background.
+
+        Args:
+            urls: Iterable of resume URLs (blank/NaN entries are ignored, duplicates fetched once)
+            max_retries: Passed to fetch()
+
+        Returns:
+            dict: {url: Future[bytes | None]}
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="resume-fetch")
+            executor = self._executor
+
+        futures = {}
+        for url in urls:
+            if not isinstance(url, str) or not url.strip():
+                continue
+            key = url.strip()
+            if key not in futures:
+                futures[key] = executor.submit(self.fetch, key, max_retries)
+        return futures
+
+    def fetch_many(self, urls, max_retries=1):
+        """Download all URLs concurrently and wait for them.
+
+        Returns:
+            dict: {url: bytes | None}
+        """
+        futures = self.prefetch(urls, max_retries=max_retries)
+        return {url: future.result() for url, future in futures.items()}
+
+    def close(self):
+        """Shut down worker threads and close pooled connections."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+_shared_fetcher = None
+_shared_lock = threading.Lock()
+
+
+def get_resume_fetcher():
+    """Return the process-wide ResumeFetcher (created on first use)."""
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = ResumeFetcher()
+        return _shared_fetcher
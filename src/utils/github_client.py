@@ -0,0 +1,270 @@
+"""
+GitHub Client
+One pooled, rate-limit-aware session for every GitHub API call.
+
+Each helper in github_utils.py, status_patches.py and usage_logger.py used to
+build its own request with requests.get/put: a new TLS connection per call,
+no timeout on some of them, and no look at GitHub's rate-limit headers, so a
+busy dashboard could burn through the hourly budget and then fail every
+save with 403s. All calls now go through GitHubClient:
+
+- one keep-alive requests.Session with a connection pool sized for the
+  parallel results downloads, and GITHUB_TIMEOUT on every request
+- X-RateLimit-Remaining / X-RateLimit-Reset are tracked from every response;
+  once fewer than GITHUB_RATE_LIMIT_RESERVE calls remain, callers sleep
+  until the reset instead of spending the rest
+- 429s and rate-limit 403s are retried after Retry-After (or the reset), and
+  502/503/504s after a short backoff
+
+Every call is counted against the current operation, named with
+github_operation("save_results") (usable as a decorator). The outermost
+operation wins, so a UI action such as toggling pooling is billed for every
+call its helpers make. Operations that need GITHUB_HEAVY_OPERATION_CALLS or
+more calls are printed, and github_call_stats() returns the totals.
+"""
+
+import contextvars
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.run_profiler import profile_event
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Network timeout for GitHub API requests (in seconds)
+GITHUB_TIMEOUT = 30
+
+# Connections kept open (load_all_results_from_github downloads in parallel)
+GITHUB_POOL_SIZE = 16
+
+# Retries for 429 / rate-limit 403 / 502-504 responses
+GITHUB_MAX_RETRIES = 3
+
+# Wait for the rate-limit reset once fewer calls than this remain
+GITHUB_RATE_LIMIT_RESERVE = 50
+
+# Never sleep longer than this for a rate-limit reset (seconds); a longer
+# wait returns the response to the caller instead
+GITHUB_MAX_RATE_WAIT = 900
+
+# Print operations that need at least this many API calls
+GITHUB_HEAVY_OPERATION_CALLS = 20
+
+_RETRY_STATUS = (502, 503, 504)
+
+# Operation billed for GitHub calls in the current context: [name, calls]
+_OPERATION = contextvars.ContextVar("github_operation", default=None)
+
+
+class GitHubClient:
+    """Pooled GitHub API session that respects the rate limit."""
+
+    def __init__(self, pool_size=GITHUB_POOL_SIZE, max_retries=GITHUB_MAX_RETRIES,
+                 reserve=GITHUB_RATE_LIMIT_RESERVE, max_wait=GITHUB_MAX_RATE_WAIT):
+        self.max_retries = max_retries
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.session = self._build_session(pool_size)
+        self.remaining = None       # X-RateLimit-Remaining of the latest response
+        self.reset_at = None        # X-RateLimit-Reset (epoch seconds)
+        self.calls = defaultdict(int)       # operation -> API calls
+        self.runs = defaultdict(int)        # operation -> times it ran
+        self.max_calls = defaultdict(int)   # operation -> most calls in one run
+        self.rate_waits = 0.0               # seconds slept for the rate limit
+        self._lock = threading.Lock()
+
+    def _build_session(self, pool_size):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _update_rate_limit(self, response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            with self._lock:
+                self.remaining = int(remaining)
+                self.reset_at = float(reset)
+        except ValueError:
+            pass
+
+    def _sleep(self, seconds, reason):
+        print(f"⏳ GitHub {reason}: waiting {seconds:.0f}s")
+        profile_event("github_rate_wait")
+        with self._lock:
+            self.rate_waits += seconds
+        time.sleep(seconds)
+
+    def _wait_for_budget(self):
+        """Sleep until the reset when the remaining budget is down to the reserve."""
+        with self._lock:
+            remaining, reset_at = self.remaining, self.reset_at
+        if remaining is None or reset_at is None or remaining > self.reserve:
+            return
+        wait = reset_at - time.time() + 1
+        if wait <= 0:
+            return
+        if wait > self.max_wait:
+            return   # too long to block; let the call fail or succeed on its own
+        self._sleep(wait, f"rate limit ({remaining} calls left)")
+        with self._lock:
+            if self.reset_at == reset_at:
+                self.remaining = None
+
+    def _retry_delay(self, response, attempt):
+        """Seconds to wait before retrying a response, or None to return it."""
+        status = response.status_code
+        if status in (403, 429):
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    return 60.0
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                reset = response.headers.get("X-RateLimit-Reset")
+                try:
+                    return max(float(reset) - time.time() + 1, 1.0)
+                except (TypeError, ValueError):
+                    return 60.0
+            return None   # a real permission error
+        if status in _RETRY_STATUS:
+            return 2.0 ** attempt
+        return None
+
+    def _count(self):
+        operation = _OPERATION.get()
+        name = operation[0] if operation is not None else "other"
+        with self._lock:
+            self.calls[name] += 1
+            if operation is not None:
+                operation[1] += 1
+        profile_event("github_api_calls")
+
+    def request(self, method, url, timeout=GITHUB_TIMEOUT, **kwargs):
+        """Send a request (retrying rate limits and gateway errors).
+
+        Args:
+            method (str): HTTP method
+            url (str): Full URL, or a path starting with "/" under GITHUB_API_URL
+            timeout (float): Request timeout in seconds
+            **kwargs: Passed to requests.Session.request (headers, params, data, json)
+
+        Returns:
+            requests.Response: The last response; network errors raise
+                requests.exceptions.RequestException as before
+        """
+        if url.startswith("/"):
+            url = GITHUB_API_URL + url
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_budget()
+            self._count()
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+            self._update_rate_limit(response)
+            delay = self._retry_delay(response, attempt)
+            if delay is None or attempt == self.max_retries or delay > self.max_wait:
+                return response
+            response.close()   # release the connection (streamed responses)
+            self._sleep(delay, f"{response.status_code} on {method} {url.split('?')[0]}")
+            if response.status_code in (403, 429):
+                profile_event("github_429")
+                # Already waited for this reset; do not wait again before the retry
+                with self._lock:
+                    self.remaining = None
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def finish_operation(self, name, calls):
+        """Record one finished run of an operation."""
+        with self._lock:
+            self.runs[name] += 1
+            self.max_calls[name] = max(self.max_calls[name], calls)
+        if calls >= GITHUB_HEAVY_OPERATION_CALLS:
+            print(f"⚠ GitHub: {name} used {calls} API calls")
+
+    def stats(self):
+        """Call counts per operation and the last known rate-limit budget."""
+        with self._lock:
+            return {
+                "operations": {
+                    name: {"calls": calls, "runs": self.runs.get(name, 0), "max_calls": self.max_calls.get(name, calls)}
+                    for name, calls in sorted(self.calls.items(), key=lambda item: item[1], reverse=True)
+                },
+                "remaining": self.remaining,
+                "reset_at": self.reset_at,
+                "rate_wait_seconds": round(self.rate_waits, 1),
+            }
+
+
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_github_client():
+    """Return the process-wide GitHub client, creating it on first use."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = GitHubClient()
+        return _CLIENT
+
+
+@contextmanager
+def github_operation(name):
+    """Bill GitHub calls made in the block (or decorated function) to `name`.
+
+    Nested operations are billed to the outermost one. Worker threads need
+    the context copied (contextvars.copy_context().run) to be billed.
+    """
+    if _OPERATION.get() is not None:
+        yield
+        return
+    operation = [name, 0]
+    token = _OPERATION.set(operation)
+    try:
+        yield
+    finally:
+        _OPERATION.reset(token)
+        get_github_client().finish_operation(name, operation[1])
+
+
+def github_call_stats():
+    """API calls per operation for this process (see GitHubClient.stats)."""
+    return get_github_client().stats()
+
+
+def github_call_summary_lines(top=None):
+    """Console lines: API calls per operation (most first) and the remaining budget."""
+    stats = github_call_stats()
+    lines = [
+        f"{name}: {op['calls']} call(s) in {op['runs']} run(s), max {op['max_calls']} per run"
+        if op["runs"] else f"{name}: {op['calls']} call(s)"
+        for name, op in list(stats["operations"].items())[:top]
+    ]
+    if stats["remaining"] is not None:
+        lines.append(f"rate limit: {stats['remaining']} call(s) left"
+                     + (f", waited {stats['rate_wait_seconds']:.0f}s" if stats["rate_wait_seconds"] else ""))
+    return lines
@@ -0,0 +1,179 @@
+"""
+HTTP Cache Module
+Small on-disk conditional-GET cache for the published Google Sheet and
+File Storage candidate CSVs.
+
+Each cached URL stores its body plus the ETag / Last-Modified validators.
+Subsequent fetches send If-None-Match / If-Modified-Since and reuse the
+cached body on 304 Not Modified. If the network fails (timeout, connection
+error, 429 or 5xx after retries) the last cached body is served as stale. A
+404 forgets the cached copy: a deleted file is not "found" again.
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+from datetime import datetime
+
+import requests
+
+from src.config.paths import HTTP_CACHE_DIR
+
+# Keep at most this many cached URLs (File Storage URLs change per export)
+HTTP_CACHE_MAX_ENTRIES = 200
+
+# Fetch outcomes
+SOURCE_NETWORK = "network"          # 200 - fresh body downloaded
+SOURCE_NOT_MODIFIED = "not_modified"  # 304 - cached body revalidated
+SOURCE_STALE = "stale"              # network failed - cached body served
+
+
+def _cache_paths(url):
+    """Return (body_path, meta_path) for a URL."""
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+    return HTTP_CACHE_DIR / f"{key}.body", HTTP_CACHE_DIR / f"{key}.json"
+
+
+def _read_cache(url):
+    """Load (body, meta) for a URL, or (None, {}) if not cached / unreadable."""
+    body_path, meta_path = _cache_paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, {}
+    # Concurrent writers of one URL can leave one's body with the other's
+    # validators; such a pair is not used
+    if meta.get("body_sha1") and meta["body_sha1"] != hashlib.sha1(body).hexdigest():
+        return None, {}
+    return body, meta
+
+
+def _write_atomic(path, data, mode):
+    """Write a file via temp file + rename so readers never see partial data.
+
+    The temp file is unique per call, so threads writing the same key never
+    share one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_cache(url, response):
+    """Store the response body and its validators."""
+    try:
+        HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        body_path, meta_path = _cache_paths(url)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "fetched_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "body_sha1": hashlib.sha1(response.content).hexdigest(),
+        }
+        _write_atomic(body_path, response.content, "wb")
+        _write_atomic(meta_path, json.dumps(meta, indent=2), "w")
+        _prune_cache()
+    except OSError as e:
+        print(f"⚠ Could not write HTTP cache: {e}")
+
+
+def _drop_cache(url):
+    """Forget a URL that no longer exists."""
+    for path in _cache_paths(url):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _touch_cache(url):
+    """Mark a revalidated entry as recently used (for pruning order)."""
+    _, meta_path = _cache_paths(url)
+    try:
+        os.utime(meta_path)
+    except OSError:
+        pass
+
+
+def _prune_cache():
+    """Drop least recently used entries beyond HTTP_CACHE_MAX_ENTRIES."""
+    metas = sorted(HTTP_CACHE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for meta_path in metas[HTTP_CACHE_MAX_ENTRIES:]:
+        for path in (meta_path, meta_path.with_suffix(".body")):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def cached_get(url, headers=None, timeout=30, max_retries=3, retry_delay=2, session=None, stale_ok=True):
+    """GET a URL with conditional revalidation and stale-on-error fallback.
+
+    Args:
+        url (str): URL to fetch
+        headers (dict): Extra request headers
+        timeout (int): Request timeout in seconds
+        max_retries (int): Attempts before falling back to the cached body
+            (network errors, 429 and 5xx responses are retried; any other
+            status returns (None, None) at once)
+        retry_delay (int): Seconds to wait between attempts
+        session: Object with a requests-style get() (e.g. the GitHub client);
+            defaults to plain requests
+        stale_ok (bool): Serve the cached body when every attempt failed with
+            a network error, 429 or 5xx; False returns (None, None) instead
+
+    Returns:
+        tuple: (content bytes or None, source) where source is one of
+            "network", "not_modified", "stale", or None when nothing is available
+    """
+    url = str(url).strip()
+    cached_body, meta = _read_cache(url)
+
+    request_headers = dict(headers or {})
+    if cached_body is not None:
+        if meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+
+    for attempt in range(max_retries):
+        try:
+            response = (session or requests).get(url, headers=request_headers, timeout=timeout)
+
+            if response.status_code == 304 and cached_body is not None:
+                _touch_cache(url)
+                return cached_body, SOURCE_NOT_MODIFIED
+
+            if response.status_code == 200:
+                _write_cache(url, response)
+                return response.content, SOURCE_NETWORK
+
+            if response.status_code < 500 and response.status_code != 429:
+                # A definite answer (404 Not Found, 401, ...): never serve a stale copy
+                if response.status_code in (404, 410):
+                    _drop_cache(url)
+                return None, None
+
+        except requests.exceptions.RequestException:
+            pass
+
+        if attempt < max_retries - 1:
+            time.sleep(retry_delay)
+
+    if cached_body is not None and stale_ok:
+        return cached_body, SOURCE_STALE
+    return None, None
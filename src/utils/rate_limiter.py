@@ -0,0 +1,126 @@
+"""
+Global LLM Rate Limiter
+One request budget shared by every thread that calls Gemini.
+
+call_api_with_retry() used to sleep REQUEST_DELAY after each call in the
+calling thread, so the real request rate grew with the number of pipeline
+workers (and of positions screened at once). WeightedRateLimiter instead hands
+out request slots at a fixed process-wide rate. When several owners (positions)
+are waiting, the next slot goes to the owner with the lowest weighted usage, so
+a position with weight 3 gets about three requests for every one of a weight-1
+position, and a large position cannot starve the others.
+
+The owner of a call is taken from a context variable set with
+set_rate_owner(); src/pipelines/stages.py copies the context into its worker
+threads so every stage of a position is billed to that position.
+"""
+
+import contextvars
+import itertools
+import threading
+import time
+from collections import defaultdict
+
+# Owner (position name) billed for LLM calls made in the current context
+_RATE_OWNER = contextvars.ContextVar("rate_owner", default=None)
+
+
+def get_rate_owner():
+    """Owner billed for LLM calls in the current context (None if unset)."""
+    return _RATE_OWNER.get()
+
+
+def set_rate_owner(owner, weight=None, limiter=None):
+    """Bill LLM calls made in the current context (and threads copied from it) to owner.
+
+    Args:
+        owner (str): Owner name, typically the job position
+        weight (float): Optional fair-share weight to register for the owner
+        limiter (WeightedRateLimiter): Limiter to register the weight on
+            (defaults to the global limiter)
+    """
+    _RATE_OWNER.set(owner)
+    if weight is not None:
+        (limiter or get_rate_limiter()).set_weight(owner, weight)
+
+
+class WeightedRateLimiter:
+    """Process-wide request pacing with weighted fair sharing between owners."""
+
+    def __init__(self, requests_per_minute):
+        """
+        Args:
+            requests_per_minute (float): Total request budget for the process
+        """
+        self.min_interval = 60.0 / max(float(requests_per_minute), 1e-6)
+        self._cond = threading.Condition()
+        self._next_slot = 0.0
+        self._waiting = []
+        self._tickets = itertools.count()
+        self._weights = {}
+        self._usage = defaultdict(float)
+        self._virtual_time = 0.0
+        self.granted = defaultdict(int)
+
+    def set_weight(self, owner, weight):
+        """Set an owner's fair-share weight (default 1)."""
+        with self._cond:
+            self._weights[owner] = max(float(weight), 1e-6)
+
+    def _next_waiter(self):
+        # Lowest weighted usage first, FIFO among equals
+        return min(self._waiting, key=lambda entry: (self._usage[entry[0]], entry[1]))
+
+    def acquire(self, owner=None):
+        """Block until the caller may send one request.
+
+        Args:
+            owner (str): Owner to bill; defaults to the context's rate owner
+        """
+        owner = owner if owner is not None else _RATE_OWNER.get()
+        with self._cond:
+            # An owner returning after being idle starts at the current virtual
+            # time instead of cashing in the share it did not use
+            if not any(entry[0] == owner for entry in self._waiting):
+                self._usage[owner] = max(self._usage[owner], self._virtual_time)
+            entry = (owner, next(self._tickets))
+            self._waiting.append(entry)
+            while True:
+                now = time.monotonic()
+                is_next = self._next_waiter() is entry
+                if is_next and now >= self._next_slot:
+                    break
+                self._cond.wait(max(self._next_slot - now, 0.01) if is_next else None)
+            self._waiting.remove(entry)
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+            self._virtual_time = self._usage[owner]
+            self._usage[owner] += 1.0 / self._weights.get(owner, 1.0)
+            self.granted[owner] += 1
+            self._cond.notify_all()
+
+    def pause(self, seconds):
+        """Hold every caller for `seconds` (e.g. after a 429 from the API)."""
+        with self._cond:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+
+_LIMITER = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter(requests_per_minute=None):
+    """Return the process-wide limiter, creating it on first use.
+
+    Args:
+        requests_per_minute (float): Budget used when the limiter is created
+            (defaults to scorer.LLM_REQUESTS_PER_MINUTE)
+    """
+    global _LIMITER
+    with _LIMITER_LOCK:
+        if _LIMITER is None:
+            if requests_per_minute is None:
+                from src.pipelines.scorer import LLM_REQUESTS_PER_MINUTE
+                requests_per_minute = LLM_REQUESTS_PER_MINUTE
+            _LIMITER = WeightedRateLimiter(requests_per_minute)
+        return _LIMITER
@@ -0,0 +1,176 @@
+"""
+Run Profiler
+Per-stage timing histograms for auto_screen runs.
+
+Console prints cannot tell whether a slow night came from Kalibrr downloads,
+PyMuPDF, Gemini throttling/429s or GitHub PUT conflicts. When a profiler is
+started (start_run_profiler()), instrumented code records durations with
+profile_span("stage") and counts events with profile_event("name"). Each
+record is attributed to the run and to the position whose rate owner is set
+in the current context (see src/utils/rate_limiter.py).
+
+write() stores one JSON file per run in outputs/profiles/:
+
+    {"meta": {...},
+     "run": {stage: stats},  "positions": {position: {stage: stats}},
+     "events": {"run": {event: n}, "positions": {position: {event: n}}}}
+
+where stats = count, total, mean, p50, p90, p99, max (seconds) and a
+histogram over HISTOGRAM_BUCKETS. scripts/compare_profiles.py diffs two runs.
+
+When no profiler is started (e.g. in the Streamlit app), the helpers do nothing.
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.config.paths import PROFILE_DIR
+from src.utils.rate_limiter import get_rate_owner
+
+# Histogram upper bounds in seconds (last bucket is open-ended)
+HISTOGRAM_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300]
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def timing_stats(durations):
+    """Summary statistics and histogram for a list of durations (seconds)."""
+    values = sorted(durations)
+    histogram = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+    for value in values:
+        histogram[bisect_left(HISTOGRAM_BUCKETS, value)] += 1
+    total = sum(values)
+    return {
+        "count": len(values),
+        "total": round(total, 4),
+        "mean": round(total / len(values), 4) if values else 0.0,
+        "p50": round(_percentile(values, 0.50), 4),
+        "p90": round(_percentile(values, 0.90), 4),
+        "p99": round(_percentile(values, 0.99), 4),
+        "max": round(values[-1], 4) if values else 0.0,
+        "histogram": histogram,
+    }
+
+
+class RunProfiler:
+    """Collects stage durations and event counts for one run."""
+
+    def __init__(self, name="auto_screen"):
+        self.name = name
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._durations = defaultdict(list)   # (position, stage) -> [seconds]
+        self._events = defaultdict(int)       # (position, event) -> count
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, position=None):
+        position = position if position is not None else get_rate_owner()
+        with self._lock:
+            self._durations[(position, stage)].append(seconds)
+
+    def event(self, name, count=1, position=None):
+        position = position if position is not None else get_rate_owner()
+        with self._lock:
+            self._events[(position, name)] += count
+
+    def to_dict(self):
+        with self._lock:
+            durations = {key: list(values) for key, values in self._durations.items()}
+            events = dict(self._events)
+
+        run_durations = defaultdict(list)
+        position_durations = defaultdict(lambda: defaultdict(list))
+        for (position, stage), values in durations.items():
+            run_durations[stage].extend(values)
+            if position is not None:
+                position_durations[position][stage].extend(values)
+
+        run_events = defaultdict(int)
+        position_events = defaultdict(dict)
+        for (position, name), count in events.items():
+            run_events[name] += count
+            if position is not None:
+                position_events[position][name] = count
+
+        return {
+            "meta": {
+                "name": self.name,
+                "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "wall_seconds": round(time.perf_counter() - self._started, 2),
+                "histogram_buckets": HISTOGRAM_BUCKETS,
+            },
+            "run": {stage: timing_stats(values) for stage, values in sorted(run_durations.items())},
+            "positions": {
+                position: {stage: timing_stats(values) for stage, values in sorted(stages.items())}
+                for position, stages in sorted(position_durations.items())
+            },
+            "events": {"run": dict(sorted(run_events.items())), "positions": dict(sorted(position_events.items()))},
+        }
+
+    def write(self, directory=PROFILE_DIR):
+        """Write the profile JSON and return its path (None on failure)."""
+        path = directory / f"run_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠ Could not write run profile: {e}")
+            return None
+        return path
+
+    def summary_lines(self, top=None):
+        """Run-level stage lines (slowest total first) for the console."""
+        stages = self.to_dict()["run"]
+        ordered = sorted(stages.items(), key=lambda item: item[1]["total"], reverse=True)
+        return [
+            f"{stage}: {stats['count']}x, total {stats['total']:.1f}s, "
+            f"p50 {stats['p50']:.2f}s, p90 {stats['p90']:.2f}s, max {stats['max']:.2f}s"
+            for stage, stats in ordered[:top]
+        ]
+
+
+_PROFILER = None
+
+
+def start_run_profiler(name="auto_screen"):
+    """Start collecting (replaces any previous profiler) and return it."""
+    global _PROFILER
+    _PROFILER = RunProfiler(name)
+    return _PROFILER
+
+
+def get_run_profiler():
+    """The active profiler, or None when profiling is off."""
+    return _PROFILER
+
+
+@contextmanager
+def profile_span(stage):
+    """Time the enclosed block as `stage` (no-op without an active profiler)."""
+    profiler = _PROFILER
+    if profiler is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.record(stage, time.perf_counter() - started)
+
+
+def profile_event(name, count=1):
+    """Count an event such as a 429 or a 409 (no-op without an active profiler)."""
+    profiler = _PROFILER
+    if profiler is not None:
+        profiler.event(name, count)
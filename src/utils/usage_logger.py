@@ -6,20 +6,36 @@ Tracks daily API usage for CV processing (both Streamlit and GitHub Actions)
 import os
 import json
 import base64
+import threading
 from datetime import datetime
 from pathlib import Path
-import requests
+
+from src.utils.github_client import get_github_client, github_operation
 
 # Log file path - src/utils/usage_logger.py → src/utils → src → project root
 CURRENT_DIR = Path(__file__).resolve().parent.parent.parent
 LOG_FILE = CURRENT_DIR / "logs" / "api_usage_log.json"
 
+# Serializes log_cv_processing() updates from concurrent screening threads
+_LOG_LOCK = threading.Lock()
+
+# When set (auto_screen), log updates are staged in this GitCommitBuilder and
+# committed with the run's batch commits instead of one commit per update
+_COMMIT_BUILDER = None
+
+
+def set_log_commit_builder(builder):
+    """Stage usage-log commits in a GitCommitBuilder (None to commit directly)."""
+    global _COMMIT_BUILDER
+    _COMMIT_BUILDER = builder
+
 def ensure_log_directory():
     """Ensure logs directory exists"""
     log_dir = LOG_FILE.parent
     log_dir.mkdir(parents=True, exist_ok=True)
 
 
+@github_operation("usage_log")
 def _commit_log_to_github(log_data):
     """Commit usage log to GitHub repository using GitHub API
     
@@ -29,6 +45,10 @@ def _commit_log_to_github(log_data):
     Returns:
         bool: True if commit successful, False otherwise
     """
+    if _COMMIT_BUILDER is not None:
+        _COMMIT_BUILDER.put("logs/api_usage_log.json", json.dumps(log_data, indent=2, ensure_ascii=False))
+        return True
+    
     try:
         # Get GitHub credentials from environment
         token = os.environ.get("GITHUB_TOKEN")
@@ -48,7 +68,7 @@ def _commit_log_to_github(log_data):
         
         # Get current file SHA (needed for update)
         url = f"https://api.github.com/repos/{repo}/contents/{file_path}"
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_github_client().get(url, headers=headers)
         
         sha = None
         if response.status_code == 200:
@@ -72,7 +92,7 @@ def _commit_log_to_github(log_data):
             payload["sha"] = sha
         
         # Push to GitHub
-        response = requests.put(url, headers=headers, json=payload, timeout=10)
+        response = get_github_client().put(url, headers=headers, json=payload)
         
         if response.status_code in [200, 201]:
             print(f"✓ Log committed to GitHub: {file_path}")
@@ -138,55 +158,57 @@ def log_cv_processing(source="unknown", candidate_name="", position="", success=
     today = datetime.now().strftime("%Y-%m-%d")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    # Load existing log
-    log_data = load_usage_log()
+    # Load-modify-save under a lock (positions may be screened concurrently)
+    with _LOG_LOCK:
+        # Load existing log
+        log_data = load_usage_log()
+    
+        # Initialize date entry if it doesn't exist
+        if today not in log_data:
+            log_data[today] = {
+                "total": 0,
+                "streamlit": 0,
+                "github_action": 0,
+                "successful": 0,
+                "failed": 0,
+                "positions": {},
+                "entries": []
+            }
     
-    # Initialize date entry if it doesn't exist
-    if today not in log_data:
-        log_data[today] = {
-            "total": 0,
-            "streamlit": 0,
-            "github_action": 0,
-            "successful": 0,
-            "failed": 0,
-            "positions": {},
-            "entries": []
-        }
+        # Update counters
+        log_data[today]["total"] += 1
     
-    # Update counters
-    log_data[today]["total"] += 1
-    
-    # Update source counter
-    if source in ["streamlit", "github_action"]:
-        log_data[today][source] += 1
-    
-    # Update success counter
-    if success:
-        log_data[today]["successful"] += 1
-    else:
-        log_data[today]["failed"] += 1
-    
-    # Update position counter
-    if position:
-        if position not in log_data[today]["positions"]:
-            log_data[today]["positions"][position] = 0
-        log_data[today]["positions"][position] += 1
-    
-    # Add detailed entry (optional - can be disabled to reduce file size)
-    log_data[today]["entries"].append({
-        "timestamp": timestamp,
-        "source": source,
-        "candidate": candidate_name,
-        "position": position,
-        "success": success
-    })
-    
-    # Keep only last 100 entries per day to prevent log from growing too large
-    if len(log_data[today]["entries"]) > 100:
-        log_data[today]["entries"] = log_data[today]["entries"][-100:]
-    
-    # Save updated log
-    save_usage_log(log_data)
+        # Update source counter
+        if source in ["streamlit", "github_action"]:
+            log_data[today][source] += 1
+    
+        # Update success counter
+        if success:
+            log_data[today]["successful"] += 1
+        else:
+            log_data[today]["failed"] += 1
+    
+        # Update position counter
+        if position:
+            if position not in log_data[today]["positions"]:
+                log_data[today]["positions"][position] = 0
+            log_data[today]["positions"][position] += 1
+    
+        # Add detailed entry (optional - can be disabled to reduce file size)
+        log_data[today]["entries"].append({
+            "timestamp": timestamp,
+            "source": source,
+            "candidate": candidate_name,
+            "position": position,
+            "success": success
+        })
+    
+        # Keep only last 100 entries per day to prevent log from growing too large
+        if len(log_data[today]["entries"]) > 100:
+            log_data[today]["entries"] = log_data[today]["entries"][-100:]
+    
+        # Save updated log
+        save_usage_log(log_data)
     
     # Print confirmation (useful for debugging)
     print(f"✓ Logged: {candidate_name} ({position}) - {'Success' if success else 'Failed'} - Source: {source}")
@@ -0,0 +1,122 @@
+"""Test GitCommitBuilder against an in-memory Git Data API: one commit for many files, rebase on a lost race."""
+import sys, base64, itertools, json
+sys.path.insert(0, '.')
+import pandas as pd
+import src.repositories.git_commit_builder as gcb
+from src.repositories.git_commit_builder import GitCommitBuilder, git_blob_sha
+from src.repositories.github_utils import merge_results_csv, save_results_to_github
+from src.repositories.results_sidecar import HAS_PYARROW, read_sidecar
+
+
+class FakeResponse:
+    def __init__(self, status, payload):
+        self.status_code, self._payload = status, payload
+        self.headers = {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise gcb.requests.exceptions.HTTPError(str(self.status_code))
+
+
+class FakeRepo:
+    """Commits are {path: text} snapshots; trees and commits share ids."""
+    def __init__(self, files):
+        self.ids = (f"{n:040x}" for n in itertools.count(1))
+        self.commits = {}
+        self.blobs = {}
+        self.head = self._commit(dict(files), None)
+        self.before_patch = None
+
+    def _commit(self, files, parent):
+        sha = next(self.ids)
+        self.commits[sha] = (files, parent)
+        return sha
+
+    def request(self, method, url, headers=None, timeout=None, json=None, params=None):
+        path = url.split("/repos/owner/repo", 1)[1]
+        if method == "GET" and path == "/git/ref/heads/main":
+            return FakeResponse(200, {"object": {"sha": self.head}})
+        if method == "GET" and path.startswith("/git/commits/"):
+            return FakeResponse(200, {"tree": {"sha": path.rsplit("/", 1)[1]}})
+        if method == "GET" and path.startswith("/git/trees/"):
+            files = self.commits[path.rsplit("/", 1)[1]][0]
+            return FakeResponse(200, {"tree": [{"path": p, "type": "blob", "sha": git_blob_sha(t)} for p, t in files.items()]})
+        if method == "GET" and path.startswith("/git/blobs/"):
+            blob = path.rsplit("/", 1)[1]
+            text = next(t for c in self.commits.values() for t in c[0].values() if git_blob_sha(t) == blob)
+            return FakeResponse(200, {"content": base64.b64encode(text.encode()).decode()})
+        if method == "POST" and path == "/git/blobs":
+            data = base64.b64decode(json["content"])
+            self.blobs[git_blob_sha(data)] = data
+            return FakeResponse(201, {"sha": git_blob_sha(data)})
+        if method == "POST" and path == "/git/trees":
+            files = dict(self.commits[json["base_tree"]][0])
+            for entry in json["tree"]:
+                if entry.get("sha", "") is None:
+                    files.pop(entry["path"], None)
+                elif "sha" in entry:
+                    files[entry["path"]] = self.blobs[entry["sha"]]
+                else:
+                    files[entry["path"]] = entry["content"]
+            return FakeResponse(201, {"sha": self._commit(files, None)})
+        if method == "POST" and path == "/git/commits":
+            files = self.commits[json["tree"]][0]
+            return FakeResponse(201, {"sha": self._commit(files, json["parents"][0])})
+        if method == "PATCH" and path == "/git/refs/heads/main":
+            if self.before_patch:
+                self.before_patch(), setattr(self, "before_patch", None)
+            if self.commits[json["sha"]][1] != self.head:
+                return FakeResponse(422, {"message": "Update is not a fast forward"})
+            self.head = json["sha"]
+            return FakeResponse(200, {})
+        return FakeResponse(404, {})
+
+    def files(self):
+        return self.commits[self.head][0]
+
+
+def rows(*emails):
+    return pd.DataFrame({"Candidate Name": list(emails), "Candidate Email": list(emails),
+                         "Job Position": "P", "Date Applied": "2026-01-01", "Date Processed": "x"})
+
+
+paths = [f"data/processed/results_P{i}.csv" for i in range(20)]
+repo = FakeRepo({paths[0]: rows("old@x").to_csv(index=False), "README.md": "hi"})
+gcb.get_github_client().session.request = repo.request
+
+# 20 result files + the usage log in one commit, a handful of calls
+builder = GitCommitBuilder("batch", repo="owner/repo", branch="main", token="t")
+committed = []
+for path in paths:
+    save_results_to_github(rows("a@x"), path=path, builder=builder)
+builder.merge(paths[0], lambda text: merge_results_csv(text, rows("b@x")), on_commit=lambda: committed.append(1))
+builder.put("logs/api_usage_log.json", json.dumps({"n": 1}))
+assert builder.commit() and committed == [1]
+# With pyarrow every results CSV also gets its Parquet sidecar (one blob upload each)
+sidecars = len(paths) if HAS_PYARROW else 0
+print(f"First commit: {builder.api_calls} API calls for {len(paths) + 1} files (+{sidecars} sidecars)")
+assert builder.api_calls <= 7 + sidecars, builder.api_calls
+assert builder.commits == 1 and builder.pending == 0
+assert pd.read_csv(pd.io.common.StringIO(repo.files()[paths[0]]))["Candidate Email"].tolist() == ["old@x", "a@x", "b@x"]
+assert repo.files()["README.md"] == "hi" and len(repo.files()) == 22 + sidecars
+if HAS_PYARROW:
+    sidecar = read_sidecar(repo.files()[paths[0][:-4] + ".parquet"], git_blob_sha(repo.files()[paths[0]]))
+    assert sidecar["Candidate Email"].tolist() == ["old@x", "a@x", "b@x"]
+
+# Lost race: another commit lands before the ref update -> rebase and merge again
+def foreign_commit():
+    files = dict(repo.files())
+    files[paths[1]] = merge_results_csv(files[paths[1]], rows("foreign@x"))
+    repo.head = repo._commit(files, repo.head)
+repo.before_patch = foreign_commit
+calls = builder.api_calls
+save_results_to_github(rows("c@x"), path=paths[1], builder=builder)
+assert builder.commit()
+emails = pd.read_csv(pd.io.common.StringIO(repo.files()[paths[1]]))["Candidate Email"].tolist()
+assert sorted(emails) == ["a@x", "c@x", "foreign@x"], emails
+print(f"Rebased commit: {builder.api_calls - calls} API calls")
+
+print("\n✅ Commit builder tests passed")
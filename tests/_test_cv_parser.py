@@ -0,0 +1,73 @@
+"""Test the local layout-based CV parser on a synthetic template PDF (no API calls)."""
+import io, sys
+sys.path.insert(0, '.')
+import fitz
+from src.services.extractor import extract_text_from_pdf
+from src.services.cv_parser import parse_cv_layout, profile_for_prompt, is_usable, compact_prompt_chars, ParseCoverage
+
+# Build a template-style CV: large name, bold upper-case headers, bold entry titles
+doc = fitz.open()
+page = doc.new_page()
+y = 60
+def put(text, size=10, bold=False):
+    global y
+    page.insert_text((50, y), text, fontsize=size, fontname="hebo" if bold else "helv")
+    y += size + 8
+
+put("Budi Santoso", size=22, bold=True)
+put("budi@example.com | +62 812 0000 0000")
+put("WORK EXPERIENCE", size=13, bold=True)
+put("Data Analyst", bold=True)
+put("PT Kompas Gramedia")
+put("Jan 2021 - Present")
+put("- Built weekly revenue dashboards in Looker")
+put("Business Intelligence Intern", bold=True)
+put("Tokopedia")
+put("Jun 2019 - Dec 2019")
+put("- Cleaned marketplace datasets with SQL")
+put("EDUCATION", size=13, bold=True)
+put("Universitas Indonesia", bold=True)
+put("Bachelor of Science in Statistics, 2015 - 2019")
+put("SKILLS", size=13, bold=True)
+put("SQL, Python, Looker")
+pdf_bytes = doc.tobytes()
+
+text, layout = extract_text_from_pdf(io.BytesIO(pdf_bytes), with_layout=True)
+parsed = parse_cv_layout(layout)
+
+print("=== Profile ===")
+print(profile_for_prompt(parsed))
+print(f"Resolved: {parsed['resolved']}")
+print(f"Unresolved: {parsed['unresolved']}")
+print(f"Coverage: {parsed['coverage']:.0%}")
+
+profile = parsed["profile"]
+assert profile["candidate_name"] == "Budi Santoso", profile["candidate_name"]
+assert profile["latest_job_title"] == "Data Analyst", profile["latest_job_title"]
+assert "Kompas" in profile["latest_company"], profile["latest_company"]
+assert "Indonesia" in profile["education"]["university"], profile["education"]
+assert len(profile["work_experiences"]) == 2, profile["work_experiences"]
+assert is_usable(parsed)
+
+# Unstructured text (no layout) must fall back to the full-text prompt
+empty = parse_cv_layout([])
+assert not is_usable(empty)
+
+# The compact prompt only replaces CV text it is shorter than
+compact = compact_prompt_chars(parsed)
+print(f"Compact prompt: {compact} chars vs {len(text)} raw")
+assert is_usable(parsed, text) == (compact < len(text))
+assert not is_usable(parsed, text[:compact])
+long_text = text + "\n" + "- Maintained reporting pipelines\n" * 200
+assert is_usable(parsed, long_text)
+
+coverage = ParseCoverage("Data Analyst")
+coverage.record(text, parsed)
+coverage.record(long_text, parsed)
+coverage.record("plain text cv", empty)
+for line in coverage.summary_lines():
+    print(line)
+assert coverage.used == 1 + is_usable(parsed, text), coverage.used
+assert coverage.sent_chars <= coverage.raw_chars
+
+print("\n✅ CV parser tests passed")
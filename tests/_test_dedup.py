@@ -0,0 +1,57 @@
+"""Property test: vectorized _deduplicate_candidates matches the previous per-group implementation."""
+import random
+import sys
+sys.path.insert(0, '.')
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from src.repositories.github_utils import _deduplicate_candidates
+
+
+def legacy_deduplicate(df):
+    """The implementation _deduplicate_candidates replaced (split by email, drop_duplicates per group)."""
+    if df.empty:
+        return df
+    if "Candidate Email" in df.columns and "Job Position" in df.columns:
+        df = df.reset_index(drop=True)
+        has_email = df["Candidate Email"].notna() & (df["Candidate Email"] != "")
+        df_with_email = df.loc[has_email]
+        keep = df_with_email.drop_duplicates(subset=["Candidate Email", "Job Position"]).index.tolist()
+        df_without_email = df.loc[~has_email]
+        if "Candidate Name" in df.columns and "Phone" in df.columns:
+            keep += df_without_email.drop_duplicates(subset=["Candidate Name", "Phone", "Job Position"]).index.tolist()
+        elif "Candidate Name" in df.columns:
+            keep += df_without_email.drop_duplicates(subset=["Candidate Name", "Job Position"]).index.tolist()
+        else:
+            keep += df_without_email.index.tolist()
+        return df.loc[sorted(keep)].reset_index(drop=True)
+    elif "Filename" in df.columns and "Job Position" in df.columns:
+        return df.drop_duplicates(subset=["Filename", "Job Position"], keep="first")
+    return df
+
+
+EMAILS = ["ana@mail.com", "ANA@mail.com", "budi@mail.com", "", None, np.nan]
+NAMES = ["Ana", "Budi", "ana@mail.com", "", None]
+PHONES = ["0811", "0812", "", None]
+POSITIONS = ["Data Analyst", "Software Engineer", None]
+COLUMN_SETS = [
+    ["Candidate Name", "Candidate Email", "Phone", "Job Position"],
+    ["Candidate Name", "Candidate Email", "Job Position"],
+    ["Candidate Email", "Phone", "Job Position"],
+    ["Filename", "Job Position"],
+    ["Candidate Name", "Phone"],
+]
+
+rng = random.Random(47)
+for case in range(500):
+    columns = rng.choice(COLUMN_SETS)
+    n = rng.randint(0, 30)
+    pools = {"Candidate Name": NAMES, "Candidate Email": EMAILS, "Phone": PHONES,
+             "Job Position": POSITIONS, "Filename": ["a.pdf", "b.pdf", None]}
+    df = pd.DataFrame({column: [rng.choice(pools[column]) for _ in range(n)] for column in columns})
+    df["Match Score"] = range(n)
+    if rng.random() < 0.3:
+        df.index = [rng.randint(0, 5) for _ in range(n)]   # non-unique, unsorted index
+    assert_frame_equal(_deduplicate_candidates(df), legacy_deduplicate(df), obj=f"case {case}")
+
+print("\n✅ Dedup tests passed")
@@ -0,0 +1,52 @@
+"""Test export row-hash delta detection: inserted / changed / unchanged / removed (no network)."""
+import sys, tempfile
+from pathlib import Path
+sys.path.insert(0, '.')
+import pandas as pd
+from src.services.column_schema import to_canonical
+from src.repositories.export_manifest import (
+    DELTA_CHANGED, DELTA_INSERTED, DELTA_UNCHANGED, ExportManifest, export_row_keys
+)
+
+export = pd.DataFrame({
+    "First Name": ["Ana", "Budi", "Citra", ""],
+    "Last Name": ["Putri", "", "Sari", ""],
+    "Email Address": ["Ana@Mail.com", "", "citra@mail.com", ""],
+    "Mobile Number": ["0811", "0812", "", "0813"],
+    "Link Resume": [
+        "https://storage.googleapis.com/r/ana.pdf?X-Goog-Signature=aaa",
+        "https://storage.googleapis.com/r/budi.pdf?X-Goog-Signature=bbb",
+        "https://storage.googleapis.com/r/citra.pdf",
+        "",
+    ],
+})
+candidates = to_canonical(export)
+assert export_row_keys(candidates).tolist() == ["ana@mail.com", "budi_0812", "citra@mail.com", "unknown_0813"]
+
+directory = Path(tempfile.mkdtemp())
+manifest = ExportManifest("Reporter Nasional", manifest_dir=directory)
+kind, keys, hashes, removed = manifest.delta(candidates)
+assert (kind == DELTA_INSERTED).all() and removed == []
+
+# Screen the first three, then reload from disk
+manifest.remember(keys[:3], hashes[:3])
+manifest.save()
+manifest = ExportManifest("Reporter Nasional", manifest_dir=directory)
+assert manifest.path.name == "manifest_Reporter_Nasional.json", manifest.path
+
+# Next export: new download tokens (same resume path), Citra uploads a new
+# resume, Budi withdrew, the fourth row is still unscreened
+export2 = export.drop(index=1).copy()
+export2.loc[0, "Link Resume"] = "https://storage.googleapis.com/r/ana.pdf?X-Goog-Signature=zzz"
+export2.loc[2, "Link Resume"] = "https://storage.googleapis.com/r/citra_v2.pdf"
+kind, keys, hashes, removed = manifest.delta(to_canonical(export2))
+assert kind.tolist() == [DELTA_UNCHANGED, DELTA_CHANGED, DELTA_INSERTED], kind.tolist()
+assert removed == ["budi_0812"], removed
+
+# Changed rows are queued, the stored hash is kept until re-screened
+manifest.queue_changed(keys[kind == DELTA_CHANGED], hashes[kind == DELTA_CHANGED])
+manifest.forget(removed)
+assert "citra@mail.com" in manifest.changed and "budi_0812" not in manifest.rows
+assert manifest.delta(to_canonical(export2))[0].tolist() == [DELTA_UNCHANGED, DELTA_CHANGED, DELTA_INSERTED]
+
+print("\n✅ Export manifest tests passed")
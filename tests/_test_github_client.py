@@ -0,0 +1,74 @@
+"""Test the GitHub client: rate-limit waits, Retry-After, per-operation call counts (no network)."""
+import sys, time
+sys.path.insert(0, '.')
+import src.utils.github_client as gc
+from src.utils.github_client import GitHubClient, github_operation
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status_code, self.headers = status, headers or {}
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Returns the queued responses in order and records the calls."""
+    def __init__(self, *responses):
+        self.responses, self.calls = list(responses), []
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls.append((method, url, timeout))
+        return self.responses.pop(0)
+
+
+slept = []
+gc.time.sleep = slept.append
+client = GitHubClient(reserve=10)
+gc._CLIENT = client
+now = time.time()
+
+# 429 is retried after Retry-After; relative paths go to the API; every call has a timeout
+client.session = FakeSession(FakeResponse(429, {"Retry-After": "3"}), FakeResponse(200))
+assert client.get("/repos/o/r/contents/x").status_code == 200
+assert client.session.calls[0] == ("GET", "https://api.github.com/repos/o/r/contents/x", gc.GITHUB_TIMEOUT)
+assert slept == [3.0]
+
+# A rate-limit 403 waits for the reset; a plain 403 is returned as is
+client.session = FakeSession(FakeResponse(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(now + 20)}),
+                             FakeResponse(200, {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": str(now + 3600)}),
+                             FakeResponse(403))
+assert client.put("/x").status_code == 200 and 19 < slept[-1] <= 21
+assert client.get("/x").status_code == 403 and len(slept) == 2
+
+# Once the budget is down to the reserve, the next call sleeps until the reset
+client.session = FakeSession(FakeResponse(200, {"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": str(now + 30)}),
+                             FakeResponse(200))
+client.get("/x")
+assert len(slept) == 2 and client.remaining == 5
+client.get("/x")
+assert len(slept) == 3 and 29 < slept[-1] <= 31 and client.remaining is None
+
+# Gateway errors back off and give up after max_retries
+client.session = FakeSession(*[FakeResponse(502)] * (client.max_retries + 1))
+assert client.get("/x").status_code == 502 and slept[-client.max_retries:] == [1.0, 2.0, 4.0]
+
+
+# Calls are billed to the outermost operation
+@github_operation("inner")
+def inner():
+    client.get("/x")
+
+
+client.session = FakeSession(*[FakeResponse(200)] * 4)
+with github_operation("toggle_pooling"):
+    inner()
+    client.get("/x")
+inner()
+ops = client.stats()["operations"]
+assert ops["toggle_pooling"] == {"calls": 2, "runs": 1, "max_calls": 2}, ops
+assert ops["inner"] == {"calls": 1, "runs": 1, "max_calls": 1}, ops
+assert ops["other"]["calls"] == 2 + 3 + 2 + 4, ops   # retries count as calls
+
+print("\n✅ GitHub client tests passed")
@@ -0,0 +1,73 @@
+"""Test the conditional-GET cache: stale fallback only on transient failures, safe concurrent writes (no network)."""
+import sys, tempfile, threading
+from pathlib import Path
+sys.path.insert(0, '.')
+import requests
+import src.utils.http_cache as http_cache
+from src.utils.http_cache import cached_get
+
+http_cache.HTTP_CACHE_DIR = Path(tempfile.mkdtemp())
+URL = "https://example.com/sheet.csv"
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", etag='"v1"'):
+        self.status_code, self.content, self.headers = status_code, content, {"ETag": etag}
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses, self.requests = list(responses), []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def get(*responses, **kwargs):
+    return cached_get(URL, max_retries=2, retry_delay=0, session=FakeSession(*responses), **kwargs)
+
+
+assert get(FakeResponse(200, b"a,b\n")) == (b"a,b\n", "network")
+
+# 304 reuses the body; network errors, 429 and 5xx fall back to it
+session = FakeSession(FakeResponse(304))
+assert cached_get(URL, session=session) == (b"a,b\n", "not_modified")
+assert session.requests[0]["If-None-Match"] == '"v1"'
+assert get(requests.exceptions.ConnectionError(), FakeResponse(503)) == (b"a,b\n", "stale")
+assert get(FakeResponse(429), FakeResponse(502), stale_ok=False) == (None, None)
+
+# A definite answer is not retried and never served stale; a 404 forgets the copy
+session = FakeSession(FakeResponse(403), FakeResponse(200, b"x"))
+assert cached_get(URL, max_retries=2, retry_delay=0, session=session) == (None, None)
+assert len(session.requests) == 1
+assert get(FakeResponse(404)) == (None, None)
+assert get(requests.exceptions.Timeout(), requests.exceptions.Timeout()) == (None, None)
+
+# Threads writing one URL never share a temp file, and a body is only ever
+# served with its own validators
+errors = []
+
+def write(i):
+    try:
+        for j in range(20):
+            http_cache._write_cache(URL, FakeResponse(200, f"body {i} {j}".encode() * 100, etag=f'"{i}-{j}"'))
+    except Exception as e:
+        errors.append(e)
+
+threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+assert not errors, errors
+body, meta = http_cache._read_cache(URL)
+if body is not None:
+    i, j = meta["etag"].strip('"').split("-")
+    assert body == f"body {i} {j}".encode() * 100
+assert not list(http_cache.HTTP_CACHE_DIR.glob("*.tmp"))
+
+print("\n✅ HTTP cache tests passed")
@@ -0,0 +1,114 @@
+"""Test JobPositionsRepository: SHA-keyed cache, per-batch edits, one commit per flush (no network)."""
+import os, sys, json, base64, tempfile
+sys.path.insert(0, '.')
+import pandas as pd
+import src.repositories.job_positions_repository as jpr
+from src.repositories.job_positions_repository import JobPositionsRepository
+from src.repositories.results_sidecar import git_blob_sha
+
+remote = {"text": pd.DataFrame({
+    "Job ID": [1, 2],
+    "Job Position": ["Data Analyst", "Engineer"],
+    "Job Description": ["SQL", "Python"],
+    "Date Created": ["2026-01-01", "2026-01-02"],
+}).to_csv(index=False)}
+fetches, commits = [], []
+
+
+def fake_cached_get(url, **kwargs):
+    fetches.append(url)
+    text = remote["text"]
+    return json.dumps({"sha": git_blob_sha(text), "content": base64.b64encode(text.encode()).decode()}).encode(), "network"
+
+
+class FakeBuilder:
+    """Applies merges to `remote` on commit, with someone else's edit landing first."""
+    def __init__(self, message):
+        self.message, self.merges = message, []
+
+    def merge(self, path, merge_fn, on_commit=None):
+        self.merges.append((merge_fn, on_commit))
+
+    def commit(self):
+        remote["text"] += "9,Designer,Figma,2026-01-09\n"
+        for merge_fn, on_commit in self.merges:
+            remote["text"] = merge_fn(remote["text"])
+            on_commit()
+        commits.append(self.message)
+        return True
+
+
+jpr.cached_get = fake_cached_get
+jpr.GitCommitBuilder = FakeBuilder
+jpr._get_config = lambda key, default=None: "t" if key == "GITHUB_TOKEN" else default
+
+positions = JobPositionsRepository(revalidate_seconds=3600)
+changes = []
+positions.subscribe("test", lambda old, new: changes.append((old, new)))
+positions.subscribe("test", lambda old, new: changes.append((old, new)))   # replaces, not duplicates
+
+# Cached between revalidations; an unchanged SHA is not a change
+assert positions.load()["Job Position"].tolist() == ["Data Analyst", "Engineer"]
+positions.load()
+assert len(fetches) == 1
+positions.load(fresh=True)
+assert len(fetches) == 2 and changes == [] and positions.version == 0
+
+# Edits show up at once in their own batch and are committed together
+edits, other = positions.edits(), positions.edits()
+assert edits.set_pooling("Data Analyst", "Pooled")
+assert edits.update("Engineer", "Software Engineer", "Python, Go", "22")
+assert not edits.set_pooling("Nobody", "Pooled") and edits.pending == 2
+df = edits.load()
+assert df.set_index("Job Position").loc["Data Analyst", "Pooling Status"] == "Pooled"
+assert "Software Engineer" in df["Job Position"].tolist() and not commits
+assert "Software Engineer" not in positions.load()["Job Position"].tolist()
+
+# Another batch neither sees nor commits them
+assert other.delete("Data Analyst") and "Software Engineer" not in other.load()["Job Position"].tolist()
+other.discard()
+assert other.pending == 0 and other.flush() and not commits
+
+assert edits.flush()
+assert commits == ["📋 Update job_positions.csv (2 changes)"] and edits.pending == 0
+committed = pd.read_csv(pd.io.common.StringIO(remote["text"]), dtype=str).set_index("Job Position")
+assert committed.loc["Data Analyst", "Pooling Status"] == "Pooled"
+assert committed.loc["Software Engineer", "Job ID"] == "22"
+assert "Designer" in committed.index   # the concurrent edit survives
+assert positions.sha == git_blob_sha(remote["text"]) and len(changes) == 1 and positions.version == 1
+
+# Our own commit is already cached: revalidation sees the same SHA
+fetches.clear()
+positions.load(fresh=True)
+assert len(fetches) == 1 and len(changes) == 1
+assert edits.flush() and len(commits) == 1   # nothing staged
+
+# Staged edits are applied once per file version / edit, not on every load,
+# and an added position's duplicate-name warnings are logged once
+import src.repositories.github_utils as gu
+warnings = []
+gu._log_warning = warnings.append
+assert edits.add(pd.DataFrame([{"Job ID": "77", "Job Position": "Designer", "Job Description": "UI", "Date Created": "x"}]))
+for _ in range(3):
+    assert (edits.load()["Job Position"] == "Designer").sum() == 2
+assert len(warnings) == 1, warnings
+edits.discard()
+assert (edits.load()["Job Position"] == "Designer").sum() == 1
+
+# A failed commit keeps the edits staged
+FakeBuilder.commit = lambda self: False
+assert edits.delete("Designer") and not edits.flush() and edits.pending == 1
+edits.discard()
+
+# Without a token the local file is read and written
+jpr._get_config = lambda key, default=None: default
+with tempfile.TemporaryDirectory() as tmp:
+    local = JobPositionsRepository(path=os.path.join(tmp, "data", "job_positions.csv"))
+    local_edits = local.edits()
+    assert local.load().empty
+    assert local_edits.add(pd.DataFrame([{"Job ID": "5", "Job Position": "QA", "Job Description": "Tests", "Date Created": "x"}]))
+    assert local_edits.flush() and local.load()["Job Position"].tolist() == ["QA"]
+    assert local_edits.delete("QA") is True and local_edits.flush()
+    assert pd.read_csv(local.path).empty and local.load().empty
+
+print("\n✅ Job positions repository tests passed")
@@ -0,0 +1,53 @@
+"""Test the global LLM rate limiter: pacing and weighted sharing between positions (no API calls)."""
+import sys, threading, time
+sys.path.insert(0, '.')
+from src.utils.rate_limiter import WeightedRateLimiter, set_rate_owner
+from src.pipelines.stages import Stage, run_stages
+
+# 600 requests/minute = one slot every 0.1s, shared by all threads
+limiter = WeightedRateLimiter(600)
+limiter.set_weight("Priority", 3)
+stop = threading.Event()
+order = []
+
+def caller(owner):
+    while not stop.is_set():
+        limiter.acquire(owner)
+        order.append(owner)
+
+threads = [threading.Thread(target=caller, args=(owner,), daemon=True)
+           for owner in ["Priority", "Priority", "Other", "Other"]]
+start = time.monotonic()
+for t in threads:
+    t.start()
+time.sleep(2.05)
+stop.set()
+elapsed = time.monotonic() - start
+granted = dict(limiter.granted)
+print(f"Granted in {elapsed:.2f}s: {granted}")
+
+# Global pacing: ~21 slots in 2s regardless of the number of threads
+total = sum(granted.values())
+assert 18 <= total <= 23, total
+# Weighted share: ~3 Priority requests per Other request
+assert granted["Priority"] >= 2.5 * granted["Other"], granted
+assert granted["Other"] >= 3, granted
+
+# Stage worker threads inherit the caller's rate owner
+limiter = WeightedRateLimiter(6000)
+def call(job):
+    limiter.acquire()
+    return job
+
+def position(name):
+    set_rate_owner(name, limiter=limiter)
+    run_stages([{"error": None} for _ in range(5)], [Stage("llm", call, workers=2)])
+
+workers = [threading.Thread(target=position, args=(name,)) for name in ["A", "B"]]
+for t in workers:
+    t.start()
+for t in workers:
+    t.join()
+assert dict(limiter.granted) == {"A": 5, "B": 5}, dict(limiter.granted)
+
+print("\n✅ Rate limiter tests passed")
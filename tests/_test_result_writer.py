@@ -0,0 +1,78 @@
+"""Test BufferedResultWriter: row and age thresholds, timed flush while no rows arrive, journal replay (no network)."""
+import sys, time, tempfile
+from pathlib import Path
+sys.path.insert(0, '.')
+import src.repositories.result_writer as rw
+from src.repositories.result_writer import BufferedResultWriter
+
+saved = []
+rw.save_results_to_github = lambda df, **kwargs: saved.append(df["Candidate Name"].tolist()) or True
+journal_dir = Path(tempfile.mkdtemp())
+
+
+def row(name):
+    return {"Candidate Name": name, "Candidate Email": f"{name.lower()}@mail.com", "Job Position": "Data Analyst"}
+
+
+# Row threshold
+flushed = []
+writer = BufferedResultWriter("Data Analyst", flush_rows=2, flush_seconds=60, journal_dir=journal_dir,
+                              on_flush=lambda rows: flushed.append(len(rows)))
+assert writer.add(row("Ana")) and saved == []
+assert writer.add(row("Budi")) and saved == [["Ana", "Budi"]] and flushed == [2]
+assert writer.close() and not writer.journal_path.exists()
+
+# Age threshold: the timer flushes while the pipeline is stalled (no further add())
+saved.clear()
+writer = BufferedResultWriter("Data Analyst", flush_rows=100, flush_seconds=0.2, journal_dir=journal_dir)
+writer.add(row("Citra"))
+deadline = time.monotonic() + 3
+while writer.flush_count == 0 and time.monotonic() < deadline:
+    time.sleep(0.05)
+assert saved == [["Citra"]], saved
+assert writer.pending == 0 and writer.flush_count == 1
+
+# A failed timed flush keeps the rows buffered and journaled for the next flush
+rw.save_results_to_github = lambda df, **kwargs: False
+writer.add(row("Dewi"))
+time.sleep(0.5)
+assert writer.pending == 1 and writer.journal_path.exists()
+writer.close()
+
+# The next writer replays the journal
+rw.save_results_to_github = lambda df, **kwargs: saved.append(df["Candidate Name"].tolist()) or True
+replayed = BufferedResultWriter("Data Analyst", flush_rows=100, flush_seconds=60, journal_dir=journal_dir)
+assert replayed.buffered_rows() == [row("Dewi")]
+assert replayed.close() and saved[-1] == ["Dewi"] and not replayed.journal_path.exists()
+assert not replayed._timer.is_alive()
+
+# With a local store the journal is kept until the store's sync commit lands
+import pandas as pd
+from src.repositories.results_store import SQLiteResultsStore
+import src.repositories.results_store as rs
+rs.load_results_from_github = lambda path: pd.DataFrame()
+rs.get_results_blob_sha = lambda path: None
+store = SQLiteResultsStore(db_path=journal_dir / "results.db")
+saved = []
+writer = BufferedResultWriter("Data Analyst", flush_rows=1, journal_dir=journal_dir, store=store, on_saved=saved.extend)
+assert writer.add(row("Fajar")) and writer.close()
+assert writer.journal_path.exists() and store.dirty_positions() == {"Data Analyst": 1} and not saved
+
+
+class FakeBuilder:
+    def __init__(self):
+        self.callbacks = []
+
+    def merge(self, path, merge_fn, on_commit=None):
+        self.callbacks.append(on_commit)
+
+
+builder = FakeBuilder()
+store.sync(builder)
+assert writer.journal_path.exists() and not saved   # staged, not committed yet
+for on_commit in builder.callbacks:
+    on_commit()
+assert not writer.journal_path.exists() and store.dirty_positions() == {}
+assert [r["Candidate Name"] for r in saved] == ["Fajar"]
+
+print("\n✅ Result writer tests passed")
@@ -0,0 +1,66 @@
+"""Test large results files are read by blob SHA (streamed) and never overwritten unread (no network)."""
+import os, sys
+sys.path.insert(0, '.')
+import pandas as pd
+import src.repositories.github_utils as gu
+from src.utils.github_client import get_github_client
+
+csv_text = pd.DataFrame({"Candidate Name": ["Żaneta", "Budi"], "Candidate Email": ["z@x", "b@x"],
+                         "Job Position": ["P", "P"], "Date Applied": ["2026-01-01", "2026-01-02"],
+                         "Date Processed": ["x", "x"]}).to_csv(index=False)
+BLOB_SHA = "ab" * 20
+
+
+class FakeResponse:
+    def __init__(self, status, payload=None, body=b""):
+        self.status_code, self._payload, self._body, self.headers = status, payload, body, {}
+
+    def json(self):
+        return self._payload
+
+    def iter_content(self, chunk_size=1):
+        # Split every multi-byte character across chunks
+        return (self._body[i:i + 1] for i in range(len(self._body)))
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, blob_status=200):
+        self.blob_status, self.calls = blob_status, []
+
+    def request(self, method, url, timeout=None, headers=None, stream=False, **kwargs):
+        self.calls.append((method, url))
+        assert "raw.githubusercontent" not in url
+        if "/git/blobs/" in url:
+            assert url.endswith(BLOB_SHA) and headers["Accept"] == "application/vnd.github.raw" and stream
+            return FakeResponse(self.blob_status, body=csv_text.encode("utf-8"))
+        if method == "GET" and "/contents/" in url:
+            # Over the Contents API limit: no inline content
+            return FakeResponse(200, {"sha": BLOB_SHA, "size": 2_000_000, "content": "", "encoding": "none"})
+        if method == "PUT":
+            return FakeResponse(201, {})
+        return FakeResponse(404)
+
+
+os.environ["GITHUB_TOKEN"] = "t"
+client = get_github_client()
+
+client.session = FakeSession()
+assert gu._read_github_blob("o/r", BLOB_SHA, {"Authorization": "token t"}) == csv_text
+df = gu._load_results_csv("data/processed/results_P.csv")
+assert df["Candidate Name"].tolist() == ["Żaneta", "Budi"]
+
+# Save merges onto the blob it read, then PUTs
+assert gu.save_results_to_github(df.head(1).assign(**{"Candidate Name": "Citra", "Candidate Email": "c@x"}),
+                                 path="data/processed/results_P.csv")
+assert any(method == "PUT" for method, _ in client.session.calls)
+
+# If the existing file cannot be read, nothing is written
+gu.time.sleep = lambda seconds: None
+client.session = FakeSession(blob_status=500)
+assert not gu.save_results_to_github(df, path="data/processed/results_P.csv")
+assert not any(method == "PUT" for method, _ in client.session.calls)
+
+print("\n✅ Results blob tests passed")
@@ -0,0 +1,116 @@
+"""Test the SQLite results store: pull from GitHub, append/upsert by candidate key, sync (no network)."""
+import sys, tempfile
+from io import StringIO
+from pathlib import Path
+sys.path.insert(0, '.')
+import pandas as pd
+import src.repositories.results_store as rs
+from src.repositories.github_utils import RESULTS_COLUMNS
+from src.repositories.results_store import SQLiteResultsStore, result_row_keys
+
+
+def rows(*people, **values):
+    """people are (name, email, phone); values fill other columns."""
+    df = pd.DataFrame(people, columns=["Candidate Name", "Candidate Email", "Phone"])
+    df["Job Position"] = "Data Analyst"
+    df["Date Applied"] = "2026-01-01"
+    for column, value in values.items():
+        df[column] = value
+    return df
+
+
+remote = rows(("Ana", "ana@mail.com", "0811"), ("Budi", "", "0812"), **{"Match Score": 80, "Candidate Status": ""})
+remote.loc[1, "Date Applied"] = "2026-01-05"
+pulls = []
+rs.load_results_from_github = lambda path: pulls.append(path) or remote.copy()
+
+assert result_row_keys(remote).tolist() == ["ana@mail.com", "budi_0812"]
+
+store = SQLiteResultsStore(db_path=Path(tempfile.mkdtemp()) / "results.db")
+
+# First read pulls the position from GitHub; later reads are local
+df = store.load("Data Analyst")
+assert pulls == ["data/processed/results_Data_Analyst.csv"], pulls
+assert df["Candidate Name"].tolist() == ["Budi", "Ana"], df   # Date Applied, latest first
+assert df["Match Score"].dtype.kind in "if" and df["Candidate Status"].isna().all()
+assert list(df.columns) == RESULTS_COLUMNS
+store.load("Data Analyst")
+assert len(pulls) == 1 and store.dirty_positions() == {}
+
+# Once the check interval passes, a changed CSV on GitHub (e.g. new rows from
+# auto_screen) is pulled again; an unchanged one is not
+remote_sha = {"sha": "sha1"}
+rs.get_results_blob_sha = lambda path: remote_sha["sha"]
+rs.RESULTS_REMOTE_CHECK_SECONDS = 0
+checked = SQLiteResultsStore(db_path=Path(tempfile.mkdtemp()) / "results.db")
+pulls.clear()
+checked.load("Data Analyst")
+checked.load("Data Analyst")
+assert len(pulls) == 1
+original = remote
+remote = pd.concat([remote, rows(("Eko", "eko@mail.com", ""))], ignore_index=True)
+remote_sha["sha"] = "sha2"
+assert "Eko" in checked.load("Data Analyst")["Candidate Name"].tolist() and len(pulls) == 2
+remote = original
+rs.get_results_blob_sha = lambda path: None
+rs.RESULTS_REMOTE_CHECK_SECONDS = 3600
+
+# append keeps stored rows of the same candidate (email is case-insensitive)
+store.append("Data Analyst", rows(("Ana", "ANA@mail.com", "0811"), ("Citra", "citra@mail.com", ""), **{"Match Score": 10}))
+df = store.load("Data Analyst")
+assert len(df) == 3 and df.set_index("Candidate Name").loc["Ana", "Match Score"] == 80
+
+# upsert replaces them, only in the columns given
+store.upsert("Data Analyst", rows(("Budi", "", "0812"), **{"Candidate Status": "OK"})[["Candidate Name", "Candidate Email", "Phone", "Candidate Status"]])
+df = store.load("Data Analyst").set_index("Candidate Name")
+assert df.loc["Budi", "Candidate Status"] == "OK" and df.loc["Budi", "Match Score"] == 80
+assert store.dirty_positions() == {"Data Analyst": 2}
+
+# Columns outside RESULTS_COLUMNS survive the round trip
+store.upsert("Data Analyst", rows(("Citra", "citra@mail.com", ""), **{"Notes": "call back"}))
+assert store.load("Data Analyst").set_index("Candidate Name").loc["Citra", "Notes"] == "call back"
+
+
+class FakeBuilder:
+    def __init__(self):
+        self.merges = []
+
+    def merge(self, path, merge_fn, on_commit=None):
+        self.merges.append((path, merge_fn, on_commit))
+
+
+# sync stages one merge per dirty position; local rows win, GitHub-only rows are kept
+builder = FakeBuilder()
+assert store.sync(builder)
+(path, merge_fn, on_commit), = builder.merges
+assert path == "data/processed/results_Data_Analyst.csv"
+github_csv = pd.concat([remote, rows(("Dewi", "dewi@mail.com", ""))]).to_csv(index=False)
+merged = pd.read_csv(StringIO(merge_fn(github_csv))).set_index("Candidate Name")
+assert sorted(merged.index) == ["Ana", "Budi", "Citra", "Dewi"], merged.index
+assert merged.loc["Budi", "Candidate Status"] == "OK"
+assert store.dirty_positions() == {"Data Analyst": 3}
+on_commit()
+assert store.dirty_positions() == {}
+
+# Status updates are row-level upserts in the local store
+assert store.update_status("Data Analyst", "CITRA@mail.com", "Citra", {"Candidate Status": "Rejected"}, "r1")
+assert store.load("Data Analyst").set_index("Candidate Name").loc["Citra", "Candidate Status"] == "Rejected"
+assert not store.update_status("Data Analyst", "nobody@mail.com", "", {"Candidate Status": "OK"})
+
+# replace drops rows that are not in the new frame
+store.replace("Data Analyst", rows(("Ana", "ana@mail.com", "0811")))
+assert store.load("Data Analyst")["Candidate Name"].tolist() == ["Ana"]
+
+# A backend missing part of the interface fails when created, not on first use
+class PartialStore(rs.ResultsStore):
+    def load(self, job_position, fresh=False, columns=None):
+        return pd.DataFrame(columns=RESULTS_COLUMNS)
+
+try:
+    PartialStore()
+    raise AssertionError("incomplete ResultsStore was created")
+except TypeError:
+    pass
+rs.LocalCSVStore(), rs.GitHubCSVStore()
+
+print("\n✅ Results store tests passed")
@@ -0,0 +1,92 @@
+"""Test recruiter status patches: matching, ordering, local patch files, compaction (no network)."""
+import os, sys, tempfile
+sys.path.insert(0, '.')
+import pandas as pd
+os.environ.pop("GITHUB_TOKEN", None)
+import src.repositories.status_patches as sp
+from src.repositories.status_patches import (
+    append_status_patch, apply_status_patches, load_status_patches, make_status_patch, patch_dir,
+)
+
+results = pd.DataFrame({
+    "Candidate Name": ["Ana", "Budi", "Citra"],
+    "Candidate Email": ["Ana@Mail.com", "", "citra@mail.com"],
+    "Job Position": ["Data Analyst"] * 3,
+    "Candidate Status": [None, None, None],
+    "Shortlisted": [False, False, False],
+})
+
+assert patch_dir("Data Analyst") == "data/status_patches/patches_Data_Analyst"
+
+# Email matches case-insensitively, name is the fallback, later patches win
+patches = [
+    make_status_patch("Data Analyst", "ana@mail.com ", "Ana", {"Candidate Status": "OK", "Shortlisted": True}, "r1"),
+    make_status_patch("Data Analyst", None, "Budi", {"Candidate Status": "Rejected", "Match Score": 1}, "r2"),
+    make_status_patch("Data Analyst", "ana@mail.com", "Ana", {"Candidate Status": "Rejected"}, "r2"),
+    make_status_patch("Other Position", "citra@mail.com", "Citra", {"Candidate Status": "OK"}, "r1"),
+]
+assert "Match Score" not in patches[1]["fields"]
+patched = apply_status_patches(results, patches)
+assert patched["Candidate Status"].tolist() == ["Rejected", "Rejected", None], patched["Candidate Status"].tolist()
+assert patched["Shortlisted"].tolist() == [True, False, False]
+assert results["Candidate Status"].isna().all()   # input frame untouched
+
+# Without a token each patch is a local file
+cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp())
+try:
+    assert append_status_patch(patches[0]) == (True, 1)
+    assert append_status_patch(patches[2]) == (True, 2)
+    assert [p["id"] for p in load_status_patches("Data Analyst")] == [patches[0]["id"], patches[2]["id"]]
+finally:
+    os.chdir(cwd)
+
+# Compaction applies the patches to the CSV
+csv = sp._apply_to_csv(results.to_csv(index=False), patches[:2])
+assert pd.read_csv(pd.io.common.StringIO(csv))["Candidate Status"].tolist()[:2] == ["OK", "Rejected"]
+
+# On GitHub patches are read from the directory listing, in file-name order,
+# and each patch blob is downloaded once
+import json
+directory = patch_dir("Data Analyst")
+listing = {
+    "00000000000000000002-b.json": {"sha": "sha-b"},
+    "00000000000000000001-a.json": {"sha": "sha-a"},
+    "notes.txt": {"sha": "sha-n"},
+}
+blobs = {"sha-a": json.dumps(patches[0]), "sha-b": json.dumps(patches[2])}
+downloads = []
+listed = {"stale": False}
+sp._get_config = lambda key, default=None: "token" if key == "GITHUB_TOKEN" else default
+sp._list_github_dir = lambda d, headers, repo, branch: (listing if d == directory else None, listed["stale"])
+sp._read_github_blob = lambda repo, sha, headers: downloads.append(sha) or blobs[sha]
+assert [p["id"] for p in load_status_patches("Data Analyst")] == [patches[0]["id"], patches[2]["id"]]
+assert [p["id"] for p in load_status_patches("Data Analyst")] == [patches[0]["id"], patches[2]["id"]]
+assert sorted(downloads) == ["sha-a", "sha-b"]
+
+# A stale listing is never used: it may still hold compacted patches
+listed["stale"] = True
+assert load_status_patches("Data Analyst") == []
+listed["stale"] = False
+
+
+class FakeBuilder:
+    def __init__(self):
+        self.merges, self.deletes = [], []
+
+    def merge(self, path, merge_fn, on_commit=None):
+        self.merges.append((path, merge_fn, on_commit))
+
+    def delete(self, path, on_commit=None):
+        self.deletes.append(path)
+
+
+# Compaction merges the CSV and deletes exactly the patch files it applied
+builder = FakeBuilder()
+assert sp.compact_status_patches("Data Analyst", builder)
+(path, merge_fn, on_commit), = builder.merges
+assert path == "data/processed/results_Data_Analyst.csv" and on_commit is sp.clear_results_cache
+assert pd.read_csv(pd.io.common.StringIO(merge_fn(results.to_csv(index=False))))["Candidate Status"].tolist()[0] == "Rejected"
+assert builder.deletes == [f"{directory}/00000000000000000001-a.json", f"{directory}/00000000000000000002-b.json"]
+
+print("\n✅ Status patch tests passed")